@@ -0,0 +1,41 @@
+"""
+Benchmark of the import time of the package
+
+The package is imported in a new interpreter with -X importtime and the modules with the largest cumulative import time are printed
+
+    python benchmarks/bench_import_time.py --top 20
+"""
+import argparse
+import subprocess
+import sys
+
+import pandas as pd
+
+
+def ImportTime(Module='openTEPES'):
+    # import time of every module in microseconds as reported by the interpreter in the standard error
+    Output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {Module}'], capture_output=True, text=True, check=True).stderr
+    Rows   = []
+    for Line in Output.splitlines():
+        if not Line.startswith('import time:') or 'self [us]' in Line:
+            continue
+        Self, Cumulative, Name = Line[len('import time:'):].split('|')
+        Rows.append((Name.strip(), (len(Name) - len(Name.lstrip()) - 1) // 2, int(Self), int(Cumulative)))
+    return pd.DataFrame(Rows, columns=['Module', 'Level', 'Self [us]', 'Cumulative [us]'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the import time of the package')
+    parser.add_argument('--module', type=str, default='openTEPES')
+    parser.add_argument('--top',    type=int, default=20)
+    args = parser.parse_args()
+
+    ImportTimes = ImportTime(args.module)
+    Total       = ImportTimes.loc[ImportTimes['Module'] == args.module, 'Cumulative [us]'].max()
+    print(f'Import time of {args.module}: {Total*1e-6:.3f} s')
+    # modules imported by the modules of the package, their submodules are included in the cumulative time
+    print(ImportTimes[ImportTimes['Level'] == 1].nlargest(args.top, 'Cumulative [us]').to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the phases of the model over the bundled cases
+
+Every case is copied to a temporary folder and solved with a free solver. The time of the input data, the variables,
+each model formulation function (summed over the stages), the LP file writing, the problem solving and each output
+result family, as recorded by openTEPES_run, is appended to a history file with the commit, so the phases of the current commit are compared with
+the last commit measured in the same machine
+
+    python benchmarks/bench_phases.py --case openTEPES/9n openTEPES/RTS24 --solver appsi_highs --fail-on-regression
+"""
+import argparse
+import datetime
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from   pyomo.opt import SolverFactory
+
+import openTEPES.openTEPES as oT
+
+Cases   = ['openTEPES/9n', 'openTEPES/RTS24', 'openTEPES/sSEP', 'openTEPES/RTS-GMLC', 'cases/TSO-DSO_coordination/RTS24a']
+Solvers = ['appsi_highs', 'cbc', 'glpk']
+
+
+def AvailableSolver():
+    # first free solver found in the machine
+    for SolverName in Solvers:
+        if SolverFactory(SolverName).available(exception_flag=False):
+            return SolverName
+    sys.exit('None of the solvers '+', '.join(Solvers)+' is available')
+
+
+def PhaseTimes(Case, SolverName):
+    # wall time of the phases recorded by openTEPES_run, the formulation functions are summed over the stages
+    with tempfile.TemporaryDirectory() as DirName:
+        CaseName = os.path.basename(Case)
+        shutil.copytree(Case, os.path.join(DirName, CaseName))
+        Results   = oT.openTEPES_run(DirName, CaseName, SolverName, 'Yes', 'No')
+        StartTime = time.perf_counter()
+        Results.model.write(os.path.join(DirName, CaseName, 'openTEPES_'+CaseName+'.lp'), io_options={'symbolic_solver_labels': True})
+        WritingLPFileTime = time.perf_counter() - StartTime
+    Times = Results.phases.groupby('Phase', sort=False)['Wall [s]'].sum().to_dict()
+    Times['WritingLPFile'] = WritingLPFileTime
+    return Times
+
+
+def Commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the phases of the model over the bundled cases')
+    parser.add_argument('--case',      type=str,   nargs='+', default=[Case for Case in Cases if os.path.isdir(Case)])
+    parser.add_argument('--solver',    type=str,   default=None)
+    parser.add_argument('--repeat',    type=int,   default=1)
+    parser.add_argument('--history',   type=str,   default=os.path.join('benchmarks', 'results', 'phases.csv'))
+    parser.add_argument('--threshold', type=float, default=0.2,  help='relative increase of the time of a phase reported as a regression')
+    parser.add_argument('--min-time',  type=float, default=0.1,  help='phases faster than this time [s] are not compared')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    SolverName = args.solver or AvailableSolver()
+
+    # the minimum time over the repetitions is kept for every phase
+    Rows = []
+    for Case in args.case:
+        Times = pd.DataFrame([PhaseTimes(Case, SolverName) for i in range(args.repeat)]).min()
+        Rows += [(os.path.basename(Case), Phase, Time) for Phase,Time in Times.items()]
+    Current = pd.DataFrame(Rows, columns=['Case', 'Phase', 'Time [s]'])
+    Current.insert(0, 'Solver',  SolverName)
+    Current.insert(0, 'Machine', platform.node())
+    Current.insert(0, 'Commit',  Commit())
+    Current.insert(0, 'Date',    datetime.datetime.now().isoformat(timespec='seconds'))
+
+    # comparison with the last commit measured in the same machine with the same solver
+    Key = ['Machine', 'Solver', 'Case', 'Phase']
+    if os.path.exists(args.history):
+        History  = pd.read_csv(args.history, dtype={'Commit': str})
+        Previous = History[(History['Commit'] != Current['Commit'].iloc[0]) & History['Machine'].isin(Current['Machine']) & History['Solver'].isin(Current['Solver'])]
+        Previous = Previous.sort_values('Date').groupby(Key)[['Commit', 'Time [s]']].last()
+    else:
+        History  = pd.DataFrame(columns=Current.columns)
+        Previous = pd.DataFrame(columns=['Commit', 'Time [s]'], index=pd.MultiIndex.from_arrays([[] for Level in Key], names=Key))
+    Comparison = Current.set_index(Key).join(Previous, rsuffix=' previous')
+    Comparison['Ratio'] = Comparison['Time [s]'] / Comparison['Time [s] previous']
+    print(Comparison[['Time [s]', 'Commit previous', 'Time [s] previous', 'Ratio']].droplevel([0, 1]).to_string(float_format='{:.3f}'.format))
+
+    os.makedirs(os.path.dirname(args.history) or '.', exist_ok=True)
+    pd.concat([History, Current]).to_csv(args.history, index=False)
+
+    Regressions = Comparison[(Comparison['Ratio'] > 1.0 + args.threshold) & (Comparison['Time [s]'] > args.min_time)]
+    if len(Regressions):
+        print('Phases slower than the previous commit:')
+        print(Regressions[['Time [s]', 'Commit previous', 'Time [s] previous', 'Ratio']].droplevel([0, 1]).to_string(float_format='{:.3f}'.format))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
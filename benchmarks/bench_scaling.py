@@ -0,0 +1,56 @@
+"""
+Benchmark of the scaling of the phases of the model with the size of synthetic cases
+
+Synthetic cases with an increasing number of nodes are generated and solved, and the time of building the model
+(input data, variables and model formulation), solving it and writing the results is plotted against the size
+
+    python benchmarks/bench_scaling.py --nodes 10 20 50 100 --load-levels 168 --solver appsi_highs
+"""
+import argparse
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from openTEPES.openTEPES_CaseGenerator import CaseGenerator
+from bench_phases import AvailableSolver, PhaseTimes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the scaling of the phases of the model with the size of synthetic cases')
+    parser.add_argument('--nodes',       type=int, nargs='+', default=[10, 20, 50, 100])
+    parser.add_argument('--load-levels', type=int, default=168)
+    parser.add_argument('--scenarios',   type=int, default=1)
+    parser.add_argument('--reservoirs',  type=int, default=0)
+    parser.add_argument('--pipelines',   type=int, default=0)
+    parser.add_argument('--solver',      type=str, default=None)
+    parser.add_argument('--output',      type=str, default=os.path.join('benchmarks', 'results', 'scaling'))
+    args = parser.parse_args()
+
+    SolverName = args.solver or AvailableSolver()
+
+    Rows = {}
+    with tempfile.TemporaryDirectory() as DirName:
+        for Nodes in args.nodes:
+            CaseName    = 'Synthetic'+str(Nodes)
+            Rows[Nodes] = PhaseTimes(CaseGenerator(DirName, CaseName, Nodes=Nodes, Reservoirs=args.reservoirs, Pipelines=args.pipelines, Scenarios=args.scenarios, LoadLevels=args.load_levels), SolverName)
+    Times = pd.DataFrame(Rows).T.rename_axis('Nodes').fillna(0.0)
+
+    # the phases are grouped in building, solving, and writing the model and its results
+    Results  = [Phase for Phase in Times.columns if Phase.endswith('Results')]
+    Building = [Phase for Phase in Times.columns if Phase not in Results + ['ProblemSolving', 'WritingLPFile']]
+    Summary  = pd.DataFrame({'Building': Times[Building].sum(axis=1), 'WritingLPFile': Times['WritingLPFile'], 'ProblemSolving': Times['ProblemSolving'], 'Results': Times[Results].sum(axis=1)})
+    print(Summary.to_string(float_format='{:.3f}'.format))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    Times.to_csv(args.output+'.csv')
+    Axes = Summary.plot(marker='o', logx=True, logy=True)
+    Axes.set_ylabel('Time [s]')
+    plt.savefig(args.output+'.png', bbox_inches='tight')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+"""
+Benchmark of the reliability and operation summary results
+
+The case is solved once, without writing the results, and then both writers are timed in full, writing the same
+files: the former ones, which call the variables and the string keyed duals one element at a time, and the current
+ones, which aggregate the solution snapshot with groupby. The former writers are kept here verbatim from the release
+before the vectorization, and they are given the duals as they were stored then, a dictionary keyed by the name of
+the constraint and its index. The snapshot, the concatenation of the duals and that dictionary are built once per run,
+before the results are written, so they are timed apart and not charged to any writer.
+
+No timings are recorded in the repository: the benchmark needs pyomo and a solver, and the speedups must be
+measured running it on the case of interest, e.g.
+
+    python benchmarks/bench_summary_results.py --case RTS-GMLC --solver appsi_highs
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+import openTEPES
+from openTEPES.openTEPES_OutputResults import SolutionSnapshot, DualsConcatenation, ReliabilityResults, OperationSummaryResults
+
+
+def StringKeyDuals(mTEPES):
+    # duals keyed by the name of the constraint and its index, e.g. "eBalance_2030_sc01_st1('01-01 00:00:00+01:00', 'Node_1')", as stored before
+    Duals = {}
+    for Family,Stages in mTEPES.pDuals.items():
+        for Stage,Values in Stages.items():
+            if Stage is None:
+                continue
+            Name = '_'.join([Family] + [str(Element) for Element in Stage])
+            for Index,Value in Values.items():
+                Duals[Name+str(Index[3:] if len(Index) > 4 else Index[3])] = Value
+    return Duals
+
+
+def LegacyReliabilityResults(DirName, CaseName, OptModel, mTEPES):
+    # %% outputting the reliability indexes
+    _path = os.path.join(DirName, CaseName)
+    StartTime = time.time()
+
+    # generators to nodes (r2n)
+    r2n = defaultdict(list)
+    for nd,re in mTEPES.nd*mTEPES.re:
+        if (nd,re) in mTEPES.n2g:
+            r2n[nd].append(re)
+
+    pDemand        = pd.Series(data=[mTEPES.pDemand  [p,sc,n,nd] for p,sc,n,nd in mTEPES.psnnd ], index=pd.Index(mTEPES.psnnd))
+    ExistCapacity  = [(p,sc,n,g) for p,sc,n,g in mTEPES.psng if g not in mTEPES.gc]
+    pExistMaxPower = pd.Series(data=[mTEPES.pMaxPower[p,sc,n,g ] for p,sc,n,g  in ExistCapacity], index=pd.Index(ExistCapacity))
+    if len(mTEPES.gc):
+        CandCapacity  = [(p,sc,n,g) for p,sc,n,g in mTEPES.psng if g in mTEPES.gc]
+        pCandMaxPower = pd.Series(data=[mTEPES.pMaxPower[p,sc,n,g ] * OptModel.vGenerationInvest[p,g]() for p,sc,n,g in CandCapacity], index=pd.Index(CandCapacity))
+        pMaxPower     = pd.concat([pExistMaxPower, pCandMaxPower])
+    else:
+        pMaxPower     = pExistMaxPower
+
+    # Determination of the net demand
+    OutputToFile1 = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,re]() for re in r2n[nd]) for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
+    OutputToFile2 = pd.Series(data=[      mTEPES.pDemand     [p,sc,n,nd]                      for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
+    OutputToFile  = OutputToFile2 - OutputToFile1
+    OutputToFile  *= 1e3
+    OutputToFile  = OutputToFile.to_frame(name='MW'  )
+    OutputToFile.reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkNetDemand_'+CaseName+'.csv', sep=',')
+    OutputToFile.reset_index().pivot_table(index=['level_0','level_1','level_2'],                    values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetDemand_'       +CaseName+'.csv', sep=',')
+
+    # Determination of the index: Reserve Margin
+    OutputToFile1 = pd.Series(data=[0.0 for p,sc in mTEPES.ps], index=mTEPES.ps)
+    OutputToFile2 = pd.Series(data=[0.0 for p,sc in mTEPES.ps], index=mTEPES.ps)
+    for p,sc in mTEPES.ps:
+        OutputToFile1[p,sc] = pMaxPower.loc[(p,sc)].reset_index().pivot_table(index=['level_0'], values=0, aggfunc='sum').max().iloc[0]
+        OutputToFile2[p,sc] =   pDemand.loc[(p,sc)].reset_index().pivot_table(index=['level_0'], values=0, aggfunc='sum').max().iloc[0]
+    ReserveMargin1 =  OutputToFile1 - OutputToFile2
+    ReserveMargin2 = (OutputToFile1 - OutputToFile2)/OutputToFile2
+    ReserveMargin1.to_frame(name='MW'  ).rename_axis(['Period', 'Scenario'], axis=0).to_csv(_path+'/oT_Result_ReserveMarginPower_'  +CaseName+'.csv', sep=',')
+    ReserveMargin2.to_frame(name='p.u.').rename_axis(['Period', 'Scenario'], axis=0).to_csv(_path+'/oT_Result_ReserveMarginPerUnit_'+CaseName+'.csv', sep=',')
+
+    # Determination of the index: Largest Unit
+    OutputToFile = pd.Series(data=[0.0 for p,sc in mTEPES.ps], index=mTEPES.ps)
+    for p,sc in mTEPES.ps:
+        OutputToFile[p,sc] = pMaxPower.loc[(p,sc)].reset_index().pivot_table(index=['level_1'], values=0, aggfunc='sum').max().iloc[0]
+
+    LargestUnit  = ReserveMargin1/OutputToFile
+    LargestUnit.to_frame(name='p.u.').rename_axis(['Period', 'Scenario'], axis=0).to_csv(_path+'/oT_Result_LargestUnitPerUnit_'+CaseName+'.csv', index=True, sep=',')
+
+    WritingResultsTime = time.time() - StartTime
+    print('Writing          reliability indexes   ... ', round(WritingResultsTime), 's')
+
+
+def LegacyOperationSummaryResults(DirName, CaseName, OptModel, mTEPES):
+    #%% outputting the generation operation
+    _path = os.path.join(DirName, CaseName)
+    StartTime = time.time()
+
+    # %%  Power balance per period, scenario, and load level
+    # incoming and outgoing lines (lin) (lout) and lines with losses (linl) (loutl)
+    lin   = defaultdict(list)
+    linl  = defaultdict(list)
+    lout  = defaultdict(list)
+    loutl = defaultdict(list)
+    for ni,nf,cc in mTEPES.la:
+        lin  [nf].append((ni,cc))
+        lout [ni].append((nf,cc))
+    for ni,nf,cc in mTEPES.ll:
+        linl [nf].append((ni,cc))
+        loutl[ni].append((nf,cc))
+
+    # generators to nodes (g2n)
+    g2n = defaultdict(list)
+    for nd,g in mTEPES.n2g:
+        g2n[nd].append(g)
+
+    # Ratio Fossil Fuel Generation/Total Generation [%]
+    TotalGeneration       = sum(OptModel.vTotalOutput[p,sc,n,g ]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng                 )
+    FossilFuelGeneration  = sum(OptModel.vTotalOutput[p,sc,n,g ]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng if g in mTEPES.t)
+    # Ratio Total Investments [%]
+    TotalInvestmentCost   = sum(mTEPES.pDiscountedWeight[p] *                                   OptModel.vTotalFCost      [p]()          for p          in mTEPES.p  if len(mTEPES.gc) + len(mTEPES.gd) + len(mTEPES.lc))
+    GenInvestmentCost     = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pGenInvestCost[gc]       * OptModel.vGenerationInvest[p,gc]()       for p,gc       in mTEPES.pgc)
+    GenRetirementCost     = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pGenRetireCost[gd]       * OptModel.vGenerationRetire[p,gd]()       for p,gd       in mTEPES.pgd)
+    if mTEPES.pIndHydroTopology == 1:
+        RsrInvestmentCost = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pRsrInvestCost[rc]       * OptModel.vReservoirInvest [p,rc]()       for p,rc       in mTEPES.prc)
+    else:
+        RsrInvestmentCost = 0.0
+    NetInvestmentCost     = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pNetFixedCost [ni,nf,cc] * OptModel.vNetworkInvest   [p,ni,nf,cc]() for p,ni,nf,cc in mTEPES.plc)
+    # Ratio Generation Investment cost/ Generation Installed Capacity [MEUR-MW]
+    GenInvCostCapacity    = sum(mTEPES.pGenInvestCost[gc] * OptModel.vGenerationInvest[p,gc]()/mTEPES.pRatedMaxPower[gc]               for p,gc       in mTEPES.pgc if mTEPES.pRatedMaxPower[gc])
+    # Ratio Additional Transmission Capacity-Length [MW-km]
+    NetCapacityLength     = sum(mTEPES.pLineNTCMax[ni,nf,cc]*OptModel.vNetworkInvest[p,ni,nf,cc]()/mTEPES.pLineLength[ni,nf,cc]()      for p,ni,nf,cc in mTEPES.plc)
+    # Ratio Network Investment Cost/Variable RES Injection [EUR/MWh]
+    if len(mTEPES.gc) and sum(OptModel.vTotalOutput[p,sc,n,gc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,gc in mTEPES.psngc if gc in mTEPES.re):
+        NetInvCostVRESInsCap = NetInvestmentCost*1e6/sum(OptModel.vTotalOutput[p,sc,n,gc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,gc in mTEPES.psngc if gc in mTEPES.re)
+    else:
+        NetInvCostVRESInsCap = 0.0
+    # Rate of return for VRE technologies
+    VRETechRevenue     = sum(mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vTotalOutput[p,sc,n,gc]() for p,sc,st,n,nd,gc in mTEPES.ps*mTEPES.s2n*mTEPES.nd*mTEPES.gc if (nd,gc) in mTEPES.n2g and gc in mTEPES.re and sum(1 for g in g2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd]))
+    VREInvCostCapacity = sum(mTEPES.pGenInvestCost[gc]*OptModel.vGenerationInvest[p,gc]() for p,gc in mTEPES.pgc if gc in mTEPES.re)
+
+    K1     = pd.Series(data={'Ratio Fossil Fuel Generation/Total Generation [%]'                       : FossilFuelGeneration / TotalGeneration    *1e2}).to_frame(name='Value')
+    if GenInvestmentCost:
+        K2 = pd.Series(data={'Ratio Generation Investment Cost/Total Investment Cost [%]'              : GenInvestmentCost    / TotalInvestmentCost*1e2}).to_frame(name='Value')
+    else:
+        K2 = pd.Series(data={'Ratio Generation Investment Cost/Total Investment Cost [%]'              : 0.0                                           }).to_frame(name='Value')
+    if GenRetirementCost:
+        K3 = pd.Series(data={'Ratio Generation Retirement Cost/Total Investment Cost [%]'              : GenRetirementCost    / TotalInvestmentCost*1e2}).to_frame(name='Value')
+    else:
+        K3 = pd.Series(data={'Ratio Generation Retirement Cost/Total Investment Cost [%]'              : 0.0                                           }).to_frame(name='Value')
+    if RsrInvestmentCost:
+        K4 = pd.Series(data={'Ratio Reservoir Investment Cost/Total Investment Cost [%]'               : RsrInvestmentCost    / TotalInvestmentCost*1e2}).to_frame(name='Value')
+    else:
+        K4 = pd.Series(data={'Ratio Reservoir Investment Cost/Total Investment Cost [%]'               : 0.0                                           }).to_frame(name='Value')
+    if NetInvestmentCost:
+        K5 = pd.Series(data={'Ratio Network Investment Cost/Total Investment Cost [%]'                 : NetInvestmentCost    / TotalInvestmentCost*1e2}).to_frame(name='Value')
+    else:
+        K5 = pd.Series(data={'Ratio Network Investment Cost/Total Investment Cost [%]'                 : 0.0                                           }).to_frame(name='Value')
+    if GenInvCostCapacity:
+        K6 = pd.Series(data={'Ratio Generation Investment Cost/Additional Installed Capacity [MEUR-MW]': GenInvCostCapacity   / 1e3                    }).to_frame(name='Value')
+    else:
+        K6 = pd.Series(data={'Ratio Generation Investment Cost/Additional Installed Capacity [MEUR-MW]': 0.0                                           }).to_frame(name='Value')
+    if NetCapacityLength:
+        K7 = pd.Series(data={'Ratio Additional Transmission Capacity/Line Length [MW-km]'              : NetCapacityLength    * 1e3                    }).to_frame(name='Value')
+    else:
+        K7 = pd.Series(data={'Ratio Additional Transmission Capacity/Line Length [MW-km]'              : 0.0                                           }).to_frame(name='Value')
+    if NetInvCostVRESInsCap:
+        K8 = pd.Series(data={'Ratio Network Investment Cost/Variable RES Installed Capacity [EUR/MWh]' : NetInvCostVRESInsCap * 1e3                    }).to_frame(name='Value')
+    else:
+        K8 = pd.Series(data={'Ratio Network Investment Cost/Variable RES Installed Capacity [EUR/MWh]' : 0.0                                           }).to_frame(name='Value')
+    if VREInvCostCapacity:
+        K9 = pd.Series(data={'Rate of return for VRE technologies [%]'                                 : VRETechRevenue       / VREInvCostCapacity*1e2 }).to_frame(name='Value')
+    else:
+        K9 = pd.Series(data={'Rate of return for VRE technologies [%]'                                 : 0.0                                           }).to_frame(name='Value')
+
+    OutputResults = pd.concat([K1, K2, K3, K4, K5, K6, K7, K8, K9], axis=0)
+    OutputResults.to_csv(_path+'/oT_Result_SummaryKPIs_'+CaseName+'.csv', sep=',', index=True)
+
+    # LCOE per technology
+    if len(mTEPES.gc):
+        GenTechInvestCost = pd.Series(data=[sum(OptModel.vGenerationInvest[p,     gc]()*mTEPES.pGenInvestCost    [gc]   for p,     gc in mTEPES.pgc   if (gt,gc) in mTEPES.t2g) for gt in mTEPES.gt], index=mTEPES.gt)
+        GenTechInjection  = pd.Series(data=[sum(OptModel.vTotalOutput     [p,sc,n,gc]()*mTEPES.pLoadLevelDuration[n ]() for p,sc,n,gc in mTEPES.psngc if (gt,gc) in mTEPES.t2g) for gt in mTEPES.gt], index=mTEPES.gt)
+        GenTechInvestCost *= 1e3
+        LCOE = GenTechInvestCost.div(GenTechInjection).to_frame(name='EUR/MWh')
+        LCOE.rename_axis(['Technology'], axis=0).to_csv(_path+'/oT_Result_TechnologyLCOE_'+CaseName+'.csv', index=True, sep=',')
+
+    WritingResultsTime = time.time() - StartTime
+    StartTime = time.time()
+    print('Writing          KPI summary results   ... ', round(WritingResultsTime), 's')
+
+    StartTime = time.time()
+    n2g = pd.DataFrame(mTEPES.n2g).set_index(1)
+    z2g = pd.DataFrame(mTEPES.z2g).set_index(1)
+    a2g = pd.DataFrame(mTEPES.a2g).set_index(1)
+    r2g = pd.DataFrame(mTEPES.r2g).set_index(1)
+    t2g = pd.DataFrame(mTEPES.t2g).set_index(1)
+    OutputToFile01 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]()                                                                      for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='EnergyProduction [GWh]' )
+    OutputToFile02 = pd.Series(data=[OptModel.vESSTotalCharge[p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]()                                           if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='EnergyConsumption [GWh]')
+    OutputToFile03 = pd.Series(data=[n2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Node'                   )
+    OutputToFile04 = pd.Series(data=[z2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Zone'                   )
+    OutputToFile05 = pd.Series(data=[a2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Area'                   )
+    OutputToFile06 = pd.Series(data=[r2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Region'                 )
+    OutputToFile07 = pd.Series(data=[t2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Technology'             )
+    OutputToFile08 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]()*mTEPES.pEmissionVarCost[p,sc,n,g]/mTEPES.pCO2Cost()                  for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Emissions [MtCO2]'      )
+    OutputToFile09 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g].ub                                                                                                    for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='MaxPower [MW]'          )
+    OutputToFile10 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g].lb                                                                                                    for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='MinPower [MW]'          )
+    OutputToFile11 = pd.Series(data=[mTEPES.pLoadLevelDuration[n]()                                                                                                           for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='LoadLevelDuration [h]'  )
+    OutputToFile12 = pd.Series(data=[OptModel.vCommitment    [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Commitment {0,1}'       )
+    OutputToFile13 = pd.Series(data=[OptModel.vStartUp       [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='StartUp {0,1}'          )
+    OutputToFile14 = pd.Series(data=[OptModel.vShutDown      [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Shutdown {0,1}'         )
+    OutputToFile15 = pd.Series(data=[OptModel.vReserveUp     [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ReserveUp [MW]'         )
+    OutputToFile16 = pd.Series(data=[OptModel.vReserveDown   [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ReserveDown [MW]'       )
+    OutputToFile17 = pd.Series(data=[OptModel.vESSReserveUp  [p,sc,n,g]()                                                                          if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ESSReserveUp [MW]'      )
+    OutputToFile18 = pd.Series(data=[OptModel.vESSReserveDown[p,sc,n,g]()                                                                          if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ESSReserveDown [MW]'    )
+    OutputToFile19 = pd.Series(data=[OptModel.vESSSpillage   [p,sc,n,g]()                                                                          if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ESSSpillage [GWh]'      )
+
+    OutputToFile15 *= 1e3
+    OutputToFile16 *= 1e3
+    OutputToFile17 *= 1e3
+    OutputToFile18 *= 1e3
+
+    OutputResults   = pd.concat([OutputToFile01, OutputToFile02, OutputToFile03, OutputToFile04, OutputToFile05, OutputToFile06, OutputToFile07, OutputToFile08, OutputToFile09,
+                                 OutputToFile11, OutputToFile12, OutputToFile13, OutputToFile14, OutputToFile15, OutputToFile16, OutputToFile17, OutputToFile18, OutputToFile19], axis=1)
+    OutputResults.rename_axis(['Period', 'Scenario', 'LoadLevel', 'GenerationUnit'], axis=0).to_csv(_path+'/oT_Result_SummaryGeneration_'+CaseName+'.csv', sep=',')
+
+    WritingResultsTime = time.time() - StartTime
+    StartTime = time.time()
+    print('Writing   generation summary results   ... ', round(WritingResultsTime), 's')
+
+    ndzn = pd.DataFrame(mTEPES.ndzn).set_index(0)
+    ndar = pd.DataFrame(mTEPES.ndar).set_index(0)
+    sPSNND = [(p,sc,n,nd) for p,sc,n,nd in mTEPES.psnnd if sum(1 for g in g2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd])]
+    OutputResults1     = pd.Series(data=[ ndzn[1][nd]                                                                                        for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='Zone'               )
+    OutputResults2     = pd.Series(data=[ ndar[1][nd]                                                                                        for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='Area'               )
+    OutputResults3     = pd.Series(data=[     OptModel.vENS       [p,sc,n,nd      ]()*mTEPES.pLoadLevelDuration[n]()                         for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='ENS [GWh]'          )
+    OutputResults4     = pd.Series(data=[-      mTEPES.pDemand    [p,sc,n,nd      ]  *mTEPES.pLoadLevelDuration[n]()                         for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='PowerDemand [GWh]'  )
+    OutputResults5     = pd.Series(data=[-sum(OptModel.vFlow      [p,sc,n,nd,lout ]()*mTEPES.pLoadLevelDuration[n]() for lout  in lout [nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='PowerFlowOut [GWh]' )
+    OutputResults6     = pd.Series(data=[ sum(OptModel.vFlow      [p,sc,n,ni,nd,cc]()*mTEPES.pLoadLevelDuration[n]() for ni,cc in lin  [nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='PowerFlowIn [GWh]'  )
+    if len(mTEPES.ll):
+        OutputResults7 = pd.Series(data=[-sum(OptModel.vLineLosses[p,sc,n,nd,lout ]()*mTEPES.pLoadLevelDuration[n]() for lout  in loutl[nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='LineLossesOut [GWh]')
+        OutputResults8 = pd.Series(data=[-sum(OptModel.vLineLosses[p,sc,n,ni,nd,cc]()*mTEPES.pLoadLevelDuration[n]() for ni,cc in linl [nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='LineLossesIn [GWh]' )
+
+        OutputResults  = pd.concat([OutputResults1, OutputResults2, OutputResults3, OutputResults4, OutputResults5, OutputResults6, OutputResults7, OutputResults8], axis=1)
+    else:
+        OutputResults  = pd.concat([OutputResults1, OutputResults2, OutputResults3, OutputResults4, OutputResults5, OutputResults6                                ], axis=1)
+
+    OutputResults.rename_axis(['Period', 'Scenario', 'LoadLevel', 'Node'], axis=0).to_csv(_path+'/oT_Result_SummaryNetwork_'+CaseName+'.csv', sep=',')
+
+    WritingResultsTime = time.time() - StartTime
+    print('Writing elec network summary results   ... ', round(WritingResultsTime), 's')
+
+
+def Timing(Function, *Args, Repeat=3):
+    Times = []
+    for i in range(Repeat):
+        StartTime = time.perf_counter()
+        Function(*Args)
+        Times.append(time.perf_counter() - StartTime)
+    return min(Times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the reliability and operation summary results')
+    parser.add_argument('--dir',    type=str, default=os.path.dirname(openTEPES.__file__))
+    parser.add_argument('--case',   type=str, default='RTS-GMLC')
+    parser.add_argument('--solver', type=str, default='appsi_highs')
+    args = parser.parse_args()
+
+    mTEPES = openTEPES.openTEPES_run(args.dir, args.case, args.solver, 'No', 'No', WriteResults=False).model
+
+    # data shared by all the writers of a run
+    Shared = pd.Series(data={'SolutionSnapshot':   Timing(SolutionSnapshot,   mTEPES, mTEPES, Repeat=1),
+                             'DualsConcatenation': Timing(DualsConcatenation, mTEPES,         Repeat=1)})
+    StartTime = time.perf_counter()
+    Duals     = StringKeyDuals(mTEPES)
+    Shared['StringKeyDuals'] = time.perf_counter() - StartTime
+
+    with tempfile.TemporaryDirectory() as DirName:
+        os.makedirs(os.path.join(DirName, args.case))
+        # the former writers read the string keyed duals from the model, as they did
+        pDuals = mTEPES.pDuals
+        mTEPES.pDuals = Duals
+        try:
+            Legacy = [Timing(LegacyReliabilityResults,      DirName, args.case, mTEPES, mTEPES),
+                      Timing(LegacyOperationSummaryResults, DirName, args.case, mTEPES, mTEPES)]
+        finally:
+            mTEPES.pDuals = pDuals
+        Vectorized = [Timing(ReliabilityResults,      DirName, args.case, mTEPES, mTEPES),
+                      Timing(OperationSummaryResults, DirName, args.case, mTEPES, mTEPES)]
+
+    Benchmark = pd.DataFrame(data={'Legacy [s]': Legacy, 'Vectorized [s]': Vectorized}, index=['ReliabilityResults', 'OperationSummaryResults'])
+    Benchmark['Speedup'] = Benchmark['Legacy [s]'] / Benchmark['Vectorized [s]']
+    print(Benchmark.to_string(float_format='{:.3f}'.format))
+    print(Shared.to_frame(name='Once per run [s]').to_string(float_format='{:.3f}'.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -22,3 +22,4 @@ from .openTEPES_InputData        import *
 from .openTEPES_ModelFormulation import *
 from .openTEPES_OutputResults    import *
 from .openTEPES_ProblemSolving   import *
+from .openTEPES_CaseGenerator    import *
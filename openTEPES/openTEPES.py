@@ -2,21 +2,27 @@
 Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - January 18, 2024
 """
 
+import concurrent.futures
 import math
 import os
-import setuptools
+import shutil
 import time
+import pandas        as pd
 
 import pyomo.environ as pyo
 from   pyomo.environ import ConcreteModel, Set, Param, Reals
 
 from .openTEPES_InputData        import InputData, SettingUpVariables
 from .openTEPES_ModelFormulation import TotalObjectiveFunction, InvestmentModelFormulation, GenerationOperationModelFormulationObjFunct, GenerationOperationModelFormulationInvestment, GenerationOperationModelFormulationDemand, GenerationOperationModelFormulationStorage, GenerationOperationModelFormulationReservoir, NetworkH2OperationModelFormulation, GenerationOperationModelFormulationCommitment, GenerationOperationModelFormulationRampMinTime, NetworkSwitchingModelFormulation, NetworkOperationModelFormulation
-from .openTEPES_ProblemSolving   import ProblemSolving
-from .openTEPES_OutputResults    import InvestmentResults, GenerationOperationResults, ESSOperationResults, ReservoirOperationResults, NetworkH2OperationResults, FlexibilityResults, NetworkOperationResults, MarginalResults, OperationSummaryResults, ReliabilityResults, CostSummaryResults, EconomicResults, NetworkMapResults
+from .openTEPES_ProblemSolving   import ProblemSolving, LPRelaxationPrePass, WarmStart, SolverProfiles, SolverProfileOptions, SolverThreads as SolverThreadsOption
+from .openTEPES_Checkpoint       import CheckpointFingerprint, CheckpointSave, CheckpointLoad
+from .openTEPES_Parametric       import ParametricBase, ParametricUpdate, ParametricParamsUpdate, ParametricFixedVariables, ParametricRelease
+from .openTEPES_Incremental      import InputTables, DependencyToFile, FormulationRecord, IncrementalUpdate
+from .openTEPES_Instrumentation  import PhaseStats, PhaseStatsToFile, Profilers, ProfileToFile, ModelSizeCheck
+from .openTEPES_OutputResults    import Results, StageResults, SolutionSnapshot, DualsConcatenation, ResultsScheduler, InvestmentResults, GenerationOperationResults, ESSOperationResults, ReservoirOperationResults, NetworkH2OperationResults, FlexibilityResults, NetworkOperationResults, MarginalResults, OperationSummaryResults, ReliabilityResults, CostSummaryResults, EconomicResults, NetworkMapResults
 
 
-def openTEPES_run(DirName, CaseName, SolverName, pIndOutputResults, pIndLogConsole):
+def openTEPES_run(DirName, CaseName, SolverName, pIndOutputResults, pIndLogConsole, SolverOptions=None, WriteResults=True, Profile=None, Profiler='cprofile', DryRun=False, MemoryBudget=None, Checkpoint=False, Resume=False, ParametricPoint=None, Model=None, Incremental=False):
 
     InitialTime = time.time()
     _path = os.path.join(DirName, CaseName)
@@ -37,26 +43,132 @@ def openTEPES_run(DirName, CaseName, SolverName, pIndOutputResults, pIndLogConso
     idxDict['Y'  ] = 1
     idxDict['y'  ] = 1
 
-    #%% model declaration
-    mTEPES = ConcreteModel('Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - Version 4.15.4 - January 18, 2024')
-    print(                 'Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - Version 4.15.4 - January 18, 2024', file=open(_path+'/openTEPES_version_'+CaseName+'.log','a'))
-
     pIndOutputResults = [j for i,j in idxDict.items() if i == pIndOutputResults][0]
     pIndLogConsole    = [j for i,j in idxDict.items() if i == pIndLogConsole   ][0]
 
-    # Define sets and parameters
-    InputData(DirName, CaseName, mTEPES, pIndLogConsole)
+    if ParametricPoint is not None and Incremental:
+        raise ValueError('A parametric point can not be solved with an incremental update of the model')
+
+    # formulation functions of the objective function, the investment constraints and the operation constraints of every stage
+    Formulations = [GenerationOperationModelFormulationObjFunct, GenerationOperationModelFormulationInvestment, GenerationOperationModelFormulationDemand, GenerationOperationModelFormulationStorage, GenerationOperationModelFormulationReservoir, NetworkH2OperationModelFormulation, GenerationOperationModelFormulationCommitment, GenerationOperationModelFormulationRampMinTime, NetworkSwitchingModelFormulation, NetworkOperationModelFormulation]
+
+    #%% model declaration, or model built by a previous run solved again for a new parametric point or updated with the input data changed since it was built
+    Rebuild = set()
+    if Model is not None:
+        mTEPES = Model
+
+        # values of the previous solve and aggregation of the elements read by the output results, extracted again from the new solve
+        for Cache in ['pSolution', 'pAggregation', 'pDualValues']:
+            if hasattr(mTEPES, Cache):
+                delattr(mTEPES, Cache)
+        mTEPES.pPhaseStats  = []
+        mTEPES.pFamilyStats = []
+        mTEPES.pProfilers   = Profilers(Profile, Profiler)
+
+        # variables fixed by the previous solve released keeping their values as warm start, and parameters of the new point or of the changed input data
+        if ParametricPoint is not None:
+            with PhaseStats(mTEPES, 'ParametricUpdate'):
+                ParametricRelease     (mTEPES)
+                ParametricUpdate      (mTEPES, ParametricPoint)
+                ParametricParamsUpdate(mTEPES)
+        elif hasattr(mTEPES, 'pFormulationComponents'):
+            Incremental = True
+            with PhaseStats(mTEPES, 'IncrementalUpdate'):
+                ParametricRelease     (mTEPES)
+                Rebuild = IncrementalUpdate(DirName, CaseName, mTEPES, pIndLogConsole, [TotalObjectiveFunction, InvestmentModelFormulation] + Formulations)
+        else:
+            print('Model built again, it was not built with the incremental update')
+            Incremental, Rebuild = True, None
+        if Rebuild is None:
+            Model = None
+
+    if Model is None:
+        mTEPES = ConcreteModel('Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - Version 4.15.4 - January 18, 2024')
+        print(                 'Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - Version 4.15.4 - January 18, 2024', file=open(_path+'/openTEPES_version_'+CaseName+'.log','a'))
+
+        # time, memory, and size of the model built by phase
+        mTEPES.pPhaseStats  = []
+        mTEPES.pFamilyStats = []
+
+        # profilers of the selected groups of phases (input, formulation, solve, output, or all)
+        mTEPES.pProfilers   = Profilers(Profile, Profiler)
+
+        # scales of the parameters changed by the parametric re-solve declared mutable
+        mTEPES.pIndParametric = 1 if ParametricPoint is not None else 0
+
+        # Define sets and parameters
+        with PhaseStats(mTEPES, 'InputData'):
+            InputData(DirName, CaseName, mTEPES, pIndLogConsole)
 
-    # Define variables
-    SettingUpVariables(mTEPES, mTEPES)
+        # size of the model estimated from the input data before building it, stopping the run if it exceeds the memory budget
+        with PhaseStats(mTEPES, 'ModelSizeEstimate'):
+            dfModelSize = ModelSizeCheck(DirName, CaseName, mTEPES, MemoryBudget, DryRun)
+        if DryRun:
+            PhaseStatsToFile(DirName, CaseName, mTEPES)
+            ProfileToFile   (DirName, CaseName, mTEPES)
+            return dfModelSize
 
-    # objective function and investment constraints
-    TotalObjectiveFunction    (mTEPES, mTEPES, pIndLogConsole)
-    InvestmentModelFormulation(mTEPES, mTEPES, pIndLogConsole)
+        # Define variables
+        with PhaseStats(mTEPES, 'SettingUpVariables'):
+            SettingUpVariables(mTEPES, mTEPES)
+
+        # input tables and components declared by every formulation, to update the model if the input data change
+        if Incremental:
+            mTEPES.pInputTables           = InputTables(DirName, CaseName)
+            mTEPES.pFormulationComponents = {}
+            ParametricFixedVariables(mTEPES)
+            DependencyToFile(DirName, CaseName, [TotalObjectiveFunction, InvestmentModelFormulation] + Formulations)
+
+        # objective function and investment constraints
+        with PhaseStats(mTEPES, 'TotalObjectiveFunction'):
+            if Incremental:
+                FormulationRecord(mTEPES, TotalObjectiveFunction,     (pIndLogConsole,))
+            else:
+                TotalObjectiveFunction    (mTEPES, mTEPES, pIndLogConsole)
+        with PhaseStats(mTEPES, 'InvestmentModelFormulation'):
+            if Incremental:
+                FormulationRecord(mTEPES, InvestmentModelFormulation, (pIndLogConsole,))
+            else:
+                InvestmentModelFormulation(mTEPES, mTEPES, pIndLogConsole)
+
+        # parameters of the first point and variables fixed by the input data, which are kept fixed for the next points
+        if ParametricPoint is not None:
+            with PhaseStats(mTEPES, 'ParametricUpdate'):
+                ParametricBase          (DirName, CaseName, mTEPES)
+                ParametricUpdate        (mTEPES, ParametricPoint)
+                ParametricFixedVariables(mTEPES)
+    else:
+        mTEPES.pParametricWarmStart = True
+
+        # objective function and investment constraints using the changed input data
+        for Formulation in [TotalObjectiveFunction, InvestmentModelFormulation]:
+            if Formulation.__name__ in Rebuild:
+                with PhaseStats(mTEPES, Formulation.__name__):
+                    FormulationRecord(mTEPES, Formulation, (pIndLogConsole,))
+
+        # the constraints of every stage are activated when the stage is solved, as when they were built
+        sStage = ['_'+str(p)+'_'+str(sc)+'_'+str(st) for p,sc,st in mTEPES.ps*mTEPES.stt]
+        for c in mTEPES.component_objects(pyo.Constraint):
+            if c.name.endswith(tuple(sStage)):
+                c.deactivate()
 
     # initialize parameter for dual variables
     mTEPES.pDuals = {}
 
+    # frames of the MIP start built in the first stage of the run
+    mTEPES.pWarmStartFrames = None
+
+    # solver options replacing the solver profiles and solver statistics
+    mTEPES.pSolverOptions = SolverOptions
+    mTEPES.pSolverStats   = []
+
+    # indicator of the results written by stage
+    pIndStageResults = 0
+
+    # solution of every stage saved after solving it, and stages already solved in a previous run with the same input data loaded instead of solving them
+    if Checkpoint or Resume:
+        mTEPES.pCheckpointFingerprint = CheckpointFingerprint(DirName, CaseName)
+
     # iterative model formulation for each stage of a year
     for p,sc,st in mTEPES.ps*mTEPES.stt:
         # activate only load levels to formulate
@@ -70,48 +182,101 @@ def openTEPES_run(DirName, CaseName, SolverName, pIndOutputResults, pIndLogConso
         print('Period '+str(p)+', Scenario '+str(sc)+', Stage '+str(st))
 
         # operation model objective function and constraints by stage
-        GenerationOperationModelFormulationObjFunct     (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        GenerationOperationModelFormulationInvestment   (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        GenerationOperationModelFormulationDemand       (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        GenerationOperationModelFormulationStorage      (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
+        StageFormulations = [GenerationOperationModelFormulationObjFunct, GenerationOperationModelFormulationInvestment, GenerationOperationModelFormulationDemand, GenerationOperationModelFormulationStorage]
         if mTEPES.pIndHydroTopology == 1:
-            GenerationOperationModelFormulationReservoir(mTEPES, mTEPES, pIndLogConsole, p, sc, st)
+            StageFormulations.append(GenerationOperationModelFormulationReservoir)
         if mTEPES.pIndHydrogen == 1:
-            NetworkH2OperationModelFormulation          (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        GenerationOperationModelFormulationCommitment   (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        GenerationOperationModelFormulationRampMinTime  (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        NetworkSwitchingModelFormulation                (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
-        NetworkOperationModelFormulation                (mTEPES, mTEPES, pIndLogConsole, p, sc, st)
+            StageFormulations.append(NetworkH2OperationModelFormulation)
+        StageFormulations += [GenerationOperationModelFormulationCommitment, GenerationOperationModelFormulationRampMinTime, NetworkSwitchingModelFormulation, NetworkOperationModelFormulation]
+        if Model is None or Rebuild:
+            # the constraints of the stage kept from the built model are activated before declaring the ones using the changed input data
+            if Model is not None:
+                for c in mTEPES.component_objects(pyo.Constraint):
+                    if c.name.endswith('_'+str(p)+'_'+str(sc)+'_'+str(st)):
+                        c.activate()
+            for Formulation in StageFormulations:
+                if Model is None or Formulation.__name__ in Rebuild:
+                    with PhaseStats(mTEPES, Formulation.__name__, p, sc, st):
+                        if Incremental:
+                            FormulationRecord(mTEPES, Formulation, (pIndLogConsole, p, sc, st), p, sc, st)
+                        else:
+                            Formulation(mTEPES, mTEPES, pIndLogConsole, p, sc, st)
+        else:
+            for c in mTEPES.component_objects(pyo.Constraint):
+                if c.name.endswith('_'+str(p)+'_'+str(sc)+'_'+str(st)):
+                    c.activate()
 
         if (len(mTEPES.gc) == 0 or (len(mTEPES.gc) > 0 and mTEPES.pIndBinGenInvest() == 2)) and (len(mTEPES.gd) == 0 or (len(mTEPES.gd) > 0 and mTEPES.pIndBinGenRetire() == 2)) and (len(mTEPES.lc) == 0 or (len(mTEPES.lc) > 0 and mTEPES.pIndBinNetInvest() == 2)) and (min([mTEPES.pEmission[p,ar] for ar in mTEPES.ar]) == math.inf or sum(mTEPES.pEmissionRate[nr] for nr in mTEPES.nr) == 0):
             mTEPES.pPeriodProb[p,sc] = mTEPES.pPeriodWeight[p] = mTEPES.pScenProb[p,sc] = 1.0
 
-            if pIndLogConsole == 1:
+            pIndResumed = False
+            if Resume:
+                with PhaseStats(mTEPES, 'CheckpointLoad', p, sc, st):
+                    pIndResumed = CheckpointLoad(DirName, CaseName, mTEPES, p, sc, st)
+
+            if pIndLogConsole == 1 and not pIndResumed:
                 StartTime         = time.time()
-                mTEPES.write(_path+'/openTEPES_'+CaseName+'_'+str(p)+'_'+str(sc)+'.lp', io_options={'symbolic_solver_labels': True})
+                with PhaseStats(mTEPES, 'WritingLPFile', p, sc, st):
+                    mTEPES.write(_path+'/openTEPES_'+CaseName+'_'+str(p)+'_'+str(sc)+'.lp', io_options={'symbolic_solver_labels': True})
                 WritingLPFileTime = time.time() - StartTime
                 StartTime         = time.time()
                 print('Writing LP file                        ... ', round(WritingLPFileTime), 's')
 
             # there are no expansion decisions, or they are ignored (it is an operation planning model)
-            ProblemSolving(DirName, CaseName, SolverName, mTEPES, mTEPES, pIndLogConsole, p, sc)
+            if not pIndResumed:
+                if mTEPES.pIndWarmStart():
+                    WarmStart(DirName, CaseName, mTEPES, mTEPES, pIndLogConsole, p, sc, st)
+                with PhaseStats(mTEPES, 'ProblemSolving', p, sc, st):
+                    ProblemSolving(DirName, CaseName, SolverName, mTEPES, mTEPES, pIndLogConsole, p, sc)
+                if Checkpoint or Resume:
+                    with PhaseStats(mTEPES, 'CheckpointSave', p, sc, st):
+                        CheckpointSave(DirName, CaseName, mTEPES, p, sc, st)
+            # write the results of the stage just solved
+            if mTEPES.pIndStreamResults():
+                StageResults(DirName, CaseName, mTEPES, mTEPES, p, sc, st)
+                pIndStageResults = 1
             mTEPES.pPeriodProb[p,sc] = mTEPES.pPeriodWeight[p] = mTEPES.pScenProb[p,sc] = 0.0
-            # deactivate the constraints of the previous period and scenario
-            for c in mTEPES.component_objects(pyo.Constraint, active=True):
-                if c.name.find(str(p)) != -1 and c.name.find(str(sc)) != -1:
-                    c.deactivate()
+            # deactivate the constraints of the stage just solved, or delete them to release their memory if their results are already written
+            for c in list(mTEPES.component_objects(pyo.Constraint, active=True)):
+                if c.name.endswith('_'+str(p)+'_'+str(sc)+'_'+str(st)):
+                    if mTEPES.pIndStreamResults() == 2 and ParametricPoint is None and not Incremental:
+                        mTEPES.del_component(c)
+                    else:
+                        c.deactivate()
         else:
             if mTEPES.p.last() == mTEPES.pp.last() and mTEPES.sc.last() == mTEPES.scc.last() and mTEPES.st.last() == mTEPES.stt.last():
 
-                if pIndLogConsole == 1:
+                # all the stages are solved together, so the checkpoint has the whole solution
+                pIndResumed = False
+                if Resume:
+                    with PhaseStats(mTEPES, 'CheckpointLoad', p, sc, st):
+                        pIndResumed = CheckpointLoad(DirName, CaseName, mTEPES, p, sc, st, AllStages=True)
+
+                if pIndLogConsole == 1 and not pIndResumed:
                     StartTime         = time.time()
-                    mTEPES.write(_path+'/openTEPES_'+CaseName+'_'+str(p)+'_'+str(sc)+'.lp', io_options={'symbolic_solver_labels': True})
+                    with PhaseStats(mTEPES, 'WritingLPFile', p, sc, st):
+                        mTEPES.write(_path+'/openTEPES_'+CaseName+'_'+str(p)+'_'+str(sc)+'.lp', io_options={'symbolic_solver_labels': True})
                     WritingLPFileTime = time.time() - StartTime
                     StartTime         = time.time()
                     print('Writing LP file                        ... ', round(WritingLPFileTime), 's')
 
                 # there are investment decisions (it is an expansion and operation planning model)
-                ProblemSolving(DirName, CaseName, SolverName, mTEPES, mTEPES, pIndLogConsole, p, sc)
+                if not pIndResumed:
+                    if mTEPES.pIndLPPrePass() == 1 and (mTEPES.pIndBinGenInvest() == 1 or mTEPES.pIndBinGenRetire() == 1 or mTEPES.pIndBinNetInvest() == 1 or mTEPES.pIndBinRsrInvest() == 1 or mTEPES.pIndBinNetH2Invest() == 1):
+                        with PhaseStats(mTEPES, 'LPRelaxationPrePass', p, sc, st):
+                            LPRelaxationPrePass(DirName, CaseName, SolverName, mTEPES, mTEPES, pIndLogConsole)
+                    if mTEPES.pIndWarmStart():
+                        for pp,scc,stt in mTEPES.ps*mTEPES.stt:
+                            WarmStart(DirName, CaseName, mTEPES, mTEPES, pIndLogConsole, pp, scc, stt)
+                    with PhaseStats(mTEPES, 'ProblemSolving', p, sc, st):
+                        ProblemSolving(DirName, CaseName, SolverName, mTEPES, mTEPES, pIndLogConsole, p, sc)
+                    if Checkpoint or Resume:
+                        with PhaseStats(mTEPES, 'CheckpointSave', p, sc, st):
+                            CheckpointSave(DirName, CaseName, mTEPES, p, sc, st, AllStages=True)
+
+    # parameters of the first point read by the output results, once all the constraints are built
+    if ParametricPoint is not None and Model is None:
+        ParametricParamsUpdate(mTEPES)
 
     mTEPES.del_component(mTEPES.st)
     mTEPES.del_component(mTEPES.n )
@@ -166,34 +331,266 @@ def openTEPES_run(DirName, CaseName, SolverName, pIndOutputResults, pIndLogConso
         pIndMarginalResults            = 0
         pIndEconomicResults            = 0
 
+    # without writing the output results, or if they were written by stage releasing the constraints, the results are computed only when they are accessed
+    if not WriteResults or (pIndStageResults == 1 and mTEPES.pIndStreamResults() == 2):
+        PhaseStatsToFile(DirName, CaseName, mTEPES)
+        ProfileToFile   (DirName, CaseName, mTEPES)
+        TotalTime = time.time() - InitialTime
+        print('Total time                             ... ', round(TotalTime), 's')
+        return Results(DirName, CaseName, mTEPES)
+
+    # values of the variables extracted once and shared by all the output results
+    with PhaseStats(mTEPES, 'SolutionSnapshot'):
+        SolutionSnapshot  (mTEPES, mTEPES)
+        DualsConcatenation(mTEPES)
+
+    # output result families to be written, all of them only read the solved model
+    Families = []
     if pIndInvestmentResults          == 1:
-        InvestmentResults         (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput,                 pIndPlotOutput)
+        Families.append(('Investment',          InvestmentResults,          (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput,                 pIndPlotOutput)))
     if pIndGenerationOperationResults == 1:
-        GenerationOperationResults(DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput, pIndAreaOutput, pIndPlotOutput)
+        Families.append(('GenerationOperation', GenerationOperationResults, (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput, pIndAreaOutput, pIndPlotOutput)))
     if pIndESSOperationResults        == 1 and len(mTEPES.es):
-        ESSOperationResults       (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput, pIndAreaOutput, pIndPlotOutput)
+        Families.append(('ESSOperation',        ESSOperationResults,        (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput, pIndAreaOutput, pIndPlotOutput)))
     if pIndReservoirOperationResults  == 1 and len(mTEPES.rs) and mTEPES.pIndHydroTopology == 1:
-        ReservoirOperationResults (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput,                 pIndPlotOutput)
+        Families.append(('ReservoirOperation',  ReservoirOperationResults,  (DirName, CaseName, mTEPES, mTEPES, pIndTechnologyOutput,                 pIndPlotOutput)))
     if pIndNetworkH2OperationResults  == 1 and len(mTEPES.pa) and mTEPES.pIndHydrogen == 1:
-        NetworkH2OperationResults (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('NetworkH2Operation',  NetworkH2OperationResults,  (DirName, CaseName, mTEPES, mTEPES)))
     if pIndFlexibilityResults         == 1:
-        FlexibilityResults        (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('Flexibility',         FlexibilityResults,         (DirName, CaseName, mTEPES, mTEPES)))
     if pIndReliabilityResults         == 1:
-        ReliabilityResults        (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('Reliability',         ReliabilityResults,         (DirName, CaseName, mTEPES, mTEPES)))
     if pIndNetworkOperationResults    == 1:
-        NetworkOperationResults   (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('NetworkOperation',    NetworkOperationResults,    (DirName, CaseName, mTEPES, mTEPES)))
     if pIndNetworkMapResults          == 1:
-        NetworkMapResults         (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('NetworkMap',          NetworkMapResults,          (DirName, CaseName, mTEPES, mTEPES)))
     if pIndOperationSummaryResults    == 1:
-        OperationSummaryResults   (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('OperationSummary',    OperationSummaryResults,    (DirName, CaseName, mTEPES, mTEPES)))
     if pIndCostSummaryResults         == 1:
-        CostSummaryResults        (DirName, CaseName, mTEPES, mTEPES)
+        Families.append(('CostSummary',         CostSummaryResults,         (DirName, CaseName, mTEPES, mTEPES)))
     if pIndMarginalResults            == 1:
-        MarginalResults           (DirName, CaseName, mTEPES, mTEPES,                 pIndPlotOutput)
+        Families.append(('Marginal',            MarginalResults,            (DirName, CaseName, mTEPES, mTEPES,                 pIndPlotOutput)))
     if pIndEconomicResults            == 1:
-        EconomicResults           (DirName, CaseName, mTEPES, mTEPES, pIndAreaOutput, pIndPlotOutput)
+        Families.append(('Economic',            EconomicResults,            (DirName, CaseName, mTEPES, mTEPES, pIndAreaOutput, pIndPlotOutput)))
+
+    mTEPES.pResultsTime = ResultsScheduler(DirName, CaseName, mTEPES, Families)
+
+    PhaseStatsToFile(DirName, CaseName, mTEPES)
+    ProfileToFile   (DirName, CaseName, mTEPES)
 
     TotalTime = time.time() - InitialTime
     print('Total time                             ... ', round(TotalTime), 's')
 
-    return mTEPES
+    return Results(DirName, CaseName, mTEPES)
+
+
+def openTEPES_tuning(DirName, CaseName, SolverName, OptionGrid=None):
+
+    InitialTime = time.time()
+    _path = os.path.join(DirName, CaseName)
+
+    # option sets to be tried, by default the solver profiles
+    if OptionGrid is None:
+        OptionGrid = {Profile: SolverProfileOptions(DirName, CaseName, SolverName, Profile) for Profile in SolverProfiles}
+
+    # the case is solved for every option set without writing all the results
+    OutputResults = []
+    for OptionSet,SolverOptions in OptionGrid.items():
+        print('Solver tuning with option set '+str(OptionSet)+': '+str(SolverOptions))
+        StartTime = time.time()
+        mTEPES    = openTEPES_run(DirName, CaseName, SolverName, 'No', 'No', SolverOptions=dict(SolverOptions), WriteResults=False)
+        dfStats   = pd.DataFrame(mTEPES.pSolverStats)
+        OutputResults.append({'OptionSet'  : OptionSet,
+                              'Options'    : str(SolverOptions),
+                              'Optimal'    : (dfStats['Termination'] == 'optimal').all(),
+                              'Solve [s]'  : dfStats['Time [s]'].sum(),
+                              'Total [s]'  : time.time() - StartTime,
+                              'Max Gap'    : dfStats['Gap'].max()})
+
+    OutputResults = pd.DataFrame(OutputResults).set_index('OptionSet').sort_values('Solve [s]')
+    OutputResults.to_csv(_path+'/oT_Result_SolverTuning_'+CaseName+'.csv', sep=',')
+
+    # the fastest option set reaching the optimal solution is recommended
+    if OutputResults['Optimal'].any():
+        print('Recommended option set                 ... ', OutputResults[OutputResults['Optimal']].index[0])
+    else:
+        print('No option set reached the optimal solution')
+
+    TuningTime = time.time() - InitialTime
+    print('Total tuning time                      ... ', round(TuningTime), 's')
+
+    return OutputResults
+
+
+def SweepSpec(SweepFile):
+    # parameter overrides of the variants from a CSV file (columns Variant, Table, Column, Operation, Value) or a YAML file (list of overrides by variant)
+    # an empty column overrides all the columns of the table, the operation is set (by default) or scale, and a variant without overrides is the base case
+    if SweepFile.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError('pyyaml is required to read the sweep file '+SweepFile+', a CSV file can be used instead')
+        with open(SweepFile) as File:
+            Variants = yaml.safe_load(File)
+        dfSweep = pd.DataFrame([dict(Override, Variant=Variant) for Variant,Overrides in Variants.items() for Override in (Overrides or [{}])])
+    else:
+        dfSweep = pd.read_csv(SweepFile)
+    dfSweep = dfSweep.reindex(columns=['Variant', 'Table', 'Column', 'Operation', 'Value'])
+    dfSweep['Variant'  ] = dfSweep['Variant'  ].astype(str)
+    dfSweep['Operation'] = dfSweep['Operation'].fillna('set')
+    for Operation in dfSweep['Operation'].unique():
+        if Operation not in ['set', 'scale']:
+            raise ValueError('Unknown sweep operation '+str(Operation)+', it must be set or scale')
+    return dfSweep
+
+
+def SweepTable(DirName, CaseName, Table):
+    # input data table with the unnamed columns as index, to be written again with the same format
+    dfTable = pd.read_csv(os.path.join(DirName, CaseName, 'oT_Data_'+Table+'_'+CaseName+'.csv'))
+    dfTable = dfTable.set_index([Column for Column in dfTable.columns if Column.startswith('Unnamed:')])
+    dfTable.index.names = [None] * dfTable.index.nlevels
+    return dfTable
+
+
+def CaseLink(DirName, CaseName, CaseDir, Tables=()):
+    # input files of the case linked (or copied if links are not possible) in another folder, except the data tables to be written there
+    _path       = os.path.join(DirName, CaseName)
+    VariantPath = os.path.join(CaseDir, CaseName)
+    os.makedirs(VariantPath, exist_ok=True)
+    # the tables to be written may be links to the files of the case left by a previous run, they are removed not to write through them
+    for Table in Tables:
+        if os.path.lexists(os.path.join(VariantPath, 'oT_Data_'+Table+'_'+CaseName+'.csv')):
+            os.remove(os.path.join(VariantPath, 'oT_Data_'+Table+'_'+CaseName+'.csv'))
+    for FileName in os.listdir(_path):
+        if FileName.startswith('oT_Dict_') or (FileName.startswith('oT_Data_') and FileName[len('oT_Data_'):-len('_'+CaseName+'.csv')] not in Tables):
+            if os.path.lexists(os.path.join(VariantPath, FileName)):
+                os.remove(os.path.join(VariantPath, FileName))
+            try:
+                os.link(os.path.join(_path, FileName), os.path.join(VariantPath, FileName))
+            except OSError:
+                shutil.copy2(os.path.join(_path, FileName), os.path.join(VariantPath, FileName))
+    return CaseDir
+
+
+def CaseKPIs(mTEPES):
+    # main results of a solved case: costs, energy not served, gap, and solving time
+    dfStats = pd.DataFrame(mTEPES.pSolverStats)
+    return {'Status'                  : 'optimal' if (dfStats['Termination'] == 'optimal').all() else 'feasible',
+            'Total System Cost [MEUR]': mTEPES.vTotalSCost(),
+            **{Cost+' [MEUR]': Value for Cost,Value in mTEPES.costs.groupby('Cost').sum().items()},
+            'ENS [GWh]'               : (mTEPES.ens * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,nd in mTEPES.psnnd]).sum() * 1e-3,
+            'Max Gap'                 : dfStats['Gap'].max(),
+            'Solve [s]'               : dfStats['Time [s]'].sum()}
+
+
+def SweepCase(DirName, CaseName, SweepDir, Variant, dfOverrides, BaseTables, SolverName, SolverThreads):
+    # case of a variant: the tables with overrides are written from the base tables read once, the rest of the input files are linked to the base case
+    Tables      = set(dfOverrides['Table'].dropna()) | {'SolverOption'}
+    VariantPath = os.path.join(CaseLink(DirName, CaseName, os.path.join(SweepDir, Variant), Tables), CaseName)
+
+    for Table in Tables - {'SolverOption'}:
+        dfTable = BaseTables[Table].copy()
+        for Override in dfOverrides[dfOverrides['Table'] == Table].itertuples():
+            Columns = [Override.Column] if isinstance(Override.Column, str) else list(dfTable.select_dtypes('number').columns)
+            try:
+                Value = float(Override.Value)
+            except ValueError:
+                Value = Override.Value
+            if Override.Operation == 'set':
+                dfTable[Columns] = Value
+            else:
+                dfTable[Columns] = dfTable[Columns] * Value
+        dfTable.to_csv(os.path.join(VariantPath, 'oT_Data_'+Table+'_'+CaseName+'.csv'), sep=',')
+
+    # threads of the solver of every job added to the solver options of the base case for all the profiles
+    dfSolverOption = BaseTables.get('SolverOption', pd.DataFrame(columns=['Value'], index=pd.MultiIndex.from_arrays([[], [], []])))
+    if SolverName in SolverThreadsOption:
+        dfThreads      = pd.DataFrame({'Value': SolverThreads}, index=pd.MultiIndex.from_tuples([(Profile, SolverName, SolverThreadsOption[SolverName]) for Profile in SolverProfiles]))
+        dfSolverOption = pd.concat([dfSolverOption, dfThreads])
+    dfSolverOption.rename_axis([None, None, None]).to_csv(os.path.join(VariantPath, 'oT_Data_SolverOption_'+CaseName+'.csv'), sep=',')
+    return os.path.join(SweepDir, Variant)
+
+
+def SweepJob(DirName, CaseName, SolverName, Variant, WriteResults):
+    # solving a variant in a worker process and returning its key performance indicators, the errors are reported without stopping the sweep
+    StartTime = time.time()
+    try:
+        mTEPES = openTEPES_run(DirName, CaseName, SolverName, 'No', 'No', WriteResults=WriteResults)
+        KPIs   = {'Variant': Variant, **CaseKPIs(mTEPES)}
+    except Exception as Error:
+        KPIs   = {'Variant': Variant, 'Status': 'error: '+str(Error)}
+    KPIs['Total [s]'] = time.time() - StartTime
+    return KPIs
+
+
+def openTEPES_sweep(DirName, CaseName, SolverName, SweepFile, Workers=None, SolverThreads=None, WriteResults=False):
+
+    InitialTime = time.time()
+    _path = os.path.join(DirName, CaseName)
+
+    dfSweep  = SweepSpec(SweepFile)
+    Variants = list(dict.fromkeys(dfSweep['Variant']))
+
+    # jobs solved at the same time and threads of the solver of each job, sharing the cores of the machine
+    Workers       = Workers       or max(1, min(len(Variants), (os.cpu_count() or 1) // (SolverThreads or 1)))
+    SolverThreads = SolverThreads or max(1, (os.cpu_count() or 1) // Workers)
+    print('Sweep of '+str(len(Variants))+' variants with '+str(Workers)+' workers and '+str(SolverThreads)+' solver threads each')
+
+    # base tables with overrides read once and shared by all the variants
+    BaseTables = {Table: SweepTable(DirName, CaseName, Table) for Table in dfSweep['Table'].dropna().unique()}
+    if os.path.exists(_path+'/oT_Data_SolverOption_'+CaseName+'.csv'):
+        BaseTables['SolverOption'] = pd.read_csv(_path+'/oT_Data_SolverOption_'+CaseName+'.csv', index_col=[0,1,2], dtype={'Value': str})
+    SweepDir    = os.path.join(_path, 'sweep')
+    VariantDirs = {Variant: SweepCase(DirName, CaseName, SweepDir, Variant, dfSweep[dfSweep['Variant'] == Variant], BaseTables, SolverName, SolverThreads) for Variant in Variants}
+
+    OutputResults = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=Workers) as Executor:
+        Jobs = [Executor.submit(SweepJob, VariantDirs[Variant], CaseName, SolverName, Variant, WriteResults) for Variant in Variants]
+        for Job in concurrent.futures.as_completed(Jobs):
+            OutputResults.append(Job.result())
+            print('Variant '+OutputResults[-1]['Variant']+' '+OutputResults[-1]['Status']+' in '+str(round(OutputResults[-1]['Total [s]']))+' s ('+str(len(OutputResults))+'/'+str(len(Variants))+')')
+
+    OutputResults = pd.DataFrame(OutputResults).set_index('Variant').loc[Variants]
+    OutputResults.to_csv(_path+'/oT_Result_Sweep_'+CaseName+'.csv', sep=',')
+
+    # throughput of the queue and use of the workers
+    SweepTime = time.time() - InitialTime
+    print('Variants solved                        ... ', (~OutputResults['Status'].str.startswith('error')).sum(), 'of', len(Variants))
+    print('Throughput                             ... ', round(3600 * len(Variants) / SweepTime, 1), 'variants/h')
+    print('Mean variant time                      ... ', round(OutputResults['Total [s]'].mean()), 's')
+    print('Worker utilization                     ... ', round(100 * OutputResults['Total [s]'].sum() / (SweepTime * Workers)), '%')
+    print('Total sweep time                       ... ', round(SweepTime), 's')
+
+    return OutputResults
+
+
+def openTEPES_parametric(DirName, CaseName, SolverName, Points, pIndOutputResults='No', pIndLogConsole='No'):
+
+    InitialTime = time.time()
+    _path = os.path.join(DirName, CaseName)
+
+    # values of the parameters of every point (ENSCost, CO2Cost, AnnualDiscountRate, DemandScale) from a CSV file with a row by point, a DataFrame, or a dictionary by point
+    if isinstance(Points, str):
+        dfPoints = pd.read_csv(Points, index_col=[0])
+    elif isinstance(Points, dict):
+        dfPoints = pd.DataFrame.from_dict(Points, orient='index')
+    else:
+        dfPoints = Points
+
+    # the model is built for the first point and solved again for the next ones, writing the results of every point in its own folder
+    OutputResults = []
+    mTEPES        = None
+    for Point,Values in dfPoints.iterrows():
+        print('Parametric re-solve of point '+str(Point))
+        StartTime = time.time()
+        PointDir  = CaseLink(DirName, CaseName, os.path.join(_path, 'parametric', str(Point)))
+        mTEPES    = openTEPES_run(PointDir, CaseName, SolverName, pIndOutputResults, pIndLogConsole, ParametricPoint=Values.dropna().to_dict(), Model=mTEPES.model if mTEPES is not None else None)
+        OutputResults.append({'Point': Point, **Values.to_dict(), **CaseKPIs(mTEPES), 'Total [s]': time.time() - StartTime})
+
+    OutputResults = pd.DataFrame(OutputResults).set_index('Point')
+    OutputResults.to_csv(_path+'/oT_Result_Parametric_'+CaseName+'.csv', sep=',')
+
+    ParametricTime = time.time() - InitialTime
+    print('Total parametric time                  ... ', round(ParametricTime), 's')
+
+    return OutputResults
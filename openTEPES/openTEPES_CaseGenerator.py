@@ -0,0 +1,217 @@
+"""
+Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - January 18, 2024
+"""
+
+import time
+import os
+import numpy  as np
+import pandas as pd
+
+
+# columns of the generation and network data in the order of the bundled cases
+GenerationColumns = ['Node', 'Technology', 'StorageType', 'MutuallyExclusive', 'OutflowsType', 'EnergyType', 'MustRun', 'NoOperatingReserve', 'BinaryCommitment', 'InitialPeriod', 'FinalPeriod',
+                     'MaximumPower', 'MinimumPower', 'MaximumCharge', 'MinimumCharge', 'InitialStorage', 'MaximumStorage', 'MinimumStorage', 'ProductionFunction', 'ProductionFunctionH2', 'Efficiency',
+                     'ShiftTime', 'Inertia', 'EFOR', 'Availability', 'RampUp', 'RampDown', 'UpTime', 'DownTime', 'FuelCost', 'LinearTerm', 'ConstantTerm', 'OMVariableCost', 'OperReserveCost',
+                     'StartUpCost', 'ShutDownCost', 'CO2EmissionRate', 'FixedInvestmentCost', 'FixedRetirementCost', 'FixedChargeRate', 'StorageInvestment', 'BinaryInvestment', 'BinaryRetirement',
+                     'MaximumReactivePower', 'MinimumReactivePower', 'InvestmentLo', 'InvestmentUp', 'RetirementLo', 'RetirementUp']
+NetworkColumns    = ['LineType', 'Switching', 'InitialPeriod', 'FinalPeriod', 'Voltage', 'Length', 'LossFactor', 'Reactance', 'TTC', 'TTCBck', 'SecurityFactor', 'FixedInvestmentCost', 'FixedChargeRate',
+                     'BinaryInvestment', 'SwOnTime', 'SwOffTime', 'Resistance', 'Susceptance', 'Tap', 'AngMin', 'AngMax', 'Converter', 'InvestmentLo', 'InvestmentUp']
+PipelineColumns   = ['InitialPeriod', 'FinalPeriod', 'Length', 'TTC', 'TTCBck', 'SecurityFactor', 'FixedInvestmentCost', 'FixedChargeRate', 'BinaryInvestment', 'InvestmentLo', 'InvestmentUp']
+VariableFiles     = ['VariableMinGeneration', 'VariableMaxGeneration', 'VariableMinConsumption', 'VariableMaxConsumption', 'VariableMinStorage', 'VariableMaxStorage', 'VariableMinEnergy',
+                     'VariableMaxEnergy', 'VariableFuelCost', 'VariableEmissionCost', 'EnergyInflows', 'EnergyOutflows']
+
+# thermal technologies taken from the units of the sSEP case
+ThermalTechnologies = pd.DataFrame(data={'MaximumPower':    [390,  650, 150  ], 'MinimumPower':   [150,  260,  30  ], 'RampUp':      [250, 250, 150], 'RampDown': [250, 250, 150],
+                                         'UpTime':          [  6,   24,   1  ], 'DownTime':       [  6,   24,   1  ], 'FuelCost':    [  1,   1,   1], 'LinearTerm': [ 60,  50,  90],
+                                         'ConstantTerm':    [300, 1000,  50  ], 'OMVariableCost': [  3,    5,   5  ], 'StartUpCost': [0.02, 0.06, 0.005], 'CO2EmissionRate': [0.35, 1, 0.6]},
+                                   index=['CCGT', 'Coal_Subbituminous', 'OCGT'])
+
+
+def WriteProfiles(FileName, Index, Columns, Values=None):
+    # time series indexed by period, scenario, and load level. The empty ones are written as text without formatting the missing values
+    if Values is None:
+        with open(FileName, 'w') as File:
+            File.write(',,,'+','.join(Columns)+'\n')
+            File.writelines(f'{p},{sc},{n}'+','*len(Columns)+'\n' for p,sc,n in Index)
+    else:
+        pd.DataFrame(data=Values.reshape(len(Index), len(Columns)), index=Index, columns=Columns).to_csv(FileName, float_format='%.4f')
+
+
+def WriteSet(FileName, Header, Elements):
+    pd.DataFrame(data=list(Elements), columns=Header if isinstance(Header, list) else [Header]).to_csv(FileName, index=False)
+
+
+def CaseGenerator(DirName, CaseName, Nodes=10, Lines=None, CandidateLines=0, Areas=1, ThermalUnits=None, SolarUnits=None, WindUnits=None, ESSUnits=None, Reservoirs=0, Pipelines=0,
+                  Periods=1, Scenarios=1, LoadLevels=8736, Seed=0):
+    # synthetic case with a random meshed network and profiles built as arrays of (period, scenario, load level, element)
+    StartTime = time.time()
+    _path = os.path.join(DirName, CaseName)
+    os.makedirs(_path, exist_ok=True)
+
+    if Nodes < 2:
+        raise ValueError('The synthetic case needs at least two nodes')
+    if LoadLevels > 8760:
+        raise ValueError('The load levels are the hours of a year, at most 8760')
+    if Areas > Nodes:
+        raise ValueError('The number of areas can not be larger than the number of nodes')
+
+    rng          = np.random.default_rng(Seed)
+    Lines        = int(1.5*Nodes)   if Lines        is None else Lines
+    ThermalUnits = Nodes            if ThermalUnits is None else ThermalUnits
+    SolarUnits   = (Nodes+1)//2     if SolarUnits   is None else SolarUnits
+    WindUnits    = (Nodes+1)//2     if WindUnits    is None else WindUnits
+    ESSUnits     = (Nodes+3)//4     if ESSUnits     is None else ESSUnits
+
+    #%% sets
+    sPeriod    = [2030+5*i                  for i in range(Periods)   ]
+    sScenario  = [f'sc{i+1:02d}'            for i in range(Scenarios) ]
+    sLoadLevel = pd.date_range('2030-01-01', periods=LoadLevels, freq='h').strftime('%m-%d %H:%M:%S+01:00')
+    sNode      = [f'Node{i+1:04d}'          for i in range(Nodes)     ]
+    sArea      = [f'Area{i+1:02d}'          for i in range(Areas)     ]
+    sReservoir = [f'Reservoir{i+1:04d}'     for i in range(Reservoirs)]
+    sPSN       = pd.MultiIndex.from_product([sPeriod, sScenario, sLoadLevel])
+    NodeArea   = np.arange(Nodes)*Areas//Nodes
+    StorageType = 'Weekly' if LoadLevels >= 168 else 'Daily' if LoadLevels >= 24 else 'Hourly'
+
+    #%% random meshed topology, a ring through all the nodes to keep the network connected and random chords up to the number of lines
+    Latitude   = rng.uniform(36.0, 44.0, Nodes)
+    Longitude  = rng.uniform(-9.0,  3.0, Nodes)
+    Ring       = np.argsort(np.arctan2(Latitude-Latitude.mean(), Longitude-Longitude.mean()))
+    Pairs      = np.vstack([np.column_stack([Ring, np.roll(Ring, -1)])[:Nodes if Nodes > 2 else 1], rng.integers(0, Nodes, size=(4*Lines+Nodes, 2))])
+    Pairs      = np.sort(Pairs, axis=1)
+    Pairs      = Pairs[Pairs[:,0] != Pairs[:,1]]
+    Pairs      = Pairs[np.sort(np.unique(Pairs, axis=0, return_index=True)[1])][:max(Lines, min(Nodes, Nodes*(Nodes-1)//2))]
+    Length     = 111.0*np.hypot(Latitude[Pairs[:,0]]-Latitude[Pairs[:,1]], (Longitude[Pairs[:,0]]-Longitude[Pairs[:,1]])*np.cos(np.radians(40.0)))
+
+    #%% demand profiles with daily and seasonal cycles, period growth and scenario noise
+    Hour       = np.arange(LoadLevels)
+    Shape      = 1.0 + 0.15*np.sin(2*np.pi*(Hour%24-9)/24) + 0.10*np.cos(2*np.pi*Hour/8760)
+    Capacity   = ThermalTechnologies['MaximumPower'].values[np.arange(ThermalUnits)%len(ThermalTechnologies)].sum()
+    NodeScale  = rng.uniform(0.5, 1.5, Nodes)
+    NodeScale  = NodeScale/NodeScale.sum()*0.8*Capacity/Shape.max()
+    Growth     = 1.0 + 0.02*np.arange(Periods)
+    Demand     = (Growth[:,None,None,None] * Shape[None,None,:,None] * NodeScale[None,None,None,:] *
+                  (1.0 + 0.03*rng.standard_normal((Periods, Scenarios, LoadLevels, Nodes))))
+    AreaDemand = np.stack([Demand[..., NodeArea == ar].sum(axis=3) for ar in range(Areas)], axis=3)
+
+    #%% units
+    Units = []
+    Thermal = ThermalTechnologies.iloc[np.arange(ThermalUnits)%len(ThermalTechnologies)]
+    Units.append(Thermal.assign(Technology=Thermal.index, BinaryCommitment='Yes', Availability=1.0).set_axis([f'Thermal{i+1:04d}' for i in range(ThermalUnits)]))
+    Units.append(pd.DataFrame(data={'Technology': 'Solar_PV',     'MaximumPower': 200.0}, index=[f'Solar{i+1:04d}' for i in range(SolarUnits)]))
+    Units.append(pd.DataFrame(data={'Technology': 'Onshore_wind', 'MaximumPower': 300.0}, index=[f'Wind{i+1:04d}'  for i in range(WindUnits )]))
+    Units.append(pd.DataFrame(data={'Technology': 'Battery',      'StorageType':  'Daily' if LoadLevels >= 24 else 'Hourly', 'MaximumPower': 100.0, 'MaximumCharge': 100.0,
+                                    'InitialStorage': 200.0, 'MaximumStorage': 400.0, 'Efficiency': 0.9}, index=[f'Battery{i+1:04d}' for i in range(ESSUnits)]))
+    Units.append(pd.DataFrame(data={'Technology': 'Hydropower',   'StorageType':  StorageType, 'MaximumPower': 100.0, 'ProductionFunction': 0.3}, index=[f'Hydro{i+1:04d}' for i in range(Reservoirs)]))
+    # the electrolyzers are located at the ends of the hydrogen pipelines, which follow the first electric corridors
+    PipePairs = Pairs[:Pipelines]
+    ElNodes   = np.unique(PipePairs)
+    Units.append(pd.DataFrame(data={'Technology': 'Electrolyzer', 'MaximumCharge': 100.0, 'ProductionFunctionH2': 55.0}, index=[f'Electrolyzer{i+1:04d}' for i in range(len(ElNodes))]))
+    UnitNodes = np.concatenate([rng.integers(0, Nodes, ThermalUnits+SolarUnits+WindUnits+ESSUnits+Reservoirs), ElNodes]).astype(int)
+    dfGeneration = pd.concat(Units).reindex(columns=GenerationColumns)
+    dfGeneration['Node'         ] = np.array(sNode)[UnitNodes]
+    dfGeneration['InitialPeriod'] = 2020
+    dfGeneration['FinalPeriod'  ] = 2100
+    sUnit = list(dfGeneration.index)
+
+    # solar and wind profiles, the solar one with a daylight bell and cloudiness, the wind one with random cycles of two to six days
+    DayTime   = np.clip(np.sin(np.pi*(Hour%24-6)/12), 0.0, None) * (0.8 + 0.2*np.cos(2*np.pi*(Hour-4380)/8760))
+    Solar     = DayTime[None,None,:,None] * np.clip(1.0 - 0.4*rng.random((Periods, Scenarios, LoadLevels, SolarUnits)), 0.0, 1.0)
+    Phase     = rng.uniform(0.0, 2*np.pi, WindUnits)
+    Cycle     = rng.uniform(48.0, 144.0, WindUnits)
+    Wind      = np.clip(0.35 + 0.25*np.sin(2*np.pi*Hour[:,None]/Cycle[None,:] + Phase[None,:])[None,None,:,:] + 0.10*rng.standard_normal((Periods, Scenarios, LoadLevels, WindUnits)), 0.0, 1.0)
+    MaxPower  = np.full((Periods, Scenarios, LoadLevels, len(sUnit)), np.nan)
+    MaxPower[..., ThermalUnits           :ThermalUnits+SolarUnits          ] = 200.0*Solar
+    MaxPower[..., ThermalUnits+SolarUnits:ThermalUnits+SolarUnits+WindUnits] = 300.0*Wind
+
+    #%% writing the case
+    WriteSet(_path+'/oT_Dict_Period_'      +CaseName+'.csv', 'Period',      sPeriod                         )
+    WriteSet(_path+'/oT_Dict_Scenario_'    +CaseName+'.csv', 'Scenario',    sScenario                       )
+    WriteSet(_path+'/oT_Dict_Stage_'       +CaseName+'.csv', 'Stage',       ['st1']                         )
+    WriteSet(_path+'/oT_Dict_LoadLevel_'   +CaseName+'.csv', 'LoadLevel',   sLoadLevel                      )
+    WriteSet(_path+'/oT_Dict_Generation_'  +CaseName+'.csv', 'Generator',   sUnit                           )
+    WriteSet(_path+'/oT_Dict_Technology_'  +CaseName+'.csv', 'Technology',  dfGeneration['Technology'].unique())
+    WriteSet(_path+'/oT_Dict_Storage_'     +CaseName+'.csv', 'StorageType', ['Hourly', 'Daily', 'Weekly', 'Monthly'])
+    WriteSet(_path+'/oT_Dict_Node_'        +CaseName+'.csv', 'Node',        sNode                           )
+    WriteSet(_path+'/oT_Dict_Zone_'        +CaseName+'.csv', 'Zone',        [f'Zone{i+1:02d}' for i in range(Areas)])
+    WriteSet(_path+'/oT_Dict_Area_'        +CaseName+'.csv', 'Area',        sArea                           )
+    WriteSet(_path+'/oT_Dict_Region_'      +CaseName+'.csv', 'Region',      ['Region1']                     )
+    WriteSet(_path+'/oT_Dict_Circuit_'     +CaseName+'.csv', 'Circuit',     ['ac1', 'ac2']                  )
+    WriteSet(_path+'/oT_Dict_Line_'        +CaseName+'.csv', 'LineType',    ['AC', 'DC']                    )
+    WriteSet(_path+'/oT_Dict_NodeToZone_'  +CaseName+'.csv', ['Node', 'Zone'],   [(sNode[i], f'Zone{NodeArea[i]+1:02d}') for i in range(Nodes)])
+    WriteSet(_path+'/oT_Dict_ZoneToArea_'  +CaseName+'.csv', ['Zone', 'Area'],   [(f'Zone{i+1:02d}', sArea[i])             for i in range(Areas)])
+    WriteSet(_path+'/oT_Dict_AreaToRegion_'+CaseName+'.csv', ['Area', 'Region'], [(ar, 'Region1')                          for ar in sArea      ])
+
+    pd.DataFrame(data={'IndBinGenInvest': 0, 'IndBinGenRetirement': 0, 'IndBinRsrInvest': 0, 'IndBinNetInvest': 0, 'IndBinNetH2Invest': 0, 'IndBinGenOperat': 0, 'IndBinLineCommit': 0,
+                       'IndBinNetLosses': 0, 'IndBinSingleNode': 0, 'IndBinGenRamps': 0, 'IndBinGenMinTime': 0}, index=['Options']).to_csv(_path+'/oT_Data_Option_'+CaseName+'.csv')
+    pd.DataFrame(data={'ENSCost': 10000, 'HNSCost': 300, 'CO2Cost': 50, 'SBase': 100, 'ReferenceNode': sNode[0], 'TimeStep': 1, 'UpReserveActivation': 0.25, 'DwReserveActivation': 0.3,
+                       'MinRatioDwUp': 0, 'MaxRatioDwUp': 1, 'EconomicBaseYear': 2020, 'AnnualDiscountRate': 0}, index=['Parameters']).to_csv(_path+'/oT_Data_Parameter_'+CaseName+'.csv')
+    pd.DataFrame(data={'Weight':        1.0          }, index=sPeriod                                          ).to_csv(_path+'/oT_Data_Period_'       +CaseName+'.csv')
+    pd.DataFrame(data={'Probability':   1.0/Scenarios}, index=pd.MultiIndex.from_product([sPeriod, sScenario])).to_csv(_path+'/oT_Data_Scenario_'     +CaseName+'.csv')
+    pd.DataFrame(data={'Weight':        1.0          }, index=['st1']                                          ).to_csv(_path+'/oT_Data_Stage_'        +CaseName+'.csv')
+    pd.DataFrame(data={'ReserveMargin': 1.0          }, index=pd.MultiIndex.from_product([sPeriod, sArea])    ).to_csv(_path+'/oT_Data_ReserveMargin_'+CaseName+'.csv')
+    pd.DataFrame(data={'CO2Emission':   np.nan       }, index=pd.MultiIndex.from_product([sPeriod, sArea])    ).to_csv(_path+'/oT_Data_Emission_'     +CaseName+'.csv')
+    pd.DataFrame(data={'LoadLevel': sLoadLevel, 'Duration': 1, 'Stage': 'st1'}).to_csv(_path+'/oT_Data_Duration_'+CaseName+'.csv', index=False)
+    pd.DataFrame(data={'Latitude': Latitude, 'Longitude': Longitude}, index=sNode).to_csv(_path+'/oT_Data_NodeLocation_'+CaseName+'.csv', float_format='%.6f')
+
+    WriteProfiles(_path+'/oT_Data_Demand_'              +CaseName+'.csv', sPSN, sNode, Demand         )
+    WriteProfiles(_path+'/oT_Data_OperatingReserveUp_'  +CaseName+'.csv', sPSN, sArea, 0.03*AreaDemand)
+    WriteProfiles(_path+'/oT_Data_OperatingReserveDown_'+CaseName+'.csv', sPSN, sArea, 0.02*AreaDemand)
+    WriteProfiles(_path+'/oT_Data_Inertia_'             +CaseName+'.csv', sPSN, sArea                 )
+    for File in VariableFiles:
+        WriteProfiles(_path+'/oT_Data_'+File+'_'+CaseName+'.csv', sPSN, sUnit, MaxPower if File == 'VariableMaxGeneration' else None)
+    dfGeneration.to_csv(_path+'/oT_Data_Generation_'+CaseName+'.csv')
+
+    # existing lines in the first circuit and candidate lines as a second circuit in random corridors
+    Candidate = rng.choice(len(Pairs), size=min(CandidateLines, len(Pairs)), replace=False)
+    LinePairs = np.vstack([Pairs, Pairs[Candidate]])
+    LineLength = np.concatenate([Length, Length[Candidate]])
+    dfNetwork = pd.DataFrame(index=pd.MultiIndex.from_arrays([np.array(sNode)[LinePairs[:,0]], np.array(sNode)[LinePairs[:,1]], ['ac1']*len(Pairs)+['ac2']*len(Candidate)]), columns=NetworkColumns)
+    dfNetwork['LineType'           ] = 'AC'
+    dfNetwork['InitialPeriod'      ] = 2020
+    dfNetwork['FinalPeriod'        ] = 2100
+    dfNetwork['Voltage'            ] = 400
+    dfNetwork['Length'             ] = LineLength.round(1)
+    dfNetwork['LossFactor'         ] = (0.00005*LineLength).round(6)
+    dfNetwork['Reactance'          ] = (0.0003 *LineLength).round(6)
+    dfNetwork['TTC'                ] = (rng.uniform(1.0, 3.0, len(LinePairs))*Capacity/Nodes).round()
+    dfNetwork['SecurityFactor'     ] = 1.0
+    dfNetwork['FixedInvestmentCost'] = np.where(np.arange(len(LinePairs)) >= len(Pairs), (0.1*LineLength).round(2), np.nan)
+    dfNetwork['FixedChargeRate'    ] = np.where(np.arange(len(LinePairs)) >= len(Pairs), 0.1,                       np.nan)
+    dfNetwork.to_csv(_path+'/oT_Data_Network_'+CaseName+'.csv')
+
+    # hydro reservoirs in cascades of three, the turbined and spilled water flows to the next reservoir of the cascade
+    if Reservoirs:
+        sHydro   = [f'Hydro{i+1:04d}' for i in range(Reservoirs)]
+        Cascade  = [i for i in range(Reservoirs-1) if (i+1)%3]
+        Inflows  = 20.0*(1.0 + 0.5*np.cos(2*np.pi*(Hour-1000)/8760))[None,None,:,None] * np.where(np.arange(Reservoirs)%3 == 0, 1.0, 0.2)[None,None,None,:] * rng.uniform(0.8, 1.2, (Periods, Scenarios, 1, Reservoirs))
+        pd.DataFrame(data={'StorageType': StorageType, 'OutflowsType': np.nan, 'InitialPeriod': 2020, 'FinalPeriod': 2100, 'InitialStorage': 25.0, 'MinimumStorage': 5.0, 'MaximumStorage': 50.0,
+                           'FixedInvestmentCost': np.nan, 'FixedChargeRate': np.nan, 'BinaryInvestment': np.nan}, index=sReservoir).to_csv(_path+'/oT_Data_Reservoir_'+CaseName+'.csv')
+        WriteProfiles(_path+'/oT_Data_HydroInflows_'      +CaseName+'.csv', sPSN, sReservoir, Inflows)
+        WriteProfiles(_path+'/oT_Data_HydroOutflows_'     +CaseName+'.csv', sPSN, sReservoir         )
+        WriteProfiles(_path+'/oT_Data_VariableMinVolume_' +CaseName+'.csv', sPSN, sReservoir         )
+        WriteProfiles(_path+'/oT_Data_VariableMaxVolume_' +CaseName+'.csv', sPSN, sReservoir         )
+        WriteSet(_path+'/oT_Dict_Reservoir_'             +CaseName+'.csv', 'Reservoir',                  sReservoir                                  )
+        WriteSet(_path+'/oT_Dict_ReservoirToHydro_'      +CaseName+'.csv', ['Reservoir',   'Hydro'      ], zip(sReservoir, sHydro)                    )
+        WriteSet(_path+'/oT_Dict_HydroToReservoir_'      +CaseName+'.csv', ['Hydro',       'Reservoir'  ], [(sHydro[i], sReservoir[i+1]) for i in Cascade])
+        WriteSet(_path+'/oT_Dict_ReservoirToReservoir_'  +CaseName+'.csv', ['Reservoir',   'Reservoir'  ], [(sReservoir[i], sReservoir[i+1]) for i in Cascade])
+        WriteSet(_path+'/oT_Dict_PumpedHydroToReservoir_'+CaseName+'.csv', ['PumpedHydro', 'Reservoir'  ], []                                        )
+        WriteSet(_path+'/oT_Dict_ReservoirToPumpedHydro_'+CaseName+'.csv', ['Reservoir',   'PumpedHydro'], []                                        )
+
+    # hydrogen demand at the electrolyzer nodes, half of the electrolyzer production with the daily demand cycle
+    if Pipelines:
+        DemandH2 = np.zeros((Periods, Scenarios, LoadLevels, Nodes))
+        DemandH2[..., ElNodes] = 0.5*100.0/55.0*Shape[None,None,:,None]
+        WriteProfiles(_path+'/oT_Data_DemandHydrogen_'+CaseName+'.csv', sPSN, sNode, DemandH2)
+        dfPipeline = pd.DataFrame(index=pd.MultiIndex.from_arrays([np.array(sNode)[PipePairs[:,0]], np.array(sNode)[PipePairs[:,1]], ['ac1']*len(PipePairs)]), columns=PipelineColumns)
+        dfPipeline['InitialPeriod' ] = 2020
+        dfPipeline['FinalPeriod'   ] = 2100
+        dfPipeline['Length'        ] = Length[:Pipelines].round(1)
+        dfPipeline['TTC'           ] = 20.0
+        dfPipeline['SecurityFactor'] = 1.0
+        dfPipeline.to_csv(_path+'/oT_Data_NetworkHydrogen_'+CaseName+'.csv')
+
+    GeneratingTime = time.time() - StartTime
+    print('Generating synthetic case              ... ', round(GeneratingTime), 's')
+
+    return _path
@@ -0,0 +1,93 @@
+"""
+Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - January 18, 2024
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+import time
+import numpy         as np
+import pyomo.environ as pyo
+
+# phases whose statistics are saved with the solution of the stage and restored when it is resumed
+CheckpointPhases = ['LPRelaxationPrePass', 'ProblemSolving']
+
+
+def CheckpointFingerprint(DirName, CaseName):
+    # hash of the input data files, a checkpoint is only resumed with the same input data
+    _path = os.path.join(DirName, CaseName)
+    Hash  = hashlib.sha1()
+    for FileName in sorted(glob.glob(_path+'/oT_Data_*_'+CaseName+'.csv') + glob.glob(_path+'/oT_Dict_*_'+CaseName+'.csv')):
+        Hash.update(os.path.basename(FileName).encode())
+        with open(FileName, 'rb') as File:
+            Hash.update(File.read())
+    return Hash.hexdigest()
+
+
+def CheckpointFileName(DirName, CaseName, p, sc, st):
+    return os.path.join(DirName, CaseName, 'checkpoint', 'oT_Checkpoint_'+CaseName+'_'+str(p)+'_'+str(sc)+'_'+str(st)+'.pkl')
+
+
+def CheckpointVariables(mTEPES, p, sc, AllStages):
+    # variables of the stage being solved: those indexed by the period, scenario and a load level of the stage, and those not indexed by load level (investment decisions)
+    # all the variables if the stages are solved together. The order is the same in every run with the same input data, so the indices are not saved
+    for v in mTEPES.component_objects(pyo.Var):
+        if AllStages:
+            yield v.name, list(v.values())
+        else:
+            yield v.name, [var for index,var in v.items() if not isinstance(index, tuple) or len(index) < 3 or index[2] not in mTEPES.nn or (index[:2] == (p,sc) and index[2] in mTEPES.n)]
+
+
+def CheckpointSave(DirName, CaseName, mTEPES, p, sc, st, AllStages=False):
+    # values and fixed state of the variables, duals and solver and phase statistics of the solved stage in a binary file
+    StartTime = time.time()
+    Variables = {}
+    for Name,Vars in CheckpointVariables(mTEPES, p, sc, AllStages):
+        Variables[Name] = (np.array([var.value if var.value is not None else np.nan for var in Vars], dtype='float64'), np.array([var.fixed for var in Vars], dtype='bool'))
+    Checkpoint = {'Fingerprint': mTEPES.pCheckpointFingerprint,
+                  'Variables':   Variables,
+                  'Duals':       {Family: {Stage: Duals for Stage,Duals in Stages.items() if AllStages or Stage in [(p,sc,st), None]} for Family,Stages in mTEPES.pDuals.items()},
+                  'SolverStats': [Stats for Stats in mTEPES.pSolverStats if AllStages or (Stats['Period'],Stats['Scenario']) == (p,sc)][-1:],
+                  'PhaseStats':  [Stats for Stats in mTEPES.pPhaseStats  if Stats['Phase'] in CheckpointPhases and (Stats['Period'],Stats['Scenario'],Stats['Stage']) == (p,sc,st)]}
+
+    # written in a temporary file and renamed to avoid partial checkpoints if the run is interrupted
+    FileName = CheckpointFileName(DirName, CaseName, p, sc, st)
+    os.makedirs(os.path.dirname(FileName), exist_ok=True)
+    with open(FileName+'.tmp', 'wb') as File:
+        pickle.dump(Checkpoint, File, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(FileName+'.tmp', FileName)
+    print('Saving checkpoint                      ... ', round(time.time() - StartTime), 's')
+
+
+def CheckpointLoad(DirName, CaseName, mTEPES, p, sc, st, AllStages=False):
+    # values and fixed state of the variables, duals and statistics of a stage solved in a previous run, returning False if there is no valid checkpoint of the stage
+    FileName = CheckpointFileName(DirName, CaseName, p, sc, st)
+    if not os.path.exists(FileName):
+        return False
+    with open(FileName, 'rb') as File:
+        Checkpoint = pickle.load(File)
+    if Checkpoint['Fingerprint'] != mTEPES.pCheckpointFingerprint:
+        print('Checkpoint of Period '+str(p)+', Scenario '+str(sc)+', Stage '+str(st)+' ignored, the input data have changed')
+        return False
+
+    # the variables of the model must be those saved, otherwise (options or code changed) the stage is solved again without loading any value
+    Variables = list(CheckpointVariables(mTEPES, p, sc, AllStages))
+    if any(Name not in Checkpoint['Variables'] or len(Checkpoint['Variables'][Name][0]) != len(Vars) for Name,Vars in Variables) or len(Variables) != len(Checkpoint['Variables']):
+        print('Checkpoint of Period '+str(p)+', Scenario '+str(sc)+', Stage '+str(st)+' ignored, the variables of the model have changed')
+        return False
+
+    for Name,Vars in Variables:
+        Values, Fixed = Checkpoint['Variables'][Name]
+        for var,Value,IsFixed in zip(Vars, Values, Fixed):
+            var.set_value(None if np.isnan(Value) else Value, skip_validation=True)
+            if IsFixed:
+                var.fix()
+            else:
+                var.unfix()
+    for Family,Stages in Checkpoint['Duals'].items():
+        mTEPES.pDuals.setdefault(Family, {}).update(Stages)
+    mTEPES.pSolverStats += Checkpoint['SolverStats']
+    mTEPES.pPhaseStats  += Checkpoint['PhaseStats']
+    print('Period '+str(p)+', Scenario '+str(sc)+', Stage '+str(st)+' resumed from checkpoint')
+    return True
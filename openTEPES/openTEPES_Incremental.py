@@ -0,0 +1,166 @@
+"""
+Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - January 18, 2024
+"""
+
+import ast
+import glob
+import hashlib
+import inspect
+import os
+import time
+import textwrap
+import pandas        as pd
+import pyomo.environ as pyo
+from   pyomo.environ import ConcreteModel
+
+from .openTEPES_InputData  import InputData, SettingUpVariables
+from .openTEPES_Parametric import ParamReplace
+
+
+def InputTables(DirName, CaseName):
+    # hash of every input table of the case, to find the tables changed since the model was built
+    _path  = os.path.join(DirName, CaseName)
+    Hashes = {}
+    for FileName in sorted(glob.glob(_path+'/oT_Data_*_'+CaseName+'.csv') + glob.glob(_path+'/oT_Dict_*_'+CaseName+'.csv')):
+        with open(FileName, 'rb') as File:
+            Hashes[os.path.basename(FileName)[len('oT_'):-len('_'+CaseName+'.csv')]] = hashlib.sha1(File.read()).hexdigest()
+    return Hashes
+
+
+def ModelReferences(Function):
+    # attributes of the model (sets, parameters and variables) referenced by a function
+    Tree = ast.parse(textwrap.dedent(inspect.getsource(Function)))
+    return {node.attr for node in ast.walk(Tree) if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in ['mTEPES', 'OptModel']}
+
+
+def InputDependencies():
+    # input tables (Data_<table> or Dict_<table>) from which every attribute of the model declared by InputData is derived
+    # the assignments of InputData, and the calls of methods that change an object (dictSets.load(...)), are followed until no more dependencies are found, the conditions of the assignments are not followed
+    Tree        = ast.parse(textwrap.dedent(inspect.getsource(InputData)))
+    Assignments = []
+    for node in ast.walk(Tree):
+        if   isinstance(node, ast.Assign):
+            Assignments.append((node.targets, node.value))
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)) and node.value is not None:
+            Assignments.append(([node.target], node.value))
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Attribute):
+            Assignments.append(([node.value.func.value], node.value))
+
+    def Key(node):
+        # local variable or attribute of the model assigned or read, also through subscripts and methods (dfDemand.loc[...], mTEPES.pDemand[...])
+        while isinstance(node, (ast.Subscript, ast.Attribute)) and not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'mTEPES'):
+            node = node.value
+        if isinstance(node, ast.Attribute):
+            return 'mTEPES.'+node.attr
+        if isinstance(node, ast.Name):
+            return node.id
+        return None
+
+    Dependencies = {}
+    Changed      = True
+    while Changed:
+        Changed = False
+        for Targets,Value in Assignments:
+            Tables = set()
+            for node in ast.walk(Value):
+                if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.startswith(('/oT_Data_', '/oT_Dict_')):
+                    Tables.add(node.value[len('/oT_'):].rstrip('_'))
+                elif isinstance(node, (ast.Name, ast.Attribute)):
+                    Tables |= Dependencies.get(Key(node), set())
+            for Target in [Element for Target in Targets for Element in (Target.elts if isinstance(Target, ast.Tuple) else [Target])]:
+                if Key(Target) is not None and not Tables <= Dependencies.get(Key(Target), set()):
+                    Dependencies.setdefault(Key(Target), set()).update(Tables)
+                    Changed = True
+
+    # attributes of the model derived from every input table
+    TableDependencies = {}
+    for Name,Tables in Dependencies.items():
+        if Name.startswith('mTEPES.'):
+            for Table in Tables:
+                TableDependencies.setdefault(Table, set()).add(Name[len('mTEPES.'):])
+    return TableDependencies
+
+
+def DependencyToFile(DirName, CaseName, Formulations):
+    # input tables, attributes of the model derived from them, and formulations using these attributes
+    _path = os.path.join(DirName, CaseName)
+    References = {Formulation.__name__: ModelReferences(Formulation) for Formulation in Formulations}
+    Rows = [(Table, Name, ', '.join(sorted(Formulation for Formulation,Names in References.items() if Name in Names))) for Table,Names in sorted(InputDependencies().items()) for Name in sorted(Names)]
+    pd.DataFrame(Rows, columns=['Table', 'Component', 'Formulations']).to_csv(_path+'/oT_Result_Dependency_'+CaseName+'.csv', sep=',', index=False)
+
+
+def FormulationRecord(mTEPES, Formulation, Args, p=None, sc=None, st=None):
+    # formulation of the model recording the components declared by it, to delete and declare them again if their input data change
+    Components = {c.name for c in mTEPES.component_objects(descend_into=False)}
+    Formulation(mTEPES, mTEPES, *Args)
+    mTEPES.pFormulationComponents[(Formulation.__name__, p, sc, st)] = [c.name for c in mTEPES.component_objects(descend_into=False) if c.name not in Components]
+
+
+def ComponentValues(Component):
+    # values of an attribute of the model to be compared with the ones read again
+    if   isinstance(Component, pyo.Param):
+        return {idx: pyo.value(Value) for idx,Value in Component.items()}
+    elif isinstance(Component, pyo.Set) and Component.is_indexed():
+        return {idx: list(Value.data()) for idx,Value in Component.items()}
+    elif isinstance(Component, pyo.Set):
+        return list(Component.data())
+    return Component
+
+
+def ComponentEqual(Old, New):
+    try:
+        Old, New = ComponentValues(Old), ComponentValues(New)
+        return bool(Old.equals(New)) if hasattr(Old, 'equals') else bool(Old == New)
+    except (TypeError, ValueError):
+        return False
+
+
+def IncrementalUpdate(DirName, CaseName, mTEPES, pIndLogConsole, Formulations):
+    # input data read again and compared with the ones of the built model, which is updated if only parameters used by the formulations have changed
+    # returns the formulations to be declared again, or None if the sets or the variables are affected and the model must be built again
+    StartTime = time.time()
+    Hashes    = InputTables(DirName, CaseName)
+    Tables    = sorted(Table for Table in set(Hashes) | set(mTEPES.pInputTables) if Hashes.get(Table) != mTEPES.pInputTables.get(Table))
+    print('Input tables changed                   ... ', ', '.join(Tables) if Tables else 'none')
+
+    # every attribute declared by InputData (sets, parameters, and lists of indices) is compared, not only the ones found by the static scan of the dependencies,
+    # which does not follow loops nor conditions and would leave old coefficients in the reused constraints
+    Fresh = ConcreteModel()
+    InputData(DirName, CaseName, Fresh, pIndLogConsole)
+    Names   = sorted(set(vars(Fresh)) - set(vars(ConcreteModel())))
+    Changed = [Name for Name in Names if not hasattr(mTEPES, Name) or not ComponentEqual(getattr(mTEPES, Name), getattr(Fresh, Name))]
+
+    # changes of the sets, of the options that are not parameters, or of the parameters used to declare the variables need to build the model again
+    Structural = [Name for Name in Changed if not isinstance(getattr(mTEPES, Name, None), pyo.Param) or not isinstance(getattr(Fresh, Name, None), pyo.Param) or Name in ModelReferences(SettingUpVariables)]
+    if Structural:
+        print('Model built again, changed                 ', ', '.join(Structural))
+        return None
+
+    for Name in Changed:
+        if getattr(mTEPES, Name).mutable:
+            getattr(mTEPES, Name).store_values({idx: pyo.value(Value) for idx,Value in getattr(Fresh, Name).items()})
+        else:
+            ParamReplace(mTEPES, Name, dict(getattr(Fresh, Name).extract_values()))
+    mTEPES.pInputTables = Hashes
+
+    # formulations using the changed parameters, whose components are deleted to be declared again
+    Rebuild = {Formulation.__name__ for Formulation in Formulations if set(Changed) & ModelReferences(Formulation)}
+    Rows    = []
+    for (Formulation,p,sc,st),Components in mTEPES.pFormulationComponents.items():
+        Rows.append((Formulation, p, sc, st, len(Components), 'Rebuilt' if Formulation in Rebuild else 'Reused'))
+        if Formulation in Rebuild:
+            for Name in Components:
+                mTEPES.del_component(Name)
+    mTEPES.pFormulationComponents = {Key: Components for Key,Components in mTEPES.pFormulationComponents.items() if Key[0] not in Rebuild}
+
+    # report of the reused and rebuilt components
+    _path    = os.path.join(DirName, CaseName)
+    dfReport = pd.DataFrame(Rows, columns=['Formulation', 'Period', 'Scenario', 'Stage', 'Components', 'Status'])
+    dfReport.to_csv(_path+'/oT_Result_Rebuild_'+CaseName+'.csv', sep=',', index=False)
+    print('Parameters changed                     ... ', ', '.join(Changed) if Changed else 'none')
+    print('Components reused                      ... ', dfReport.loc[dfReport['Status'] == 'Reused',  'Components'].sum(), 'of', dfReport['Components'].sum())
+    print('Formulations rebuilt                   ... ', ', '.join(sorted(Rebuild)) if Rebuild else 'none')
+
+    UpdatingTime = time.time() - StartTime
+    print('Incremental update of the model        ... ', round(UpdatingTime), 's')
+    return Rebuild
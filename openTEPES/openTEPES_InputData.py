@@ -11,6 +11,14 @@ from   collections   import defaultdict
 from   pyomo.environ import DataPortal, Set, Param, Var, Binary, NonNegativeReals, NonNegativeIntegers, PositiveReals, PositiveIntegers, Reals, UnitInterval, Any
 
 
+def DiscountedWeights(Periods, pPeriodWeight, pAnnualDiscRate, pEconomicBaseYear):
+    # discount factor of every period, also used by the parametric re-solve with the annual discount rate of each point
+    if pAnnualDiscRate == 0.0:
+        return pd.Series([                        pPeriodWeight[p]                                                                                          for p in Periods], index=list(Periods))
+    else:
+        return pd.Series([((1.0+pAnnualDiscRate)**pPeriodWeight[p]-1.0) / (pAnnualDiscRate*(1.0+pAnnualDiscRate)**(pPeriodWeight[p]-1+p-pEconomicBaseYear)) for p in Periods], index=list(Periods))
+
+
 def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     print('Input data                             ****')
     print('Cloned Version 25/11/2023              ****')
@@ -167,6 +175,44 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
             print('Hydrogen demand                   \n', dfDemandHydrogen.describe      ())
             print('Hydrogen pipeline network         \n', dfNetworkHydrogen.describe     ())
 
+    #%% clustering of identical units
+    try:
+        pIndClusterUnits   = dfOption   ['IndClusterUnits'    ].iloc[0].astype('int')         # Indicator of identical unit clustering,                    0 individual units - 1 clustered units
+    except:
+        pIndClusterUnits   = 0
+
+    # identical units located at the same node are replaced by a single unit whose commitment is an integer number of units
+    # only thermal units without storage, production function, investment, retirement, or mutually exclusive decisions are clustered
+    # rated power is scaled by the number of units while costs and ramps remain per unit
+    pUnitMultiplicity = pd.Series(1, index=dfGeneration.index)
+    sClusterToUnit    = []
+    if pIndClusterUnits == 1:
+        dfCluster = dfGeneration[(dfGeneration['MaximumPower'       ] >  0.0) & (dfGeneration['MaximumCharge'      ] == 0.0) & (dfGeneration['MaximumStorage'     ] == 0.0) &
+                                 (dfGeneration['ProductionFunction' ] == 0.0) & (dfGeneration['ProductionFunctionH2'] == 0.0) &
+                                 (dfGeneration['FixedInvestmentCost'] == 0.0) & (dfGeneration['FixedRetirementCost'] == 0.0) & (dfGeneration['MutuallyExclusive'  ] == 0.0) &
+                                 (dfGeneration['LinearTerm'] * dfGeneration['FuelCost'] + dfGeneration['CO2EmissionRate'] > 0.0)].copy()
+        # units are identical if all their data and time series are equal
+        for idx,dfVariable in enumerate([dfVariableMinPower, dfVariableMaxPower, dfVariableMinEnergy, dfVariableMaxEnergy, dfVariableFuelCost, dfVariableEmissionCost]):
+            dfCluster['TimeSeries'+str(idx)] = [hash(dfVariable[g].values.tobytes()) if g in dfVariable.columns else 0 for g in dfCluster.index]
+
+        nClusters = 0
+        for key,sUnits in dfCluster.groupby(list(dfCluster.columns), sort=False).groups.items():
+            if len(sUnits) > 1:
+                # the first unit represents the cluster
+                cl = sUnits[0]
+                nClusters            += 1
+                pUnitMultiplicity[cl] = len(sUnits)
+                sClusterToUnit       += [(cl,g) for g in sUnits]
+                for Column in ['MaximumPower', 'MinimumPower', 'MaximumReactivePower', 'MinimumReactivePower', 'InitialStorage', 'Inertia']:
+                    dfGeneration.loc[cl, Column] *= len(sUnits)
+                for dfVariable in [dfVariableMinPower, dfVariableMaxPower, dfVariableMinEnergy, dfVariableMaxEnergy]:
+                    if cl in dfVariable.columns:
+                        dfVariable[cl] *= len(sUnits)
+                dfGeneration      = dfGeneration.drop     (sUnits[1:])
+                pUnitMultiplicity = pUnitMultiplicity.drop(sUnits[1:])
+
+        print('Identical units clustered              ... ', len(sClusterToUnit), 'units in', nClusters, 'clusters')
+
     #%% reading the sets
     dictSets = DataPortal()
     dictSets.load(filename=_path+'/oT_Dict_Period_'      +CaseName+'.csv', set='p'   , format='set')
@@ -191,7 +237,8 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     mTEPES.scc  = Set(initialize=dictSets['sc'  ], ordered=True,  doc='scenarios'                       )
     mTEPES.stt  = Set(initialize=dictSets['st'  ], ordered=True,  doc='stages'                          )
     mTEPES.nn   = Set(initialize=dictSets['n'   ], ordered=True,  doc='load levels'                     )
-    mTEPES.gg   = Set(initialize=dictSets['g'   ], ordered=False, doc='units'                           )
+    sClustered  = {g for cl,g in sClusterToUnit if g != cl}
+    mTEPES.gg   = Set(initialize=[g for g in dictSets['g'] if g not in sClustered], ordered=False, doc='units')
     mTEPES.gt   = Set(initialize=dictSets['gt'  ], ordered=False, doc='technologies'                    )
     mTEPES.et   = Set(initialize=dictSets['et'  ], ordered=False, doc='ESS types'                       )
     mTEPES.nd   = Set(initialize=dictSets['nd'  ], ordered=False, doc='nodes'                           )
@@ -258,6 +305,38 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     pIndBinGenMinTime      = dfOption   ['IndBinGenMinTime'   ].iloc[0].astype('int')         # Indicator of minimum up/downtime constraints,              0 no min time      - 1 min time constraints
     pIndBinLineCommit      = dfOption   ['IndBinLineCommit'   ].iloc[0].astype('int')         # Indicator of binary electric network switching decisions,  0 continuous       - 1 binary
     pIndBinNetLosses       = dfOption   ['IndBinNetLosses'    ].iloc[0].astype('int')         # Indicator of        electric network losses,               0 lossless         - 1 ohmic losses
+    try:
+        pIndWarmStart      = dfOption   ['IndWarmStart'       ].iloc[0].astype('int')         # Indicator of MIP start of the unit commitment,             0 no MIP start     - 1 merit order - 2 previous results
+    except:
+        pIndWarmStart      = 0
+    try:
+        pIndLPPrePass      = dfOption   ['IndLPPrePass'       ].iloc[0].astype('int')         # Indicator of LP relaxation pre-pass of binary investments, 0 no pre-pass      - 1 LP relaxation pre-pass
+    except:
+        pIndLPPrePass      = 0
+    try:
+        pIndResultFormat   = dfOption   ['IndResultFormat'    ].iloc[0].astype('int')         # Indicator of format of the output results,                 0 CSV              - 1 Parquet     - 2 Feather - 3 all
+    except:
+        pIndResultFormat   = 0
+    try:
+        pIndParallelResults = dfOption  ['IndParallelResults' ].iloc[0].astype('int')         # Indicator of concurrent writing of the output results,     0 sequential       - 1 concurrent
+    except:
+        pIndParallelResults = 0
+    try:
+        pIndResultDatabase = dfOption   ['IndResultDatabase'  ].iloc[0].astype('int')         # Indicator of results database,                             0 no database      - 1 SQLite      - 2 DuckDB
+    except:
+        pIndResultDatabase = 0
+    try:
+        pIndStreamResults  = dfOption   ['IndStreamResults'   ].iloc[0].astype('int')         # Indicator of writing the results of each stage,            0 at the end       - 1 by stage    - 2 by stage releasing the stage constraints
+    except:
+        pIndStreamResults  = 0
+    try:
+        pIndMapLoadLevels  = dfOption   ['IndMapLoadLevels'   ].iloc[0].astype('int')         # Number of load levels of the network maps,                 1 first load level - n load levels in a slider
+    except:
+        pIndMapLoadLevels  = 1
+    try:
+        pIndMapOffline     = dfOption   ['IndMapOffline'      ].iloc[0].astype('int')         # Indicator of network maps without map tiles,               0 mapbox tiles     - 1 without tiles
+    except:
+        pIndMapOffline     = 0
     pENSCost               = dfParameter['ENSCost'            ].iloc[0] * 1e-3                # cost of energy   not served               [MEUR/GWh]
     pHNSCost               = dfParameter['HNSCost'            ].iloc[0] * 1e-3                # cost of hydrogen not served               [MEUR/tH2]
     pCO2Cost               = dfParameter['CO2Cost'            ].iloc[0]                       # cost of CO2 emission                      [EUR/tCO2]
@@ -614,6 +693,9 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     # assigning a line to an area. Both nodes are in the same area. Cross-area lines not included
     mTEPES.laar = [(ni,nf,cc,ar) for ni,nf,cc,ar in mTEPES.la*mTEPES.ar if (ni,ar) in mTEPES.ndar and (nf,ar) in mTEPES.ndar]
 
+    # assigning the identical units to the cluster that represents them
+    mTEPES.c2g  = sClusterToUnit
+
     # replacing string values by numerical values
     idxDict = dict()
     idxDict[0    ] = 0
@@ -676,10 +758,7 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
             if pStageDuration[st] != pStageDuration[mTEPES.st.prev(st)]:
                 assert (0 == 1)
 
-    if pAnnualDiscRate == 0.0:
-        pDiscountedWeight = pd.Series([                        pPeriodWeight[p]                                                                                          for p in mTEPES.p], index=mTEPES.p)
-    else:
-        pDiscountedWeight = pd.Series([((1.0+pAnnualDiscRate)**pPeriodWeight[p]-1.0) / (pAnnualDiscRate*(1.0+pAnnualDiscRate)**(pPeriodWeight[p]-1+p-pEconomicBaseYear)) for p in mTEPES.p], index=mTEPES.p)
+    pDiscountedWeight = DiscountedWeights(mTEPES.p, pPeriodWeight, pAnnualDiscRate, pEconomicBaseYear)
 
     mTEPES.pLoadLevelWeight = Param(mTEPES.n, initialize=0.0, within=NonNegativeReals, doc='Load level weight', mutable=True)
     for st,n in mTEPES.s2n:
@@ -1062,6 +1141,14 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     mTEPES.pIndBinNetLosses      = Param(initialize=pIndBinNetLosses     , within=Binary,              doc='Indicator of binary electric network ohmic losses',         mutable=True)
     mTEPES.pIndHydroTopology     = Param(initialize=pIndHydroTopology    , within=Binary,              doc='Indicator of reservoir and hydropower topology'                         )
     mTEPES.pIndHydrogen          = Param(initialize=pIndHydrogen         , within=Binary,              doc='Indicator of hydrogen demand and pipeline network'                      )
+    mTEPES.pIndWarmStart         = Param(initialize=pIndWarmStart        , within=NonNegativeIntegers, doc='Indicator of MIP start of the unit commitment',             mutable=True)
+    mTEPES.pIndLPPrePass         = Param(initialize=pIndLPPrePass        , within=Binary,              doc='Indicator of LP relaxation pre-pass of binary investments', mutable=True)
+    mTEPES.pIndResultFormat      = Param(initialize=pIndResultFormat     , within=NonNegativeIntegers, doc='Indicator of format of the output results',                 mutable=True)
+    mTEPES.pIndParallelResults   = Param(initialize=pIndParallelResults  , within=Binary,              doc='Indicator of concurrent writing of the output results',    mutable=True)
+    mTEPES.pIndResultDatabase    = Param(initialize=pIndResultDatabase   , within=NonNegativeIntegers, doc='Indicator of results database',                             mutable=True)
+    mTEPES.pIndStreamResults     = Param(initialize=pIndStreamResults    , within=NonNegativeIntegers, doc='Indicator of writing the results of each stage',            mutable=True)
+    mTEPES.pIndMapLoadLevels     = Param(initialize=pIndMapLoadLevels    , within=NonNegativeIntegers, doc='Number of load levels of the network maps',                 mutable=True)
+    mTEPES.pIndMapOffline        = Param(initialize=pIndMapOffline       , within=Binary,              doc='Indicator of network maps without map tiles',               mutable=True)
 
     mTEPES.pENSCost              = Param(initialize=pENSCost             , within=NonNegativeReals,    doc='ENS cost'                                          )
     mTEPES.pHNSCost              = Param(initialize=pHNSCost             , within=NonNegativeReals,    doc='HNS cost'                                          )
@@ -1082,6 +1169,14 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     mTEPES.pDemandAbs            = Param(mTEPES.psnnd, initialize=pDemandAbs.stack().to_dict()        , within=NonNegativeReals,    doc='Electric demand'                                     )
     mTEPES.pPeriodWeight         = Param(mTEPES.p,     initialize=pPeriodWeight.to_dict()             , within=NonNegativeIntegers, doc='Period weight',                          mutable=True)
     mTEPES.pDiscountedWeight     = Param(mTEPES.p,     initialize=pDiscountedWeight.to_dict()         , within=NonNegativeReals,    doc='Discount factor'                                     )
+
+    # scale of the parameters changed by the parametric re-solve of the built model, mutable only in that mode to keep constant coefficients otherwise
+    pIndParametric = getattr(mTEPES, 'pIndParametric', 0)
+    mTEPES.pENSCostScale         = Param(              initialize=1.0                                 , within=NonNegativeReals,    doc='ENS cost scale',                         mutable=pIndParametric == 1)
+    mTEPES.pCO2CostScale         = Param(              initialize=1.0                                 , within=NonNegativeReals,    doc='CO2 emission cost scale',                mutable=pIndParametric == 1)
+    mTEPES.pDemandScale          = Param(              initialize=1.0                                 , within=NonNegativeReals,    doc='Electric demand scale',                  mutable=pIndParametric == 1)
+    mTEPES.pDiscountScale        = Param(mTEPES.p,     initialize=1.0                                 , within=NonNegativeReals,    doc='Discount factor scale',                  mutable=pIndParametric == 1)
+
     mTEPES.pScenProb             = Param(mTEPES.psc,   initialize=pScenProb.to_dict()                 , within=UnitInterval    ,    doc='Probability',                            mutable=True)
     mTEPES.pStageWeight          = Param(mTEPES.stt,   initialize=pStageWeight.to_dict()              , within=NonNegativeReals,    doc='Stage weight'                                        )
     mTEPES.pDuration             = Param(mTEPES.n,     initialize=pDuration.to_dict()                 , within=NonNegativeReals,    doc='Duration',                               mutable=True)
@@ -1106,6 +1201,7 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     mTEPES.pRatedMaxPower        = Param(mTEPES.gg,    initialize=pRatedMaxPower.to_dict()            , within=NonNegativeReals,    doc='Rated maximum power'                                 )
     mTEPES.pRatedMaxCharge       = Param(mTEPES.gg,    initialize=pRatedMaxCharge.to_dict()           , within=NonNegativeReals,    doc='Rated maximum charge'                                )
     mTEPES.pMustRun              = Param(mTEPES.gg,    initialize=pMustRun.to_dict()                  , within=Binary          ,    doc='must-run unit'                                       )
+    mTEPES.pUnitMultiplicity     = Param(mTEPES.gg,    initialize=pUnitMultiplicity.to_dict()         , within=PositiveIntegers,    doc='number of identical units in the cluster'            )
     mTEPES.pInertia              = Param(mTEPES.gg,    initialize=pInertia.to_dict()                  , within=NonNegativeReals,    doc='unit inertia constant'                               )
     mTEPES.pPeriodIniGen         = Param(mTEPES.gg,    initialize=pPeriodIniGen.to_dict()             , within=PositiveIntegers,    doc='installation year',                                  )
     mTEPES.pPeriodFinGen         = Param(mTEPES.gg,    initialize=pPeriodFinGen.to_dict()             , within=PositiveIntegers,    doc='retirement   year',                                  )
@@ -1262,7 +1358,7 @@ def InputData(DirName, CaseName, mTEPES, pIndLogConsole):
     pInitialSwitch = pd.DataFrame([[0  ]*len(mTEPES.la)]*len(mTEPES.psn), index=mTEPES.psn, columns=list(mTEPES.la))
 
     mTEPES.pInitialOutput = Param(mTEPES.psngg, initialize=pInitialOutput.stack().to_dict(), within=NonNegativeReals, doc='unit initial output',     mutable=True)
-    mTEPES.pInitialUC     = Param(mTEPES.psngg, initialize=pInitialUC.stack().to_dict()    , within=Binary,           doc='unit initial commitment', mutable=True)
+    mTEPES.pInitialUC     = Param(mTEPES.psngg, initialize=pInitialUC.stack().to_dict()    , within=NonNegativeIntegers, doc='unit initial commitment', mutable=True)
     mTEPES.pInitialSwitch = Param(mTEPES.psnla, initialize=pInitialSwitch.stack().to_dict(), within=Binary,           doc='line initial switching',  mutable=True)
 
     SettingUpDataTime = time.time() - StartTime
@@ -1445,6 +1541,16 @@ def SettingUpVariables(OptModel, mTEPES):
         if mTEPES.pIndBinUnitCommit[nr] == 0:
             OptModel.vMaxCommitment[p,sc,  nr].domain = UnitInterval
 
+    # clustered units are committed, started up and shut down by an integer number of identical units
+    for p,sc,n,nr in mTEPES.psnnr:
+        if mTEPES.pUnitMultiplicity[nr] > 1:
+            for vUnitCommit in [OptModel.vCommitment, OptModel.vStartUp, OptModel.vShutDown]:
+                if mTEPES.pIndBinGenOperat() == 0 or mTEPES.pIndBinUnitCommit[nr] == 0:
+                    vUnitCommit[p,sc,n,nr].domain = NonNegativeReals
+                else:
+                    vUnitCommit[p,sc,n,nr].domain = NonNegativeIntegers
+                vUnitCommit    [p,sc,n,nr].setub(mTEPES.pUnitMultiplicity[nr])
+
     # existing lines are always committed if no switching decision is modeled
     [OptModel.vLineCommit[p,sc,n,ni,nf,cc].fix(1) for p,sc,n,ni,nf,cc in mTEPES.psnle if mTEPES.pIndBinLineSwitch[ni,nf,cc] == 0]
     nFixedVariables += sum(                    1  for p,sc,n,ni,nf,cc in mTEPES.psnle if mTEPES.pIndBinLineSwitch[ni,nf,cc] == 0)
@@ -1486,13 +1592,13 @@ def SettingUpVariables(OptModel, mTEPES):
             OptModel.vMaxCommitment     [p,sc,  nr].fix(1)
             nFixedVariables += 1/len(mTEPES.n)
             if (mTEPES.pMustRun[nr] == 1 or (mTEPES.pMinPower[p,sc,n,nr] == 0.0 and mTEPES.pRatedConstantVarCost[nr] == 0.0) or nr in mTEPES.es) and nr not in mTEPES.ec:
-                OptModel.vCommitment    [p,sc,n,nr].fix(1)
+                OptModel.vCommitment    [p,sc,n,nr].fix(mTEPES.pUnitMultiplicity[nr])
                 OptModel.vStartUp       [p,sc,n,nr].fix(0)
                 OptModel.vShutDown      [p,sc,n,nr].fix(0)
                 nFixedVariables += 3
         elif len(mTEPES.g2g) >  0 and sum(1 for g in mTEPES.nr if (nr,g) in mTEPES.g2g or (g,nr) in mTEPES.g2g) == 0:
             if (mTEPES.pMustRun[nr] == 1 or (mTEPES.pMinPower[p,sc,n,nr] == 0.0 and mTEPES.pRatedConstantVarCost[nr] == 0.0) or nr in mTEPES.es) and nr not in mTEPES.ec:
-                OptModel.vCommitment    [p,sc,n,nr].fix(1)
+                OptModel.vCommitment    [p,sc,n,nr].fix(mTEPES.pUnitMultiplicity[nr])
                 OptModel.vStartUp       [p,sc,n,nr].fix(0)
                 OptModel.vShutDown      [p,sc,n,nr].fix(0)
                 OptModel.vMaxCommitment [p,sc,  nr].fix(1)
@@ -1570,7 +1676,7 @@ def SettingUpVariables(OptModel, mTEPES):
             for nr in mTEPES.nr:
                 if pSystemOutput < sum(mTEPES.pDemand[n1,nd] for nd in mTEPES.nd) and mTEPES.pMustRun[nr] == 1:
                     mTEPES.pInitialOutput[n1,nr] = mTEPES.pMaxPower[n1,nr]
-                    mTEPES.pInitialUC    [n1,nr] = 1
+                    mTEPES.pInitialUC    [n1,nr] = mTEPES.pUnitMultiplicity[nr]
                     pSystemOutput               += mTEPES.pInitialOutput[n1,nr]()
 
             # determine the initial committed units and their output at the first load level of each period, scenario, and stage
@@ -1580,7 +1686,7 @@ def SettingUpVariables(OptModel, mTEPES):
                         mTEPES.pInitialOutput[n1,go] = mTEPES.pMaxPower[n1,go]
                     else:
                         mTEPES.pInitialOutput[n1,go] = mTEPES.pMinPower[n1,go]
-                    mTEPES.pInitialUC[n1,go] = 1
+                    mTEPES.pInitialUC[n1,go] = mTEPES.pUnitMultiplicity[go]
                     pSystemOutput = pSystemOutput + mTEPES.pInitialOutput[n1,go]()
 
             # determine the initial committed lines
@@ -1907,7 +2013,7 @@ def SettingUpVariables(OptModel, mTEPES):
                 print('### Minimum energy violation ', p, sc, n, g)
                 assert (0 == 1)
 
-    mTEPES.nFixedVariables = Param(initialize=round(nFixedVariables), within=NonNegativeIntegers, doc='Number of fixed variables')
+    mTEPES.nFixedVariables = Param(initialize=round(nFixedVariables), within=NonNegativeIntegers, doc='Number of fixed variables', mutable=True)
 
     SettingUpVariablesTime = time.time() - StartTime
     print('Setting up variables                   ... ', round(SettingUpVariablesTime), 's')
@@ -0,0 +1,528 @@
+"""
+Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - January 18, 2024
+"""
+
+import math
+import time
+import os
+import sys
+import io
+import json
+import psutil
+import cProfile
+import pstats
+import threading
+import pandas        as pd
+from   collections   import Counter, defaultdict
+from   pyomo.environ import Constraint, Var
+
+
+def PeakMemory():
+    # peak resident memory of the process [MB], given by psutil on Windows and by the resource module on Unix
+    MemoryInfo = psutil.Process().memory_info()
+    if hasattr(MemoryInfo, 'peak_wset'):
+        return MemoryInfo.peak_wset / 2**20
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == 'darwin' else 2**10)
+    except ImportError:
+        return MemoryInfo.rss / 2**20
+
+
+# Definition of the profilers of the phase groups
+ProfileGroups = ['input', 'formulation', 'solve', 'output']
+
+
+def ProfileGroup(Phase):
+    # group of phases profiled together
+    if Phase == 'InputData':
+        return 'input'
+    elif Phase in ['SettingUpVariables', 'TotalObjectiveFunction', 'ParametricUpdate', 'IncrementalUpdate'] or 'ModelFormulation' in Phase:
+        return 'formulation'
+    elif Phase in ['WritingLPFile', 'LPRelaxationPrePass', 'ProblemSolving', 'CheckpointSave', 'CheckpointLoad']:
+        return 'solve'
+    else:
+        return 'output'
+
+
+class SamplingProfiler:
+    # stacks of all the other threads sampled at a fixed interval by a background thread, with the interface of cProfile
+    def __init__(self, Interval=0.005):
+        self.Interval = Interval
+        self.Stacks   = Counter()
+        self.Active   = threading.Event()
+        self.Thread   = None
+
+    def enable(self):
+        self.Active.set()
+        self.Thread = threading.Thread(target=self.Sample, daemon=True)
+        self.Thread.start()
+
+    def disable(self):
+        self.Active.clear()
+        self.Thread.join()
+
+    def Sample(self):
+        Ident = threading.get_ident()
+        while self.Active.is_set():
+            for ThreadIdent,Frame in sys._current_frames().items():
+                if ThreadIdent == Ident:
+                    continue
+                Stack = []
+                while Frame is not None:
+                    Stack.append(Frame.f_code.co_name+' ('+os.path.basename(Frame.f_code.co_filename)+':'+str(Frame.f_code.co_firstlineno)+')')
+                    Frame = Frame.f_back
+                self.Stacks[';'.join(reversed(Stack))] += 1
+            time.sleep(self.Interval)
+
+
+def Profilers(Profile, Profiler='cprofile'):
+    # one profiler for each selected group of phases, all of them with 'all'
+    if Profile is None:
+        return {}
+    Groups = ProfileGroups if Profile == 'all' else Profile.split(',') if isinstance(Profile, str) else list(Profile)
+    for Group in Groups:
+        if Group not in ProfileGroups:
+            raise ValueError('Unknown profile group '+str(Group)+', it must be one of '+', '.join(ProfileGroups)+' or all')
+    if Profiler not in ['cprofile', 'sampling']:
+        raise ValueError('Unknown profiler '+str(Profiler)+', it must be cprofile or sampling')
+    return {Group: cProfile.Profile() if Profiler == 'cprofile' else SamplingProfiler() for Group in Groups}
+
+
+def FoldedStacks(Stats, MinFraction=1e-3):
+    # collapsed stacks in microseconds rebuilt from the caller-callee times of cProfile
+    # the time of a function called from several stacks is shared out in proportion to the cumulative time of each call edge
+    Callees = defaultdict(dict)
+    for Function,(cc,nc,tt,ct,Callers) in Stats.stats.items():
+        for Caller,Edge in Callers.items():
+            Callees[Caller][Function] = Edge[3]
+    MinTime = MinFraction * Stats.total_tt
+    Stacks  = Counter()
+
+    def FunctionName(Function):
+        return Function[2]+' ('+os.path.basename(Function[0])+':'+str(Function[1])+')'
+
+    def Expand(Function, Stack, Time):
+        Stack = Stack + [FunctionName(Function)]
+        Share = Time / Stats.stats[Function][3] if Stats.stats[Function][3] else 0.0
+        Stacks[';'.join(Stack)] += round(1e6 * Share * Stats.stats[Function][2])
+        for Callee,CalleeTime in Callees[Function].items():
+            if Share * CalleeTime >= MinTime and FunctionName(Callee) not in Stack:
+                Expand(Callee, Stack, Share * CalleeTime)
+
+    for Function,(cc,nc,tt,ct,Callers) in Stats.stats.items():
+        if not Callers and ct >= MinTime:
+            Expand(Function, [], ct)
+    return Stacks
+
+
+def ProfileToFile(DirName, CaseName, mTEPES, Top=20):
+    # writing the cProfile statistics (.prof), the collapsed stacks for flame graphs (.folded), and the hot functions of every profiled group
+    _path = os.path.join(DirName, CaseName)
+    Summary = io.StringIO()
+    for Group,Profiler in getattr(mTEPES, 'pProfilers', {}).items():
+        FileName = _path+'/openTEPES_Profile_'+Group+'_'+CaseName
+        if isinstance(Profiler, cProfile.Profile):
+            Profiler.create_stats()
+            if not Profiler.stats:
+                continue
+            Profiler.dump_stats(FileName+'.prof')
+            Stacks = FoldedStacks(pstats.Stats(Profiler))
+            print('Profile of the '+Group+' phases', file=Summary)
+            pstats.Stats(Profiler, stream=Summary).strip_dirs().sort_stats('cumulative').print_stats(Top)
+        else:
+            Stacks = Profiler.Stacks
+            if not Stacks:
+                continue
+            # samples with the function at the top of the stack (own) or anywhere in it (total)
+            Own   = Counter()
+            Total = Counter()
+            for Stack,Samples in Stacks.items():
+                Functions = Stack.split(';')
+                Own[Functions[-1]] += Samples
+                for Function in set(Functions):
+                    Total[Function] += Samples
+            print('Profile of the '+Group+' phases, '+str(sum(Stacks.values()))+' samples every '+str(Profiler.Interval)+' s', file=Summary)
+            print(pd.DataFrame({'Own samples': Own, 'Total samples': Total}).fillna(0).astype(int).nlargest(Top, 'Own samples').to_string(), file=Summary)
+            print('', file=Summary)
+        with open(FileName+'.folded', 'w') as File:
+            File.writelines(Stack+' '+str(Count)+'\n' for Stack,Count in Stacks.items() if Count > 0)
+    if Summary.getvalue():
+        with open(_path+'/openTEPES_Profile_'+CaseName+'.txt', 'w') as File:
+            File.write(Summary.getvalue())
+        print(Summary.getvalue())
+
+
+class PhaseStats:
+    # context manager recording the wall and CPU time, the memory, and the variables and constraints built in a phase, and profiling it if its group is selected
+    # the phases are appended to mTEPES.pPhaseStats and the constraint families built in them to mTEPES.pFamilyStats
+    def __init__(self, mTEPES, Phase, p=None, sc=None, st=None):
+        self.mTEPES = mTEPES
+        self.Phase  = Phase
+        self.Stage  = {'Period': p, 'Scenario': sc, 'Stage': st}
+        # suffix of the constraints formulated by stage, removed to get the constraint family
+        self.Suffix = '_'+str(p)+'_'+str(sc)+'_'+str(st) if st is not None else None
+
+    def __enter__(self):
+        if not hasattr(self.mTEPES, 'pPhaseStats'):
+            self.mTEPES.pPhaseStats  = []
+            self.mTEPES.pFamilyStats = []
+        # position of the next component declared in the model, pyomo appends the components in order and leaves a hole in the place of the deleted ones
+        self.Components  = len(self.mTEPES._decl_order)
+        self.RSS         = psutil.Process().memory_info().rss
+        self.PeakRSS     = PeakMemory()
+        self.WallTime    = time.perf_counter()
+        self.CPUTime     = time.process_time()
+        # profiler of the group of the phase, if it is profiled
+        self.Profiler    = getattr(self.mTEPES, 'pProfilers', {}).get(ProfileGroup(self.Phase))
+        if self.Profiler is not None:
+            self.Profiler.enable()
+        return self
+
+    def __exit__(self, *Exception):
+        if self.Profiler is not None:
+            self.Profiler.disable()
+        WallTime = time.perf_counter()  - self.WallTime
+        CPUTime  = time.process_time()  - self.CPUTime
+        RSS      = psutil.Process().memory_info().rss
+        # only the components declared in the phase are visited, not the whole model
+        Added    = [Component for Component,Next in self.mTEPES._decl_order[self.Components:] if Component is not None]
+        Families = [c for c in Added if c.ctype is Constraint]
+        for c in Families:
+            Family = c.name[:-len(self.Suffix)] if self.Suffix and c.name.endswith(self.Suffix) else c.name
+            self.mTEPES.pFamilyStats.append({'Phase': self.Phase, **self.Stage, 'Family': Family, 'Constraints': len(c)})
+        self.mTEPES.pPhaseStats.append({'Phase': self.Phase, **self.Stage, 'Wall [s]': WallTime, 'CPU [s]': CPUTime, 'RSS [MB]': RSS / 2**20,
+                                        'RSS delta [MB]': (RSS - self.RSS) / 2**20, 'Peak RSS delta [MB]': PeakMemory() - self.PeakRSS,
+                                        'Variables': sum(len(v) for v in Added if v.ctype is Var), 'Constraints': sum(len(c) for c in Families)})
+        return False
+
+
+def PhaseStatsToFile(DirName, CaseName, mTEPES):
+    # writing the phase and constraint family statistics in CSV and JSON files next to the output results
+    _path = os.path.join(DirName, CaseName)
+    dfPhaseStats  = pd.DataFrame(getattr(mTEPES, 'pPhaseStats',  []))
+    dfFamilyStats = pd.DataFrame(getattr(mTEPES, 'pFamilyStats', []))
+    dfPhaseStats.to_csv (_path+'/oT_Result_PhaseStats_'           +CaseName+'.csv', index=False, sep=',')
+    dfFamilyStats.to_csv(_path+'/oT_Result_ConstraintFamilyStats_'+CaseName+'.csv', index=False, sep=',')
+    with open(_path+'/oT_Result_PhaseStats_'+CaseName+'.json', 'w') as File:
+        json.dump({'Phases': dfPhaseStats.to_dict(orient='records'), 'ConstraintFamilies': dfFamilyStats.to_dict(orient='records')}, File, indent=1, default=str)
+
+
+# rough memory taken by pyomo for every variable, constraint, and nonzero of the constraint matrix [bytes], only indicative as it depends on the versions of python and pyomo
+BytesPerVariable   = 1000
+BytesPerConstraint =  800
+BytesPerNonzero    =  150
+
+# families of the electric network, with a memory that can be avoided by solving the case as a single node
+NetworkFamilies = ['vLineCommit', 'vLineOnState', 'vLineOffState', 'vLineLosses', 'vFlow', 'vTheta', 'eLineStateCand', 'eSWOnOff', 'eMinSwOnState', 'eMinSwOffState',
+                   'eNetCapacity1', 'eNetCapacity2', 'eKirchhoff2ndLaw1', 'eKirchhoff2ndLaw2', 'eLineLosses1', 'eLineLosses2']
+
+
+def ModelSizeEstimate(mTEPES):
+    # number of variables, binaries, constraints and nonzeros by family without building the pyomo components
+    # the variables are counted on the index sets of SettingUpVariables, and the constraints on the load levels of every stage with the same conditions the rules of the formulations skip rows with
+    # the nonzeros are the rows times an approximate number of terms per row
+    G   = list(mTEPES.g )
+    NR  = list(mTEPES.nr)
+    ES  = list(mTEPES.es)
+    EC  = list(mTEPES.ec)
+    AR  = list(mTEPES.ar)
+    nP, nPSN, nG, nNR, nEH, nND, nAR, nLA, nLL = len(mTEPES.p), len(mTEPES.psn), len(G), len(NR), len(mTEPES.eh), len(mTEPES.nd), len(AR), len(mTEPES.la), len(mTEPES.ll)
+
+    # load levels of the stages and their order in the stage, as the set n redefined for every stage
+    Levels = pd.DataFrame(mTEPES.psn, columns=['p', 'sc', 'n'])
+    Levels['st'] = Levels['n'].map({n: st for st,n in mTEPES.s2n})
+    Levels = Levels.dropna(subset=['st'])
+    Index  = pd.MultiIndex.from_frame(Levels[['p', 'sc', 'n']])
+    Ord    = Levels.groupby(['p', 'sc', 'st']).cumcount().add(1).set_axis(Index)
+    nL     = len(Index)
+    nStages = len(mTEPES.ps) * len(mTEPES.stt)
+
+    def Values(Param, Elements):
+        # parameter indexed by period, scenario, load level and element as a frame of the load levels of the stages by element
+        Frame = pd.Series(Param.extract_values(), dtype='float64')
+        if Frame.empty:
+            return pd.DataFrame(0.0, index=Index, columns=Elements)
+        return Frame.unstack(fill_value=0.0).reindex(index=Index, columns=Elements, fill_value=0.0)
+
+    def Member(Tuples, Keys, Elements):
+        # elements of a list of tuples of the formulations (load level or period and scenario first) at every load level as a boolean frame
+        if not Tuples:
+            return pd.DataFrame(False, index=Index, columns=Elements)
+        Frame = pd.Series(True, index=pd.MultiIndex.from_tuples(Tuples)).unstack(fill_value=False)
+        Rows  = Index.droplevel([Level for Level in Index.names if Level not in Keys])
+        return Frame.reindex(index=Rows, columns=Elements, fill_value=False).fillna(False).astype(bool).set_axis(Index)
+
+    def Static(Param, Elements, Default=0.0):
+        # parameter indexed by element as a series
+        return pd.Series({e: Param[e] if e in Param else Default for e in Elements}, index=Elements, dtype='float64')
+
+    def Rows(Mask):
+        return int(Mask.values.sum())
+
+    # parameters of the units at the load levels of the stages
+    MaxPower          = Values(mTEPES.pMaxPower,          G)
+    MinPower          = Values(mTEPES.pMinPower,          G)
+    MaxPower2ndBlock  = Values(mTEPES.pMaxPower2ndBlock,  G)
+    MaxCharge         = Values(mTEPES.pMaxCharge,         G)
+    MaxCharge2ndBlock = Values(mTEPES.pMaxCharge2ndBlock, G)
+    ConstantVarCost   = Values(mTEPES.pConstantVarCost,   G)
+    EmissionVarCost   = Values(mTEPES.pEmissionVarCost,   G)
+    Area              = pd.DataFrame([[float((ar,g) in mTEPES.a2g) for g in G] for ar in AR], index=AR, columns=G)
+    # operating reserves of the areas of every unit
+    ReserveUp         = Values(mTEPES.pOperReserveUp, AR).dot(Area)
+    ReserveDw         = Values(mTEPES.pOperReserveDw, AR).dot(Area)
+    NoOperReserve     = Static(mTEPES.pIndOperReserve, G) == 0
+    NotMustRun        = Static(mTEPES.pMustRun,        G) == 0
+    NotESS            = pd.Series({g: g not in mTEPES.es for g in G}, index=G, dtype=bool)
+    Committed         = (MinPower.ne(0.0) | ConstantVarCost.ne(0.0)) & NotMustRun & NotESS
+
+    def Investment(Elements, IndBin, IndBinElement):
+        # investment decisions are binary unless they are relaxed by the option or by the element
+        return nP * sum(1 for e in Elements if IndBin != 0 and IndBinElement[e] == 1)
+
+    # commitment decisions are binary for the units with binary commitment, and integer for the clustered ones
+    nCommit    = sum(1 for nr in NR if mTEPES.pIndBinGenOperat() == 1 and mTEPES.pIndBinUnitCommit[nr] == 1)
+    nCommitBin = sum(1 for nr in NR if mTEPES.pIndBinGenOperat() == 1 and mTEPES.pIndBinUnitCommit[nr] == 1 and mTEPES.pUnitMultiplicity[nr] <= 1)
+    LineBin    = mTEPES.pIndBinSingleNode() == 1 or mTEPES.pIndBinLineCommit() == 1
+    nSwitch    = sum(1 for la in mTEPES.la if mTEPES.pIndBinLineSwitch[la] == 1)
+
+    # kind, family, rows, binaries, and approximate terms per row
+    Families = [
+        ('Variable',   'vTotalSCost',        1,                                                      0,                                                                                  0),
+        ('Variable',   'vTotalICost',        1,                                                      0,                                                                                  0),
+        ('Variable',   'vTotalFCost',        nP,                                                     0,                                                                                  0),
+        ('Variable',   'vTotalGCost',        nPSN,                                                   0,                                                                                  0),
+        ('Variable',   'vTotalCCost',        nPSN,                                                   0,                                                                                  0),
+        ('Variable',   'vTotalECost',        nPSN,                                                   0,                                                                                  0),
+        ('Variable',   'vTotalRCost',        nPSN,                                                   0,                                                                                  0),
+        ('Variable',   'vTotalECostArea',    len(mTEPES.psnar),                                      0,                                                                                  0),
+        ('Variable',   'vTotalOutput',       len(mTEPES.psng),                                       0,                                                                                  0),
+        ('Variable',   'vOutput2ndBlock',    len(mTEPES.psnnr),                                      0,                                                                                  0),
+        ('Variable',   'vReserveUp',         len(mTEPES.psnnr),                                      0,                                                                                  0),
+        ('Variable',   'vReserveDown',       len(mTEPES.psnnr),                                      0,                                                                                  0),
+        ('Variable',   'vEnergyInflows',     len(mTEPES.psnec),                                      0,                                                                                  0),
+        ('Variable',   'vEnergyOutflows',    len(mTEPES.psnes),                                      0,                                                                                  0),
+        ('Variable',   'vESSInventory',      len(mTEPES.psnes),                                      0,                                                                                  0),
+        ('Variable',   'vESSSpillage',       len(mTEPES.psnes),                                      0,                                                                                  0),
+        ('Variable',   'vESSTotalCharge',    len(mTEPES.psneh),                                      0,                                                                                  0),
+        ('Variable',   'vCharge2ndBlock',    len(mTEPES.psneh),                                      0,                                                                                  0),
+        ('Variable',   'vESSReserveUp',      len(mTEPES.psneh),                                      0,                                                                                  0),
+        ('Variable',   'vESSReserveDown',    len(mTEPES.psneh),                                      0,                                                                                  0),
+        ('Variable',   'vENS',               len(mTEPES.psnnd),                                      0,                                                                                  0),
+        ('Variable',   'vGenerationInvest',  len(mTEPES.pgc),                                        Investment(mTEPES.gc, mTEPES.pIndBinGenInvest(), mTEPES.pIndBinUnitInvest),       0),
+        ('Variable',   'vGenerationInvPer',  len(mTEPES.pgc),                                        len(mTEPES.pgc) if mTEPES.pIndBinGenInvest() != 0 else 0,                        0),
+        ('Variable',   'vGenerationRetire',  len(mTEPES.pgd),                                        Investment(mTEPES.gd, mTEPES.pIndBinGenRetire(), mTEPES.pIndBinUnitRetire),       0),
+        ('Variable',   'vGenerationRetPer',  len(mTEPES.pgd),                                        len(mTEPES.pgd) if mTEPES.pIndBinGenRetire() != 0 else 0,                        0),
+        ('Variable',   'vNetworkInvest',     len(mTEPES.plc),                                        Investment(mTEPES.lc, mTEPES.pIndBinNetInvest(), mTEPES.pIndBinLineInvest),       0),
+        ('Variable',   'vNetworkInvPer',     len(mTEPES.plc),                                        len(mTEPES.plc) if mTEPES.pIndBinNetInvest() != 0 else 0,                        0),
+        ('Variable',   'vCommitment',        len(mTEPES.psnnr),                                      len(mTEPES.psn) * nCommitBin,                                                     0),
+        ('Variable',   'vStartUp',           len(mTEPES.psnnr),                                      len(mTEPES.psn) * nCommitBin,                                                     0),
+        ('Variable',   'vShutDown',          len(mTEPES.psnnr),                                      len(mTEPES.psn) * nCommitBin,                                                     0),
+        ('Variable',   'vMaxCommitment',     len(mTEPES.psnr),                                       len(mTEPES.ps)  * nCommit,                                                        0),
+        ('Variable',   'vLineCommit',        len(mTEPES.psnla),                                      len(mTEPES.psnla) if LineBin else 0,                                              0),
+        ('Variable',   'vLineOnState',       len(mTEPES.psnla) if nSwitch else 0,                    len(mTEPES.psnla) if nSwitch and LineBin else 0,                                  0),
+        ('Variable',   'vLineOffState',      len(mTEPES.psnla) if nSwitch else 0,                    len(mTEPES.psnla) if nSwitch and LineBin else 0,                                  0),
+        ('Variable',   'vLineLosses',        len(mTEPES.psnll),                                      0,                                                                                  0),
+        ('Variable',   'vFlow',              len(mTEPES.psnla),                                      0,                                                                                  0),
+        ('Variable',   'vTheta',             len(mTEPES.psnnd),                                      0,                                                                                  0),
+        ]
+    if mTEPES.pIndHydroTopology == 1:
+        Families += [
+        ('Variable',   'vHydroInflows',      len(mTEPES.psnrc),                                      0,                                                                                  0),
+        ('Variable',   'vHydroOutflows',     len(mTEPES.psnrs),                                      0,                                                                                  0),
+        ('Variable',   'vReservoirVolume',   len(mTEPES.psnrs),                                      0,                                                                                  0),
+        ('Variable',   'vReservoirSpillage', len(mTEPES.psnrs),                                      0,                                                                                  0),
+        ('Variable',   'vReservoirInvest',   len(mTEPES.prc),                                        Investment(mTEPES.rn, mTEPES.pIndBinRsrInvest(), mTEPES.pIndBinRsrvInvest),       0),
+        ('Variable',   'vReservoirInvPer',   len(mTEPES.prc),                                        len(mTEPES.prc) if mTEPES.pIndBinRsrInvest() != 0 else 0,                        0),
+        ]
+    if mTEPES.pIndHydrogen == 1:
+        Families += [
+        ('Variable',   'vHNS',               len(mTEPES.psnnd),                                      0,                                                                                  0),
+        ('Variable',   'vPipelineInvest',    len(mTEPES.ppc),                                        Investment(mTEPES.pc, mTEPES.pIndBinNetH2Invest(), mTEPES.pIndBinPipeInvest),      0),
+        ('Variable',   'vPipelineInvPer',    len(mTEPES.ppc),                                        len(mTEPES.ppc) if mTEPES.pIndBinNetH2Invest() != 0 else 0,                      0),
+        ('Variable',   'vFlowH2',            len(mTEPES.psnpa),                                      0,                                                                                  0),
+        ]
+
+    # constraints of the objective function and of the investment decisions declared once
+    GC, GD = list(mTEPES.gc), list(mTEPES.gd)
+    nInvest = len(GC) + len(GD) + len(mTEPES.lc) + len(mTEPES.rn) + len(mTEPES.pc)
+    # constraints of the areas declared in every stage for all the periods
+    Candidates = mTEPES.gc or mTEPES.gd
+    nAdequacy  = sum(1 for p,ar in mTEPES.p*mTEPES.ar if mTEPES.pReserveMargin[p,ar] and sum(1 for g in G if (ar,g) in mTEPES.a2g) and
+                     (mTEPES.pDemandScale.mutable or sum(mTEPES.pRatedMaxPower[g] * mTEPES.pAvailability[g]() / (1.0-mTEPES.pEFOR[g]) for g in G if (ar,g) in mTEPES.a2g and g not in Candidates) <= mTEPES.pPeakDemand[p,ar] * mTEPES.pReserveMargin[p,ar]))
+    EmissionArea = EmissionVarCost[NR].dot(Area[NR].T).groupby([Levels['sc'].values, Levels['st'].values, Levels['p'].values]).sum()
+    EmissionArea = EmissionArea.ne(0.0) & pd.DataFrame({ar: [mTEPES.pEmission[p,ar] < math.inf for sc,st,p in EmissionArea.index] for ar in AR}, index=EmissionArea.index)
+    EmissionArea = EmissionArea.groupby(level=[0, 1]).sum().sum(axis=1)
+    nEmission    = sum(EmissionArea.get((sc,st), 0) for p,sc,st in mTEPES.ps*mTEPES.stt)
+
+    # nodes with units or lines, and mutually exclusive units
+    Connected  = {nd for nd,g in mTEPES.n2g} | {ni for ni,nf,cc in mTEPES.la} | {nf for ni,nf,cc in mTEPES.la}
+    Exclusive  = defaultdict(set)
+    for g,gg in mTEPES.g2g:
+        Exclusive[g ].add(gg)
+        Exclusive[gg].add(g )
+    Excluded   = {g for gg,g in mTEPES.g2g if gg in mTEPES.g}
+
+    # ESS with cycles, outflows and investment linked to the generation
+    CycleESS   = Member(mTEPES.nesc, ['n'],       ES)
+    CycleCand  = Member(mTEPES.necc, ['n'],       EC)
+    Outflows   = Member(mTEPES.eo,   ['p', 'sc'], ES)
+    StorInvest = Static(mTEPES.pIndBinStorInvest, EC).ne(0.0)
+    MaxStorage = Values(mTEPES.pMaxStorage,    ES)
+    MinStorage = Values(mTEPES.pMinStorage,    ES)
+    Inflows    = Values(mTEPES.pEnergyInflows, ES)
+    StorageCap = (MaxCharge[EC] + MaxPower[EC]).ne(0.0) & CycleCand & StorInvest
+
+    # thermal units with minimum up and down times at the load levels of the stages after them
+    T          = list(mTEPES.t)
+    UpTime     = Static(mTEPES.pUpTime, T)
+    DwTime     = Static(mTEPES.pDwTime, T)
+    MinTime    = Committed[T] if mTEPES.pIndBinGenMinTime() == 1 else pd.DataFrame(False, index=Index, columns=T)
+    UpTimeRows = MinTime & pd.DataFrame({t: Ord.values >= UpTime[t] for t in T}, index=Index, columns=T) & (UpTime > 1)
+    DwTimeRows = MinTime & pd.DataFrame({t: Ord.values >= DwTime[t] for t in T}, index=Index, columns=T) & (DwTime > 1)
+    RampUp     = Static(mTEPES.pRampUp, G)
+    RampDw     = Static(mTEPES.pRampDw, G)
+    Ramps      = mTEPES.pIndBinGenRamps() == 1
+
+    # lines switched, and lines installed in every period
+    Network    = mTEPES.pIndBinSingleNode() == 0
+    LevelsByP  = Levels['p'].value_counts()
+    def Kirchhoff(Lines):
+        return sum(LevelsByP.get(p, 0) * sum(1 for ni,nf,cc in Lines if mTEPES.pPeriodIniNet[ni,nf,cc] <= p and mTEPES.pPeriodFinNet[ni,nf,cc] >= p and mTEPES.pLineX[ni,nf,cc] > 0.0) for p in mTEPES.p)
+
+    Families += [
+        ('Constraint', 'eTotalTCost',             1,                                                                                                      0, 1 + 4*nPSN),
+        ('Constraint', 'eTotalICost',             1 if len(GC) + len(GD) + len(mTEPES.lc) else 0,                                                         0, 1 + nP),
+        ('Constraint', 'eTotalFCost',             nP if nInvest else 0,                                                                                   0, 1 + nInvest),
+        ('Constraint', 'eConsecutiveGenInvest',   (nP-1) * len(GC),                                                                                       0, 3),
+        ('Constraint', 'eConsecutiveGenRetire',   (nP-1) * len(GD),                                                                                       0, 3),
+        ('Constraint', 'eConsecutiveRsrInvest',   (nP-1) * len(mTEPES.rn),                                                                                0, 3),
+        ('Constraint', 'eConsecutiveNetInvest',   (nP-1) * len(mTEPES.lc),                                                                                0, 3),
+        ('Constraint', 'eConsecutiveNet2Invest',  (nP-1) * len(mTEPES.pc),                                                                                0, 3),
+        ('Constraint', 'eTotalGCost',             nL,                                                                                                     0, 1 + nG + 4*nNR + 3*nEH),
+        ('Constraint', 'eTotalCCost',             nL,                                                                                                     0, 1 + nEH),
+        ('Constraint', 'eTotalECost',             Rows(EmissionVarCost[NR].sum(axis=1).ne(0.0)),                                                          0, 1 + nNR),
+        ('Constraint', 'eTotalECostArea',         Rows(EmissionVarCost[NR].dot(Area[NR].T).ne(0.0)),                                                      0, 1 + nNR / max(nAR, 1)),
+        ('Constraint', 'eTotalRCost',             nL,                                                                                                     0, 1 + nND),
+        ('Constraint', 'eInstalGenComm',          Rows(Committed[[gc for gc in GC if gc in mTEPES.nr]]),                                                  0, 2),
+        ('Constraint', 'eInstalESSComm',          nL * int(StorInvest.sum()),                                                                             0, 2),
+        ('Constraint', 'eInstalGenCap',           Rows(MaxPower[GC].ne(0.0)),                                                                             0, 2),
+        ('Constraint', 'eInstalConESS',           Rows(MaxCharge[EC].ne(0.0)),                                                                            0, 2),
+        ('Constraint', 'eUninstalGenComm',        Rows(Committed[[gd for gd in GD if gd in mTEPES.nr]]),                                                  0, 2),
+        ('Constraint', 'eUninstalGenCap',         Rows(MaxPower[GD].ne(0.0)),                                                                             0, 2),
+        ('Constraint', 'eAdequacyReserveMargin',  nStages * nAdequacy,                                                                                    0, 1 + nG / max(nAR, 1)),
+        ('Constraint', 'eMaxSystemEmission',      nEmission,                                                                                              0, nL / max(nStages, 1)),
+        ('Constraint', 'eSystemInertia',          Rows(Values(mTEPES.pSystemInertia, AR).ne(0.0) & Area[NR].sum(axis=1).gt(0.0)),                         0, 1 + nNR / max(nAR, 1)),
+        ('Constraint', 'eOperReserveUp',          Rows(Values(mTEPES.pOperReserveUp, AR).ne(0.0)),                                                        0, 1 + (nNR + nEH) / max(nAR, 1)),
+        ('Constraint', 'eOperReserveDw',          Rows(Values(mTEPES.pOperReserveDw, AR).ne(0.0)),                                                        0, 1 + (nNR + nEH) / max(nAR, 1)),
+        ('Constraint', 'eReserveMinRatioDwUp',    Rows(ReserveUp[NR].ne(0.0) & ReserveDw[NR].ne(0.0) & MaxPower2ndBlock[NR].ne(0.0) & NoOperReserve[NR]) if mTEPES.pMinRatioDwUp       else 0, 0, 2),
+        ('Constraint', 'eReserveMaxRatioDwUp',    Rows(ReserveUp[NR].ne(0.0) & ReserveDw[NR].ne(0.0) & MaxPower2ndBlock[NR].ne(0.0) & NoOperReserve[NR]) if mTEPES.pMaxRatioDwUp < 1.0 else 0, 0, 2),
+        ('Constraint', 'eRsrvMinRatioDwUpESS',    Rows(ReserveUp[ES].ne(0.0) & ReserveDw[ES].ne(0.0) & MaxPower2ndBlock[ES].ne(0.0) & NoOperReserve[ES]) if mTEPES.pMinRatioDwUp > 0.0 else 0, 0, 2),
+        ('Constraint', 'eRsrvMaxRatioDwUpESS',    Rows(ReserveUp[ES].ne(0.0) & ReserveDw[ES].ne(0.0) & MaxPower2ndBlock[ES].ne(0.0) & NoOperReserve[ES]) if mTEPES.pMaxRatioDwUp < 1.0 else 0, 0, 2),
+        ('Constraint', 'eReserveUpIfEnergy',      Rows(CycleESS & NoOperReserve[ES] & ReserveUp[ES].ne(0.0) & MaxPower2ndBlock [ES].ne(0.0)),             0, 3),
+        ('Constraint', 'eReserveDwIfEnergy',      Rows(CycleESS & NoOperReserve[ES] & ReserveDw[ES].ne(0.0) & MaxPower2ndBlock [ES].ne(0.0)),             0, 3),
+        ('Constraint', 'eESSReserveUpIfEnergy',   Rows(CycleESS & NoOperReserve[ES] & ReserveUp[ES].ne(0.0) & MaxCharge2ndBlock[ES].ne(0.0)),             0, 3),
+        ('Constraint', 'eESSReserveDwIfEnergy',   Rows(CycleESS & NoOperReserve[ES] & ReserveDw[ES].ne(0.0) & MaxCharge2ndBlock[ES].ne(0.0)),             0, 3),
+        ('Constraint', 'eBalance',                nL * sum(1 for nd in mTEPES.nd if nd in Connected),                                                     0, 2 + (nG + nEH + 2*nLA + 2*nLL) / max(nND, 1)),
+        ('Constraint', 'eMaxInventory2Comm',      Rows(StorageCap & MaxStorage[EC].ne(0.0)),                                                              0, 2),
+        ('Constraint', 'eMinInventory2Comm',      Rows(StorageCap & MinStorage[EC].ne(0.0)),                                                              0, 2),
+        ('Constraint', 'eInflows2Comm',           Rows(StorageCap & Inflows   [EC].ne(0.0)),                                                              0, 2),
+        ('Constraint', 'eESSInventory',           Rows(CycleESS & (MaxCharge[ES] + MaxPower[ES]).ne(0.0)),                                                0, 6),
+        ('Constraint', 'eMaxShiftTime',           nL * sum(1 for es in ES if mTEPES.pShiftTime[es]),                                                      0, 1 + max([mTEPES.pShiftTime[es] for es in ES], default=0)),
+        ('Constraint', 'eMaxCharge',              Rows(ReserveDw[ES].ne(0.0) & MaxCharge[ES].ne(0.0) & NoOperReserve[ES]),                                0, 3),
+        ('Constraint', 'eMinCharge',              Rows(ReserveUp[ES].ne(0.0) & MaxCharge[ES].ne(0.0) & NoOperReserve[ES]),                                0, 3),
+        ('Constraint', 'eChargeDischarge',        Rows(MaxPower2ndBlock[ES].ne(0.0) & MaxCharge2ndBlock[ES].ne(0.0)),                                     0, 4),
+        ('Constraint', 'eESSTotalCharge',         Rows(MaxCharge[ES].ne(0.0) & MaxCharge2ndBlock[ES].ne(0.0)),                                            0, 3),
+        ('Constraint', 'eChargeOutflows',         Rows(Outflows),                                                                                         0, 3),
+        ('Constraint', 'eEnergyOutflows',         Rows(Outflows & Member(mTEPES.neso, ['n'], ES)),                                                        0, 1 + nL / max(len(mTEPES.neso), 1)),
+        ('Constraint', 'eMinimumEnergy',          Rows(Member(mTEPES.gm, ['p', 'sc'], G) & Member(mTEPES.ngen, ['n'], G)),                                0, 1 + nL / max(len(mTEPES.ngen), 1)),
+        ('Constraint', 'eMaximumEnergy',          Rows(Member(mTEPES.gM, ['p', 'sc'], G) & Member(mTEPES.ngen, ['n'], G)),                                0, 1 + nL / max(len(mTEPES.ngen), 1)),
+        ]
+    if mTEPES.pIndHydroTopology == 1:
+        H, RS, RN = list(mTEPES.h), list(mTEPES.rs), list(mTEPES.rn)
+        # turbines of the candidate reservoirs, and hydro units pumping from or to a reservoir
+        Turbines   = pd.DataFrame([[float((rc,h) in mTEPES.r2h) for rc in RN] for h in H], index=H, columns=RN)
+        Turbined   = (MaxCharge[H] + MaxPower[H]).dot(Turbines).ne(0.0) & Member(mTEPES.nrcc, ['n'], RN) & Static(mTEPES.pIndBinRsrvInvest, RN).ne(0.0)
+        PumpedTo   = pd.Series({h: sum(1 for rs in RS if (h,rs) in mTEPES.p2r) > 0 for h in H}, index=H, dtype=bool)
+        PumpedFrom = pd.Series({h: sum(1 for rs in RS if (rs,h) in mTEPES.r2p) > 0 for h in H}, index=H, dtype=bool)
+        Linked     = pd.Series({rs: sum(1 for h in H if (rs,h) in mTEPES.r2h or (h,rs) in mTEPES.h2r or (rs,h) in mTEPES.r2p or (h,rs) in mTEPES.p2r) > 0 for rs in RS}, index=RS, dtype=bool)
+        Turbine    = Member(mTEPES.nhc, ['n'], H) & NoOperReserve[H]
+        Families += [
+        ('Constraint', 'eMaxVolume2Comm',         Rows(Turbined & Values(mTEPES.pMaxVolume, RN).ne(0.0)),                                                 0, 2),
+        ('Constraint', 'eMinVolume2Comm',         Rows(Turbined & Values(mTEPES.pMinVolume, RN).ne(0.0)),                                                 0, 2),
+        ('Constraint', 'eTrbReserveUpIfEnergy',   Rows(Turbine & ReserveUp[H].ne(0.0) & MaxPower2ndBlock[H].ne(0.0)),                                     0, 3),
+        ('Constraint', 'eTrbReserveDwIfEnergy',   Rows(Turbine & ReserveDw[H].ne(0.0) & MaxPower2ndBlock[H].ne(0.0)),                                     0, 3),
+        ('Constraint', 'ePmpReserveUpIfEnergy',   Rows(Member(mTEPES.np2c, ['n'], H) & NoOperReserve[H] & PumpedTo   & ReserveUp[H].ne(0.0) & MaxCharge2ndBlock[H].ne(0.0)), 0, 3),
+        ('Constraint', 'ePmpReserveDwIfEnergy',   Rows(Member(mTEPES.npc,  ['n'], H) & NoOperReserve[H] & PumpedFrom & ReserveDw[H].ne(0.0) & MaxCharge2ndBlock[H].ne(0.0)), 0, 3),
+        ('Constraint', 'eHydroInventory',         Rows(Member(mTEPES.nrsc, ['n'], RS) & Linked),                                                          0, 4 + len(H) / max(len(RS), 1)),
+        ('Constraint', 'eHydroOutflows',          Rows(Member(mTEPES.nrso, ['n'], RS) & Member(mTEPES.ro, ['p', 'sc'], RS)),                              0, 1 + nL / max(len(mTEPES.nrso), 1)),
+        ]
+    if mTEPES.pIndHydrogen == 1:
+        ConnectedH2 = {nd for nd,el in mTEPES.n2g if el in mTEPES.el} | {ni for ni,nf,cc in mTEPES.pa} | {nf for ni,nf,cc in mTEPES.pa}
+        Families += [
+        ('Constraint', 'eBalanceH2',              nL * sum(1 for nd in mTEPES.nd if nd in ConnectedH2),                                                   0, 2 + (len(mTEPES.el) + 2*len(mTEPES.pa)) / max(nND, 1)),
+        ]
+
+    Families += [
+        ('Constraint', 'eMaxOutput2ndBlock',      Rows(ReserveUp[NR].ne(0.0) & MaxPower2ndBlock[NR].ne(0.0)),                                             0, 3),
+        ('Constraint', 'eMinOutput2ndBlock',      Rows(ReserveDw[NR].ne(0.0) & MaxPower2ndBlock[NR].ne(0.0)),                                             0, 3),
+        ('Constraint', 'eTotalOutput',            Rows(MaxPower[NR].ne(0.0)),                                                                             0, 3),
+        ('Constraint', 'eUCStrShut',              Rows(Committed[NR]),                                                                                    0, 4),
+        ('Constraint', 'eMaxCommitment',          nL * sum(1 for nr in NR if Exclusive[nr] & set(NR)) if len(mTEPES.g2g) else 0,                         0, 2),
+        ('Constraint', 'eMaxCommitGen',           Rows(MaxPower[[g for g in G if Exclusive[g] & set(G)]].ne(0.0)) if len(mTEPES.g2g) else 0,              0, 2),
+        ('Constraint', 'eExclusiveGens',          nL * sum(1 for g in G if g in Excluded) if len(mTEPES.g2g) else 0,                                      0, 2 + len(mTEPES.g2g) / max(len(Excluded), 1)),
+        ('Constraint', 'eRampUp',                 Rows(MaxPower2ndBlock[NR].gt(RampUp[NR]) & RampUp[NR].ne(0.0)) if Ramps else 0,                         0, 5),
+        ('Constraint', 'eRampDw',                 Rows(MaxPower2ndBlock[NR].gt(RampDw[NR]) & RampDw[NR].ne(0.0)) if Ramps else 0,                         0, 5),
+        ('Constraint', 'eRampUpChr',              Rows(MaxCharge2ndBlock[ES].ne(0.0) & RampUp[ES].ne(0.0)) if Ramps else 0,                               0, 4),
+        ('Constraint', 'eRampDwChr',              Rows(MaxCharge        [ES].ne(0.0) & RampDw[ES].ne(0.0)) if Ramps else 0,                               0, 4),
+        ('Constraint', 'eMinUpTime',              Rows(UpTimeRows),                                                                                       0, 2 + UpTime.mean() if len(T) else 0),
+        ('Constraint', 'eMinDownTime',            Rows(DwTimeRows),                                                                                       0, 2 + DwTime.mean() if len(T) else 0),
+        ('Constraint', 'eLineStateCand',          nL * len(mTEPES.lc) if Network else 0,                                                                  0, 2),
+        ('Constraint', 'eSWOnOff',                nL * sum(1 for la in mTEPES.la if mTEPES.pIndBinLineSwitch[la] == 1 and (mTEPES.pSwOnTime[la] > 1 or mTEPES.pSwOffTime[la] > 1)) if Network else 0, 0, 4),
+        ('Constraint', 'eMinSwOnState',           sum(int((Ord >= mTEPES.pSwOnTime [la]).sum()) for la in mTEPES.la if mTEPES.pIndBinLineSwitch[la] == 1 and mTEPES.pSwOnTime [la] > 1) if Network else 0, 0, 1 + max([mTEPES.pSwOnTime [la] for la in mTEPES.la], default=0)),
+        ('Constraint', 'eMinSwOffState',          sum(int((Ord >= mTEPES.pSwOffTime[la]).sum()) for la in mTEPES.la if mTEPES.pIndBinLineSwitch[la] == 1 and mTEPES.pSwOffTime[la] > 1) if Network else 0, 0, 1 + max([mTEPES.pSwOffTime[la] for la in mTEPES.la], default=0)),
+        ('Constraint', 'eNetCapacity1',           nL * sum(1 for la in mTEPES.la if la in mTEPES.lc or mTEPES.pIndBinLineSwitch[la] == 1) if Network else 0, 0, 3),
+        ('Constraint', 'eNetCapacity2',           nL * sum(1 for la in mTEPES.la if la in mTEPES.lc or mTEPES.pIndBinLineSwitch[la] == 1) if Network else 0, 0, 3),
+        ('Constraint', 'eKirchhoff2ndLaw1',       Kirchhoff(mTEPES.laa) if Network else 0,                                                                0, 4),
+        ('Constraint', 'eKirchhoff2ndLaw2',       Kirchhoff(mTEPES.lca) if Network else 0,                                                                0, 4),
+        ('Constraint', 'eLineLosses1',            nL * nLL if Network and mTEPES.pIndBinNetLosses() and nLL else 0,                                       0, 3),
+        ('Constraint', 'eLineLosses2',            nL * nLL if Network and mTEPES.pIndBinNetLosses() and nLL else 0,                                       0, 3),
+        ]
+    dfModelSize = pd.DataFrame(Families, columns=['Kind', 'Family', 'Rows', 'Binaries', 'Nonzeros'])
+    dfModelSize['Nonzeros'] = (dfModelSize['Rows'] * dfModelSize['Nonzeros']).round().astype('int')
+    dfModelSize['Memory [MB]'] = (dfModelSize['Rows'] * dfModelSize['Kind'].map({'Variable': BytesPerVariable, 'Constraint': BytesPerConstraint}) + dfModelSize['Nonzeros'] * BytesPerNonzero) / 2**20
+    return dfModelSize[dfModelSize['Rows'] > 0].reset_index(drop=True)
+
+
+def ModelSizeCheck(DirName, CaseName, mTEPES, MemoryBudget=None, DryRun=False):
+    # model size estimated after reading the input data and its memory compared with the budget [GB], the available memory of the machine if it is not given
+    # the run is stopped if the estimate exceeds a budget given explicitly, otherwise a warning is printed together with some reductions of the size of the model
+    # the estimate is written only in a dry run or if a budget is given
+    _path = os.path.join(DirName, CaseName)
+    dfModelSize = ModelSizeEstimate(mTEPES)
+    if DryRun or MemoryBudget is not None:
+        dfModelSize.to_csv(_path+'/oT_Result_ModelSize_'+CaseName+'.csv', index=False, sep=',')
+
+    Memory = psutil.Process().memory_info().rss / 2**20 + dfModelSize['Memory [MB]'].sum()
+    Budget = MemoryBudget * 2**10 if MemoryBudget is not None else psutil.virtual_memory().available / 2**20
+    print('Model size estimate                   ... ', dfModelSize.groupby('Kind')['Rows'].sum().to_dict(), 'binaries', dfModelSize['Binaries'].sum(), 'nonzeros', dfModelSize['Nonzeros'].sum())
+    print('Expected memory                       ... ', round(Memory), 'MB of a budget of', round(Budget), 'MB')
+    if DryRun:
+        print(dfModelSize.to_string(index=False, float_format='{:.1f}'.format))
+
+    if Memory > Budget:
+        Factor = Memory / Budget
+        Reductions = ['TimeStep of '+str(math.ceil(mTEPES.pTimeStep() * Factor))+' h instead of '+str(mTEPES.pTimeStep())+' h',
+                      'about '+str(int(len(mTEPES.n) / Factor))+' load levels instead of '+str(len(mTEPES.n))]
+        if len(mTEPES.sc) > 1:
+            Reductions.append('fewer than '+str(len(mTEPES.sc))+' scenarios')
+        Network = dfModelSize.loc[dfModelSize['Family'].isin(NetworkFamilies), 'Memory [MB]'].sum()
+        if mTEPES.pIndBinSingleNode() == 0 and Network > 0.5 * dfModelSize['Memory [MB]'].sum():
+            Reductions.append('IndBinSingleNode to solve it as a single node')
+        Message = 'The model is expected to take '+str(round(Memory))+' MB of a budget of '+str(round(Budget))+' MB, consider a '+', a '.join(Reductions)
+        if MemoryBudget is not None and not DryRun:
+            raise MemoryError(Message)
+        print('Warning: '+Message)
+
+    return dfModelSize
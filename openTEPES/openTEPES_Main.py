@@ -682,7 +682,7 @@
 import argparse
 import os
 # import pkg_resources
-from .openTEPES import openTEPES_run
+from .openTEPES import openTEPES_run, openTEPES_sweep, openTEPES_parametric
 
 print('\n #### Academic research license - for non-commercial use only #### \n')
 
@@ -692,6 +692,16 @@ parser.add_argument('--dir',    type=str, default=None)
 parser.add_argument('--solver', type=str, default=None)
 parser.add_argument('--log',    type=str, default=None)
 parser.add_argument('--result', type=str, default=None)
+parser.add_argument('--profile',  type=str, default=None, help='phases to profile: input, formulation, solve, output separated by commas, or all')
+parser.add_argument('--profiler', type=str, default='cprofile', choices=['cprofile', 'sampling'])
+parser.add_argument('--dry-run',       action='store_true', help='estimate the size and memory of the model after reading the input data without building it')
+parser.add_argument('--memory-budget', type=float, default=None, help='memory budget [GB], the run is stopped if the model is expected to exceed it')
+parser.add_argument('--checkpoint',    action='store_true', help='save the solution of every stage after solving it')
+parser.add_argument('--resume',        action='store_true', help='load the stages solved in a previous run with checkpoints and solve only the remaining ones')
+parser.add_argument('--sweep',         type=str, default=None, help='CSV or YAML file of parameter overrides of the variants of the case, solved without asking for the parameters')
+parser.add_argument('--workers',       type=int, default=None, help='variants of the sweep solved at the same time')
+parser.add_argument('--threads',       type=int, default=None, help='solver threads of each variant of the sweep')
+parser.add_argument('--parametric',    type=str, default=None, help='CSV file of points of ENSCost, CO2Cost, AnnualDiscountRate and DemandScale solved again with the same model')
 
 DIR    = os.path.dirname(__file__)
 CASE   = '9n'
@@ -702,6 +712,14 @@ LOG    = 'No'
 
 def main():
     args = parser.parse_args()
+    if args.sweep is not None:
+        openTEPES_sweep(args.dir or DIR, args.case or CASE, args.solver or SOLVER, args.sweep, Workers=args.workers, SolverThreads=args.threads)
+        print('End of the sweep              ************')
+        return
+    if args.parametric is not None:
+        openTEPES_parametric(args.dir or DIR, args.case or CASE, args.solver or SOLVER, args.parametric, args.result or RESULT, args.log or LOG)
+        print('End of the parametric re-solve ***********')
+        return
     if args.dir is None:
         args.dir    = input('Input Dir    Name (Default {}): '.format(DIR))
         if args.dir == '':
@@ -728,7 +746,7 @@ def main():
     import sys
     print(sys.argv)
     print(args)
-    openTEPES_run(args.dir, args.case, args.solver, args.result, args.log)
+    openTEPES_run(args.dir, args.case, args.solver, args.result, args.log, Profile=args.profile, Profiler=args.profiler, DryRun=args.dry_run, MemoryBudget=args.memory_budget, Checkpoint=args.checkpoint, Resume=args.resume)
     print('End of the run                ************')
     print('\n #### Academic research license - for non-commercial use only #### \n')
 
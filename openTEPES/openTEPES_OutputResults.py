@@ -5,13 +5,33 @@ Open Generation, Storage, and Transmission Operation and Expansion Planning Mode
 import time
 import os
 import math
+import shutil
+import psutil
+import sqlite3
+import threading
+import importlib
+import multiprocessing
 import pandas            as     pd
-import altair            as     alt
-import plotly.io         as     pio
-import plotly.graph_objs as     go
 from   collections       import defaultdict
-from   pyomo.environ     import Set
-from   colour            import Color
+from   functools         import cached_property
+from   concurrent.futures import ProcessPoolExecutor
+from   pyomo.environ     import Set, Var
+from   .openTEPES_Instrumentation import PhaseStats
+
+
+# Definition of the plotting modules imported at the first use
+class LazyModule:
+    # the plotting libraries take most of the import time of the package and are only needed when a plot is written
+    def __init__(self, Name):
+        self.Name = Name
+
+    def __getattr__(self, Attribute):
+        return getattr(importlib.import_module(self.Name), Attribute)
+
+
+alt    = LazyModule('altair')
+go     = LazyModule('plotly.graph_objs')
+colour = LazyModule('colour')
 
 
 # Definition of Pie plots
@@ -37,10 +57,31 @@ def PiePlots(period, scenario, df, Category, Value):
     return chart
 
 
+# Definition of the downsampling of the plot data to a maximum number of points, with the average of each bucket of load levels for stacked areas or its minimum and maximum for lines
+def PlotDownsampling(Results, Category, X, Y, OperationType, MaxPoints):
+    sX    = pd.unique(Results[X])
+    Width = math.ceil(len(sX) * max(Results[Category].nunique(), 1) / MaxPoints)
+    if OperationType != 'sum':
+        Width *= 2
+    if Width <= 1:
+        return Results
+    Results = Results.assign(Bucket=Results[X].map(dict(zip(sX, range(len(sX))))) // Width)
+    if OperationType == 'sum':
+        Results = Results.groupby([Category, 'Bucket'], sort=False).agg({X: 'first', Y: 'mean'}).reset_index()
+    else:
+        Results = Results.dropna(subset=[Y]).reset_index(drop=True)
+        Buckets = Results.groupby([Category, 'Bucket'], sort=False)[Y]
+        Results = Results.loc[sorted(set(Buckets.idxmin()) | set(Buckets.idxmax()))]
+
+    return Results.drop(columns='Bucket')
+
+
 # Definition of Area plots
-def AreaPlots(period, scenario, df, Category, X, Y, OperationType):
+def AreaPlots(period, scenario, df, Category, X, Y, OperationType, MaxPoints=4000):
     Results = df.loc[period,scenario,:,:]
     Results = Results.reset_index().rename(columns={'level_0': X, 'level_1': Category, 0: Y})
+    # Reduce the data embedded in the chart to the size budget
+    Results = PlotDownsampling(Results, Category, X, Y, OperationType, MaxPoints)
     # Change the format of the LoadLevel
     Results[X] = Results[X].str[:14]
     Results[X] = (Results[X]+'+01:00')
@@ -67,10 +108,12 @@ def AreaPlots(period, scenario, df, Category, X, Y, OperationType):
 
 
 # Definition of Line plots
-def LinePlots(period, scenario, df, Category, X, Y, OperationType):
+def LinePlots(period, scenario, df, Category, X, Y, OperationType, MaxPoints=4000):
     Results = df.loc[period,scenario,:,:].rename_axis(['level_0', 'level_1'], axis=0)
     Results.columns = [0]
     Results = Results.reset_index().rename(columns={'level_0': X, 'level_1': Category, 0: Y})
+    # Reduce the data embedded in the chart to the size budget
+    Results = PlotDownsampling(Results, Category, X, Y, OperationType, MaxPoints)
     # Change the format of the LoadLevel
     Results[X] = Results[X].str[:14]
     Results[X] = (Results[X]+'+01:00')
@@ -96,6 +139,505 @@ def LinePlots(period, scenario, df, Category, X, Y, OperationType):
     return plot
 
 
+# Definition of the disaggregation of clustered units into their identical units
+def ClusterDisaggregation(mTEPES, Upper, Lower=None):
+    # without lower values the results of a cluster are split evenly among its units (output, energy, reserves, emissions)
+    # with lower values the k-th unit of a cluster takes the part of the interval [Lower,Upper] between k and k+1 (commitment, startup, shutdown)
+    if len(mTEPES.c2g) == 0:
+        return Upper if Lower is None else Upper - Lower
+    c2g = pd.DataFrame(mTEPES.c2g, columns=['level_3', 'Unit'])
+    c2g['Order'] = c2g.groupby('level_3').cumcount()
+    Results = Upper.to_frame(name='Upper').reset_index()
+    Results['Lower'] = 0.0 if Lower is None else Lower.values
+    Results = Results.merge(c2g, on='level_3', how='left')
+    Results['Unit' ] = Results['Unit' ].fillna(Results['level_3'])
+    Results['Order'] = Results['Order'].fillna(0)
+    if Lower is None:
+        Results['Value'] = Results['Upper'] / Results['level_3'].map(lambda g: mTEPES.pUnitMultiplicity[g])
+    else:
+        Results['Value'] = (Results['Upper'] - Results['Order']).clip(0.0, 1.0) - (Results['Lower'] - Results['Order']).clip(0.0, 1.0)
+    Results = Results.set_index(['level_0', 'level_1', 'level_2', 'Unit'])['Value']
+    Results.index.names = [None]*4
+
+    return Results
+
+
+# Definition of the writing of a result series, with the column levels in columns (CSV) or in long format with compression (Parquet, Feather, database)
+def ResultsToFile(mTEPES, OutputToFile, Value, sRows, Columns, sRowNames, FileName, AggFunc='mean', FillValue=None):
+    OutputToFile = OutputToFile.to_frame(name=Value).reset_index()
+    if mTEPES.pIndResultFormat() in [0, 3]:
+        if isinstance(Columns, list):
+            OutputToFile.pivot_table(index=sRows, columns=Columns, values=Value, aggfunc=AggFunc, fill_value=FillValue).rename_axis(sRowNames, axis=0).rename_axis([None]*len(Columns), axis=1).reset_index().to_csv(FileName+'.csv', index=False, sep=',')
+        else:
+            OutputToFile.pivot_table(index=sRows, columns=Columns, values=Value, aggfunc=AggFunc, fill_value=FillValue).rename_axis(sRowNames, axis=0).rename_axis([None],                axis=1).to_csv(FileName+'.csv', sep=',')
+    if mTEPES.pIndResultFormat() in [1, 2, 3] or mTEPES.pIndResultDatabase() in [1, 2]:
+        # the wide pivot is skipped and the index levels are stored as categories
+        sColumnNames = Columns if isinstance(Columns, list) else ['Element']
+        sColumns     = Columns if isinstance(Columns, list) else [Columns]
+        OutputToFile = OutputToFile.groupby(sRows+sColumns, sort=False)[Value].agg(AggFunc).reset_index()
+        OutputToFile.columns = sRowNames + sColumnNames + [Value]
+        for Level in sRowNames + sColumnNames:
+            OutputToFile[Level] = OutputToFile[Level].astype('str').astype('category')
+        if mTEPES.pIndResultFormat() in [1, 3]:
+            OutputToFile.to_parquet(FileName+'.parquet', compression='zstd', index=False)
+        if mTEPES.pIndResultFormat() in [2, 3]:
+            OutputToFile.to_feather(FileName+'.feather', compression='lz4')
+        if mTEPES.pIndResultDatabase() in [1, 2]:
+            ResultsToDatabase(mTEPES, OutputToFile, sRowNames + sColumnNames, FileName)
+
+
+# lock to write the tables of the results database from concurrent result families
+DatabaseLock = threading.Lock()
+
+
+# Definition of the writing of a result in long format into a table of the results database (SQLite or DuckDB) with indexes on its keys
+def ResultsToDatabase(mTEPES, OutputToFile, sKeys, FileName):
+    _path, Table = os.path.split(FileName)
+    CaseName     = os.path.basename(_path)
+    Table        = Table[len('oT_Result_'):-len('_'+CaseName)]
+    with DatabaseLock:
+        Connection = DatabaseConnection(_path, CaseName, mTEPES.pIndResultDatabase())
+        if isinstance(Connection, sqlite3.Connection):
+            OutputToFile.to_sql(Table, Connection, if_exists='replace', index=False)
+        else:
+            Connection.register('OutputToFile', OutputToFile)
+            Connection.execute('CREATE OR REPLACE TABLE "'+Table+'" AS SELECT * FROM OutputToFile')
+            Connection.unregister('OutputToFile')
+        for Key in sKeys:
+            Connection.execute('CREATE INDEX IF NOT EXISTS "'+Table+'_'+Key+'" ON "'+Table+'" ("'+Key+'")')
+        Connection.commit()
+        Connection.close()
+
+
+# Definition of the connection to the results database, DuckDB if requested and available or SQLite otherwise
+def DatabaseConnection(_path, CaseName, pIndResultDatabase):
+    if pIndResultDatabase == 2:
+        try:
+            import duckdb
+            return duckdb.connect(_path+'/oT_Result_'+CaseName+'.duckdb')
+        except ImportError:
+            print('DuckDB not available, results written to a SQLite database')
+
+    return sqlite3.connect(_path+'/oT_Result_'+CaseName+'.db')
+
+
+# Definition of the reading of a table of the results database with the elements in columns, as in the CSV files, or the list of tables
+def DatabaseResults(DirName, CaseName, Table=None):
+    _path = os.path.join(DirName, CaseName)
+    Connection = DatabaseConnection(_path, CaseName, 2 if os.path.exists(_path+'/oT_Result_'+CaseName+'.duckdb') else 1)
+    if Table is None:
+        if isinstance(Connection, sqlite3.Connection):
+            OutputResults = pd.read_sql('SELECT name FROM sqlite_master WHERE type = \'table\' ORDER BY name', Connection)['name'].tolist()
+        else:
+            OutputResults = Connection.execute('SELECT table_name FROM information_schema.tables ORDER BY table_name').df()['table_name'].tolist()
+        Connection.close()
+        return OutputResults
+
+    if isinstance(Connection, sqlite3.Connection):
+        OutputResults = pd.read_sql('SELECT * FROM "'+Table+'"', Connection)
+    else:
+        OutputResults = Connection.execute('SELECT * FROM "'+Table+'"').df()
+    Connection.close()
+
+    # the period, scenario, and load level are in rows and the remaining keys (element, nodes, circuit, areas) in columns
+    Value    = OutputResults.columns[-1]
+    sRows    = [Key for Key in ['Period', 'Scenario', 'LoadLevel'] if Key in OutputResults.columns]
+    sColumns = [Key for Key in OutputResults.columns[:-1] if Key not in sRows]
+    OutputResults = OutputResults.pivot_table(index=sRows, columns=sColumns, values=Value).rename_axis([None]*len(sColumns), axis=1)
+
+    return OutputResults
+
+
+# Definition of the solution snapshot, the values of every variable are extracted once after solving the model
+def SolutionSnapshot(OptModel, mTEPES):
+    StartTime = time.time()
+    mTEPES.pSolution = {}
+    # the variables without elements are also included, so the output results never add them while they are written
+    for v in OptModel.component_objects(Var, active=True):
+        if v.is_indexed():
+            mTEPES.pSolution[str(v.name)] = pd.Series(data=[vd.value for vd in v.values()], index=pd.MultiIndex.from_tuples([idx if isinstance(idx, tuple) else (idx,) for idx in v.keys()]) if len(v) else None, dtype='float64')
+
+    SnapshotTime = time.time() - StartTime
+    print('Extracting the solution values         ... ', round(SnapshotTime), 's')
+
+
+# Definition of the solution values of a variable for a list of indices
+def SolutionValues(mTEPES, Name, sIndex):
+    if len(sIndex) == 0:
+        return pd.Series(0.0, index=range(len(sIndex)), dtype='float64').values
+    # variables not included in the snapshot (e.g., writers called without it) are extracted on demand
+    if not hasattr(mTEPES, 'pSolution'):
+        mTEPES.pSolution = {}
+    if Name not in mTEPES.pSolution:
+        v = getattr(mTEPES, Name)
+        mTEPES.pSolution[Name] = pd.Series(data=[vd.value for vd in v.values()], index=pd.MultiIndex.from_tuples([idx if isinstance(idx, tuple) else (idx,) for idx in v.keys()]), dtype='float64')
+
+    return mTEPES.pSolution[Name].reindex(pd.MultiIndex.from_tuples([idx if isinstance(idx, tuple) else (idx,) for idx in sIndex])).values
+
+
+# Definition of the aggregation index: integer codes of the node, area, and technology of each unit, of the area of each node, and of the areas of each line
+def AggregationIndex(mTEPES):
+    # computed once per model and shared by all the output results, each mapping is a pair (codes of the elements, labels of the codes)
+    if not hasattr(mTEPES, 'pAggregation'):
+        Node       = pd.Index(list(mTEPES.nd))
+        Area       = pd.Index(list(mTEPES.ar))
+        Technology = pd.Index(list(mTEPES.gt))
+        nd2ar      = pd.Series(data=Area.get_indexer([ar for nd,ar in mTEPES.ndar]), index=[nd for nd,ar in mTEPES.ndar], dtype='int64')
+        nd2ar      = nd2ar[~nd2ar.index.duplicated()]
+        sLA        = pd.MultiIndex.from_tuples(list(mTEPES.la)) if len(mTEPES.la) else pd.MultiIndex.from_arrays([[], [], []])
+        mTEPES.pAggregation = {
+            'g2nd' : (pd.Series(data=Node.get_indexer      ([nd for nd,g in mTEPES.n2g]), index=[g for nd,g in mTEPES.n2g], dtype='int64'), Node      ),
+            'g2ar' : (pd.Series(data=Area.get_indexer      ([ar for ar,g in mTEPES.a2g]), index=[g for ar,g in mTEPES.a2g], dtype='int64'), Area      ),
+            'g2gt' : (pd.Series(data=Technology.get_indexer([gt for gt,g in mTEPES.t2g]), index=[g for gt,g in mTEPES.t2g], dtype='int64'), Technology),
+            'nd2ar': (nd2ar,                                                                                                                   Area      ),
+            'la2ai': (pd.Series(data=nd2ar.reindex(sLA.get_level_values(0), fill_value=-1).values, index=sLA, dtype='int64'),                  Area      ),
+            'la2af': (pd.Series(data=nd2ar.reindex(sLA.get_level_values(1), fill_value=-1).values, index=sLA, dtype='int64'),                  Area      ),
+        }
+    return mTEPES.pAggregation
+
+
+def AggregationCodes(mTEPES, Map, Elements):
+    # codes of the elements they are mapped to (e.g., technology of each unit), -1 for the elements not mapped
+    return AggregationIndex(mTEPES)[Map][0].reindex(Elements, fill_value=-1).values
+
+
+def AggregationCategories(mTEPES, Map, Elements):
+    # elements they are mapped to as a categorical on the codes, missing for the elements not mapped
+    return pd.Categorical.from_codes(AggregationCodes(mTEPES, Map, Elements), AggregationIndex(mTEPES)[Map][1])
+
+
+def AggregationLabels(mTEPES, Map, Elements):
+    # labels of the elements they are mapped to, missing for the elements not mapped
+    return AggregationCategories(mTEPES, Map, Elements).astype('object')
+
+
+def AggregatedValues(mTEPES, Values, Level, Map):
+    # sum of the values replacing the index level by the element it is mapped to (e.g., unit by technology), with a single groupby over the codes
+    Keys        = [Values.index.get_level_values(Index) for Index in range(Values.index.nlevels)]
+    Keys[Level] = AggregationCategories(mTEPES, Map, Keys[Level])
+    Values      = Values.groupby(Keys, observed=True).sum()
+    Values.index = Values.index.set_levels(Values.index.levels[Level].astype('object'), level=Level)
+    return Values
+
+
+def NodeAreaIndex(mTEPES, sNodes):
+    # periods, scenarios, load levels, areas, and nodes of the given nodes, with the area of each node
+    sPSNND = [(p,sc,n,nd) for p,sc,n,nd in mTEPES.psnnd if nd in sNodes]
+    sArea  = AggregationLabels(mTEPES, 'nd2ar', [nd for p,sc,n,nd in sPSNND])
+    return pd.MultiIndex.from_tuples([(p,sc,n,ar,nd) for (p,sc,n,nd),ar in zip(sPSNND, sArea) if not pd.isna(ar)])
+
+
+def NodeValues(mTEPES, Values, Level, sPSNARND):
+    # values summed by the node of the index level (e.g., initial node of each line) for the periods, scenarios, load levels, areas, and nodes
+    if len(Values) == 0:
+        return pd.Series(data=0.0, index=sPSNARND)
+    Values = Values.groupby(level=[0,1,2,Level]).sum()
+    return pd.Series(data=Values.reindex(sPSNARND.droplevel(3), fill_value=0.0).values, index=sPSNARND)
+
+
+def NodeTechnologyValues(mTEPES, Values, sPSNARND, Technologies):
+    # values of the units summed by node and technology, a column per technology
+    if len(Values) == 0:
+        return pd.DataFrame(data=0.0, index=sPSNARND, columns=Technologies)
+    sUnit  = Values.index.get_level_values(3)
+    Values = Values.groupby([Values.index.get_level_values(0), Values.index.get_level_values(1), Values.index.get_level_values(2), AggregationCategories(mTEPES, 'g2nd', sUnit), AggregationCategories(mTEPES, 'g2gt', sUnit)], observed=True).sum()
+    Values.index = Values.index.set_levels([Values.index.levels[3].astype('object'), Values.index.levels[4].astype('object')], level=[3,4])
+    Values = Values.unstack(4).reindex(sPSNARND.droplevel(3)).reindex(columns=Technologies).fillna(0.0)
+    return pd.DataFrame(data=Values.values, index=sPSNARND, columns=Technologies)
+
+
+# families of results to be written, shared with the worker processes forked from the run, which inherit the solved model without copying it
+ResultsFamilies = []
+
+
+# Definition of the writing of an output result family, in the run or in a worker process, returning its writing time and its phase statistics
+def ResultsFamily(Index):
+    Family, Function, Args = ResultsFamilies[Index]
+    mTEPES          = Args[2]
+    nPhaseStats     = len(getattr(mTEPES, 'pPhaseStats', []))
+    FamilyStartTime = time.time()
+    with PhaseStats(mTEPES, Family+'Results'):
+        Function(*Args)
+    return Family, time.time() - FamilyStartTime, mTEPES.pPhaseStats[nPhaseStats:]
+
+
+# Definition of the writing of the output result families, concurrently or in sequence
+def ResultsScheduler(DirName, CaseName, mTEPES, Families):
+    global ResultsFamilies, DatabaseLock
+    StartTime = time.time()
+
+    # the solution snapshot, the aggregation of the elements, and the duals are filled before the families are written, so the families only read them
+    if not hasattr(mTEPES, 'pSolution'):
+        SolutionSnapshot(mTEPES, mTEPES)
+    if not hasattr(mTEPES, 'pDualValues'):
+        DualsConcatenation(mTEPES)
+    AggregationIndex(mTEPES)
+
+    # the families are pandas and pyomo code holding the GIL, so they are written by worker processes forked from the run, which read the model without pickling it
+    # a worker shares the memory of the run until it writes on it, and as the reference counts of the objects it reads are written, it may copy all the memory of the run,
+    # so the number of workers is bounded by the families, the cores, and the available memory divided by the memory of the run
+    # the profilers do not follow the worker processes, so the families are written one after the other when they are profiled, as where fork is not available (Windows)
+    if mTEPES.pIndParallelResults() == 1 and 'output' not in getattr(mTEPES, 'pProfilers', {}) and 'fork' in multiprocessing.get_all_start_methods():
+        nWorkers = max(1, min(len(Families), os.cpu_count() or 1, int(psutil.virtual_memory().available / psutil.Process().memory_info().rss)))
+    else:
+        nWorkers = 1
+
+    ResultsFamilies = Families
+    try:
+        if nWorkers == 1:
+            FamilyTime = [ResultsFamily(Index)[:2] for Index in range(len(Families))]
+        else:
+            # the tables of the results database are written by one worker at a time
+            Context      = multiprocessing.get_context('fork')
+            DatabaseLock = Context.Lock()
+            with ProcessPoolExecutor(max_workers=nWorkers, mp_context=Context) as Pool:
+                FamilyTime = []
+                for Family,Time,FamilyPhaseStats in Pool.map(ResultsFamily, range(len(Families))):
+                    FamilyTime.append((Family, Time))
+                    mTEPES.pPhaseStats.extend(FamilyPhaseStats)
+    finally:
+        ResultsFamilies, DatabaseLock = [], threading.Lock()
+
+    WritingTime = time.time() - StartTime
+    print('Writing output results                 ... ', round(WritingTime), 's with', nWorkers, 'workers')
+    for Family,Time in FamilyTime:
+        print('  '+f'{Family:<37}'+'... ', round(Time), 's')
+
+    return pd.Series(data=dict(FamilyTime), dtype='float64')
+
+
+# Definition of the dual variables of every constraint family concatenated over the stages, built once before the output results are read
+def DualsConcatenation(mTEPES):
+    mTEPES.pDualValues = {}
+    for Family,Stages in mTEPES.pDuals.items():
+        Duals = [Values for Values in Stages.values() if len(Values)]
+        mTEPES.pDualValues[Family] = pd.concat(Duals) if len(Duals) else pd.Series(dtype='float64')
+
+
+# Definition of the dual variables of a constraint family for a list of indices (period, scenario, stage, and constraint index)
+def DualValues(mTEPES, Family, sIndex):
+    if len(sIndex) == 0 or Family not in mTEPES.pDuals:
+        return pd.Series(0.0, index=range(len(sIndex)), dtype='float64').values
+    # results computed on demand, without the output results written by the run
+    if not hasattr(mTEPES, 'pDualValues'):
+        DualsConcatenation(mTEPES)
+    sIndex = pd.MultiIndex.from_tuples(sIndex)
+    Duals  = mTEPES.pDualValues[Family].reindex(sIndex)
+
+    # the indices of the constraints skipped in a stage solved are 0, the stages without duals (wrong stage or duals not obtained) are an error
+    Stages = [Stage for Stage in mTEPES.pDuals[Family] if Stage is not None]
+    if len(Stages):
+        sStage  = sIndex.droplevel(list(range(3, sIndex.nlevels)))
+        Missing = Duals.isna().values & ~sStage.isin(Stages)
+        if Missing.any():
+            raise ValueError('The duals of '+Family+' are not available for the stages '+', '.join(sorted({str(Stage) for Stage in sStage[Missing]})))
+
+    return Duals.fillna(0.0).values
+
+
+# Definition of the load levels of the network maps, evenly spaced along the horizon
+def MapLoadLevels(mTEPES):
+    nLoadLevels = max(1, min(mTEPES.pIndMapLoadLevels(), len(mTEPES.n)))
+    return [n for i,n in enumerate(mTEPES.n) if i % max(1, len(mTEPES.n)//nLoadLevels) == 0][:nLoadLevels]
+
+
+# Definition of the network maps, with the utilization and color of the lines computed as arrays and the lines grouped in one trace per color and width
+def NetworkMapPlot(mTEPES, FileName, Title, p, sc, Flow, Lines, Demand, Unit, OverloadColor):
+    # Flow and Demand have the load levels in rows and the corridors (initial and final node) or nodes in columns
+    # Lines has the corridors in rows and the NTC, number of circuits, and width in columns
+    DIR    = os.path.dirname(__file__)
+    Colors = ['rgb'+str(x.rgb) for x in colour.Color('lightgreen').range_to(colour.Color('darkred'), 11)]
+    Colors[10] = OverloadColor or Colors[10]
+
+    Lon  = pd.Series(data={nd: mTEPES.pNodeLon[nd] for nd in mTEPES.nd}, dtype='float64')
+    Lat  = pd.Series(data={nd: mTEPES.pNodeLat[nd] for nd in mTEPES.nd}, dtype='float64')
+    Zone = pd.Series(data={nd: zn for nd,zn in mTEPES.ndzn}, dtype='object').reindex(Lon.index).fillna('')
+    sNI  = Lines.index.get_level_values(0)
+    sNF  = Lines.index.get_level_values(1)
+
+    # utilization of the maximum of both directions and color class by tenths of the utilization, the last one for overloaded lines
+    Flow        = Flow.reindex(columns=Lines.index).fillna(0.0)
+    Utilization = Flow.div(Lines['NTCFrw']).where(Flow >= 0.0, -Flow.div(Lines['NTCBck'])).mul(100.0)
+    ColorClass  = (-(-Utilization // 10.0) - 1).clip(0, 10).astype('int')
+    sGroups     = [(k,w) for k in range(len(Colors)) for w in sorted(Lines['Width'].unique())]
+
+    def MapTraces(n):
+        # nodes
+        Traces = [go.Scattermapbox(lat=Lat, lon=Lon, mode='markers', marker=go.scattermapbox.Marker(size=150, sizeref=1.1, sizemode='area', color='LightSkyBlue',), hoverinfo='text',
+                                   text='<br>Node: '+pd.Series(data=Lon.index.astype(str), index=Lon.index)+'<br>[Lon, Lat]: ('+Lon.astype(str)+', '+Lat.astype(str)+')<br>Zone: '+Zone+'<br>Demand: '+Demand.loc[n].reindex(Lon.index).fillna(0.0).round(2).astype(str)+' '+Unit,)]
+        # lines of the same color and width, separated by None, in a single trace
+        for k,w in sGroups:
+            sLines = ((ColorClass.loc[n] == k) & (Lines['Width'] == w)).values
+            Segments = pd.DataFrame(data={'i': Lon.reindex(sNI[sLines]).values, 'f': Lon.reindex(sNF[sLines]).values, 'none': None})
+            lon = Segments.values.ravel().tolist()
+            Segments = pd.DataFrame(data={'i': Lat.reindex(sNI[sLines]).values, 'f': Lat.reindex(sNF[sLines]).values, 'none': None})
+            lat = Segments.values.ravel().tolist()
+            Traces.append(go.Scattermapbox(lon=lon, lat=lat, mode='lines', line=dict(width=w, color=Colors[k]), opacity=1, hoverinfo='skip',))
+        # colorbar and line information at the middle of the lines
+        Traces.append(go.Scattermapbox(lon=(Lon.reindex(sNI).values+Lon.reindex(sNF).values)*0.5, lat=(Lat.reindex(sNI).values+Lat.reindex(sNF).values)*0.5, mode='markers', opacity=0, hoverinfo='text',
+                                       marker=dict(size=20, color=Utilization.loc[n].values, showscale=True, colorbar={'title': 'Utilization [%]', 'titleside': 'top', 'thickness': 8, 'ticksuffix': '%'}, colorscale=[[0, 'lightgreen'], [1, 'darkred']], cmin=0, cmax=100,),
+                                       text='<br>Line: '+pd.Series(data=sNI.astype(str), index=Lines.index)+' → '+pd.Series(data=sNF.astype(str), index=Lines.index)+'<br># circuits: '+Lines['Circuits'].astype(str)+'<br>NTC Forward: '+Lines['NTCFrw'].round(2).astype(str)+'<br>NTC Backward: '+Lines['NTCBck'].round(2).astype(str)+
+                                            '<br>Flow: '+Flow.loc[n].round(2).astype(str)+' '+Unit+'<br>Utilization [%]: '+Utilization.loc[n].round(2).astype(str),))
+        return Traces
+
+    sLoadLevels = list(Flow.index)
+    fig = go.Figure(data=MapTraces(sLoadLevels[0]))
+
+    # slider over the load levels, with one frame per load level
+    if len(sLoadLevels) > 1:
+        fig.frames = [go.Frame(data=MapTraces(n), name=str(n)) for n in sLoadLevels]
+        fig.update_layout(sliders=[dict(active=0, currentvalue={'prefix': 'LoadLevel: '}, steps=[dict(method='animate', label=str(n), args=[[str(n)], {'mode': 'immediate', 'frame': {'duration': 0, 'redraw': True}}]) for n in sLoadLevels])])
+
+    # the offline maps use a style without tiles, which does not need network access nor token
+    if mTEPES.pIndMapOffline() == 1:
+        mapbox = dict(style='white-bg', bearing=0, center=dict(lat=(Lat.max()+Lat.min())*0.5, lon=(Lon.max()+Lon.min())*0.5), pitch=0, zoom=5)
+    else:
+        mapbox = dict(style='dark', accesstoken=open(DIR+'/openTEPES.mapbox_token').read(), bearing=0, center=dict(lat=(Lat.max()+Lat.min())*0.5, lon=(Lon.max()+Lon.min())*0.5), pitch=0, zoom=5)
+    fig.update_layout(title={'text': Title+'<br>Period: '+str(p)+'; Scenario: '+str(sc)+'; LoadLevel: '+str(sLoadLevels[0]) if len(sLoadLevels) == 1 else Title+'<br>Period: '+str(p)+'; Scenario: '+str(sc), 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top'},
+                      font=dict(size=14), hovermode='closest', geo=dict(projection_type='azimuthal equal area', showland=True,), mapbox=mapbox, showlegend=False,)
+
+    # Saving the figure
+    fig.write_html(FileName)
+
+
+# Definition of the results of a solved stage, appended in long format to the stage result files just after solving it
+def StageResults(DirName, CaseName, OptModel, mTEPES, p, sc, st):
+    _path = os.path.join(DirName, CaseName)
+    StartTime = time.time()
+
+    # values of the variables of the stage load levels, read directly because the later stages are not solved yet
+    OutputResults = {}
+    for Name,Value,Factor,v,sElements,sNames in [('Generation',  'MW',  1e3, OptModel.vTotalOutput,    mTEPES.g,  ['Unit'                           ]),
+                                                 ('Consumption', 'MW',  1e3, OptModel.vESSTotalCharge, mTEPES.eh, ['Unit'                           ]),
+                                                 ('Inventory',   'GWh', 1.0, OptModel.vESSInventory,   mTEPES.es, ['Unit'                           ]),
+                                                 ('NetworkFlow', 'MW',  1e3, OptModel.vFlow,           mTEPES.la, ['InitialNode', 'FinalNode', 'Circuit']),
+                                                 ('NetworkENS',  'MW',  1e3, OptModel.vENS,            mTEPES.nd, ['Node'                           ])]:
+        sIndex = [(p,sc)+idx for idx in mTEPES.n*sElements if (p,sc)+idx in v]
+        if len(sIndex):
+            OutputResults[Name] = pd.Series(data=[v[idx].value for idx in sIndex], index=pd.MultiIndex.from_tuples(sIndex, names=['Period', 'Scenario', 'LoadLevel']+sNames), dtype='float64').mul(Factor).rename(Value)
+    if 'eBalance' in mTEPES.pDuals and len(mTEPES.pDuals['eBalance'].get((p,sc,st), [])):
+        OutputToFile = mTEPES.pDuals['eBalance'][(p,sc,st)]
+        OutputToFile = OutputToFile * [1e3/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() for pp,scc,stt,n,nd in OutputToFile.index]
+        OutputToFile.index = pd.MultiIndex.from_tuples([(pp,scc,n,nd) for pp,scc,stt,n,nd in OutputToFile.index], names=['Period', 'Scenario', 'LoadLevel', 'Node'])
+        OutputResults['NetworkSRMC'] = OutputToFile.rename('EUR/MWh')
+
+    # the files are rewritten with the first stage and appended with the next ones, so the results of the solved stages survive an interruption
+    FirstStage = (p,sc,st) == next(iter(mTEPES.ps*mTEPES.stt))
+    for Name,OutputToFile in OutputResults.items():
+        FileName     = _path+'/oT_Result_Stage'+Name+'_'+CaseName
+        OutputToFile = OutputToFile.reset_index()
+        if mTEPES.pIndResultFormat() in [0, 3]:
+            OutputToFile.to_csv(FileName+'.csv', mode='w' if FirstStage else 'a', header=FirstStage or not os.path.exists(FileName+'.csv'), index=False, sep=',')
+        if mTEPES.pIndResultFormat() in [1, 2, 3]:
+            # one file per stage in a directory, which is read as a single dataset
+            if FirstStage and os.path.isdir(FileName):
+                shutil.rmtree(FileName)
+            os.makedirs(FileName, exist_ok=True)
+            if mTEPES.pIndResultFormat() in [1, 3]:
+                OutputToFile.to_parquet(FileName+'/'+str(p)+'_'+str(sc)+'_'+str(st)+'.parquet', compression='zstd', index=False)
+            if mTEPES.pIndResultFormat() in [2, 3]:
+                OutputToFile.to_feather(FileName+'/'+str(p)+'_'+str(sc)+'_'+str(st)+'.feather', compression='lz4')
+
+    WritingResultsTime = time.time() - StartTime
+    print('Writing                stage results   ... ', round(WritingResultsTime), 's')
+
+
+# Definition of the results of a solved case, computed from the solution values only when they are accessed and cached
+class Results:
+    # other attributes are taken from the model, so the object can be used as the model returned by previous versions
+    def __init__(self, DirName, CaseName, mTEPES):
+        self.DirName  = DirName
+        self.CaseName = CaseName
+        self.model    = mTEPES
+
+    def __getattr__(self, Name):
+        if Name == 'model':
+            raise AttributeError(Name)
+        return getattr(self.model, Name)
+
+    @cached_property
+    def costs(self):
+        # total system cost and cost components by period [MEUR]
+        mTEPES = self.model
+        OutputResults = {(p,'Generation Investment Cost'): mTEPES.pDiscountedWeight[p] * (SolutionValues(mTEPES, 'vGenerationInvest', [(p,gc) for gc in mTEPES.gc]) * [mTEPES.pGenInvestCost[gc] for gc in mTEPES.gc]).sum() for p in mTEPES.p}
+        OutputResults.update({(p,'Network Investment Cost'): mTEPES.pDiscountedWeight[p] * (SolutionValues(mTEPES, 'vNetworkInvest', [(p,)+lc for lc in mTEPES.lc]) * [mTEPES.pNetFixedCost[lc] for lc in mTEPES.lc]).sum() for p in mTEPES.p})
+        for Cost,Name in [('Generation Operation Cost', 'vTotalGCost'), ('Consumption Operation Cost', 'vTotalCCost'), ('Emission Cost', 'vTotalECost'), ('Reliability Cost', 'vTotalRCost')]:
+            OutputResults.update({(p,Cost): mTEPES.pDiscountedWeight[p] * (SolutionValues(mTEPES, Name, [(pp,sc,n) for pp,sc,n in mTEPES.psn if pp == p]) * [mTEPES.pScenProb[pp,sc]() for pp,sc,n in mTEPES.psn if pp == p]).sum() for p in mTEPES.p})
+        OutputResults = pd.Series(data=OutputResults, dtype='float64').rename_axis(['Period', 'Cost'], axis=0).rename('MEUR')
+        return OutputResults
+
+    @cached_property
+    def investments(self):
+        # generation investment decisions [p.u.]
+        mTEPES = self.model
+        return pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc), index=pd.MultiIndex.from_tuples(mTEPES.pgc, names=['Period', 'Unit']) if len(mTEPES.pgc) else None, dtype='float64', name='p.u.')
+
+    @cached_property
+    def network_investments(self):
+        # electric network investment decisions [p.u.]
+        mTEPES = self.model
+        return pd.Series(data=SolutionValues(mTEPES, 'vNetworkInvest', mTEPES.plc), index=pd.MultiIndex.from_tuples(mTEPES.plc, names=['Period', 'InitialNode', 'FinalNode', 'Circuit']) if len(mTEPES.plc) else None, dtype='float64', name='p.u.')
+
+    @cached_property
+    def generation(self):
+        # output of the units [MW]
+        mTEPES = self.model
+        return pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng)*1e3, index=pd.MultiIndex.from_tuples(mTEPES.psng, names=['Period', 'Scenario', 'LoadLevel', 'Unit']), dtype='float64', name='MW')
+
+    @cached_property
+    def marginal_prices(self):
+        # locational short-run marginal costs [EUR/MWh]
+        mTEPES   = self.model
+        sPSSTNND = [(p,sc,st,n,nd) for p,sc,st,n,nd in mTEPES.ps*mTEPES.s2n*mTEPES.nd]
+        OutputResults = pd.Series(data=DualValues(mTEPES, 'eBalance', sPSSTNND) * [1e3/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() for p,sc,st,n,nd in sPSSTNND], index=pd.MultiIndex.from_tuples([(p,sc,n,nd) for p,sc,st,n,nd in sPSSTNND], names=['Period', 'Scenario', 'LoadLevel', 'Node']), dtype='float64', name='EUR/MWh')
+        return OutputResults
+
+    @cached_property
+    def flows(self):
+        # electric flows of the lines [MW]
+        mTEPES = self.model
+        return pd.Series(data=SolutionValues(mTEPES, 'vFlow', mTEPES.psnla)*1e3, index=pd.MultiIndex.from_tuples(mTEPES.psnla, names=['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']) if len(mTEPES.psnla) else None, dtype='float64', name='MW')
+
+    @cached_property
+    def storage_levels(self):
+        # inventory of the ESS [GWh]
+        mTEPES = self.model
+        return pd.Series(data=SolutionValues(mTEPES, 'vESSInventory', mTEPES.psnes), index=pd.MultiIndex.from_tuples(mTEPES.psnes, names=['Period', 'Scenario', 'LoadLevel', 'Unit']) if len(mTEPES.psnes) else None, dtype='float64', name='GWh')
+
+    @cached_property
+    def ens(self):
+        # energy not served by node [MW]
+        mTEPES = self.model
+        return pd.Series(data=SolutionValues(mTEPES, 'vENS', mTEPES.psnnd)*1e3, index=pd.MultiIndex.from_tuples(mTEPES.psnnd, names=['Period', 'Scenario', 'LoadLevel', 'Node']), dtype='float64', name='MW')
+
+    @property
+    def phases(self):
+        # wall and CPU time [s], memory [MB], and variables and constraints built by phase
+        return pd.DataFrame(getattr(self.model, 'pPhaseStats', []))
+
+    @property
+    def constraint_families(self):
+        # constraints built by phase and constraint family
+        return pd.DataFrame(getattr(self.model, 'pFamilyStats', []))
+
+    def export(self, names=None, format='csv'):
+        # writing of the requested results in long format (csv, parquet, or feather), all of them by default
+        _path = os.path.join(self.DirName, self.CaseName)
+        if names is None:
+            names = ['costs', 'investments', 'network_investments', 'generation', 'marginal_prices', 'flows', 'storage_levels', 'ens']
+        for name in [names] if isinstance(names, str) else names:
+            OutputResults = getattr(self, name).reset_index()
+            FileName      = _path+'/oT_Result_'+''.join(Word.capitalize() for Word in name.split('_'))+'_'+self.CaseName
+            if   format == 'csv':
+                OutputResults.to_csv(FileName+'.csv', index=False, sep=',')
+            elif format == 'parquet':
+                OutputResults.to_parquet(FileName+'.parquet', compression='zstd', index=False)
+            elif format == 'feather':
+                OutputResults.to_feather(FileName+'.feather', compression='lz4')
+            else:
+                raise ValueError('Unknown result format '+str(format)+', it must be csv, parquet, or feather')
+
+
 def InvestmentResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutput, pIndPlotOutput):
     #%% outputting the investment decisions
     _path = os.path.join(DirName, CaseName)
@@ -103,40 +645,35 @@ def InvestmentResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutput,
 
     if len(mTEPES.gc):
 
-        # generators to area (g2a)
-        g2a = defaultdict(list)
-        for ar,gc in mTEPES.ar*mTEPES.gc:
-            if (ar,gc) in mTEPES.a2g:
-                g2a[ar].append(gc)
-
         # Saving generation investment into CSV file
-        OutputToFile = pd.Series(data=[OptModel.vGenerationInvest[p,gc]()                                                           for p,gc in mTEPES.pgc], index=pd.Index(mTEPES.pgc))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc), index=pd.Index(mTEPES.pgc))
         OutputToFile = OutputToFile.fillna(0).to_frame(name='InvestmentDecision').reset_index().rename(columns={'level_0': 'Period', 'level_1': 'Generating unit'})
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
             OutputToFile.pivot_table(index=['Period'], columns=['Generating unit'], values='InvestmentDecision').rename_axis(['Period'], axis=0).to_csv(_path+'/oT_Result_GenerationInvestmentPerUnit_'+CaseName+'.csv', index=True, sep=',')
         OutputToFile = OutputToFile.set_index(['Period', 'Generating unit'])
-        OutputToFile = pd.Series(data=[OptModel.vGenerationInvest[p,gc]()*max(mTEPES.pRatedMaxPower[gc],mTEPES.pRatedMaxCharge[gc]) for p,gc in mTEPES.pgc], index=pd.Index(mTEPES.pgc))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc) * [max(mTEPES.pRatedMaxPower[gc],mTEPES.pRatedMaxCharge[gc]) for p,gc in mTEPES.pgc], index=pd.Index(mTEPES.pgc))
         OutputToFile *= 1e3
         OutputToFile = OutputToFile.fillna(0).to_frame(name='MW'                ).reset_index().rename(columns={'level_0': 'Period', 'level_1': 'Generating unit'})
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
             OutputToFile.pivot_table(index=['Period'], columns=['Generating unit'], values='MW'                ).rename_axis(['Period'], axis=0).to_csv(_path+'/oT_Result_GenerationInvestment_'       +CaseName+'.csv', index=True, sep=',')
         OutputToFile = OutputToFile.set_index(['Period', 'Generating unit'])
 
-        if sum(1 for ar in mTEPES.ar if sum(1 for g in g2a[ar])) > 1:
+        if len(set(AggregationCodes(mTEPES, 'g2ar', list(mTEPES.gc))) - {-1}) > 1:
             if pIndPlotOutput == 1:
-                sPARGC           = [(p,ar,gc) for p,ar,gc in mTEPES.par*mTEPES.gc if (ar,gc) in mTEPES.a2g]
-                GenInvestToArea  = pd.Series(data=[OutputToFile['MW'][p,gc] for p,ar,gc in sPARGC], index=pd.Index(sPARGC)).to_frame(name='MW')
+                sUnit            = OutputToFile.index.get_level_values(1)
+                GenInvestToArea  = pd.Series(data=OutputToFile['MW'].values, index=pd.MultiIndex.from_arrays([OutputToFile.index.get_level_values(0), AggregationLabels(mTEPES, 'g2ar', sUnit), sUnit])).to_frame(name='MW')
+                GenInvestToArea  = GenInvestToArea[GenInvestToArea.index.get_level_values(1).notna()]
                 GenInvestToArea.index.names = ['Period', 'Area', 'Generating unit']
                 chart = alt.Chart(GenInvestToArea.reset_index()).mark_bar().encode(x='Generating unit:O', y='sum(MW):Q', color='Area:N', column='Period:N').properties(width=600, height=400)
                 chart.save(_path+'/oT_Plot_GenerationInvestmentPerArea_'+CaseName+'.html', embed_options={'renderer':'svg'})
-                TechInvestToArea = pd.Series(data=[sum(OutputToFile['MW'][p,gc] for gc in mTEPES.gc if (ar,gc) in mTEPES.a2g if (gt,gc) in mTEPES.t2g) for p,ar,gt in mTEPES.par*mTEPES.gt], index=pd.Index(mTEPES.par*mTEPES.gt)).to_frame(name='MW')
+                TechInvestToArea = AggregatedValues(mTEPES, GenInvestToArea['MW'], 2, 'g2gt').to_frame(name='MW')
                 TechInvestToArea.index.names = ['Period', 'Area', 'Technology'    ]
                 chart = alt.Chart(TechInvestToArea.reset_index()).mark_bar().encode(x='Technology:O', y='sum(MW):Q', color='Area:N', column='Period:N').properties(width=600, height=400)
                 chart.save(_path+'/oT_Plot_TechnologyInvestmentPerArea_'+CaseName+'.html', embed_options={'renderer':'svg'})
 
         if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
             # Ordering data to plot the investment decision
-            OutputResults1 = pd.Series(data=[gt for p,gc,gt in mTEPES.pgc*mTEPES.gt if (gt,gc) in mTEPES.t2g], index=pd.Index(mTEPES.pgc))
+            OutputResults1 = pd.Series(data=AggregationLabels(mTEPES, 'g2gt', [gc for p,gc in mTEPES.pgc]), index=pd.Index(mTEPES.pgc))
             OutputResults1 = OutputResults1.to_frame(name='Technology')
             OutputResults2 = OutputToFile
             OutputResults  = pd.concat([OutputResults1, OutputResults2], axis=1)
@@ -151,10 +688,10 @@ def InvestmentResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutput,
 
             # Saving and plotting generation investment cost into CSV file
             OutputResults0 = OutputResults
-            OutputToFile   = pd.Series(data=[mTEPES.pDiscountedWeight[p] * mTEPES.pGenInvestCost[gc] * OptModel.vGenerationInvest[p,gc]() for p,gc in mTEPES.pgc], index=pd.Index(mTEPES.pgc))
+            OutputToFile   = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc) * [mTEPES.pDiscountedWeight[p] * mTEPES.pGenInvestCost[gc] for p,gc in mTEPES.pgc], index=pd.Index(mTEPES.pgc))
             OutputToFile   = OutputToFile.fillna(0).to_frame(name='MEUR').reset_index().rename(columns={'level_0': 'Period', 'level_1': 'Generating unit'}).set_index(['Period', 'Generating unit'])
 
-            OutputResults1 = pd.Series(data=[gt for p,gc,gt in mTEPES.pgc*mTEPES.gt if (gt,gc) in mTEPES.t2g], index=pd.Index(mTEPES.pgc))
+            OutputResults1 = pd.Series(data=AggregationLabels(mTEPES, 'g2gt', [gc for p,gc in mTEPES.pgc]), index=pd.Index(mTEPES.pgc))
             OutputResults1 = OutputResults1.to_frame(name='Technology')
             OutputResults2 = OutputToFile
             OutputResults  = pd.concat([OutputResults1, OutputResults2], axis=1)
@@ -177,38 +714,33 @@ def InvestmentResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutput,
 
     if len(mTEPES.gd):
 
-        # generators to area (g2a)
-        g2a = defaultdict(list)
-        for ar,gd in mTEPES.ar*mTEPES.gd:
-            if (ar,gd) in mTEPES.a2g:
-                g2a[ar].append(gd)
-
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
             # Saving generation retirement into CSV file
-            OutputToFile = pd.Series(data=[OptModel.vGenerationRetire[p,gd]()                                                           for p,gd in mTEPES.pgd], index=pd.Index(mTEPES.pgd))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vGenerationRetire', mTEPES.pgd), index=pd.Index(mTEPES.pgd))
             OutputToFile = OutputToFile.fillna(0).to_frame(name='RetirementDecision').reset_index().rename(columns={'level_0': 'Period', 'level_1': 'Generating unit'})
             OutputToFile.pivot_table(index=['Period'], columns=['Generating unit'], values='RetirementDecision').rename_axis(['Period'], axis=0).to_csv(_path+'/oT_Result_GenerationRetirementPerUnit_'+CaseName+'.csv', index=True, sep=',')
-            OutputToFile = pd.Series(data=[OptModel.vGenerationRetire[p,gd]()*max(mTEPES.pRatedMaxPower[gd],mTEPES.pRatedMaxCharge[gd]) for p,gd in mTEPES.pgd], index=pd.Index(mTEPES.pgd))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vGenerationRetire', mTEPES.pgd) * [max(mTEPES.pRatedMaxPower[gd],mTEPES.pRatedMaxCharge[gd]) for p,gd in mTEPES.pgd], index=pd.Index(mTEPES.pgd))
             OutputToFile *= 1e3
             OutputToFile = OutputToFile.fillna(0).to_frame(name='MW'                ).reset_index().rename(columns={'level_0': 'Period', 'level_1': 'Generating unit'})
             OutputToFile.pivot_table(index=['Period'], columns=['Generating unit'], values='MW').rename_axis(['Period'], axis=0).to_csv(_path+'/oT_Result_GenerationRetirement_'+CaseName+'.csv', index=True, sep=',')
             OutputToFile = OutputToFile.set_index(['Period', 'Generating unit'])
 
-        if sum(1 for ar in mTEPES.ar if sum(1 for g in g2a[ar])) > 1:
+        if len(set(AggregationCodes(mTEPES, 'g2ar', list(mTEPES.gd))) - {-1}) > 1:
             if pIndPlotOutput == 1:
-                sPARGD           = [(p,ar,gd) for p,ar,gd in mTEPES.par*mTEPES.gd if (ar,gd) in mTEPES.a2g]
-                GenRetireToArea  = pd.Series(data=[OutputToFile['MW'][p,gd] for p,ar,gd in sPARGD], index=pd.Index(sPARGD)).to_frame(name='MW')
+                sUnit            = OutputToFile.index.get_level_values(1)
+                GenRetireToArea  = pd.Series(data=OutputToFile['MW'].values, index=pd.MultiIndex.from_arrays([OutputToFile.index.get_level_values(0), AggregationLabels(mTEPES, 'g2ar', sUnit), sUnit])).to_frame(name='MW')
+                GenRetireToArea  = GenRetireToArea[GenRetireToArea.index.get_level_values(1).notna()]
                 GenRetireToArea.index.names = ['Period', 'Area', 'Generating unit']
                 chart = alt.Chart(GenRetireToArea.reset_index()).mark_bar().encode(x='Generating unit:O', y='sum(MW):Q', color='Area:N', column='Period:N').properties(width=600, height=400)
                 chart.save(_path+'/oT_Plot_GenerationRetirementPerArea_'+CaseName+'.html', embed_options={'renderer':'svg'})
-                TechRetireToArea = pd.Series(data=[sum(OutputToFile['MW'][p,gd] for gd in mTEPES.gd if (ar,gd) in mTEPES.a2g if (gt,gd) in mTEPES.t2g) for p,ar,gt in mTEPES.par*mTEPES.gt], index=pd.Index(mTEPES.par*mTEPES.gt)).to_frame(name='MW')
+                TechRetireToArea = AggregatedValues(mTEPES, GenRetireToArea['MW'], 2, 'g2gt').to_frame(name='MW')
                 TechRetireToArea.index.names = ['Period', 'Area', 'Technology'    ]
                 chart = alt.Chart(TechRetireToArea.reset_index()).mark_bar().encode(x='Technology:O',     y='sum(MW):Q', color='Area:N', column='Period:N').properties(width=600, height=400)
                 chart.save(_path+'/oT_Plot_TechnologyRetirementPerArea_'+CaseName+'.html', embed_options={'renderer':'svg'})
 
         if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
             # Ordering data to plot the investment retirement
-            OutputResults1 = pd.Series(data=[gt for p,gd,gt in mTEPES.pgd*mTEPES.gt if (gt,gd) in mTEPES.t2g], index=pd.Index(mTEPES.pgd))
+            OutputResults1 = pd.Series(data=AggregationLabels(mTEPES, 'g2gt', [gd for p,gd in mTEPES.pgd]), index=pd.Index(mTEPES.pgd))
             OutputResults1 = OutputResults1.to_frame(name='Technology')
             OutputResults2 = OutputToFile
             OutputResults  = pd.concat([OutputResults1, OutputResults2], axis=1)
@@ -224,7 +756,7 @@ def InvestmentResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutput,
     if len(mTEPES.lc):
 
         # Saving investment decisions
-        OutputToFile = pd.Series(data=[OptModel.vNetworkInvest[p,ni,nf,cc]() for p,ni,nf,cc in mTEPES.plc], index=pd.Index(mTEPES.plc))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vNetworkInvest', mTEPES.plc), index=pd.Index(mTEPES.plc))
         OutputToFile = OutputToFile.fillna(0).to_frame(name='Investment Decision').rename_axis(['Period', 'InitialNode', 'FinalNode', 'Circuit'], axis=0)
         OutputToFile.reset_index().pivot_table(index=['Period'], columns=['InitialNode','FinalNode','Circuit'], values='Investment Decision').rename_axis([None, None, None], axis=1).rename_axis(['Period'], axis=0).reset_index().to_csv(_path+'/oT_Result_NetworkInvestment_'+CaseName+'.csv', index=False, sep=',')
         # OutputToFile = OutputToFile.set_index(['Period', 'InitialNode', 'FinalNode', 'Circuit'])
@@ -242,7 +774,7 @@ def InvestmentResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutput,
             chart = alt.Chart(OutputResults.reset_index()).mark_bar().encode(x='LineType:O', y='sum(Investment Decision):Q', color='LineType:N', column='Period:N').properties(width=600, height=400)
             chart.save(_path+'/oT_Plot_NetworkInvestment_'+CaseName+'.html', embed_options={'renderer':'svg'})
 
-        OutputToFile = pd.Series(data=[OptModel.vNetworkInvest[p,ni,nf,cc]()*mTEPES.pLineNTCFrw[ni,nf,cc]/mTEPES.pLineLength[ni,nf,cc]() for p,ni,nf,cc in mTEPES.plc], index=pd.Index(mTEPES.plc))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vNetworkInvest', mTEPES.plc) * [mTEPES.pLineNTCFrw[ni,nf,cc]/mTEPES.pLineLength[ni,nf,cc]() for p,ni,nf,cc in mTEPES.plc], index=pd.Index(mTEPES.plc))
         OutputToFile *= 1e3
         OutputToFile = OutputToFile.fillna(0).to_frame(name='MW-km').reset_index().rename(columns={'level_0': 'Period', 'level_1': 'InitialNode', 'level_2': 'FinalNode', 'level_3': 'Circuit'})
         OutputToFile.reset_index().pivot_table(index=['Period'], columns=['InitialNode','FinalNode','Circuit'], values='MW-km').rename_axis([None,None,None], axis=1).rename_axis(['Period'], axis=0).reset_index().to_csv(_path+'/oT_Result_NetworkInvestment_MWkm_'+CaseName+'.csv', index=False, sep=',')
@@ -270,94 +802,68 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
-    # generators to area (n2a)
-    n2a = defaultdict(list)
-    for ar,nr in mTEPES.ar*mTEPES.nr:
-        if (ar,nr) in mTEPES.a2g:
-            n2a[ar].append(nr)
-
-    # generators to area (g2a)
-    g2a = defaultdict(list)
-    for ar,g in mTEPES.a2g:
-        g2a[ar].append(g)
-
-    # technology to generators (o2e) (g2n)
-    o2e = defaultdict(list)
-    for ot,es in mTEPES.ot*mTEPES.es:
-        if (ot,es) in mTEPES.t2g:
-            o2e[ot].append(es)
-    g2n = defaultdict(list)
-    for gt,nr in mTEPES.gt*mTEPES.nr:
-        if (gt,nr) in mTEPES.t2g:
-            g2n[gt].append(nr)
-
-    # generators to technology (g2t)
-    g2t = defaultdict(list)
-    for gt,g in mTEPES.t2g:
-        g2t[gt].append(g)
-
     if len(mTEPES.nr):
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-            OutputToFile = pd.Series(data=[OptModel.vCommitment[p,sc,n,nr]() for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
-            OutputToFile.to_frame(name='p.u.').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='p.u.').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCommitment_'+CaseName+'.csv', sep=',')
-            OutputToFile = pd.Series(data=[OptModel.vStartUp   [p,sc,n,nr]() for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
-            OutputToFile.to_frame(name='p.u.').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='p.u.').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationStartUp_'   +CaseName+'.csv', sep=',')
-            OutputToFile = pd.Series(data=[OptModel.vShutDown  [p,sc,n,nr]() for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
-            OutputToFile.to_frame(name='p.u.').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='p.u.').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationShutDown_'  +CaseName+'.csv', sep=',')
+            # committed units of a cluster are those that remain committed plus those started up (or those shut down in the previous load level)
+            OutputCommit = pd.Series(data=SolutionValues(mTEPES, 'vCommitment', mTEPES.psnnr), index=pd.Index(mTEPES.psnnr))
+            OutputStrUp  = pd.Series(data=SolutionValues(mTEPES, 'vStartUp', mTEPES.psnnr), index=pd.Index(mTEPES.psnnr))
+            OutputShtDw  = pd.Series(data=SolutionValues(mTEPES, 'vShutDown', mTEPES.psnnr), index=pd.Index(mTEPES.psnnr))
+            OutputToFile = ClusterDisaggregation(mTEPES, OutputCommit, OutputCommit*0.0)
+            ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCommitment_'+CaseName)
+            OutputToFile = ClusterDisaggregation(mTEPES, OutputCommit, OutputCommit-OutputStrUp)
+            ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationStartUp_'+CaseName)
+            OutputToFile = ClusterDisaggregation(mTEPES, OutputCommit-OutputStrUp+OutputShtDw, OutputCommit-OutputStrUp)
+            ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationShutDown_'+CaseName)
 
     if sum(mTEPES.pOperReserveUp[:,:,:,:]):
         if len(mTEPES.nr):
-            OutputToFile = pd.Series(data=[OptModel.vReserveUp     [p,sc,n,nr]() for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vReserveUp', mTEPES.psnnr), index=pd.Index(mTEPES.psnnr))
             OutputToFile = OutputToFile.fillna(0.0)
             OutputToFile *= 1e3
             if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationReserveUp_'+CaseName+'.csv', sep=',')
+                ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationReserveUp_'+CaseName)
 
             if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-                sPSNGT       = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for nr in g2n[gt])]
-                OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,nr] for nr in g2n[gt]) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyOperatingReserveUp_'+CaseName+'.csv', sep=',')
+                OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+                ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyOperatingReserveUp_'+CaseName)
 
         if len(mTEPES.eh):
-            OutputToFile = pd.Series(data=[OptModel.vESSReserveUp  [p,sc,n,eh]() for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vESSReserveUp', mTEPES.psneh), index=pd.Index(mTEPES.psneh))
             OutputToFile = OutputToFile.fillna(0.0)
             OutputToFile *= 1e3
             if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ConsumptionReserveUp_'+CaseName+'.csv', sep=',')
+                ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ConsumptionReserveUp_'+CaseName)
 
             if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-                sPSNOT       = [(p,sc,n,ot) for p,sc,n,ot in mTEPES.psnot if sum(1 for es in o2e[ot])]
-                OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,es] for es in o2e[ot]) for p,sc,n,ot in sPSNOT], index=pd.Index(sPSNOT))
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyOperatingReserveUpESS_'+CaseName+'.csv', sep=',')
+                OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+                ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyOperatingReserveUpESS_'+CaseName)
 
     if sum(mTEPES.pOperReserveDw[:,:,:,:]):
         if len(mTEPES.nr):
-            OutputToFile = pd.Series(data=[OptModel.vReserveDown   [p,sc,n,nr]() for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vReserveDown', mTEPES.psnnr), index=pd.Index(mTEPES.psnnr))
             OutputToFile = OutputToFile.fillna(0.0)
             OutputToFile *= 1e3
             if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationReserveDown_'+CaseName+'.csv', sep=',')
+                ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationReserveDown_'+CaseName)
 
             if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-                sPSNGT       = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for nr in g2n[gt])]
-                OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,nr] for nr in g2n[gt]) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyOperatingReserveDown_'+CaseName+'.csv', sep=',')
+                OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+                ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyOperatingReserveDown_'+CaseName)
 
         if len(mTEPES.eh):
-            OutputToFile = pd.Series(data=[OptModel.vESSReserveDown[p,sc,n,eh]() for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vESSReserveDown', mTEPES.psneh), index=pd.Index(mTEPES.psneh))
             OutputToFile = OutputToFile.fillna(0.0)
             OutputToFile *= 1e3
             if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ConsumptionReserveDown_'       +CaseName+'.csv', sep=',')
+                ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ConsumptionReserveDown_'+CaseName)
 
             if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-                sPSNOT       = [(p,sc,n,ot) for p,sc,n,ot in mTEPES.psnot if sum(1 for es in o2e[ot])]
-                OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,es] for es in o2e[ot]) for p,sc,n,ot in sPSNOT], index=pd.Index(sPSNOT))
-                OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyOperatingReserveDownESS_'+CaseName+'.csv', sep=',')
+                OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+                ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyOperatingReserveDownESS_'+CaseName)
 
-    OutputToFile = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,g]()                                             for p,sc,n,g  in mTEPES.psng ], index=pd.Index(mTEPES.psng))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng), index=pd.Index(mTEPES.psng))
     OutputToFile *= 1e3
-    OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'],        columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_Generation_'       +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_Generation_'+CaseName)
 
     # tolerance to consider 0 a number
     pEpsilon = 1e-6
@@ -368,7 +874,7 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
     for p,sc,n,g in sPSNG:
         if g in mTEPES.gc:
             OutputToFile[p,sc,n,g] *= OptModel.vGenerationInvest[p,g]()
-    OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationSurplus_'+CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationSurplus_'+CaseName)
 
     OutputResults = []
     sPSSTNNR      = [(p,sc,st,n,nr) for p,sc,st,n,nr in mTEPES.ps*mTEPES.s2n*mTEPES.nr if mTEPES.pRampUp[nr] and mTEPES.pIndBinGenRamps() == 1 and mTEPES.pRampUp[nr] < mTEPES.pMaxPower2ndBlock[p,sc,n,nr] and n == mTEPES.n.first()]
@@ -379,9 +885,10 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
     OutputToFile  = pd.Series(data=[(getattr(OptModel, 'eRampUp_'+str(p)+'_'+str(sc)+'_'+str(st))[n,nr].uslack())*mTEPES.pDuration[n]()*mTEPES.pRampUp[nr]*(mTEPES.pInitialUC[p,sc,n,nr]() - OptModel.vStartUp[p,sc,n,nr]()) for p,sc,st,n,nr in sPSSTNNR], index=pd.Index(sPSSTNNR), dtype='float64')
     OutputToFile *= 1e3
     OutputResults.append(OutputToFile)
+    # the ramp surplus of a cluster is split evenly among its units, without the stage of the load levels
     OutputResults = pd.concat(OutputResults)
     if len(OutputResults.index):
-        OutputResults.to_frame(name='MW/h').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='MW/h', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationRampUpSurplus_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputResults.droplevel(2)), 'MW/h', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationRampUpSurplus_'+CaseName, 'sum')
 
     OutputResults = []
     sPSSTNNR      = [(p,sc,st,n,nr) for p,sc,st,n,nr in mTEPES.ps*mTEPES.s2n*mTEPES.nr if mTEPES.pRampDw[nr] and mTEPES.pIndBinGenRamps() == 1 and mTEPES.pRampDw[nr] < mTEPES.pMaxPower2ndBlock[p,sc,n,nr] and n == mTEPES.n.first()]
@@ -392,50 +899,45 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
     OutputToFile  = pd.Series(data=[(getattr(OptModel, 'eRampDw_'+str(p)+'_'+str(sc)+'_'+str(st))[n,nr].uslack())*mTEPES.pDuration[n]()*mTEPES.pRampDw[nr]*(mTEPES.pInitialUC[p,sc,n,nr]() - OptModel.vShutDown[p,sc,n,nr]()) for p,sc,st,n,nr in sPSSTNNR], index=pd.Index(sPSSTNNR), dtype='float64')
     OutputToFile *= 1e3
     OutputResults.append(OutputToFile)
+    # the ramp surplus of a cluster is split evenly among its units, without the stage of the load levels
     OutputResults = pd.concat(OutputResults)
     if len(OutputResults.index):
-        OutputResults.to_frame(name='MW/h').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='MW/h', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationRampDwSurplus_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputResults.droplevel(2)), 'MW/h', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationRampDwSurplus_'+CaseName, 'sum')
 
     if len(mTEPES.re) and len(mTEPES.rt):
-        OutputToFile1 = pd.Series(data=[(OptModel.vTotalOutput[p,sc,n,re].ub - OptModel.vTotalOutput[p,sc,n,re]())*mTEPES.pLoadLevelDuration[n]() for p,sc,n,re in mTEPES.psnre], index=pd.Index(mTEPES.psnre))
-        OutputToFile2 = pd.Series(data=[(OptModel.vTotalOutput[p,sc,n,re].ub                                     )*mTEPES.pLoadLevelDuration[n]() for p,sc,n,re in mTEPES.psnre], index=pd.Index(mTEPES.psnre))
-        for p,sc,n,re in mTEPES.psnre:
-            if re in mTEPES.gc:
-                OutputToFile1[p,sc,n,re] *= OptModel.vGenerationInvest[p,re]()
-                OutputToFile2[p,sc,n,re] *= OptModel.vGenerationInvest[p,re]()
+        # the output of the candidate units is scaled by their investment decision
+        pDuration     = [mTEPES.pLoadLevelDuration[n]() for p,sc,n,re in mTEPES.psnre]
+        pInvest       = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', [(p,re) for p,sc,n,re in mTEPES.psnre])).fillna(1.0).values
+        pMaxOutput    = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,re].ub for p,sc,n,re in mTEPES.psnre], index=pd.Index(mTEPES.psnre)) * pInvest
+        Curtailment   = pMaxOutput - SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psnre) * pInvest
+        OutputToFile1 = Curtailment * pDuration
+        OutputToFile2 = pMaxOutput  * pDuration
         OutputToFile1 = OutputToFile1.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_3'], values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'Generating unit'], axis=0).rename_axis([None], axis=1)
         OutputToFile2 = OutputToFile2.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_3'], values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'Generating unit'], axis=0).rename_axis([None], axis=1)
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-            OutputToFile = OutputToFile1.div(OutputToFile2)*1e2
-            OutputToFile = OutputToFile.fillna(0.0)
-            OutputToFile.rename(columns = {'GWh':'%'}, inplace = True)
+            # the curtailment of a cluster is split evenly among its units, and so is its maximum output
+            OutputToFile = ClusterDisaggregation(mTEPES, Curtailment*pDuration).groupby(level=[0,1,3]).sum().div(ClusterDisaggregation(mTEPES, pMaxOutput*pDuration).groupby(level=[0,1,3]).sum())*1e2
+            OutputToFile = OutputToFile.fillna(0.0).to_frame(name='%').rename_axis(['Period', 'Scenario', 'Generating unit'], axis=0)
             OutputToFile.to_csv(_path+'/oT_Result_GenerationCurtailmentEnergyRelative_'+CaseName+'.csv', sep=',')
 
         if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-            OutputToFile1 = pd.Series(data=[sum(OutputToFile1['GWh'][p,sc,re] for re in mTEPES.re if (rt,re) in mTEPES.t2g) for p,sc,rt in mTEPES.psrt], index=pd.Index(mTEPES.psrt))
-            OutputToFile2 = pd.Series(data=[sum(OutputToFile2['GWh'][p,sc,re] for re in mTEPES.re if (rt,re) in mTEPES.t2g) for p,sc,rt in mTEPES.psrt], index=pd.Index(mTEPES.psrt))
+            OutputToFile1 = AggregatedValues(mTEPES, OutputToFile1['GWh'], 2, 'g2gt')
+            OutputToFile2 = AggregatedValues(mTEPES, OutputToFile2['GWh'], 2, 'g2gt')
             OutputToFile  = OutputToFile1.div(OutputToFile2)*1e2
             OutputToFile  = OutputToFile.fillna(0.0)
             OutputToFile.to_frame(name='%').rename_axis(['Period', 'Scenario', 'Technology'], axis=0).to_csv(_path+'/oT_Result_TechnologyCurtailmentEnergyRelative_'+CaseName+'.csv', index=True, sep=',')
 
-        OutputToFile = pd.Series(data=[(OptModel.vTotalOutput[p,sc,n,re].ub - OptModel.vTotalOutput[p,sc,n,re]())  for p,sc,n,re in mTEPES.psnre], index=pd.Index(mTEPES.psnre))
-        OutputToFile *= 1e3
-        for p,sc,n,re in mTEPES.psnre:
-            if re in mTEPES.gc:
-                OutputToFile[p,sc,n,re] *= OptModel.vGenerationInvest[p,re]()
+        OutputToFile = Curtailment * 1e3
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-            OutputToFile.to_frame(name='MW' ).reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW' , aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCurtailmentOutput_'+CaseName+'.csv', sep=',')
+            ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCurtailmentOutput_'+CaseName, 'sum')
 
-        OutputToFile = pd.Series(data=[(OptModel.vTotalOutput[p,sc,n,re].ub - OptModel.vTotalOutput[p,sc,n,re]())*mTEPES.pLoadLevelDuration[n]() for p,sc,n,re in mTEPES.psnre], index=pd.Index(mTEPES.psnre))
-        for p,sc,n,re in mTEPES.psnre:
-            if re in mTEPES.gc:
-                OutputToFile[p,sc,n,re] *= OptModel.vGenerationInvest[p,re]()
+        OutputToFile = Curtailment * pDuration
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-            OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCurtailmentEnergy_'+CaseName+'.csv', sep=',')
+            ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCurtailmentEnergy_'+CaseName, 'sum')
 
         if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-            OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,re] for re in mTEPES.re if (rt,re) in mTEPES.t2g) for p,sc,n,rt in mTEPES.psnrt], index=pd.Index(mTEPES.psnrt))
-            OutputToFile.to_frame(name='GWh').reset_index().pivot_table(               index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyCurtailmentEnergy_'+CaseName+'.csv', sep=',')
+            OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+            ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyCurtailmentEnergy_'+CaseName, 'sum')
             if pIndPlotOutput == 1:
                 TechCurt = OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).stack().rename_axis(['Period', 'Scenario', 'LoadLevel', 'Technology']).reset_index().groupby(['Period', 'Scenario', 'Technology']).sum(numeric_only=True).rename(columns={0: 'GWh'})
                 TechCurt = TechCurt[(TechCurt[['GWh']] != 0).all(axis=1)]
@@ -443,27 +945,25 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
                 chart.save(_path+'/oT_Plot_TechnologyCurtailmentEnergy_'+CaseName+'.html', embed_options={'renderer':'svg'})
 
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,g ]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng))
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(      index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationEnergy_'+CaseName+'.csv', sep=',')
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng))
+        ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationEnergy_'+CaseName, 'sum')
 
     if len(mTEPES.nr):
-        OutputToFile = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,nr]()*mTEPES.pLoadLevelDuration[n]()*mTEPES.pEmissionRate[nr]/1e3 for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psnnr) * [mTEPES.pLoadLevelDuration[n]()*mTEPES.pEmissionRate[nr]/1e3 for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
         if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-            OutputToFile.to_frame(name='MtCO2').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MtCO2', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationEmission_'+CaseName+'.csv', sep=',')
+            ResultsToFile(mTEPES, ClusterDisaggregation(mTEPES, OutputToFile), 'MtCO2', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationEmission_'+CaseName, 'sum')
 
         if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-            if sum(1 for ar in mTEPES.ar if sum(1 for nr in n2a[ar])) > 1:
+            UnitArea = AggregationLabels(mTEPES, 'g2ar', OutputToFile.index.get_level_values(3))
+            if pd.Series(UnitArea).nunique() > 1:
                 if pIndAreaOutput == 1:
                     for ar in mTEPES.ar:
-                        if sum(1 for nr in n2a[ar]):
-                            sPSNGT = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for nr in g2n[gt])]
-                            if len(sPSNGT):
-                                OutputResults = pd.Series(data=[sum(OutputToFile[p,sc,n,nr] for nr in g2n[gt] if (ar,nr) in mTEPES.a2g) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-                                OutputResults.to_frame(name='MtCO2').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MtCO2', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyEmission_'+ar+'_'+CaseName+'.csv', sep=',')
-
-            sPSNGT       = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for nr in g2n[gt])]
-            OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,nr] for nr in g2n[gt]) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-            OutputToFile.to_frame(name='MtCO2').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MtCO2', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyEmission_'+CaseName+'.csv', sep=',')
+                        if (UnitArea == ar).any():
+                            OutputResults = AggregatedValues(mTEPES, OutputToFile[UnitArea == ar], 3, 'g2gt')
+                            OutputResults.to_frame(name='MtCO2').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MtCO2', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyEmission_'+ar+'_'+CaseName+'.csv', sep=',')
+
+            OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+            ResultsToFile(mTEPES, OutputToFile, 'MtCO2', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyEmission_'+CaseName, 'sum')
             if pIndPlotOutput == 1:
                 TechEmission = OutputToFile.to_frame(name='MtCO2').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MtCO2', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).stack().rename_axis(['Period', 'Scenario', 'LoadLevel', 'Technology']).reset_index().groupby(['Period', 'Scenario', 'Technology']).sum(numeric_only=True).rename(columns={0: 'MtCO2'})
                 TechEmission = TechEmission[(TechEmission[['MtCO2']] != 0).all(axis=1)]
@@ -472,10 +972,10 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
                     chart.save(_path+'/oT_Plot_TechnologyEmission_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        sPSNGT       = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for g in g2t[gt])]
-        OutputToFile = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,g]() for g in mTEPES.g if (gt,g) in mTEPES.t2g) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
+        UnitOutput   = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng), index=pd.Index(mTEPES.psng))
+        OutputToFile = AggregatedValues(mTEPES, UnitOutput, 3, 'g2gt')
         OutputToFile *= 1e3
-        OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyGeneration_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyGeneration_'+CaseName, 'sum')
 
         if pIndPlotOutput == 1:
             TechnologyOutput = OutputToFile.loc[:,:,:,:]
@@ -483,27 +983,27 @@ def GenerationOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolo
                 chart = AreaPlots(p, sc, TechnologyOutput, 'Technology', 'LoadLevel', 'MW', 'sum')
                 chart.save(_path+'/oT_Plot_TechnologyGeneration_'+str(p)+'_'+str(sc)+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
-        OutputToFile = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]() for g in mTEPES.g if (gt,g) in mTEPES.t2g) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyGenerationEnergy_'+CaseName+'.csv', sep=',')
+        UnitEnergy   = UnitOutput * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng]
+        OutputToFile = AggregatedValues(mTEPES, UnitEnergy, 3, 'g2gt')
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyGenerationEnergy_'+CaseName, 'sum')
 
         if pIndPlotOutput == 1:
             for p,sc in mTEPES.ps:
                 chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
                 chart.save(_path+'/oT_Plot_TechnologyGenerationEnergy_'+str(p)+'_'+str(sc)+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
-        if sum(1 for ar in mTEPES.ar if sum(1 for g in g2a[ar])) > 1:
+        UnitArea = AggregationLabels(mTEPES, 'g2ar', UnitEnergy.index.get_level_values(3))
+        if pd.Series(UnitArea).nunique() > 1:
             if pIndAreaOutput == 1:
                 for ar in mTEPES.ar:
-                    if sum(1 for g in g2a[ar]):
-                        sPSNGT = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for g in mTEPES.t2g if (ar,g) in mTEPES.a2g)]
-                        if len(sPSNGT):
-                            OutputToFile = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]() for g in mTEPES.t2g if (ar,g) in mTEPES.a2g) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-                            OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyGenerationEnergy_'+ar+'_'+CaseName+'.csv', sep=',')
+                    if (UnitArea == ar).any():
+                        OutputToFile = AggregatedValues(mTEPES, UnitEnergy[UnitArea == ar], 3, 'g2gt')
+                        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyGenerationEnergy_'+ar+'_'+CaseName+'.csv', sep=',')
 
-                            if pIndPlotOutput == 1:
-                                for p,sc in mTEPES.ps:
-                                    chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
-                                    chart.save(_path+'/oT_Plot_TechnologyGenerationEnergy_'+str(p)+'_'+str(sc)+'_'+ar+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
+                        if pIndPlotOutput == 1:
+                            for p,sc in mTEPES.ps:
+                                chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
+                                chart.save(_path+'/oT_Plot_TechnologyGenerationEnergy_'+str(p)+'_'+str(sc)+'_'+ar+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
     WritingResultsTime = time.time() - StartTime
     StartTime          = time.time()
@@ -515,53 +1015,37 @@ def ESSOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutpu
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
-    # generators to area (e2a) (n2a)
-    e2a = defaultdict(list)
-    for ar,es in mTEPES.ar*mTEPES.es:
-        if (ar,es) in mTEPES.a2g:
-            e2a[ar].append(es)
-    n2a = defaultdict(list)
-    for ar,nr in mTEPES.ar*mTEPES.nr:
-        if (ar,nr) in mTEPES.a2g:
-            n2a[ar].append(nr)
-
-    # technology to generators (o2e)
-    o2e = defaultdict(list)
-    for ot,es in mTEPES.ot*mTEPES.es:
-        if (ot,es) in mTEPES.t2g:
-            o2e[ot].append(es)
-
-    OutputToFile = pd.Series(data=[OptModel.vEnergyOutflows    [p,sc,n,es]() for p,sc,n,es in mTEPES.psnes], index=pd.Index(mTEPES.psnes))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vEnergyOutflows', mTEPES.psnes), index=pd.Index(mTEPES.psnes))
     OutputToFile *= 1e3
-    OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationOutflows_'        +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationOutflows_'+CaseName, 'sum')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,es] for es in o2e[ot]) for p,sc,n,ot in mTEPES.psnot], index=pd.Index(mTEPES.psnot))
-        OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyOutflows_'        +CaseName+'.csv', sep=',')
+        OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+        ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyOutflows_'+CaseName, 'sum')
 
-    OutputToFile = pd.Series(data=[-OptModel.vESSTotalCharge   [p,sc,n,eh]() for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh))
+    OutputToFile = pd.Series(data=-SolutionValues(mTEPES, 'vESSTotalCharge', mTEPES.psneh), index=pd.Index(mTEPES.psneh))
     OutputToFile *= 1e3
-    OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_Consumption_'                   +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_Consumption_'+CaseName, 'sum')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,eh] for eh in o2e[ot]) for p,sc,n,ot in mTEPES.psnot], index=pd.Index(mTEPES.psnot))
-        OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyConsumption_'     +CaseName+'.csv', sep=',')
+        OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+        ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyConsumption_'+CaseName, 'sum')
 
-    OutputToFile = pd.Series(data=[OptModel.vEnergyOutflows    [p,sc,n,es]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,es in mTEPES.psnes], index=pd.Index(mTEPES.psnes))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vEnergyOutflows', mTEPES.psnes) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,es in mTEPES.psnes], index=pd.Index(mTEPES.psnes))
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationOutflowsEnergy_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationOutflowsEnergy_'+CaseName, 'sum')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,es] for es in o2e[ot]) for p,sc,n,ot in mTEPES.psnot], index=pd.Index(mTEPES.psnot))
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyOutflowsEnergy_'+CaseName+'.csv', sep=',')
+        OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyOutflowsEnergy_'+CaseName, 'sum')
 
-    OutputToFile = pd.Series(data=[-OptModel.vESSTotalCharge   [p,sc,n,eh]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh))
+    ESSCharge    = pd.Series(data=-SolutionValues(mTEPES, 'vESSTotalCharge', mTEPES.psneh) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh))
+    OutputToFile = ESSCharge.copy()
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ConsumptionEnergy_'            +CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ConsumptionEnergy_'+CaseName, 'sum')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        sPSNOT = [(p,sc,n,ot) for p,sc,n,ot in mTEPES.psnot if sum(1 for es in o2e[ot])]
-        OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,eh] for eh in o2e[ot]) for p,sc,n,ot in sPSNOT], index=pd.Index(sPSNOT))
+        OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
         OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh').rename_axis             (['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyConsumptionEnergy_'     +CaseName+'.csv', sep=',')
 
     if pIndPlotOutput == 1:
@@ -577,48 +1061,45 @@ def ESSOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutpu
                 chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
                 chart.save(_path+'/oT_Plot_TechnologyConsumptionEnergy_'+str(p)+'_'+str(sc)+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
-    if sum(1 for ar in mTEPES.ar if sum(1 for eh in e2a[ar])) > 1:
+    UnitArea = AggregationLabels(mTEPES, 'g2ar', ESSCharge.index.get_level_values(3))
+    if pd.Series(UnitArea).nunique() > 1:
         if pIndAreaOutput == 1:
             for ar in mTEPES.ar:
-                if sum(1 for eh in e2a[ar]):
-                    sPSNOT = [(p,sc,n,ot) for p,sc,n,ot in mTEPES.psnot if sum(1 for eh in e2a[ar] if (ot,eh) in mTEPES.t2g)]
-                    if len(sPSNOT):
-                        OutputToFile = pd.Series(data=[sum(-OptModel.vESSTotalCharge[p,sc,n,eh]()*mTEPES.pLoadLevelDuration[n]() for eh in e2a[ar] if (ot,eh) in mTEPES.t2g) for p,sc,n,ot in sPSNOT], index=pd.Index(sPSNOT))
-                        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyConsumptionEnergy_'+ar+'_'+CaseName+'.csv', sep=',')
+                if (UnitArea == ar).any():
+                    OutputToFile = AggregatedValues(mTEPES, ESSCharge[UnitArea == ar], 3, 'g2gt')
+                    OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyConsumptionEnergy_'+ar+'_'+CaseName+'.csv', sep=',')
 
-                        if pIndPlotOutput == 1:
-                            OutputToFile *= -1.0
-                            for p,sc in mTEPES.ps:
-                                chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
-                                chart.save(_path+'/oT_Plot_TechnologyConsumptionEnergy_'+str(p)+'_'+str(sc)+'_'+ar+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
+                    if pIndPlotOutput == 1:
+                        OutputToFile *= -1.0
+                        for p,sc in mTEPES.ps:
+                            chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
+                            chart.save(_path+'/oT_Plot_TechnologyConsumptionEnergy_'+str(p)+'_'+str(sc)+'_'+ar+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
     # tolerance to consider avoid division by 0
     pEpsilon = 1e-6
 
     InventoryConstraints = [(p,sc,n,es) for p,sc,n,es in mTEPES.ps*mTEPES.nesc if mTEPES.pMaxCharge[p,sc,n,es] + mTEPES.pMaxPower[p,sc,n,es]]
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile = pd.Series(data=[OptModel.vESSInventory[p,sc,n,es]()                                          for p,sc,n,es in InventoryConstraints], index=pd.Index(InventoryConstraints))
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh',               aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationInventory_'+CaseName+'.csv', sep=',')
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vESSInventory', InventoryConstraints), index=pd.Index(InventoryConstraints))
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationInventory_'+CaseName, 'sum')
 
-        OutputToFile = pd.Series(data=[OptModel.vESSInventory[p,sc,n,es]()/(mTEPES.pMaxStorage[p,sc,n,es]+pEpsilon) for p,sc,n,es in InventoryConstraints], index=pd.Index(InventoryConstraints))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vESSInventory', InventoryConstraints) * [1.0/(mTEPES.pMaxStorage[p,sc,n,es]+pEpsilon) for p,sc,n,es in InventoryConstraints], index=pd.Index(InventoryConstraints))
         OutputToFile = OutputToFile.fillna(0.0)
         OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', dropna=False, aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationInventoryUtilization_'+CaseName+'.csv', sep=',')
 
-    OutputToFile = pd.Series(data=[OptModel.vESSSpillage[p,sc,n,es]()                                               for p,sc,n,es in InventoryConstraints], index=pd.Index(InventoryConstraints))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vESSSpillage', InventoryConstraints), index=pd.Index(InventoryConstraints))
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh',               aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationSpillage_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationSpillage_'+CaseName, 'sum')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        ESSTechnologies = [(p,sc,n,ot) for p,sc,n,ot in mTEPES.psnot if sum(1 for es in o2e[ot])]
-        OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,es] for es in o2e[ot] if (n,es) in mTEPES.nesc and mTEPES.pMaxCharge[p,sc,n,es] + mTEPES.pMaxPower[p,sc,n,es]) for p,sc,n,ot in ESSTechnologies], index=pd.Index(ESSTechnologies))
-        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologySpillage_'+CaseName+'.csv', sep=',')
-
-    OutputToFile1 = pd.Series(data=[(OptModel.vTotalOutput[p,sc,n,es].ub - OptModel.vTotalOutput[p,sc,n,es]())*mTEPES.pLoadLevelDuration[n]() for p,sc,n,es in mTEPES.psnes], index=pd.Index(mTEPES.psnes))
-    OutputToFile2 = pd.Series(data=[(OptModel.vTotalOutput[p,sc,n,es].ub                                     )*mTEPES.pLoadLevelDuration[n]() for p,sc,n,es in mTEPES.psnes], index=pd.Index(mTEPES.psnes))
-    for p,sc,n,es in mTEPES.psnes:
-        if es in mTEPES.gc:
-            OutputToFile1[p,sc,n,es] *= OptModel.vGenerationInvest[p,es]()
-            OutputToFile2[p,sc,n,es] *= OptModel.vGenerationInvest[p,es]()
+        OutputToFile = AggregatedValues(mTEPES, OutputToFile, 3, 'g2gt')
+        ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologySpillage_'+CaseName, 'sum')
+
+    # the output of the candidate units is scaled by their investment decision
+    pInvest       = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', [(p,es) for p,sc,n,es in mTEPES.psnes])).fillna(1.0).values
+    pMaxOutput    = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,es].ub*mTEPES.pLoadLevelDuration[n]() for p,sc,n,es in mTEPES.psnes], index=pd.Index(mTEPES.psnes)) * pInvest
+    OutputToFile1 = pMaxOutput - SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psnes) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,es in mTEPES.psnes] * pInvest
+    OutputToFile2 = pMaxOutput
     OutputToFile1 = OutputToFile1.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_3'], values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'Generating unit'], axis=0).rename_axis([None], axis=1)
     OutputToFile2 = OutputToFile2.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_3'], values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'Generating unit'], axis=0).rename_axis([None], axis=1)
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
@@ -628,8 +1109,8 @@ def ESSOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnologyOutpu
         OutputToFile.to_csv(_path+'/oT_Result_GenerationSpillageRelative_'+CaseName+'.csv', sep=',')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
-        OutputToFile1 = pd.Series(data=[sum(OutputToFile1['GWh'][p,sc,es] for es in o2e[ot]) for p,sc,ot in mTEPES.psot], index=pd.Index(mTEPES.psot))
-        OutputToFile2 = pd.Series(data=[sum(OutputToFile2['GWh'][p,sc,es] for es in o2e[ot]) for p,sc,ot in mTEPES.psot], index=pd.Index(mTEPES.psot))
+        OutputToFile1 = AggregatedValues(mTEPES, OutputToFile1['GWh'], 2, 'g2gt')
+        OutputToFile2 = AggregatedValues(mTEPES, OutputToFile2['GWh'], 2, 'g2gt')
         OutputToFile  = OutputToFile1.div(OutputToFile2)*1e2
         OutputToFile  = OutputToFile.fillna(0.0)
         OutputToFile.to_frame(name='%').rename_axis(['Period', 'Scenario', 'Technology'], axis=0).to_csv(_path+'/oT_Result_TechnologySpillageRelative_'+CaseName+'.csv', index=True, sep=',')
@@ -655,30 +1136,30 @@ def ReservoirOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolog
 
     VolumeConstraints = [(p,sc,n,rs) for p,sc,n,rs in mTEPES.ps*mTEPES.nrsc if sum(1 for h in mTEPES.h if (rs,h) in mTEPES.r2h or (h,rs) in mTEPES.h2r)]
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile = pd.Series(data=[OptModel.vReservoirVolume[p,sc,n,rs]()                                         for p,sc,n,rs in VolumeConstraints], index=pd.Index(VolumeConstraints))
-        OutputToFile.to_frame(name='hm3').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='hm3',               aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ReservoirVolume_'+CaseName+'.csv', sep=',')
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vReservoirVolume', VolumeConstraints), index=pd.Index(VolumeConstraints))
+        ResultsToFile(mTEPES, OutputToFile, 'hm3', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ReservoirVolume_'+CaseName, 'sum')
 
-        OutputToFile = pd.Series(data=[OptModel.vReservoirVolume[p,sc,n,rs]()/(mTEPES.pMaxVolume[p,sc,n,rs]+pEpsilon) for p,sc,n,rs in VolumeConstraints], index=pd.Index(VolumeConstraints))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vReservoirVolume', VolumeConstraints) * [1.0/(mTEPES.pMaxVolume[p,sc,n,rs]+pEpsilon) for p,sc,n,rs in VolumeConstraints], index=pd.Index(VolumeConstraints))
         OutputToFile = OutputToFile.fillna(0.0)
         OutputToFile.to_frame(name='hm3').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='hm3', dropna=False, aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ReservoirVolumeUtilization_'+CaseName+'.csv', sep=',')
 
-    OutputToFile = pd.Series(data=[OptModel.vReservoirSpillage[p,sc,n,rs]()                                           for p,sc,n,rs in VolumeConstraints], index=pd.Index(VolumeConstraints))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vReservoirSpillage', VolumeConstraints), index=pd.Index(VolumeConstraints))
     if pIndTechnologyOutput == 0 or pIndTechnologyOutput == 2:
-        OutputToFile.to_frame(name='hm3').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='hm3',               aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ReservoirSpillage_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'hm3', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ReservoirSpillage_'+CaseName, 'sum')
 
     if pIndTechnologyOutput == 1 or pIndTechnologyOutput == 2:
         HydroTechnologies = [(p,sc,n,ht) for p,sc,n,ht in mTEPES.psnht if sum(1 for h in o2h[ht])]
         OutputToFile = pd.Series(data=[sum(OutputToFile[p,sc,n,rs] for rs in mTEPES.rs if (n,rs) in mTEPES.nrsc and sum(1 for h in o2h[ht] if (rs,h) in mTEPES.r2h)) for p,sc,n,ht in HydroTechnologies], index=pd.Index(HydroTechnologies))
-        OutputToFile.to_frame(name='hm3').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='hm3', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyReservoirSpillage_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'hm3', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_TechnologyReservoirSpillage_'+CaseName, 'sum')
 
     #%% outputting the water volume values
     OutputResults = []
     sPSSTNES      = [(p,sc,st,n,rs) for p,sc,st,n,rs in mTEPES.ps*mTEPES.s2n*mTEPES.rs if (n,rs) in mTEPES.nrsc and sum(1 for h in mTEPES.h if (rs,h) in mTEPES.r2h or (h,rs) in mTEPES.h2r or (rs,h) in mTEPES.r2p or (h,rs) in mTEPES.p2r)]
-    OutputToFile = pd.Series(data=[-mTEPES.pDuals["".join(["eHydroInventory_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(rs), "')"])]*1e3 for p,sc,st,n,rs in sPSSTNES], index=pd.Index(sPSSTNES))
+    OutputToFile = pd.Series(data=-DualValues(mTEPES, 'eHydroInventory', [(p,sc,st,n,rs) for p,sc,st,n,rs in sPSSTNES]) * 1e3, index=pd.Index(sPSSTNES))
     OutputResults.append(OutputToFile)
     OutputResults = pd.concat(OutputResults)
     if len(OutputResults.index):
-        OutputResults.to_frame(name='WaterValue').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='WaterValue').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_MarginalWaterVolumeValue_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputResults, 'WaterValue', ['level_0', 'level_1', 'level_3'], 'level_4', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_MarginalWaterVolumeValue_'+CaseName)
 
     if pIndPlotOutput == 1:
         WaterValue = OutputResults.to_frame(name='WaterValue').reset_index().pivot_table(index=['level_0','level_1','level_3','level_4'], values='WaterValue').rename_axis(['level_0','level_1','level_2','level_3'], axis=0).loc[:,:,:,:]
@@ -694,36 +1175,21 @@ def ReservoirOperationResults(DirName, CaseName, OptModel, mTEPES, pIndTechnolog
 def NetworkH2OperationResults(DirName, CaseName, OptModel, mTEPES):
     # %% outputting the hydrogen pipeline network operation
     _path = os.path.join(DirName, CaseName)
-    DIR   = os.path.dirname(__file__)
     StartTime = time.time()
 
-    # incoming and outgoing pipelines (lin) (lout)
-    lin  = defaultdict(list)
-    lout = defaultdict(list)
-    for ni,nf,cc in mTEPES.pa:
-        lin [nf].append((ni,cc))
-        lout[ni].append((nf,cc))
-
-    # nodes to electrolyzers (e2n)
-    e2n = defaultdict(list)
-    for nd,el in mTEPES.nd*mTEPES.el:
-        if (nd,el) in mTEPES.n2g:
-            e2n[nd].append(el)
-
-    # electrolyzers to technology (e2t)
-    e2t = defaultdict(list)
-    for gt,el in mTEPES.gt*mTEPES.el:
-        if (gt,el) in mTEPES.t2g:
-            e2t[gt].append(el)
-
-    sPSNARND   = [(p,sc,n,ar,nd)    for p,sc,n,ar,nd    in mTEPES.psnar*mTEPES.nd if sum(1 for el in e2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd]) and (nd,ar) in mTEPES.ndar]
-    sPSNARNDGT = [(p,sc,n,ar,nd,gt) for p,sc,n,ar,nd,gt in sPSNARND*mTEPES.gt     if sum(1 for el in e2t[gt])                                                             and (nd,ar) in mTEPES.ndar]
-
-    OutputResults2 = pd.Series(data=[ sum(OptModel.vESSTotalCharge[p,sc,n,el      ]()*mTEPES.pDuration[n]()/mTEPES.pProductionFunctionH2[el] for el in mTEPES.el if (nd,el) in mTEPES.n2g and (gt,el) in mTEPES.t2g) for p,sc,n,ar,nd,gt in sPSNARNDGT], index=pd.Index(sPSNARNDGT)).to_frame(name='Generation'       ).reset_index().pivot_table(index=['level_0','level_1','level_2','level_3','level_4'], columns='level_5', values='Generation', aggfunc='sum')
-    OutputResults3 = pd.Series(data=[     OptModel.vHNS           [p,sc,n,nd      ]()                                                                                                                                for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='HydrogenNotServed')
-    OutputResults4 = pd.Series(data=[-      mTEPES.pDemandH2      [p,sc,n,nd      ]  *mTEPES.pDuration[n]()                                                                                                          for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='HydrogenDemand'   )
-    OutputResults5 = pd.Series(data=[-sum(OptModel.vFlowH2        [p,sc,n,nd,lout ]()                                                        for lout  in lout[nd])                                                  for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='HydrogenFlowOut'  )
-    OutputResults6 = pd.Series(data=[ sum(OptModel.vFlowH2        [p,sc,n,ni,nd,cc]()                                                        for ni,cc in lin [nd])                                                  for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='HydrogenFlowIn'   )
+    # nodes with any electrolyzer or pipeline connected, and technologies of the electrolyzers
+    sND        = set(nd for nd,el in mTEPES.n2g if el in mTEPES.el) | set(ni for ni,nf,cc in mTEPES.pa) | set(nf for ni,nf,cc in mTEPES.pa)
+    sGT        = set(AggregationLabels(mTEPES, 'g2gt', list(mTEPES.el)))
+    sGT        = [gt for gt in mTEPES.gt if gt in sGT]
+    sPSNARND   = NodeAreaIndex(mTEPES, sND)
+    sPSNEL     = [(p,sc,n,el) for p,sc,n,el in mTEPES.psneh if el in mTEPES.el]
+    FlowH2     = pd.Series(data=SolutionValues(mTEPES, 'vFlowH2', mTEPES.psnpa), index=pd.MultiIndex.from_tuples(mTEPES.psnpa))
+
+    OutputResults2 = NodeTechnologyValues(mTEPES, pd.Series(data=SolutionValues(mTEPES, 'vESSTotalCharge', sPSNEL) * [mTEPES.pDuration[n]()/mTEPES.pProductionFunctionH2[el] for p,sc,n,el in sPSNEL], index=pd.MultiIndex.from_tuples(sPSNEL) if len(sPSNEL) else None, dtype='float64'), sPSNARND, sGT)
+    OutputResults3 = pd.Series(data= SolutionValues(mTEPES, 'vHNS', sPSNARND.droplevel(3)),                                    index=sPSNARND).to_frame(name='HydrogenNotServed')
+    OutputResults4 = pd.Series(data=[-mTEPES.pDemandH2[p,sc,n,nd]*mTEPES.pDuration[n]() for p,sc,n,ar,nd in sPSNARND],          index=sPSNARND).to_frame(name='HydrogenDemand'   )
+    OutputResults5 = (-NodeValues(mTEPES, FlowH2, 3, sPSNARND)).to_frame(name='HydrogenFlowOut')
+    OutputResults6 = ( NodeValues(mTEPES, FlowH2, 4, sPSNARND)).to_frame(name='HydrogenFlowIn' )
     OutputResults  = pd.concat([OutputResults2, OutputResults3, OutputResults4, OutputResults5, OutputResults6], axis=1)
 
     OutputResults.stack().rename_axis(['Period', 'Scenario', 'LoadLevel', 'Area', 'Node', 'Technology'], axis=0).reset_index().rename(columns={0: 'tH2'}, inplace=False).to_csv(_path+'/oT_Result_BalanceHydrogen_'+CaseName+'.csv', index=False, sep=',')
@@ -732,104 +1198,19 @@ def NetworkH2OperationResults(DirName, CaseName, OptModel, mTEPES):
     OutputResults.stack().reset_index().pivot_table(index=['level_0','level_1','level_2'          ,'level_5'], columns='level_4', values=0, aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel', 'Technology'  ], axis=0).to_csv(_path+'/oT_Result_BalanceHydrogenPerNode_'+CaseName+'.csv', sep=',')
     OutputResults.stack().reset_index().pivot_table(index=['level_0','level_1'                    ,'level_5'], columns='level_3', values=0, aggfunc='sum').rename_axis(['Period', 'Scenario'             , 'Technology'  ], axis=0).to_csv(_path+'/oT_Result_BalanceHydrogenPerArea_'+CaseName+'.csv', sep=',')
 
-    OutputToFile = pd.Series(data=[OptModel.vFlowH2[p,sc,n,ni,nf,cc]() for p,sc,n,ni,nf,cc in mTEPES.psnpa], index=pd.Index(mTEPES.psnpa))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vFlowH2', mTEPES.psnpa), index=pd.Index(mTEPES.psnpa))
     OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-    OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='tH2'), values='tH2', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-    OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkFlowH2PerNode_'     +CaseName+'.csv', index=False, sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'tH2', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkFlowH2PerNode_'+CaseName, FillValue=0.0)
 
-    sPSNND = [(p,sc,n,nd) for p,sc,n,nd in mTEPES.psnnd if sum(1 for el in e2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd])]
-    OutputToFile = pd.Series(data=[OptModel.vHNS[p,sc,n,nd]() for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND))
-    OutputToFile.to_frame(name='tH2').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='tH2').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkHNS_'  +CaseName+'.csv', sep=',')
+    sPSNND = [(p,sc,n,nd) for p,sc,n,nd in mTEPES.psnnd if nd in sND]
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vHNS', sPSNND), index=pd.Index(sPSNND))
+    ResultsToFile(mTEPES, OutputToFile, 'tH2', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkHNS_'+CaseName)
 
     # plot hydrogen network map
-    # Sub functions
-    def oT_make_series(_var, _sets, _factor):
-        return pd.Series(data=[_var[p,sc,n,ni,nf,cc]()*_factor for p,sc,n,ni,nf,cc in _sets], index=pd.Index(list(_sets)))
-
-    def oT_selecting_data(p,sc,n):
-        # Nodes data
-        pio.renderers.default = 'chrome'
-
-        loc_df = pd.Series(data=[mTEPES.pNodeLat[i] for i in mTEPES.nd], index=mTEPES.nd).to_frame(name='Lat')
-        loc_df['Lon'   ] =  0.0
-        loc_df['Zone'  ] =  ''
-        loc_df['Demand'] =  0.0
-        loc_df['Size'  ] = 15.0
-
-        for nd,zn in mTEPES.ndzn:
-            loc_df['Lon'   ][nd] = mTEPES.pNodeLon[nd]
-            loc_df['Zone'  ][nd] = zn
-            loc_df['Demand'][nd] = mTEPES.pDemandH2[p,sc,n,nd]
-
-        loc_df = loc_df.reset_index().rename(columns={'Type': 'Scenario'}, inplace=False)
-
-        # Edges data
-        OutputToFile = oT_make_series(OptModel.vFlowH2, mTEPES.psnpa, 1)
-        OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-        OutputToFile = OutputToFile.to_frame(name='tH2')
-
-        # tolerance to consider avoid division by 0
-        pEpsilon = 1e-6
-
-        line_df = pd.DataFrame(data={'NTCFrw': pd.Series(data=[mTEPES.pPipeNTCFrw[i] + pEpsilon for i in mTEPES.pa], index=mTEPES.pa),
-                                     'NTCBck': pd.Series(data=[mTEPES.pPipeNTCBck[i] + pEpsilon for i in mTEPES.pa], index=mTEPES.pa)}, index=mTEPES.pa)
-        line_df['vFlowH2'    ] = 0.0
-        line_df['utilization'] = 0.0
-        line_df['color'      ] = 0.0
-        line_df['width'      ] = 3.0
-        line_df['lon'        ] = 0.0
-        line_df['lat'        ] = 0.0
-        line_df['ni'         ] = 0.0
-        line_df['nf'         ] = 0.0
-        line_df['cc'         ] = 0.0
-
-        line_df = line_df.groupby(level=[0,1]).sum(numeric_only=True)
-        ncolors = 11
-        colors = list(Color('lightgreen').range_to(Color('darkred'), ncolors))
-        colors = ['rgb'+str(x.rgb) for x in colors]
-
-        for ni,nf,cc in mTEPES.pa:
-            line_df['vFlowH2'    ][ni,nf] += OutputToFile['tH2'][p,sc,n,ni,nf,cc]
-            line_df['utilization'][ni,nf]  = max(line_df['vFlowH2'][ni,nf]/line_df['NTCFrw'][ni,nf],-line_df['vFlowH2'][ni,nf]/line_df['NTCBck'][ni,nf])*100.0
-            line_df['lon'        ][ni,nf]  = (mTEPES.pNodeLon[ni]+mTEPES.pNodeLon[nf]) * 0.5
-            line_df['lat'        ][ni,nf]  = (mTEPES.pNodeLat[ni]+mTEPES.pNodeLat[nf]) * 0.5
-            line_df['ni'         ][ni,nf]  = ni
-            line_df['nf'         ][ni,nf]  = nf
-            line_df['cc'         ][ni,nf] += 1
-
-            if   0.0 <= line_df['utilization'][ni,nf] <= 10.0:
-                line_df['color'][ni,nf] = colors[0]
-            if  10.0 <  line_df['utilization'][ni,nf] <= 20.0:
-                line_df['color'][ni,nf] = colors[1]
-            if  20.0 <  line_df['utilization'][ni,nf] <= 30.0:
-                line_df['color'][ni,nf] = colors[2]
-            if  30.0 <  line_df['utilization'][ni,nf] <= 40.0:
-                line_df['color'][ni,nf] = colors[3]
-            if  40.0 <  line_df['utilization'][ni,nf] <= 50.0:
-                line_df['color'][ni,nf] = colors[4]
-            if  50.0 <  line_df['utilization'][ni,nf] <= 60.0:
-                line_df['color'][ni,nf] = colors[5]
-            if  60.0 <  line_df['utilization'][ni,nf] <= 70.0:
-                line_df['color'][ni,nf] = colors[6]
-            if  70.0 <  line_df['utilization'][ni,nf] <= 80.0:
-                line_df['color'][ni,nf] = colors[7]
-            if  80.0 <  line_df['utilization'][ni,nf] <= 90.0:
-                line_df['color'][ni,nf] = colors[8]
-            if  90.0 <  line_df['utilization'][ni,nf] <= 100.0:
-                line_df['color'][ni,nf] = colors[9]
-            if 100.0 <  line_df['utilization'][ni,nf]:
-                line_df['color'][ni,nf] = colors[10]
-
-        # Rounding to decimals
-        line_df = line_df.round(decimals=2)
-
-        return loc_df, line_df
-
     # tolerance to consider avoid division by 0
     pEpsilon = 1e-6
 
     p = list(mTEPES.p)[0]
-    n = list(mTEPES.n)[0]
 
     if len(mTEPES.sc) > 1:
         for scc in mTEPES.sc:
@@ -839,35 +1220,12 @@ def NetworkH2OperationResults(DirName, CaseName, OptModel, mTEPES):
     else:
         sc = list(mTEPES.sc)[0]
 
-    loc_df, line_df = oT_selecting_data(p,sc,n)
-
-    # Making the network
-    # Get node position dict
-    x, y = loc_df['Lon'].values, loc_df['Lat'].values
-    pos_dict = {}
-    for index, iata in enumerate(loc_df['index']):
-        pos_dict[iata] = (x[index], y[index])
-
-    # Setting up the figure
-    token = open(DIR+'/openTEPES.mapbox_token').read()
-
-    fig = go.Figure()
-
-    # Add nodes
-    fig.add_trace(go.Scattermapbox(lat=loc_df['Lat'], lon=loc_df['Lon'], mode='markers', marker=go.scattermapbox.Marker(size=loc_df['Size']*10, sizeref=1.1, sizemode='area', color='LightSkyBlue',), hoverinfo='text', text='<br>Node: ' + loc_df['index'] + '<br>[Lon, Lat]: ' + '(' + loc_df['Lon'].astype(str) + ', ' + loc_df['Lat'].astype(str) + ')' + '<br>Zone: ' + loc_df['Zone'] + '<br>Demand: ' + loc_df['Demand'].astype(str) + ' MW',))
-
-    # Add edges
-    for ni,nf,cc in mTEPES.pa:
-        fig.add_trace(go.Scattermapbox(lon=[pos_dict[ni][0], pos_dict[nf][0]], lat=[pos_dict[ni][1], pos_dict[nf][1]], mode='lines+markers', marker=dict(size=0, showscale=True, colorbar={'title': 'Utilization [%]', 'titleside': 'top', 'thickness': 8, 'ticksuffix': '%'}, colorscale=[[0, 'lightgreen'], [1, 'darkred']], cmin=0, cmax=100,), line=dict(width=line_df['width'][ni,nf], color=line_df['color'][ni,nf]), opacity=1, hoverinfo='text', textposition='middle center',))
-
-    # Add legends related to the lines
-    fig.add_trace(go.Scattermapbox(lat=line_df['lat'], lon=line_df['lon'], mode='markers', marker=go.scattermapbox.Marker(size=20, sizeref=1.1, sizemode='area', color='LightSkyBlue',), opacity=0, hoverinfo='text', text='<br>Line: '+line_df['ni']+' → '+line_df['nf']+'<br># circuits: '+line_df['cc'].astype(str)+'<br>NTC Forward: '+line_df['NTCFrw'].astype(str)+'<br>NTC Backward: '+line_df['NTCBck'].astype(str)+'<br>Power flow: '+line_df['vFlowH2'].astype(str)+'<br>Utilization [%]: '+line_df['utilization'].astype(str),))
-
-    # Setting up the layout
-    fig.update_layout(title={'text': 'Hydrogen Network: '+CaseName+'<br>Period: '+str(p)+'; Scenario: '+str(sc)+'; LoadLevel: '+n, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top'}, font=dict(size=14), hovermode='closest', geo=dict(projection_type='azimuthal equal area', showland=True,), mapbox=dict(style='dark', accesstoken=token, bearing=0, center=dict(lat=(loc_df['Lat'].max()+loc_df['Lat'].min())*0.5, lon=(loc_df['Lon'].max()+loc_df['Lon'].min())*0.5), pitch=0, zoom=5), showlegend=False,)
-
-    # Saving the figure
-    fig.write_html(_path+'/oT_Plot_MapNetworkH2_'+CaseName+'.html')
+    sLoadLevels = MapLoadLevels(mTEPES)
+    Flow   = pd.Series(data=SolutionValues(mTEPES, 'vFlowH2', [(p,sc,n)+pa for n in sLoadLevels for pa in mTEPES.pa]), index=pd.MultiIndex.from_tuples([(n,)+pa for n in sLoadLevels for pa in mTEPES.pa])).groupby(level=[0,1,2]).sum().unstack([1,2])
+    Lines  = pd.DataFrame(data={'NTCFrw': [mTEPES.pPipeNTCFrw[pa] + pEpsilon for pa in mTEPES.pa], 'NTCBck': [mTEPES.pPipeNTCBck[pa] + pEpsilon for pa in mTEPES.pa], 'Circuits': 1}, index=pd.MultiIndex.from_tuples(list(mTEPES.pa))).groupby(level=[0,1]).sum()
+    Lines['Width'] = 3.0
+    Demand = pd.DataFrame(data=[[mTEPES.pDemandH2[p,sc,n,nd] for nd in mTEPES.nd] for n in sLoadLevels], index=sLoadLevels, columns=list(mTEPES.nd))
+    NetworkMapPlot(mTEPES, _path+'/oT_Plot_MapNetworkH2_'+CaseName+'.html', 'Hydrogen Network: '+CaseName, p, sc, Flow, Lines, Demand, 'tH2', None)
 
     PlottingNetMapsTime = time.time() - StartTime
     print('Plotting  hydrogen network maps        ... ', round(PlottingNetMapsTime), 's')
@@ -882,48 +1240,46 @@ def OperationSummaryResults(DirName, CaseName, OptModel, mTEPES):
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
-    # %%  Power balance per period, scenario, and load level
-    # incoming and outgoing lines (lin) (lout) and lines with losses (linl) (loutl)
-    lin   = defaultdict(list)
-    linl  = defaultdict(list)
-    lout  = defaultdict(list)
-    loutl = defaultdict(list)
-    for ni,nf,cc in mTEPES.la:
-        lin  [nf].append((ni,cc))
-        lout [ni].append((nf,cc))
-    for ni,nf,cc in mTEPES.ll:
-        linl [nf].append((ni,cc))
-        loutl[ni].append((nf,cc))
+    # the KPIs are computed as groupby aggregations over the solution snapshot
+    # unit to node (g2nd), unit to technology (g2gt), and load level to stage (n2st)
+    g2nd = {g :nd for nd,g  in mTEPES.n2g}
+    g2gt = {g :gt for gt,g  in mTEPES.t2g}
+    n2st = {n :st for st,n  in mTEPES.s2n}
+    sRE  = set(mTEPES.re)
+    sGC  = set(mTEPES.gc)
 
-    # generators to nodes (g2n)
-    g2n = defaultdict(list)
-    for nd,g in mTEPES.n2g:
-        g2n[nd].append(g)
+    sPSNG         = pd.MultiIndex.from_tuples(mTEPES.psng)
+    pDuration     = pd.Series(data=[mTEPES.pLoadLevelDuration[n]() for n in mTEPES.n], index=list(mTEPES.n), dtype='float64')
+    UnitDuration  = pDuration.reindex(sPSNG.get_level_values(2)).values
+    UnitName      = sPSNG.get_level_values(3)
+    UnitEnergy    = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng) * UnitDuration, index=sPSNG)
 
     # Ratio Fossil Fuel Generation/Total Generation [%]
-    TotalGeneration       = sum(OptModel.vTotalOutput[p,sc,n,g ]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng                 )
-    FossilFuelGeneration  = sum(OptModel.vTotalOutput[p,sc,n,g ]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng if g in mTEPES.t)
+    TotalGeneration       = UnitEnergy.sum()
+    FossilFuelGeneration  = UnitEnergy[UnitName.isin(list(mTEPES.t))].sum()
     # Ratio Total Investments [%]
-    TotalInvestmentCost   = sum(mTEPES.pDiscountedWeight[p] *                                   OptModel.vTotalFCost      [p]()          for p          in mTEPES.p  if len(mTEPES.gc) + len(mTEPES.gd) + len(mTEPES.lc))
-    GenInvestmentCost     = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pGenInvestCost[gc]       * OptModel.vGenerationInvest[p,gc]()       for p,gc       in mTEPES.pgc)
-    GenRetirementCost     = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pGenRetireCost[gd]       * OptModel.vGenerationRetire[p,gd]()       for p,gd       in mTEPES.pgd)
+    TotalInvestmentCost   = sum(mTEPES.pDiscountedWeight[p] * OptModel.vTotalFCost[p]() for p in mTEPES.p if len(mTEPES.gc) + len(mTEPES.gd) + len(mTEPES.lc))
+    GenInvestmentCost     = (SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc) * [mTEPES.pDiscountedWeight[p] * mTEPES.pGenInvestCost[gc]       for p,gc       in mTEPES.pgc]).sum()
+    GenRetirementCost     = (SolutionValues(mTEPES, 'vGenerationRetire', mTEPES.pgd) * [mTEPES.pDiscountedWeight[p] * mTEPES.pGenRetireCost[gd]       for p,gd       in mTEPES.pgd]).sum()
     if mTEPES.pIndHydroTopology == 1:
-        RsrInvestmentCost = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pRsrInvestCost[rc]       * OptModel.vReservoirInvest [p,rc]()       for p,rc       in mTEPES.prc)
+        RsrInvestmentCost = (SolutionValues(mTEPES, 'vReservoirInvest',  mTEPES.prc) * [mTEPES.pDiscountedWeight[p] * mTEPES.pRsrInvestCost[rc]       for p,rc       in mTEPES.prc]).sum()
     else:
         RsrInvestmentCost = 0.0
-    NetInvestmentCost     = sum(mTEPES.pDiscountedWeight[p] * mTEPES.pNetFixedCost [ni,nf,cc] * OptModel.vNetworkInvest   [p,ni,nf,cc]() for p,ni,nf,cc in mTEPES.plc)
+    NetInvestmentCost     = (SolutionValues(mTEPES, 'vNetworkInvest',    mTEPES.plc) * [mTEPES.pDiscountedWeight[p] * mTEPES.pNetFixedCost [ni,nf,cc] for p,ni,nf,cc in mTEPES.plc]).sum()
     # Ratio Generation Investment cost/ Generation Installed Capacity [MEUR-MW]
-    GenInvCostCapacity    = sum(mTEPES.pGenInvestCost[gc] * OptModel.vGenerationInvest[p,gc]()/mTEPES.pRatedMaxPower[gc]               for p,gc       in mTEPES.pgc if mTEPES.pRatedMaxPower[gc])
+    GenInvCostCapacity    = (SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc) * [mTEPES.pGenInvestCost[gc]/mTEPES.pRatedMaxPower[gc] if mTEPES.pRatedMaxPower[gc] else 0.0 for p,gc in mTEPES.pgc]).sum()
     # Ratio Additional Transmission Capacity-Length [MW-km]
-    NetCapacityLength     = sum(mTEPES.pLineNTCMax[ni,nf,cc]*OptModel.vNetworkInvest[p,ni,nf,cc]()/mTEPES.pLineLength[ni,nf,cc]()      for p,ni,nf,cc in mTEPES.plc)
+    NetCapacityLength     = (SolutionValues(mTEPES, 'vNetworkInvest',    mTEPES.plc) * [mTEPES.pLineNTCMax[ni,nf,cc]/mTEPES.pLineLength[ni,nf,cc]()     for p,ni,nf,cc in mTEPES.plc]).sum()
     # Ratio Network Investment Cost/Variable RES Injection [EUR/MWh]
-    if len(mTEPES.gc) and sum(OptModel.vTotalOutput[p,sc,n,gc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,gc in mTEPES.psngc if gc in mTEPES.re):
-        NetInvCostVRESInsCap = NetInvestmentCost*1e6/sum(OptModel.vTotalOutput[p,sc,n,gc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,gc in mTEPES.psngc if gc in mTEPES.re)
+    VRECandGeneration     = UnitEnergy[UnitName.isin(list(sGC & sRE))].sum()
+    if len(mTEPES.gc) and VRECandGeneration:
+        NetInvCostVRESInsCap = NetInvestmentCost*1e6/VRECandGeneration
     else:
         NetInvCostVRESInsCap = 0.0
-    # Rate of return for VRE technologies
-    VRETechRevenue     = sum(mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vTotalOutput[p,sc,n,gc]() for p,sc,st,n,nd,gc in mTEPES.ps*mTEPES.s2n*mTEPES.nd*mTEPES.gc if (nd,gc) in mTEPES.n2g and gc in mTEPES.re and sum(1 for g in g2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd]))
-    VREInvCostCapacity = sum(mTEPES.pGenInvestCost[gc]*OptModel.vGenerationInvest[p,gc]() for p,gc in mTEPES.pgc if gc in mTEPES.re)
+    # Rate of return for VRE technologies: candidate VRE output valued at the marginal cost of its node
+    sPSNGC             = [(p,sc,n,gc) for p,sc,n,gc in mTEPES.psngc if gc in sRE]
+    VRETechRevenue     = (DualValues(mTEPES, 'eBalance', [(p,sc,n2st[n],n,g2nd[gc]) for p,sc,n,gc in sPSNGC]) * SolutionValues(mTEPES, 'vTotalOutput', sPSNGC) / [mTEPES.pPeriodProb[p,sc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,gc in sPSNGC]).sum()
+    VREInvCostCapacity = (SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc) * [mTEPES.pGenInvestCost[gc] if gc in sRE else 0.0 for p,gc in mTEPES.pgc]).sum()
 
     K1     = pd.Series(data={'Ratio Fossil Fuel Generation/Total Generation [%]'                       : FossilFuelGeneration / TotalGeneration    *1e2}).to_frame(name='Value')
     if GenInvestmentCost:
@@ -964,8 +1320,9 @@ def OperationSummaryResults(DirName, CaseName, OptModel, mTEPES):
 
     # LCOE per technology
     if len(mTEPES.gc):
-        GenTechInvestCost = pd.Series(data=[sum(OptModel.vGenerationInvest[p,     gc]()*mTEPES.pGenInvestCost    [gc]   for p,     gc in mTEPES.pgc   if (gt,gc) in mTEPES.t2g) for gt in mTEPES.gt], index=mTEPES.gt)
-        GenTechInjection  = pd.Series(data=[sum(OptModel.vTotalOutput     [p,sc,n,gc]()*mTEPES.pLoadLevelDuration[n ]() for p,sc,n,gc in mTEPES.psngc if (gt,gc) in mTEPES.t2g) for gt in mTEPES.gt], index=mTEPES.gt)
+        GenTechInvestCost = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', mTEPES.pgc) * [mTEPES.pGenInvestCost[gc] for p,gc in mTEPES.pgc], index=[g2gt[gc] for p,gc in mTEPES.pgc], dtype='float64').groupby(level=0).sum().reindex(list(mTEPES.gt), fill_value=0.0)
+        CandUnit          = UnitName.isin(list(sGC))
+        GenTechInjection  = UnitEnergy[CandUnit].groupby(UnitName[CandUnit].map(g2gt).values).sum().reindex(list(mTEPES.gt), fill_value=0.0)
         GenTechInvestCost *= 1e3
         LCOE = GenTechInvestCost.div(GenTechInjection).to_frame(name='EUR/MWh')
         LCOE.rename_axis(['Technology'], axis=0).to_csv(_path+'/oT_Result_TechnologyLCOE_'+CaseName+'.csv', index=True, sep=',')
@@ -980,25 +1337,26 @@ def OperationSummaryResults(DirName, CaseName, OptModel, mTEPES):
     a2g = pd.DataFrame(mTEPES.a2g).set_index(1)
     r2g = pd.DataFrame(mTEPES.r2g).set_index(1)
     t2g = pd.DataFrame(mTEPES.t2g).set_index(1)
-    OutputToFile01 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]()                                                                      for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='EnergyProduction [GWh]' )
-    OutputToFile02 = pd.Series(data=[OptModel.vESSTotalCharge[p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]()                                           if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='EnergyConsumption [GWh]')
-    OutputToFile03 = pd.Series(data=[n2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Node'                   )
-    OutputToFile04 = pd.Series(data=[z2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Zone'                   )
-    OutputToFile05 = pd.Series(data=[a2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Area'                   )
-    OutputToFile06 = pd.Series(data=[r2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Region'                 )
-    OutputToFile07 = pd.Series(data=[t2g[0][g]                                                                                                                                for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Technology'             )
-    OutputToFile08 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]()*mTEPES.pEmissionVarCost[p,sc,n,g]/mTEPES.pCO2Cost()                  for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Emissions [MtCO2]'      )
-    OutputToFile09 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g].ub                                                                                                    for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='MaxPower [MW]'          )
-    OutputToFile10 = pd.Series(data=[OptModel.vTotalOutput   [p,sc,n,g].lb                                                                                                    for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='MinPower [MW]'          )
-    OutputToFile11 = pd.Series(data=[mTEPES.pLoadLevelDuration[n]()                                                                                                           for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='LoadLevelDuration [h]'  )
-    OutputToFile12 = pd.Series(data=[OptModel.vCommitment    [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Commitment {0,1}'       )
-    OutputToFile13 = pd.Series(data=[OptModel.vStartUp       [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='StartUp {0,1}'          )
-    OutputToFile14 = pd.Series(data=[OptModel.vShutDown      [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='Shutdown {0,1}'         )
-    OutputToFile15 = pd.Series(data=[OptModel.vReserveUp     [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ReserveUp [MW]'         )
-    OutputToFile16 = pd.Series(data=[OptModel.vReserveDown   [p,sc,n,g]()                                                                          if g in mTEPES.nr else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ReserveDown [MW]'       )
-    OutputToFile17 = pd.Series(data=[OptModel.vESSReserveUp  [p,sc,n,g]()                                                                          if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ESSReserveUp [MW]'      )
-    OutputToFile18 = pd.Series(data=[OptModel.vESSReserveDown[p,sc,n,g]()                                                                          if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ESSReserveDown [MW]'    )
-    OutputToFile19 = pd.Series(data=[OptModel.vESSSpillage   [p,sc,n,g]()                                                                          if g in mTEPES.es else 0.0 for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng)).to_frame(name='ESSSpillage [GWh]'      )
+    # variables not defined for a unit (e.g., commitment of a renewable unit) are reported as zero
+    OutputToFile01 = UnitEnergy.to_frame(name='EnergyProduction [GWh]' )
+    OutputToFile02 = pd.Series(data=SolutionValues(mTEPES, 'vESSTotalCharge', mTEPES.psng) * UnitDuration,                                                                                index=sPSNG).fillna(0.0).to_frame(name='EnergyConsumption [GWh]')
+    OutputToFile03 = pd.Series(data=n2g[0].reindex(UnitName).values,                                                                                                                     index=sPSNG).to_frame(name='Node'                   )
+    OutputToFile04 = pd.Series(data=z2g[0].reindex(UnitName).values,                                                                                                                     index=sPSNG).to_frame(name='Zone'                   )
+    OutputToFile05 = pd.Series(data=a2g[0].reindex(UnitName).values,                                                                                                                     index=sPSNG).to_frame(name='Area'                   )
+    OutputToFile06 = pd.Series(data=r2g[0].reindex(UnitName).values,                                                                                                                     index=sPSNG).to_frame(name='Region'                 )
+    OutputToFile07 = pd.Series(data=t2g[0].reindex(UnitName).values,                                                                                                                     index=sPSNG).to_frame(name='Technology'             )
+    OutputToFile08 = pd.Series(data=UnitEnergy.values * [mTEPES.pEmissionVarCost[p,sc,n,g]/mTEPES.pCO2Cost() for p,sc,n,g in mTEPES.psng],                                               index=sPSNG).to_frame(name='Emissions [MtCO2]'      )
+    OutputToFile09 = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,g].ub for p,sc,n,g in mTEPES.psng],                                                                                     index=sPSNG).to_frame(name='MaxPower [MW]'          )
+    OutputToFile10 = pd.Series(data=[OptModel.vTotalOutput[p,sc,n,g].lb for p,sc,n,g in mTEPES.psng],                                                                                     index=sPSNG).to_frame(name='MinPower [MW]'          )
+    OutputToFile11 = pd.Series(data=UnitDuration,                                                                                                                                         index=sPSNG).to_frame(name='LoadLevelDuration [h]'  )
+    OutputToFile12 = pd.Series(data=SolutionValues(mTEPES, 'vCommitment',     mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='Commitment {0,1}'       )
+    OutputToFile13 = pd.Series(data=SolutionValues(mTEPES, 'vStartUp',        mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='StartUp {0,1}'          )
+    OutputToFile14 = pd.Series(data=SolutionValues(mTEPES, 'vShutDown',       mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='Shutdown {0,1}'         )
+    OutputToFile15 = pd.Series(data=SolutionValues(mTEPES, 'vReserveUp',      mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='ReserveUp [MW]'         )
+    OutputToFile16 = pd.Series(data=SolutionValues(mTEPES, 'vReserveDown',    mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='ReserveDown [MW]'       )
+    OutputToFile17 = pd.Series(data=SolutionValues(mTEPES, 'vESSReserveUp',   mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='ESSReserveUp [MW]'      )
+    OutputToFile18 = pd.Series(data=SolutionValues(mTEPES, 'vESSReserveDown', mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='ESSReserveDown [MW]'    )
+    OutputToFile19 = pd.Series(data=SolutionValues(mTEPES, 'vESSSpillage',    mTEPES.psng),                                                                                               index=sPSNG).fillna(0.0).to_frame(name='ESSSpillage [GWh]'      )
 
     OutputToFile15 *= 1e3
     OutputToFile16 *= 1e3
@@ -1013,18 +1371,29 @@ def OperationSummaryResults(DirName, CaseName, OptModel, mTEPES):
     StartTime = time.time()
     print('Writing   generation summary results   ... ', round(WritingResultsTime), 's')
 
-    ndzn = pd.DataFrame(mTEPES.ndzn).set_index(0)
-    ndar = pd.DataFrame(mTEPES.ndar).set_index(0)
-    sPSNND = [(p,sc,n,nd) for p,sc,n,nd in mTEPES.psnnd if sum(1 for g in g2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd])]
-    OutputResults1     = pd.Series(data=[ ndzn[1][nd]                                                                                        for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='Zone'               )
-    OutputResults2     = pd.Series(data=[ ndar[1][nd]                                                                                        for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='Area'               )
-    OutputResults3     = pd.Series(data=[     OptModel.vENS       [p,sc,n,nd      ]()*mTEPES.pLoadLevelDuration[n]()                         for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='ENS [GWh]'          )
-    OutputResults4     = pd.Series(data=[-      mTEPES.pDemand    [p,sc,n,nd      ]  *mTEPES.pLoadLevelDuration[n]()                         for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='PowerDemand [GWh]'  )
-    OutputResults5     = pd.Series(data=[-sum(OptModel.vFlow      [p,sc,n,nd,lout ]()*mTEPES.pLoadLevelDuration[n]() for lout  in lout [nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='PowerFlowOut [GWh]' )
-    OutputResults6     = pd.Series(data=[ sum(OptModel.vFlow      [p,sc,n,ni,nd,cc]()*mTEPES.pLoadLevelDuration[n]() for ni,cc in lin  [nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='PowerFlowIn [GWh]'  )
+    # nodes with any unit or line connected
+    sND    = set(g2nd.values()) | set(ni for ni,nf,cc in mTEPES.la) | set(nf for ni,nf,cc in mTEPES.la)
+    ndzn   = pd.DataFrame(mTEPES.ndzn).set_index(0)
+    ndar   = pd.DataFrame(mTEPES.ndar).set_index(0)
+    sPSNND = pd.MultiIndex.from_tuples([(p,sc,n,nd) for p,sc,n,nd in mTEPES.psnnd if nd in sND])
+    NodeName     = sPSNND.get_level_values(3)
+    NodeDuration = pDuration.reindex(sPSNND.get_level_values(2)).values
+
+    # flows and losses are summed by sending (level 3) or receiving (level 4) node of each line
+    def NodeSum(Name, sIndex, Level):
+        if len(sIndex) == 0:
+            return pd.Series(0.0, index=sPSNND)
+        return pd.Series(data=SolutionValues(mTEPES, Name, sIndex), index=pd.MultiIndex.from_tuples(sIndex)).groupby(level=[0,1,2,Level]).sum().reindex(sPSNND, fill_value=0.0)
+
+    OutputResults1     = pd.Series(data=ndzn[1].reindex(NodeName).values,                                                                  index=sPSNND).to_frame(name='Zone'               )
+    OutputResults2     = pd.Series(data=ndar[1].reindex(NodeName).values,                                                                  index=sPSNND).to_frame(name='Area'               )
+    OutputResults3     = pd.Series(data= SolutionValues(mTEPES, 'vENS', sPSNND) * NodeDuration,                                            index=sPSNND).to_frame(name='ENS [GWh]'          )
+    OutputResults4     = pd.Series(data=[-mTEPES.pDemand[p,sc,n,nd] for p,sc,n,nd in sPSNND] * NodeDuration,                               index=sPSNND).to_frame(name='PowerDemand [GWh]'  )
+    OutputResults5     = (-NodeSum('vFlow',       mTEPES.psnla, 3) * NodeDuration).to_frame(name='PowerFlowOut [GWh]' )
+    OutputResults6     = ( NodeSum('vFlow',       mTEPES.psnla, 4) * NodeDuration).to_frame(name='PowerFlowIn [GWh]'  )
     if len(mTEPES.ll):
-        OutputResults7 = pd.Series(data=[-sum(OptModel.vLineLosses[p,sc,n,nd,lout ]()*mTEPES.pLoadLevelDuration[n]() for lout  in loutl[nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='LineLossesOut [GWh]')
-        OutputResults8 = pd.Series(data=[-sum(OptModel.vLineLosses[p,sc,n,ni,nd,cc]()*mTEPES.pLoadLevelDuration[n]() for ni,cc in linl [nd]) for p,sc,n,nd in sPSNND], index=pd.Index(sPSNND)).to_frame(name='LineLossesIn [GWh]' )
+        OutputResults7 = (-NodeSum('vLineLosses', mTEPES.psnll, 3) * NodeDuration).to_frame(name='LineLossesOut [GWh]')
+        OutputResults8 = (-NodeSum('vLineLosses', mTEPES.psnll, 4) * NodeDuration).to_frame(name='LineLossesIn [GWh]' )
 
         OutputResults  = pd.concat([OutputResults1, OutputResults2, OutputResults3, OutputResults4, OutputResults5, OutputResults6, OutputResults7, OutputResults8], axis=1)
     else:
@@ -1041,45 +1410,27 @@ def FlexibilityResults(DirName, CaseName, OptModel, mTEPES):
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
-    # generators to technology (e2o)
-    e2o = defaultdict(list)
-    for ot,es in mTEPES.ot*mTEPES.es:
-        if (ot,es) in mTEPES.t2g:
-            e2o[ot].append(es)
-
-    # generators to technology (g2t)
-    g2t = defaultdict(list)
-    for gt,g  in mTEPES.t2g:
-        g2t[gt].append(g)
-
-    sPSNGT               = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for g in g2t[gt])]
-    OutputToFile         = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,g]() for g in mTEPES.g if (gt,g) in mTEPES.t2g) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-    OutputToFile *= 1e3
-    TechnologyOutput     = OutputToFile.loc[:,:,:,:]
-    MeanTechnologyOutput = OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).mean()
-    NetTechnologyOutput  = pd.Series([0.0]*len(sPSNGT), index=pd.Index(sPSNGT))
-    for p,sc,n,gt in sPSNGT:
-        NetTechnologyOutput[p,sc,n,gt] = TechnologyOutput[p,sc,n,gt] - MeanTechnologyOutput[gt]
-    NetTechnologyOutput.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_FlexibilityTechnology_'+CaseName+'.csv', sep=',')
+    # output of each technology with respect to its mean output
+    TechnologyOutput     = AggregatedValues(mTEPES, pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng), index=pd.Index(mTEPES.psng)), 3, 'g2gt')
+    TechnologyOutput    *= 1e3
+    MeanTechnologyOutput = TechnologyOutput.groupby(level=3).mean()
+    NetTechnologyOutput  = TechnologyOutput - MeanTechnologyOutput.reindex(TechnologyOutput.index.get_level_values(3)).values
+    ResultsToFile(mTEPES, NetTechnologyOutput, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_FlexibilityTechnology_'+CaseName, 'sum')
 
     if len(mTEPES.es):
-        ESSTechnologies = [(p,sc,n,ot) for p,sc,n,ot in mTEPES.psnot if sum(1 for es in e2o[ot])]
-        OutputToFile = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,es]() for es in e2o[ot]) for p,sc,n,ot in ESSTechnologies], index=pd.Index(ESSTechnologies))
-        OutputToFile *= 1e3
-        ESSTechnologyOutput     = -OutputToFile.loc[:,:,:,:]
-        MeanESSTechnologyOutput = -OutputToFile.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).mean()
-        NetESSTechnologyOutput  = pd.Series([0.0] * len(ESSTechnologies), index=pd.Index(ESSTechnologies))
-        for p,sc,n,gt in ESSTechnologies:
-            NetESSTechnologyOutput[p,sc,n,gt] = MeanESSTechnologyOutput[gt] - ESSTechnologyOutput[p,sc,n,gt]
-        NetESSTechnologyOutput.to_frame(name='MW').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_FlexibilityTechnologyESS_'+CaseName+'.csv', sep=',')
-
-    MeanDemand   = pd.Series(data=[sum(mTEPES.pDemand[p,sc,n,nd] for nd in mTEPES.nd)              for p,sc,n in mTEPES.psn], index=pd.Index(mTEPES.psn)).mean()
-    OutputToFile = pd.Series(data=[sum(mTEPES.pDemand[p,sc,n,nd] for nd in mTEPES.nd) - MeanDemand for p,sc,n in mTEPES.psn], index=pd.Index(mTEPES.psn))
+        ESSTechnologyOutput     = -AggregatedValues(mTEPES, pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psnes), index=pd.Index(mTEPES.psnes)), 3, 'g2gt')
+        ESSTechnologyOutput    *= 1e3
+        MeanESSTechnologyOutput = ESSTechnologyOutput.groupby(level=3).mean()
+        NetESSTechnologyOutput  = MeanESSTechnologyOutput.reindex(ESSTechnologyOutput.index.get_level_values(3)).values - ESSTechnologyOutput
+        ResultsToFile(mTEPES, NetESSTechnologyOutput, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_FlexibilityTechnologyESS_'+CaseName, 'sum')
+
+    OutputToFile = pd.Series(data=[mTEPES.pDemand[p,sc,n,nd] for p,sc,n,nd in mTEPES.psnnd], index=pd.MultiIndex.from_tuples(mTEPES.psnnd)).groupby(level=[0,1,2]).sum()
+    OutputToFile = OutputToFile - OutputToFile.mean()
     OutputToFile *= 1e3
     OutputToFile.to_frame(name='Demand').reset_index().pivot_table(index=['level_0','level_1','level_2']).rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_FlexibilityDemand_'+CaseName+'.csv', sep=',')
 
-    MeanENS      = pd.Series(data=[sum(OptModel.vENS[p,sc,n,nd]() for nd in mTEPES.nd)           for p,sc,n in mTEPES.psn], index=pd.Index(mTEPES.psn)).mean()
-    OutputToFile = pd.Series(data=[sum(OptModel.vENS[p,sc,n,nd]() for nd in mTEPES.nd) - MeanENS for p,sc,n in mTEPES.psn], index=pd.Index(mTEPES.psn))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vENS', mTEPES.psnnd), index=pd.MultiIndex.from_tuples(mTEPES.psnnd)).groupby(level=[0,1,2]).sum()
+    OutputToFile = OutputToFile - OutputToFile.mean()
     OutputToFile *= 1e3
     OutputToFile.to_frame(name='PNS').reset_index().pivot_table(index=['level_0','level_1','level_2']).rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_FlexibilityPNS_'   +CaseName+'.csv', sep=',')
 
@@ -1095,38 +1446,33 @@ def NetworkOperationResults(DirName, CaseName, OptModel, mTEPES):
 
     if sum(mTEPES.pIndBinLineSwitch[:, :, :]):
         if len(mTEPES.lc):
-            OutputToFile = pd.Series(data=[OptModel.vLineCommit  [p,sc,n,ni,nf,cc]() for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
+            OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vLineCommit', mTEPES.psnla), index=pd.Index(mTEPES.psnla))
             OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-            OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='p.u.'), values='p.u.', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-            OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkCommitment_'+CaseName+'.csv', index=False, sep=',')
-        OutputToFile = pd.Series(data=[OptModel.vLineOnState [p,sc,n,ni,nf,cc]() for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
+            ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkCommitment_'+CaseName, FillValue=0.0)
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vLineOnState', mTEPES.psnla), index=pd.Index(mTEPES.psnla))
         OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-        OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='p.u.'), values='p.u.', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-        OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkSwitchOn_'  +CaseName+'.csv', index=False, sep=',')
-        OutputToFile = pd.Series(data=[OptModel.vLineOffState[p,sc,n,ni,nf,cc]() for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
+        ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkSwitchOn_'+CaseName, FillValue=0.0)
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vLineOffState', mTEPES.psnla), index=pd.Index(mTEPES.psnla))
         OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-        OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='p.u.'), values='p.u.', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-        OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkSwitchOff_' +CaseName+'.csv', index=False, sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkSwitchOff_'+CaseName, FillValue=0.0)
 
-    OutputToFile = pd.Series(data=[OptModel.vFlow[p,sc,n,ni,nf,cc]() for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vFlow', mTEPES.psnla), index=pd.Index(mTEPES.psnla))
     OutputToFile *= 1e3
     OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-    OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='MW'), values='MW', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-    OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkFlowPerNode_'       +CaseName+'.csv', index=False, sep=',')
-
-    PSNLAARAR = [(p,sc,n,ni,nf,cc,ai,af) for p,sc,n,ni,nf,cc,ai,af in mTEPES.psnla*mTEPES.ar*mTEPES.ar if (ni,ai) in mTEPES.ndar and (nf,af) in mTEPES.ndar]
-    OutputToFile = pd.Series(data=[OptModel.vFlow[p,sc,n,ni,nf,cc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,ni,nf,cc,ai,af in PSNLAARAR], index=pd.Index(PSNLAARAR))
+    ResultsToFile(mTEPES, OutputToFile, 'MW', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkFlowPerNode_'+CaseName, FillValue=0.0)
+
+    # areas of the initial and final nodes of each line from the aggregation index, lines with nodes without area are excluded
+    sLine        = pd.MultiIndex.from_tuples([(ni,nf,cc) for p,sc,n,ni,nf,cc in mTEPES.psnla])
+    InitialArea  = AggregationLabels(mTEPES, 'la2ai', sLine)
+    FinalArea    = AggregationLabels(mTEPES, 'la2af', sLine)
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vFlow', mTEPES.psnla) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.MultiIndex.from_arrays(list(zip(*mTEPES.psnla)) + [InitialArea, FinalArea]))
+    OutputToFile = OutputToFile[~(pd.isna(InitialArea) | pd.isna(FinalArea))]
     OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit', 'InitialArea', 'FinalArea']
-    OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='GWh'), values='GWh', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialArea', 'FinalArea'], fill_value=0.0).rename_axis([None, None], axis=1)
-    OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkEnergyPerArea_'+CaseName+'.csv', index=False, sep=',')
-
-    OutputToFile = pd.Series(data=[OptModel.vFlow[p,sc,n,ni,nf,cc]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,ni,nf,cc,ai,af in PSNLAARAR], index=pd.Index(PSNLAARAR))
-    OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit', 'InitialArea', 'FinalArea']
-    OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='GWh'), values='GWh', index=['Period', 'Scenario'], columns=['InitialArea', 'FinalArea'], fill_value=0.0).rename_axis([None, None], axis=1)
-    OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkEnergyTotalPerArea_'+CaseName+'.csv', index=False, sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'GWh', ['Period', 'Scenario', 'LoadLevel'], ['InitialArea', 'FinalArea'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkEnergyPerArea_'+CaseName, FillValue=0.0)
+    ResultsToFile(mTEPES, OutputToFile, 'GWh', ['Period', 'Scenario'             ], ['InitialArea', 'FinalArea'], ['Period', 'Scenario'             ], _path+'/oT_Result_NetworkEnergyTotalPerArea_'+CaseName, FillValue=0.0)
 
     if len(mTEPES.la):
-        OutputResults = pd.Series(data=[OptModel.vFlow[p,sc,n,ni,nf,cc]()*(mTEPES.pDuration[n]()*mTEPES.pLoadLevelWeight[n]()*mTEPES.pPeriodWeight[p]()*mTEPES.pScenProb[p,sc]())*(mTEPES.pLineLength[ni,nf,cc]()*1e-3) for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
+        OutputResults = pd.Series(data=SolutionValues(mTEPES, 'vFlow', mTEPES.psnla) * [(mTEPES.pDuration[n]()*mTEPES.pLoadLevelWeight[n]()*mTEPES.pPeriodWeight[p]()*mTEPES.pScenProb[p,sc]())*(mTEPES.pLineLength[ni,nf,cc]()*1e-3) for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
         OutputResults.index.names = ['Scenario', 'Period', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
         OutputResults = OutputResults.reset_index().groupby(['InitialNode', 'FinalNode', 'Circuit']).sum(numeric_only=True)[0]
         OutputResults.to_frame(name='GWh-Mkm').rename_axis(['InitialNode', 'FinalNode', 'Circuit'], axis=0).reset_index().to_csv(_path+'/oT_Result_NetworkEnergyTransport_'+CaseName+'.csv', index=False, sep=',')
@@ -1136,24 +1482,22 @@ def NetworkOperationResults(DirName, CaseName, OptModel, mTEPES):
 
     OutputToFile = pd.Series(data=[max(OptModel.vFlow[p,sc,n,ni,nf,cc]()/(mTEPES.pLineNTCFrw[ni,nf,cc]+pEpsilon),-OptModel.vFlow[p,sc,n,ni,nf,cc]()/(mTEPES.pLineNTCBck[ni,nf,cc]+pEpsilon)) for p,sc,n,ni,nf,cc in mTEPES.psnla], index=pd.Index(mTEPES.psnla))
     OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-    OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='p.u.'), values='p.u.', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-    OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkUtilization_'+CaseName+'.csv', index=False, sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkUtilization_'+CaseName, FillValue=0.0)
 
     if mTEPES.pIndBinNetLosses():
-        OutputToFile = pd.Series(data=[OptModel.vLineLosses[p,sc,n,ni,nf,cc]() for p,sc,n,ni,nf,cc in mTEPES.psnll], index=pd.Index(mTEPES.psnll))
+        OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vLineLosses', mTEPES.psnll), index=pd.Index(mTEPES.psnll))
         OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-        OutputToFile = pd.pivot_table(OutputToFile.to_frame(name='p.u.'), values='p.u.', index=['Period', 'Scenario', 'LoadLevel'], columns=['InitialNode', 'FinalNode', 'Circuit'], fill_value=0.0).rename_axis([None, None, None], axis=1)
-        OutputToFile.reset_index().to_csv(_path+'/oT_Result_NetworkLosses_' +CaseName+'.csv', index=False, sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'p.u.', ['Period', 'Scenario', 'LoadLevel'], ['InitialNode', 'FinalNode', 'Circuit'], ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkLosses_'+CaseName, FillValue=0.0)
 
-    OutputToFile = pd.Series(data=[OptModel.vTheta[p,sc,n,nd]()                              for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
-    OutputToFile.to_frame(name='rad').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='rad').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkAngle_'+CaseName+'.csv', sep=',')
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vTheta', mTEPES.psnnd), index=pd.Index(mTEPES.psnnd))
+    ResultsToFile(mTEPES, OutputToFile, 'rad', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkAngle_'+CaseName)
 
-    OutputToFile = pd.Series(data=[OptModel.vENS[p,sc,n,nd]()                            for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vENS', mTEPES.psnnd), index=pd.Index(mTEPES.psnnd))
     OutputToFile *= 1e3
-    OutputToFile.to_frame(name='MW' ).reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW' ).rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkPNS_'  +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'MW', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkPNS_'+CaseName)
 
-    OutputToFile = pd.Series(data=[OptModel.vENS[p,sc,n,nd]()*mTEPES.pLoadLevelDuration[n]() for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
-    OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkENS_'  +CaseName+'.csv', sep=',')
+    OutputToFile = pd.Series(data=SolutionValues(mTEPES, 'vENS', mTEPES.psnnd) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
+    ResultsToFile(mTEPES, OutputToFile, 'GWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkENS_'+CaseName)
 
     WritingResultsTime = time.time() - StartTime
     StartTime = time.time()
@@ -1203,13 +1547,13 @@ def MarginalResults(DirName, CaseName, OptModel, mTEPES, pIndPlotOutput):
     IncrementalGens.rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).to_csv(_path+'/oT_Result_MarginalIncrementalGenerator_'+CaseName+'.csv', index=True, sep=',')
 
     OutputToFile = pd.Series(data=[mTEPES.pEmissionRate[g] for p,sc,n,g in sPSNG], index=pd.Index(sPSNG))
-    OutputToFile.to_frame(name='tCO2/MWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='tCO2/MWh').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationIncrementalEmission_'+CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'tCO2/MWh', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationIncrementalEmission_'+CaseName)
 
     #%% outputting the LSRMC
     sPSSTNND      = [(p,sc,st,n,nd) for p,sc,st,n,nd in mTEPES.ps*mTEPES.s2n*mTEPES.nd if sum(1 for g in g2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd])]
-    OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() for p,sc,st,n,nd in sPSSTNND], index=pd.Index(sPSSTNND))
+    OutputResults = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd in sPSSTNND]) * [1.0/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() for p,sc,st,n,nd in sPSSTNND], index=pd.Index(sPSSTNND))
     OutputResults *= 1e3
-    OutputResults.to_frame(name='LSRMC').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='LSRMC').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkSRMC_'+CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputResults, 'LSRMC', ['level_0', 'level_1', 'level_3'], 'level_4', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkSRMC_'+CaseName)
 
     OptModel.LSRMC = OutputResults.to_frame(name='LSRMC').reset_index().pivot_table(index=['level_0','level_1','level_3','level_4'], values='LSRMC').rename_axis(['level_0','level_1','level_2','level_3'], axis=0).loc[:,:,:,:]
 
@@ -1221,19 +1565,19 @@ def MarginalResults(DirName, CaseName, OptModel, mTEPES, pIndPlotOutput):
     if sum(mTEPES.pReserveMargin[:,:]):
         if len(mTEPES.gc):
             sPSSTAR       = [(p,sc,st,ar) for p,sc,st,ar in mTEPES.ps*mTEPES.st*mTEPES.ar if mTEPES.pReserveMargin[p,ar] and sum(1 for g in mTEPES.g if (ar,g) in mTEPES.a2g) and sum(mTEPES.pRatedMaxPower[g] * mTEPES.pAvailability[g]() / (1.0-mTEPES.pEFOR[g]) for g in mTEPES.g if (ar,g) in mTEPES.a2g and g not in (mTEPES.gc or mTEPES.gd)) <= mTEPES.pPeakDemand[p,ar] * mTEPES.pReserveMargin[p,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eAdequacyReserveMargin_", str(p), "_", str(sc), "_", str(st), "(", str(p), ", '", str(ar), "')"])] for p,sc,st,ar in sPSSTAR], index=pd.Index(sPSSTAR))
-            OutputResults.to_frame(name='RM').reset_index().pivot_table(index=['level_0','level_1'], columns='level_3', values='RM').rename_axis(['Period', 'Scenario'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_MarginalReserveMargin_'+CaseName+'.csv', sep=',')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eAdequacyReserveMargin', [(p,sc,st,p,ar) for p,sc,st,ar in sPSSTAR]), index=pd.Index(sPSSTAR))
+            ResultsToFile(mTEPES, OutputResults, 'RM', ['level_0', 'level_1'], 'level_3', ['Period', 'Scenario'], _path+'/oT_Result_MarginalReserveMargin_'+CaseName)
 
     sPSSTAR           = [(p,sc,st,ar) for p,sc,st,ar in mTEPES.ps*mTEPES.st*mTEPES.ar if mTEPES.pEmission[p,ar] < math.inf and sum(1 for g in mTEPES.g if (ar,g) in mTEPES.a2g)]
     if len(sPSSTAR):
-        OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eMaxSystemEmission_", str(p), "_", str(sc), "_", str(st),  "(", str(p), ", '", str(ar), "')"])] for p,sc,st,ar in sPSSTAR], index=pd.Index(sPSSTAR))
-        OutputResults.to_frame(name='EM').reset_index().pivot_table(index=['level_0','level_1'], columns='level_3', values='EM').rename_axis(['Period', 'Scenario'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_MarginalEmission_'+CaseName+'.csv', sep=',')
+        OutputResults = pd.Series(data=DualValues(mTEPES, 'eMaxSystemEmission', [(p,sc,st,p,ar) for p,sc,st,ar in sPSSTAR]), index=pd.Index(sPSSTAR))
+        ResultsToFile(mTEPES, OutputResults, 'EM', ['level_0', 'level_1'], 'level_3', ['Period', 'Scenario'], _path+'/oT_Result_MarginalEmission_'+CaseName)
 
     #%% outputting the up operating reserve marginal
     if sum(mTEPES.pOperReserveUp[:,:,:,:]) and (sum(1 for ar,nr in mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pIndOperReserve[nr] == 0) + sum(1 for ar,es in mTEPES.ar*mTEPES.es if (ar,es) in mTEPES.a2g if mTEPES.pIndOperReserve[es] == 0)):
         sPSSTNAR      = [(p,sc,st,n,ar) for p,sc,st,n,ar in mTEPES.ps*mTEPES.s2n*mTEPES.ar if mTEPES.pOperReserveUp[p,sc,n,ar] and sum(1 for nr in n2a[ar]) + sum(1 for es in e2a[ar])]
-        OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveUp_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])] for p,sc,st,n,ar in sPSSTNAR], index=pd.Index(sPSSTNAR))
-        OutputResults.to_frame(name='UORM').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='UORM').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_MarginalOperatingReserveUp_'+CaseName+'.csv', sep=',')
+        OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveUp', [(p,sc,st,n,ar) for p,sc,st,n,ar in sPSSTNAR]), index=pd.Index(sPSSTNAR))
+        ResultsToFile(mTEPES, OutputResults, 'UORM', ['level_0', 'level_1', 'level_3'], 'level_4', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_MarginalOperatingReserveUp_'+CaseName)
 
         if pIndPlotOutput == 1:
             MarginalUpOperatingReserve = OutputResults.to_frame(name='UORM').reset_index().pivot_table(index=['level_0','level_1','level_3','level_4'], values='UORM').rename_axis(['level_0','level_1','level_2','level_3'], axis=0).loc[:,:,:,:]
@@ -1244,8 +1588,8 @@ def MarginalResults(DirName, CaseName, OptModel, mTEPES, pIndPlotOutput):
     #%% outputting the down operating reserve marginal
     if sum(mTEPES.pOperReserveDw[:,:,:,:]) and (sum(1 for ar,nr in mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g if mTEPES.pIndOperReserve[nr] == 0) + sum(1 for ar,es in mTEPES.ar*mTEPES.es if (ar,es) in mTEPES.a2g if mTEPES.pIndOperReserve[es] == 0)):
         sPSSTNAR      = [(p,sc,st,n,ar) for p,sc,st,n,ar in mTEPES.ps*mTEPES.s2n*mTEPES.ar if mTEPES.pOperReserveDw[p,sc,n,ar] and sum(1 for nr in n2a[ar]) + sum(1 for es in e2a[ar])]
-        OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveDw_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])] for p,sc,st,n,ar in sPSSTNAR], index=pd.Index(sPSSTNAR))
-        OutputResults.to_frame(name='DORM').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='DORM').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_MarginalOperatingReserveDown_'+CaseName+'.csv', sep=',')
+        OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveDw', [(p,sc,st,n,ar) for p,sc,st,n,ar in sPSSTNAR]), index=pd.Index(sPSSTNAR))
+        ResultsToFile(mTEPES, OutputResults, 'DORM', ['level_0', 'level_1', 'level_3'], 'level_4', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_MarginalOperatingReserveDown_'+CaseName)
 
         if pIndPlotOutput == 1:
             MarginalDwOperatingReserve = OutputResults.to_frame(name='DORM').reset_index().pivot_table(index=['level_0','level_1','level_3','level_4'], values='DORM').rename_axis(['level_0','level_1','level_2','level_3'], axis=0).loc[:,:,:,:]
@@ -1257,11 +1601,11 @@ def MarginalResults(DirName, CaseName, OptModel, mTEPES, pIndPlotOutput):
     if len(mTEPES.es):
         OutputResults = []
         sPSSTNES      = [(p,sc,st,n,es) for p,sc,st,n,es in mTEPES.ps*mTEPES.s2n*mTEPES.es if (n,es) in mTEPES.nesc and mTEPES.pMaxCharge[p,sc,n,es] + mTEPES.pMaxPower[p,sc,n,es]]
-        OutputToFile  = pd.Series(data=[-mTEPES.pDuals["".join(["eESSInventory_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(es), "')"])]*1e3 for p,sc,st,n,es in sPSSTNES], index=pd.Index(sPSSTNES))
+        OutputToFile  = pd.Series(data=-DualValues(mTEPES, 'eESSInventory', [(p,sc,st,n,es) for p,sc,st,n,es in sPSSTNES]) * 1e3, index=pd.Index(sPSSTNES))
         OutputResults.append(OutputToFile)
         OutputResults = pd.concat(OutputResults)
         if len(OutputResults.index):
-            OutputResults.to_frame(name='WaterValue').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_4', values='WaterValue').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_MarginalWaterValue_'+CaseName+'.csv', sep=',')
+            ResultsToFile(mTEPES, OutputResults, 'WaterValue', ['level_0', 'level_1', 'level_3'], 'level_4', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_MarginalWaterValue_'+CaseName)
 
         if pIndPlotOutput == 1:
             WaterValue = OutputResults.to_frame(name='WaterValue').reset_index().pivot_table(index=['level_0','level_1','level_3','level_4'], values='WaterValue').rename_axis(['level_0','level_1','level_2','level_3'], axis=0).loc[:,:,:,:]
@@ -1294,46 +1638,42 @@ def ReliabilityResults(DirName, CaseName, OptModel, mTEPES):
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
-    # generators to nodes (r2n)
-    r2n = defaultdict(list)
-    for nd,re in mTEPES.nd*mTEPES.re:
-        if (nd,re) in mTEPES.n2g:
-            r2n[nd].append(re)
+    # renewable units to nodes (re2n)
+    re2n = {re:nd for nd,re in mTEPES.n2g if re in mTEPES.re}
 
-    pDemand        = pd.Series(data=[mTEPES.pDemand  [p,sc,n,nd] for p,sc,n,nd in mTEPES.psnnd ], index=pd.Index(mTEPES.psnnd))
+    pDemand        = pd.Series(data=[mTEPES.pDemand  [p,sc,n,nd] for p,sc,n,nd in mTEPES.psnnd ], index=pd.MultiIndex.from_tuples(mTEPES.psnnd))
     ExistCapacity  = [(p,sc,n,g) for p,sc,n,g in mTEPES.psng if g not in mTEPES.gc]
-    pExistMaxPower = pd.Series(data=[mTEPES.pMaxPower[p,sc,n,g ] for p,sc,n,g  in ExistCapacity], index=pd.Index(ExistCapacity))
+    pExistMaxPower = pd.Series(data=[mTEPES.pMaxPower[p,sc,n,g ] for p,sc,n,g  in ExistCapacity], index=pd.Index(ExistCapacity), dtype='float64')
     if len(mTEPES.gc):
         CandCapacity  = [(p,sc,n,g) for p,sc,n,g in mTEPES.psng if g in mTEPES.gc]
-        pCandMaxPower = pd.Series(data=[mTEPES.pMaxPower[p,sc,n,g ] * OptModel.vGenerationInvest[p,g]() for p,sc,n,g in CandCapacity], index=pd.Index(CandCapacity))
+        pCandMaxPower = pd.Series(data=SolutionValues(mTEPES, 'vGenerationInvest', [(p,g) for p,sc,n,g in CandCapacity]) * [mTEPES.pMaxPower[p,sc,n,g] for p,sc,n,g in CandCapacity], index=pd.Index(CandCapacity))
         pMaxPower     = pd.concat([pExistMaxPower, pCandMaxPower])
     else:
         pMaxPower     = pExistMaxPower
 
     # Determination of the net demand
-    OutputToFile1 = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,re]() for re in r2n[nd]) for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
-    OutputToFile2 = pd.Series(data=[      mTEPES.pDemand     [p,sc,n,nd]                      for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
-    OutputToFile  = OutputToFile2 - OutputToFile1
+    sPSNRE        = [(p,sc,n,re) for p,sc,n,re in mTEPES.psnre if re in re2n]
+    OutputToFile1 = pd.Series(data=0.0, index=pDemand.index)
+    if len(sPSNRE):
+        OutputToFile1 = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', sPSNRE), index=pd.MultiIndex.from_tuples([(p,sc,n,re2n[re]) for p,sc,n,re in sPSNRE])).groupby(level=[0,1,2,3]).sum().reindex(pDemand.index, fill_value=0.0)
+    OutputToFile  = pDemand - OutputToFile1
     OutputToFile  *= 1e3
     OutputToFile  = OutputToFile.to_frame(name='MW'  )
     OutputToFile.reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkNetDemand_'+CaseName+'.csv', sep=',')
     OutputToFile.reset_index().pivot_table(index=['level_0','level_1','level_2'],                    values='MW', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetDemand_'       +CaseName+'.csv', sep=',')
 
     # Determination of the index: Reserve Margin
-    OutputToFile1 = pd.Series(data=[0.0 for p,sc in mTEPES.ps], index=mTEPES.ps)
-    OutputToFile2 = pd.Series(data=[0.0 for p,sc in mTEPES.ps], index=mTEPES.ps)
-    for p,sc in mTEPES.ps:
-        OutputToFile1[p,sc] = pMaxPower.loc[(p,sc)].reset_index().pivot_table(index=['level_0'], values=0, aggfunc='sum').max().iloc[0]
-        OutputToFile2[p,sc] =   pDemand.loc[(p,sc)].reset_index().pivot_table(index=['level_0'], values=0, aggfunc='sum').max().iloc[0]
+    # maximum over the load levels of the total available capacity and of the total demand
+    OutputToFile1  = pMaxPower.groupby(level=[0,1,2]).sum().groupby(level=[0,1]).max()
+    OutputToFile2  =   pDemand.groupby(level=[0,1,2]).sum().groupby(level=[0,1]).max()
     ReserveMargin1 =  OutputToFile1 - OutputToFile2
     ReserveMargin2 = (OutputToFile1 - OutputToFile2)/OutputToFile2
     ReserveMargin1.to_frame(name='MW'  ).rename_axis(['Period', 'Scenario'], axis=0).to_csv(_path+'/oT_Result_ReserveMarginPower_'  +CaseName+'.csv', sep=',')
     ReserveMargin2.to_frame(name='p.u.').rename_axis(['Period', 'Scenario'], axis=0).to_csv(_path+'/oT_Result_ReserveMarginPerUnit_'+CaseName+'.csv', sep=',')
 
     # Determination of the index: Largest Unit
-    OutputToFile = pd.Series(data=[0.0 for p,sc in mTEPES.ps], index=mTEPES.ps)
-    for p,sc in mTEPES.ps:
-        OutputToFile[p,sc] = pMaxPower.loc[(p,sc)].reset_index().pivot_table(index=['level_1'], values=0, aggfunc='sum').max().iloc[0]
+    # maximum over the units of the capacity summed over the load levels
+    OutputToFile = pMaxPower.groupby(level=[0,1,3]).sum().groupby(level=[0,1]).max()
 
     LargestUnit  = ReserveMargin1/OutputToFile
     LargestUnit.to_frame(name='p.u.').rename_axis(['Period', 'Scenario'], axis=0).to_csv(_path+'/oT_Result_LargestUnitPerUnit_'+CaseName+'.csv', index=True, sep=',')
@@ -1370,65 +1710,42 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
-    # %%  Power balance per period, scenario, and load level
-    # incoming and outgoing lines (lin) (lout)
-    lin   = defaultdict(list)
-    linl  = defaultdict(list)
-    lout  = defaultdict(list)
-    loutl = defaultdict(list)
-    for ni,nf,cc in mTEPES.la:
-        lin  [nf].append((ni,cc))
-        lout [ni].append((nf,cc))
-    for ni,nf,cc in mTEPES.ll:
-        linl [nf].append((ni,cc))
-        loutl[ni].append((nf,cc))
+    # area of each unit
+    GenArea = pd.Series(data=AggregationLabels(mTEPES, 'g2ar', list(mTEPES.g)), index=list(mTEPES.g))
 
-    # generators to nodes (g2n)
-    g2n = defaultdict(list)
-    for nd,g  in mTEPES.n2g:
-        g2n[nd].append(g)
-    e2n = defaultdict(list)
-    for nd,es in mTEPES.nd*mTEPES.es:
-        if (nd,es) in mTEPES.n2g:
-            e2n[nd].append(es)
-
-    # generators to technology (g2t)
-    g2t = defaultdict(list)
-    for gt,g  in mTEPES.t2g:
-        g2t[gt].append(g)
-
-    # generators to area (g2a)
-    g2a = defaultdict(list)
-    for ar,g  in mTEPES.a2g:
-        g2a[ar].append(g)
-
-    if sum(1 for ar in mTEPES.ar if sum(1 for g in g2a[ar])) > 1:
+    if GenArea.nunique() > 1:
         if pIndAreaOutput == 1:
+            UnitEnergy = pd.Series(data=SolutionValues(mTEPES, 'vTotalOutput', mTEPES.psng) * [mTEPES.pLoadLevelDuration[n]() for p,sc,n,g in mTEPES.psng], index=pd.Index(mTEPES.psng))
+            UnitArea   = AggregationLabels(mTEPES, 'g2ar', UnitEnergy.index.get_level_values(3))
             for ar in mTEPES.ar:
-                if sum(1 for g in g2a[ar]):
-                    sPSNGT = [(p,sc,n,gt) for p,sc,n,gt in mTEPES.psngt if sum(1 for g in mTEPES.t2g if (ar,g) in mTEPES.a2g)]
-                    if len(sPSNGT):
-                        OutputToFile = pd.Series(data=[sum(OptModel.vTotalOutput[p,sc,n,g]()*mTEPES.pLoadLevelDuration[n]() for g in mTEPES.t2g if (ar,g) in mTEPES.a2g) for p,sc,n,gt in sPSNGT], index=pd.Index(sPSNGT))
-                        OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyGenerationEnergy_'+ar+'_'+CaseName+'.csv', sep=',')
+                if (UnitArea == ar).any():
+                    OutputToFile = AggregatedValues(mTEPES, UnitEnergy[UnitArea == ar], 3, 'g2gt')
+                    OutputToFile.to_frame(name='GWh').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='GWh', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_TechnologyGenerationEnergy_'+ar+'_'+CaseName+'.csv', sep=',')
 
-                        if pIndPlotOutput == 1:
-                            for p,sc in mTEPES.ps:
-                                chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
-                                chart.save(_path+'/oT_Plot_TechnologyGenerationEnergy_'+str(p)+'_'+str(sc)+'_'+ar+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
+                    if pIndPlotOutput == 1:
+                        for p,sc in mTEPES.ps:
+                            chart = PiePlots(p, sc, OutputToFile, 'Technology', '%')
+                            chart.save(_path+'/oT_Plot_TechnologyGenerationEnergy_'+str(p)+'_'+str(sc)+'_'+ar+'_'+CaseName+'.html', embed_options={'renderer': 'svg'})
 
-    sPSNARND   = [(p,sc,n,ar,nd)    for p,sc,n,ar,nd    in mTEPES.psnar*mTEPES.nd if sum(1 for g in g2n[nd]) + sum(1 for lout in lout[nd]) + sum(1 for ni,cc in lin[nd]) and (nd,ar) in mTEPES.ndar]
-    sPSNARNDGT = [(p,sc,n,ar,nd,gt) for p,sc,n,ar,nd,gt in sPSNARND*mTEPES.gt     if sum(1 for g in g2t[gt])                                                             and (nd,ar) in mTEPES.ndar]
-
-    OutputResults1     = pd.Series(data=[ sum(OptModel.vTotalOutput   [p,sc,n,g       ]()*mTEPES.pLoadLevelDuration[n]()                        for g  in mTEPES.g  if (nd,g ) in mTEPES.n2g and (gt,g ) in mTEPES.t2g) for p,sc,n,ar,nd,gt in sPSNARNDGT], index=pd.Index(sPSNARNDGT)).to_frame(name='Generation'    ).reset_index().pivot_table(index=['level_0','level_1','level_2','level_3','level_4'], columns='level_5', values='Generation' , aggfunc='sum')
-    OutputResults2     = pd.Series(data=[-sum(OptModel.vESSTotalCharge[p,sc,n,eh      ]()*mTEPES.pLoadLevelDuration[n]()*mTEPES.pEfficiency[eh] for eh in mTEPES.eh if (nd,eh) in mTEPES.n2g and (gt,eh) in mTEPES.t2g) for p,sc,n,ar,nd,gt in sPSNARNDGT], index=pd.Index(sPSNARNDGT)).to_frame(name='Consumption'   ).reset_index().pivot_table(index=['level_0','level_1','level_2','level_3','level_4'], columns='level_5', values='Consumption', aggfunc='sum')
-    OutputResults3     = pd.Series(data=[     OptModel.vENS           [p,sc,n,nd      ]()*mTEPES.pLoadLevelDuration[n]()                                                                                                for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='PowerNotServed')
-    OutputResults4     = pd.Series(data=[-      mTEPES.pDemand        [p,sc,n,nd      ]  *mTEPES.pLoadLevelDuration[n]()                                                                                                for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='EnergyDemand'  )
-    OutputResults5     = pd.Series(data=[-sum(OptModel.vFlow          [p,sc,n,nd,lout ]()*mTEPES.pLoadLevelDuration[n]()                        for lout  in lout [nd])                                                 for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='EnergyFlowOut' )
-    OutputResults6     = pd.Series(data=[ sum(OptModel.vFlow          [p,sc,n,ni,nd,cc]()*mTEPES.pLoadLevelDuration[n]()                        for ni,cc in lin  [nd])                                                 for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='EnergyFlowIn'  )
-    # OutputResults9   = pd.Series(data=[ ar                                                                                                    for ar in mTEPES.ar                          for p,sc,n,ar,nd    in sPSNND if (nd,ar) in mTEPES.ndar     ], index=pd.Index(sPSNARND  )).to_frame(name='Area'          )
+    # %%  Power balance per period, scenario, and load level
+    # nodes with any unit or line connected, and technologies with any unit
+    sND      = set(nd for nd,g in mTEPES.n2g) | set(ni for ni,nf,cc in mTEPES.la) | set(nf for ni,nf,cc in mTEPES.la)
+    sGT      = set(gt for gt,g in mTEPES.t2g)
+    sGT      = [gt for gt in mTEPES.gt if gt in sGT]
+    sPSNARND = NodeAreaIndex(mTEPES, sND)
+    Duration = pd.Series(data=[mTEPES.pLoadLevelDuration[n]() for n in mTEPES.n], index=list(mTEPES.n), dtype='float64').reindex(sPSNARND.get_level_values(2)).values
+    Flow     = pd.Series(data=SolutionValues(mTEPES, 'vFlow', mTEPES.psnla), index=pd.MultiIndex.from_tuples(mTEPES.psnla))
+
+    OutputResults1     = NodeTechnologyValues(mTEPES, pd.Series(data= SolutionValues(mTEPES, 'vTotalOutput',    mTEPES.psng ) * [mTEPES.pLoadLevelDuration[n]()                         for p,sc,n,g  in mTEPES.psng ], index=pd.Index(mTEPES.psng )), sPSNARND, sGT)
+    OutputResults2     = NodeTechnologyValues(mTEPES, pd.Series(data=-SolutionValues(mTEPES, 'vESSTotalCharge', mTEPES.psneh) * [mTEPES.pLoadLevelDuration[n]()*mTEPES.pEfficiency[eh] for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh), dtype='float64'), sPSNARND, sGT)
+    OutputResults3     = pd.Series(data= SolutionValues(mTEPES, 'vENS', sPSNARND.droplevel(3)) * Duration,                   index=sPSNARND).to_frame(name='PowerNotServed')
+    OutputResults4     = pd.Series(data=[-mTEPES.pDemand[p,sc,n,nd] for p,sc,n,ar,nd in sPSNARND] * Duration,                index=sPSNARND).to_frame(name='EnergyDemand'  )
+    OutputResults5     = (-NodeValues(mTEPES, Flow, 3, sPSNARND) * Duration).to_frame(name='EnergyFlowOut' )
+    OutputResults6     = ( NodeValues(mTEPES, Flow, 4, sPSNARND) * Duration).to_frame(name='EnergyFlowIn'  )
     if len(mTEPES.ll):
-        OutputResults7 = pd.Series(data=[-sum(OptModel.vLineLosses    [p,sc,n,nd,lout ]()*mTEPES.pLoadLevelDuration[n]()                        for lout  in loutl[nd])                                                 for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='LineLossesOut' )
-        OutputResults8 = pd.Series(data=[-sum(OptModel.vLineLosses    [p,sc,n,ni,nd,cc]()*mTEPES.pLoadLevelDuration[n]()                        for ni,cc in linl [nd])                                                 for p,sc,n,ar,nd    in sPSNARND  ], index=pd.Index(sPSNARND  )).to_frame(name='LineLossesIn'  )
+        LineLosses     = pd.Series(data=SolutionValues(mTEPES, 'vLineLosses', mTEPES.psnll), index=pd.MultiIndex.from_tuples(mTEPES.psnll))
+        OutputResults7 = (-NodeValues(mTEPES, LineLosses, 3, sPSNARND) * Duration).to_frame(name='LineLossesOut' )
+        OutputResults8 = (-NodeValues(mTEPES, LineLosses, 4, sPSNARND) * Duration).to_frame(name='LineLossesIn'  )
 
         OutputResults  = pd.concat([OutputResults1, OutputResults2, OutputResults3, OutputResults4, OutputResults5, OutputResults6, OutputResults7, OutputResults8], axis=1)
     else:
@@ -1444,29 +1761,29 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
                                     mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelDuration[n]() * mTEPES.pConstantVarCost[p,sc,n,nr] * OptModel.vCommitment [p,sc,n,nr]() +
                                     mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelWeight  [n]() * mTEPES.pStartUpCost    [       nr] * OptModel.vStartUp    [p,sc,n,nr]() +
                                     mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelWeight  [n]() * mTEPES.pShutDownCost   [       nr] * OptModel.vShutDown   [p,sc,n,nr]()) for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
-    OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCostOperation_'       +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCostOperation_'+CaseName, 'sum')
 
     if sum(mTEPES.pOperReserveUp[:,:,:,:]) + sum(mTEPES.pOperReserveDw[:,:,:,:]):
         OutputToFile = pd.Series(data=[(mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelWeight[n]() * mTEPES.pOperReserveCost[nr] * OptModel.vReserveUp  [p,sc,n,nr]() +
                                         mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelWeight[n]() * mTEPES.pOperReserveCost[nr] * OptModel.vReserveDown[p,sc,n,nr]()) for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
-        OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCostOperReserve_' +CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCostOperReserve_'+CaseName, 'sum')
 
     if len(mTEPES.re):
         OutputToFile = pd.Series(data=[mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelDuration[n]() * mTEPES.pLinearOMCost [re] * OptModel.vTotalOutput [p,sc,n,re]() for p,sc,n,re in mTEPES.psnre], index=pd.Index(mTEPES.psnre))
-        OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCostOandM_'       +CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCostOandM_'+CaseName, 'sum')
 
     if len(mTEPES.es) and sum(mTEPES.pIndOperReserve[es] for es in mTEPES.es if mTEPES.pIndOperReserve[es] == 0):
         OutputToFile = pd.Series(data=[mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelDuration[n]() * mTEPES.pLinearVarCost[p,sc,n,eh] * OptModel.vESSTotalCharge[p,sc,n,eh]()  for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psnes))
-        OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ConsumptionCostOperation_'  +CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ConsumptionCostOperation_'+CaseName, 'sum')
         OutputToFile = pd.Series(data=[(mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelWeight[n]() * mTEPES.pOperReserveCost[eh] * OptModel.vESSReserveUp  [p,sc,n,eh]() +
                                         mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelWeight[n]() * mTEPES.pOperReserveCost[eh] * OptModel.vESSReserveDown[p,sc,n,eh]()) for p,sc,n,eh in mTEPES.psneh], index=pd.Index(mTEPES.psneh))
-        OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'], columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_ConsumptionCostOperReserve_'+CaseName+'.csv', sep=',')
+        ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_ConsumptionCostOperReserve_'+CaseName, 'sum')
 
     OutputToFile = pd.Series(data=[mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelDuration[n]() * mTEPES.pEmissionVarCost[p,sc,n,nr] * OptModel.vTotalOutput[p,sc,n,nr]() for p,sc,n,nr in mTEPES.psnnr], index=pd.Index(mTEPES.psnnr))
-    OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'],     columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_GenerationCostEmission_'    +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_GenerationCostEmission_'+CaseName, 'sum')
 
     OutputToFile = pd.Series(data=[mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb[p,sc]() * mTEPES.pLoadLevelDuration[n]() * mTEPES.pENSCost()                  * OptModel.vENS        [p,sc,n,nd]() for p,sc,n,nd in mTEPES.psnnd], index=pd.Index(mTEPES.psnnd))
-    OutputToFile.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_2'],     columns='level_3', values='MEUR', aggfunc='sum').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_NetworkCostENS_'            +CaseName+'.csv', sep=',')
+    ResultsToFile(mTEPES, OutputToFile, 'MEUR', ['level_0', 'level_1', 'level_2'], 'level_3', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_NetworkCostENS_'+CaseName, 'sum')
 
     def Transformation1(df, _name):
         df = df.to_frame(name='MEUR')
@@ -1474,10 +1791,10 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
         df = df.reset_index().pivot_table(index=['level_0', 'level_1', 'Cost'], values='MEUR', aggfunc='sum')
         return df
 
-    if sum(1 for ar in mTEPES.ar if sum(1 for g in g2a[ar])) > 1:
+    if GenArea.nunique() > 1:
         if pIndAreaOutput == 1:
             for ar in mTEPES.ar:
-                if sum(1 for g in g2a[ar]):
+                if (GenArea == ar).any():
                     OutputResults1 = pd.DataFrame(data={'MEUR': [0.0]}, index=pd.Index([(p,sc,'Generation Operation Cost'         ) for p,sc in mTEPES.ps]))
                     OutputResults2 = pd.DataFrame(data={'MEUR': [0.0]}, index=pd.Index([(p,sc,'Generation Operating Reserve Cost' ) for p,sc in mTEPES.ps]))
                     OutputResults3 = pd.DataFrame(data={'MEUR': [0.0]}, index=pd.Index([(p,sc,'Generation O&M Cost'               ) for p,sc in mTEPES.ps]))
@@ -1525,31 +1842,31 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
                     OutputResults.rename_axis(['Period', 'Scenario', 'Cost'], axis=0).to_csv(_path+'/oT_Result_CostSummary_'+ar+'_'+CaseName+'.csv', sep=',')
 
     sPSSTNNDG     = [(p,sc,st,n,nd,g) for p,sc,st,n,nd,g in mTEPES.ps*mTEPES.s2n*mTEPES.n2g]
-    OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vTotalOutput[p,sc,n,g]() for p,sc,st,n,nd,g in sPSSTNNDG], index=pd.Index(sPSSTNNDG))
-    OutputResults.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_RevenueEnergyGeneration_'+CaseName+'.csv', sep=',')
+    OutputResults = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd,g in sPSSTNNDG]) * [1.0/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vTotalOutput[p,sc,n,g]() for p,sc,st,n,nd,g in sPSSTNNDG], index=pd.Index(sPSSTNNDG))
+    ResultsToFile(mTEPES, OutputResults, 'MEUR', ['level_0', 'level_1', 'level_3'], 'level_5', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_RevenueEnergyGeneration_'+CaseName)
 
     if len(mTEPES.eh):
         sPSSTNNDES    = [(p,sc,st,n,nd,eh) for p,sc,st,n,nd,eh in mTEPES.ps*mTEPES.s2n*mTEPES.n2g if eh in mTEPES.eh]
-        OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vESSTotalCharge[p,sc,n,eh]() for p,sc,st,n,nd,eh in sPSSTNNDES], index=pd.Index(sPSSTNNDES))
-        OutputResults.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_RevenueEnergyConsumption_'+CaseName+'.csv', sep=',')
+        OutputResults = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd,eh in sPSSTNNDES]) * [1.0/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vESSTotalCharge[p,sc,n,eh]() for p,sc,st,n,nd,eh in sPSSTNNDES], index=pd.Index(sPSSTNNDES))
+        ResultsToFile(mTEPES, OutputResults, 'MEUR', ['level_0', 'level_1', 'level_3'], 'level_5', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_RevenueEnergyConsumption_'+CaseName)
 
     if len(mTEPES.gc):
         GenRev    = []
         ChargeRev = []
         sPSSTNNDGC1    = [(p,sc,st,n,nd,gc) for p,sc,st,n,nd,gc in mTEPES.ps*mTEPES.s2n*mTEPES.n2g if gc in mTEPES.gc]
-        OutputToGenRev = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vTotalOutput   [p,sc,n,gc]()         for p,sc,st,n,nd,gc in sPSSTNNDGC1], index=pd.Index(sPSSTNNDGC1))
+        OutputToGenRev = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd,gc in sPSSTNNDGC1]) * [1.0/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vTotalOutput   [p,sc,n,gc]() for p,sc,st,n,nd,gc in sPSSTNNDGC1], index=pd.Index(sPSSTNNDGC1))
         GenRev.append(OutputToGenRev)
         if len([(p,sc,n,nd,gc) for p,sc,n,nd,gc in mTEPES.psn*mTEPES.n2g if gc in mTEPES.gc for ot in mTEPES.ot if (ot,gc)     in mTEPES.t2g]):
             sPSSTNNDGC2        = [(p,sc,st,n,nd,gc) for p,sc,st,n,nd,gc in sPSSTNNDGC1      for ot in mTEPES.ot if (ot,gc)     in mTEPES.t2g]
-            OutputChargeRevESS = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vESSTotalCharge[p,sc,n,gc]() for p,sc,st,n,nd,gc in sPSSTNNDGC2], index=pd.Index(sPSSTNNDGC2))
+            OutputChargeRevESS = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd,gc in sPSSTNNDGC2]) * [1.0/mTEPES.pPeriodProb[p,sc]()/mTEPES.pLoadLevelDuration[n]() * OptModel.vESSTotalCharge[p,sc,n,gc]() for p,sc,st,n,nd,gc in sPSSTNNDGC2], index=pd.Index(sPSSTNNDGC2))
             ChargeRev.append(OutputChargeRevESS)
         if len([(p,sc,n,nd,gc) for p,sc,n,nd,gc in mTEPES.psn*mTEPES.n2g if gc in mTEPES.gc for rt in mTEPES.rt if (rt,gc)     in mTEPES.t2g]):
             sPSSTNNDGC3        = [(p,sc,st,n,nd,gc) for p,sc,st,n,nd,gc in sPSSTNNDGC1      for rt in mTEPES.rt if (rt,gc)     in mTEPES.t2g]
-            OutputChargeRevRES = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]() * 0.0                                                                  for p,sc,st,n,nd,gc in sPSSTNNDGC3], index=pd.Index(sPSSTNNDGC3))
+            OutputChargeRevRES = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd,gc in sPSSTNNDGC3]) * [1.0/mTEPES.pPeriodProb[p,sc]() * 0.0 for p,sc,st,n,nd,gc in sPSSTNNDGC3], index=pd.Index(sPSSTNNDGC3))
             ChargeRev.append(OutputChargeRevRES)
         if len([(p,sc,n,nd,gc) for p,sc,n,nd,gc in mTEPES.psn*mTEPES.n2g if gc in mTEPES.gc for ot in mTEPES.ot if (ot,gc) not in mTEPES.t2g]):
             sPSSTNNDGC4        = [(p,sc,st,n,nd,gc) for p,sc,st,n,nd,gc in sPSSTNNDGC1      for ot in mTEPES.ot if (ot,gc) not in mTEPES.t2g]
-            OutputChargeRevThr = pd.Series(data=[mTEPES.pDuals["".join(["eBalance_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(nd), "')"])]/mTEPES.pPeriodProb[p,sc]() * 0.0                                                                  for p,sc,st,n,nd,gc in sPSSTNNDGC4], index=pd.Index(sPSSTNNDGC4))
+            OutputChargeRevThr = pd.Series(data=DualValues(mTEPES, 'eBalance', [(p,sc,st,n,nd) for p,sc,st,n,nd,gc in sPSSTNNDGC4]) * [1.0/mTEPES.pPeriodProb[p,sc]() * 0.0 for p,sc,st,n,nd,gc in sPSSTNNDGC4], index=pd.Index(sPSSTNNDGC4))
             ChargeRev.append(OutputChargeRevThr)
         GenRev    = pd.concat(GenRev)
         ChargeRev = pd.concat(ChargeRev)
@@ -1562,7 +1879,7 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
     if sum(mTEPES.pReserveMargin[:,:]):
         if len(mTEPES.gc):
             sPSSTARGC      = [(p,sc,st,ar,gc) for p,sc,st,ar,gc in mTEPES.ps*mTEPES.st*mTEPES.ar*mTEPES.gc if (ar,gc) in mTEPES.a2g and mTEPES.pReserveMargin[p,ar] and sum(1 for g in mTEPES.g if (ar,g) in mTEPES.a2g) and sum(mTEPES.pRatedMaxPower[g] * mTEPES.pAvailability[g]() / (1.0-mTEPES.pEFOR[g]) for g in mTEPES.g if (ar,g) in mTEPES.a2g and g not in (mTEPES.gc or mTEPES.gd)) <= mTEPES.pPeakDemand[p,ar] * mTEPES.pReserveMargin[p,ar]]
-            OutputToResRev = pd.Series(data=[mTEPES.pDuals["".join(["eAdequacyReserveMargin_", str(p), "_", str(sc), "_", str(st),  "(", str(p), ", '", str(ar), "')"])]*mTEPES.pRatedMaxPower[gc]*mTEPES.pAvailability[gc]() for p,sc,st,ar,gc in sPSSTARGC], index=pd.Index(sPSSTARGC))
+            OutputToResRev = pd.Series(data=DualValues(mTEPES, 'eAdequacyReserveMargin', [(p,sc,st,p,ar) for p,sc,st,ar,gc in sPSSTARGC]) * [mTEPES.pRatedMaxPower[gc]*mTEPES.pAvailability[gc]() for p,sc,st,ar,gc in sPSSTARGC], index=pd.Index(sPSSTARGC))
             OutputToResRev /= 1e3
             OutputToResRev = OutputToResRev.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1'], columns='level_4', values='MEUR').rename_axis(['Stages', 'Areas'], axis=0).rename_axis([None], axis=1).sum(axis=0)
             ResRev         = pd.Series(data=[0.0 for gc in mTEPES.gc], index=mTEPES.gc, dtype='float64')
@@ -1576,17 +1893,17 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
     if sum(mTEPES.pOperReserveUp[:,:,:,:]) and (sum(1 for ar,nr in mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pIndOperReserve[nr] == 0) + sum(1 for ar,es in mTEPES.ar*mTEPES.es if (ar,es) in mTEPES.a2g and mTEPES.pIndOperReserve[es] == 0)):
         if len([(p,sc,n,ar,nr) for p,sc,n,ar,nr in mTEPES.psn*mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pOperReserveUp[p,sc,n,ar]]):
             sPSSTNARNR    = [(p,sc,st,n,ar,nr) for p,sc,st,n,ar,nr in mTEPES.ps*mTEPES.s2n*mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pOperReserveUp[p,sc,n,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveUp_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])]/mTEPES.pPeriodProb[p,sc]()*OptModel.vReserveUp   [p,sc,n,nr]() for p,sc,st,n,ar,nr in sPSSTNARNR], index=pd.Index(sPSSTNARNR))
-            OutputResults.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_RevenueOperatingReserveUp_'+CaseName+'.csv', sep=',')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveUp', [(p,sc,st,n,ar) for p,sc,st,n,ar,nr in sPSSTNARNR]) * [1.0/mTEPES.pPeriodProb[p,sc]()*OptModel.vReserveUp   [p,sc,n,nr]() for p,sc,st,n,ar,nr in sPSSTNARNR], index=pd.Index(sPSSTNARNR))
+            ResultsToFile(mTEPES, OutputResults, 'MEUR', ['level_0', 'level_1', 'level_3'], 'level_5', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_RevenueOperatingReserveUp_'+CaseName)
 
         if len([(p,sc,n,ar,eh) for p,sc,n,ar,eh in mTEPES.psn*mTEPES.ar*mTEPES.eh if (ar,eh) in mTEPES.a2g and mTEPES.pOperReserveUp[p,sc,n,ar]]):
             sPSSTNARES    = [(p,sc,st,n,ar,eh) for p,sc,st,n,ar,eh in mTEPES.ps*mTEPES.s2n*mTEPES.ar*mTEPES.eh if (ar,eh) in mTEPES.a2g and mTEPES.pOperReserveUp[p,sc,n,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveUp_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])]/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveUp[p,sc,n,eh]() for p,sc,st,n,ar,eh in sPSSTNARES], index=pd.Index(sPSSTNARES))
-            OutputResults.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_RevenueOperatingReserveUpESS_'+CaseName+'.csv', sep=',')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveUp', [(p,sc,st,n,ar) for p,sc,st,n,ar,eh in sPSSTNARES]) * [1.0/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveUp[p,sc,n,eh]() for p,sc,st,n,ar,eh in sPSSTNARES], index=pd.Index(sPSSTNARES))
+            ResultsToFile(mTEPES, OutputResults, 'MEUR', ['level_0', 'level_1', 'level_3'], 'level_5', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_RevenueOperatingReserveUpESS_'+CaseName)
 
         if len([(p,sc,n,ar,ec) for p,sc,n,ar,ec in mTEPES.psn*mTEPES.ar*mTEPES.gc if (ar,ec) in mTEPES.a2g and mTEPES.pOperReserveUp[p,sc,n,ar]]):
             sPSSTNAREC    = [(p,sc,st,n,ar,ec) for p,sc,st,n,ar,ec in mTEPES.ps*mTEPES.s2n*mTEPES.ar*mTEPES.ec if (ar,ec) in mTEPES.a2g and mTEPES.pOperReserveUp[p,sc,n,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveUp_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])]/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveUp[p,sc,n,ec]() for p,sc,st,n,ar,ec in sPSSTNAREC], index=pd.Index(sPSSTNAREC), dtype='float64')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveUp', [(p,sc,st,n,ar) for p,sc,st,n,ar,ec in sPSSTNAREC]) * [1.0/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveUp[p,sc,n,ec]() for p,sc,st,n,ar,ec in sPSSTNAREC], index=pd.Index(sPSSTNAREC), dtype='float64')
             if len(OutputResults):
                 OutputToUpRev = OutputResults.to_frame('MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).sum(axis=0)
             else:
@@ -1603,17 +1920,17 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
     if sum(mTEPES.pOperReserveDw[:,:,:,:]) and (sum(1 for ar,nr in mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pIndOperReserve[nr] == 0) + sum(1 for ar,es in mTEPES.ar*mTEPES.es if (ar,es) in mTEPES.a2g and mTEPES.pIndOperReserve[es] == 0)):
         if len([(p,sc,n,ar,nr) for p,sc,n,ar,nr in mTEPES.psn*mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pOperReserveDw[p,sc,n,ar]]):
             sPSSTNARNR    = [(p,sc,st,n,ar,nr) for p,sc,st,n,ar,nr in mTEPES.ps*mTEPES.s2n*mTEPES.ar*mTEPES.nr if (ar,nr) in mTEPES.a2g and mTEPES.pOperReserveDw[p,sc,n,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveDw_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])]/mTEPES.pPeriodProb[p,sc]()*OptModel.vReserveDown   [p,sc,n,nr]() for p,sc,st,n,ar,nr in sPSSTNARNR], index=pd.Index(sPSSTNARNR))
-            OutputResults.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_RevenueOperatingReserveDw_'+CaseName+'.csv', sep=',')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveDw', [(p,sc,st,n,ar) for p,sc,st,n,ar,nr in sPSSTNARNR]) * [1.0/mTEPES.pPeriodProb[p,sc]()*OptModel.vReserveDown   [p,sc,n,nr]() for p,sc,st,n,ar,nr in sPSSTNARNR], index=pd.Index(sPSSTNARNR))
+            ResultsToFile(mTEPES, OutputResults, 'MEUR', ['level_0', 'level_1', 'level_3'], 'level_5', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_RevenueOperatingReserveDw_'+CaseName)
 
         if len([(p,sc,n,ar,eh) for p,sc,n,ar,eh in mTEPES.psn*mTEPES.ar*mTEPES.eh if (ar,eh) in mTEPES.a2g if mTEPES.pOperReserveDw[p,sc,n,ar]]):
             sPSSTNARES    = [(p,sc,st,n,ar,eh) for p,sc,st,n,ar,eh in mTEPES.ps*mTEPES.s2n*mTEPES.ar*mTEPES.eh if (ar,eh) in mTEPES.a2g and mTEPES.pOperReserveDw[p,sc,n,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveDw_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])]/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveDown[p,sc,n,eh]() for p,sc,st,n,ar,eh in sPSSTNARES], index=pd.Index(sPSSTNARES))
-            OutputResults.to_frame(name='MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).to_csv(_path+'/oT_Result_RevenueOperatingReserveDwESS_'+CaseName+'.csv', sep=',')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveDw', [(p,sc,st,n,ar) for p,sc,st,n,ar,eh in sPSSTNARES]) * [1.0/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveDown[p,sc,n,eh]() for p,sc,st,n,ar,eh in sPSSTNARES], index=pd.Index(sPSSTNARES))
+            ResultsToFile(mTEPES, OutputResults, 'MEUR', ['level_0', 'level_1', 'level_3'], 'level_5', ['Period', 'Scenario', 'LoadLevel'], _path+'/oT_Result_RevenueOperatingReserveDwESS_'+CaseName)
 
         if len([(p,sc,n,ar,ec) for p,sc,n,ar,ec in mTEPES.psn*mTEPES.ar*mTEPES.gc if (ar,ec) in mTEPES.a2g if mTEPES.pOperReserveDw[p,sc,n,ar]]):
             sPSSTNAREC    = [(p,sc,st,n,ar,ec) for p,sc,st,n,ar,ec in mTEPES.ps*mTEPES.s2n*mTEPES.ar*mTEPES.ec if (ar,ec) in mTEPES.a2g and mTEPES.pOperReserveDw[p,sc,n,ar]]
-            OutputResults = pd.Series(data=[mTEPES.pDuals["".join(["eOperReserveUp_", str(p), "_", str(sc), "_", str(st), "('", str(n), "', '", str(ar), "')"])]/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveDown[p,sc,n,ec]() for p,sc,st,n,ar,ec in sPSSTNAREC], index=pd.Index(sPSSTNAREC), dtype='float64')
+            OutputResults = pd.Series(data=DualValues(mTEPES, 'eOperReserveUp', [(p,sc,st,n,ar) for p,sc,st,n,ar,ec in sPSSTNAREC]) * [1.0/mTEPES.pPeriodProb[p,sc]()*OptModel.vESSReserveDown[p,sc,n,ec]() for p,sc,st,n,ar,ec in sPSSTNAREC], index=pd.Index(sPSSTNAREC), dtype='float64')
             if len(OutputResults):
                 OutputToDwRev = OutputResults.to_frame('MEUR').reset_index().pivot_table(index=['level_0','level_1','level_3'], columns='level_5', values='MEUR').rename_axis(['Period', 'Scenario', 'LoadLevel'], axis=0).rename_axis([None], axis=1).sum(axis=0)
             else:
@@ -1639,101 +1956,12 @@ def EconomicResults(DirName, CaseName, OptModel, mTEPES, pIndAreaOutput, pIndPlo
 def NetworkMapResults(DirName, CaseName, OptModel, mTEPES):
     # %% plotting the network in a map
     _path = os.path.join(DirName, CaseName)
-    DIR   = os.path.dirname(__file__)
     StartTime = time.time()
 
-    # Sub functions
-    def oT_make_series(_var, _sets, _factor):
-        return pd.Series(data=[_var[p,sc,n,ni,nf,cc]()*_factor for p,sc,n,ni,nf,cc in _sets], index=pd.Index(list(_sets)))
-
-    def oT_selecting_data(p,sc,n):
-        # Nodes data
-        pio.renderers.default = 'chrome'
-
-        loc_df = pd.Series(data=[mTEPES.pNodeLat[i] for i in mTEPES.nd], index=mTEPES.nd).to_frame(name='Lat')
-        loc_df['Lon'   ] =  0.0
-        loc_df['Zone'  ] =  ''
-        loc_df['Demand'] =  0.0
-        loc_df['Size'  ] = 15.0
-
-        for nd,zn in mTEPES.ndzn:
-            loc_df['Lon'   ][nd] = mTEPES.pNodeLon[nd]
-            # warnings
-            loc_df['Zone'  ][nd] = zn
-            loc_df['Demand'][nd] = mTEPES.pDemand[p,sc,n,nd]*1e3
-
-        loc_df = loc_df.reset_index().rename(columns={'Type': 'Scenario'}, inplace=False)
-
-        # Edges data
-        OutputToFile = oT_make_series(OptModel.vFlow, mTEPES.psnla, 1e3)
-        OutputToFile.index.names = ['Period', 'Scenario', 'LoadLevel', 'InitialNode', 'FinalNode', 'Circuit']
-        OutputToFile = OutputToFile.to_frame(name='MW')
-
-        # tolerance to consider avoid division by 0
-        pEpsilon = 1e-6
-
-        line_df = pd.DataFrame(data={'NTCFrw': pd.Series(data=[mTEPES.pLineNTCFrw[i] * 1e3 + pEpsilon for i in mTEPES.la], index=mTEPES.la),
-                                     'NTCBck': pd.Series(data=[mTEPES.pLineNTCBck[i] * 1e3 + pEpsilon for i in mTEPES.la], index=mTEPES.la)}, index=mTEPES.la)
-
-        line_df = line_df.groupby(level=[0,1]).sum(numeric_only=True)
-        line_df['vFlow'      ] = 0.0
-        line_df['utilization'] = 0.0
-        line_df['color'      ] = ''
-        line_df['voltage'    ] = 0.0
-        line_df['width'      ] = 0.0
-        line_df['lon'        ] = 0.0
-        line_df['lat'        ] = 0.0
-        line_df['ni'         ] = '0.0'
-        line_df['nf'         ] = '0.0'
-        line_df['cc'         ] = 0.0
-
-        ncolors = 11
-        colors = list(Color('lightgreen').range_to(Color('darkred'), ncolors))
-        colors = ['rgb'+str(x.rgb) for x in colors]
-
-        for ni,nf,cc in mTEPES.la:
-            line_df['vFlow'      ][ni,nf] += OutputToFile['MW'][p,sc,n,ni,nf,cc]
-            line_df['utilization'][ni,nf]  = max(line_df['vFlow'][ni,nf]/line_df['NTCFrw'][ni,nf],-line_df['vFlow'][ni,nf]/line_df['NTCBck'][ni,nf])*100.0
-            line_df['lon'        ][ni,nf]  = (mTEPES.pNodeLon[ni]+mTEPES.pNodeLon[nf]) * 0.5
-            line_df['lat'        ][ni,nf]  = (mTEPES.pNodeLat[ni]+mTEPES.pNodeLat[nf]) * 0.5
-            line_df['ni'         ][ni,nf]  = ni
-            line_df['nf'         ][ni,nf]  = nf
-            line_df['cc'         ][ni,nf] += 1
-
-            for i in range(len(colors)):
-                if 10*i <= line_df['utilization'][ni,nf] <= 10*(i+1):
-                    line_df['color'][ni,nf] = colors[i]
-
-            # assigning black color to lines with utilization > 100%
-            if line_df['utilization'][ni,nf] > 100:
-                line_df['color'][ni,nf] = 'rgb(0,0,0)'
-
-            line_df['voltage'][ni,nf] = mTEPES.pLineVoltage[ni,nf,cc]
-            if   700 < line_df['voltage'][ni,nf] <= 900:
-                line_df['width'][ni,nf] = 4
-            elif 500 < line_df['voltage'][ni,nf] <= 700:
-                line_df['width'][ni,nf] = 3
-            elif 350 < line_df['voltage'][ni,nf] <= 500:
-                line_df['width'][ni,nf] = 2.5
-            elif 290 < line_df['voltage'][ni,nf] <= 350:
-                line_df['width'][ni,nf] = 2
-            elif 200 < line_df['voltage'][ni,nf] <= 290:
-                line_df['width'][ni,nf] = 1.5
-            elif  50 < line_df['voltage'][ni,nf] <= 200:
-                line_df['width'][ni,nf] = 1
-            else:
-                line_df['width'][ni,nf] = 0.5
-
-        # Rounding to decimals
-        line_df = line_df.round(decimals=2)
-
-        return loc_df, line_df
-
     # tolerance to consider avoid division by 0
     pEpsilon = 1e-6
 
     p = list(mTEPES.p)[0]
-    n = list(mTEPES.n)[0]
 
     if len(mTEPES.sc) > 1:
         for scc in mTEPES.sc:
@@ -1743,35 +1971,14 @@ def NetworkMapResults(DirName, CaseName, OptModel, mTEPES):
     else:
         sc = list(mTEPES.sc)[0]
 
-    loc_df, line_df = oT_selecting_data(p,sc,n)
-
-    # Making the network
-    # Get node position dict
-    x, y = loc_df['Lon'].values, loc_df['Lat'].values
-    pos_dict = {}
-    for index, iata in enumerate(loc_df['index']):
-        pos_dict[iata] = (x[index], y[index])
-
-    # Setting up the figure
-    token = open(DIR+'/openTEPES.mapbox_token').read()
-
-    fig = go.Figure()
-
-    # Add nodes
-    fig.add_trace(go.Scattermapbox(lat=loc_df['Lat'], lon=loc_df['Lon'], mode='markers', marker=go.scattermapbox.Marker(size=loc_df['Size']*10, sizeref=1.1, sizemode='area', color='LightSkyBlue',), hoverinfo='text', text='<br>Node: ' + loc_df['index'] + '<br>[Lon, Lat]: ' + '(' + loc_df['Lon'].astype(str) + ', ' + loc_df['Lat'].astype(str) + ')' + '<br>Zone: ' + loc_df['Zone'] + '<br>Demand: ' + loc_df['Demand'].astype(str) + ' MW',))
-
-    # Add edges
-    for ni,nf,cc in mTEPES.la:
-        fig.add_trace(go.Scattermapbox(lon=[pos_dict[ni][0], pos_dict[nf][0]], lat=[pos_dict[ni][1], pos_dict[nf][1]], mode='lines+markers', marker=dict(size=0, showscale=True, colorbar={'title': 'Utilization [%]', 'titleside': 'top', 'thickness': 8, 'ticksuffix': '%'}, colorscale=[[0, 'lightgreen'], [1, 'darkred']], cmin=0, cmax=100,), line=dict(width=line_df['width'][ni,nf], color=line_df['color'][ni,nf]), opacity=1, hoverinfo='text', textposition='middle center',))
-
-    # Add legends related to the lines
-    fig.add_trace(go.Scattermapbox(lat=line_df['lat'], lon=line_df['lon'], mode='markers', marker=go.scattermapbox.Marker(size=20, sizeref=1.1, sizemode='area', color='LightSkyBlue',), opacity=0, hoverinfo='text', text='<br>Line: '+line_df['ni']+' → '+line_df['nf']+'<br># circuits: '+line_df['cc'].astype(str)+'<br>NTC Forward: '+line_df['NTCFrw'].astype(str)+'<br>NTC Backward: '+line_df['NTCBck'].astype(str)+'<br>Power flow: '+line_df['vFlow'].astype(str)+'<br>Utilization [%]: '+line_df['utilization'].astype(str),))
-
-    # Setting up the layout
-    fig.update_layout(title={'text': 'Power Network: '+CaseName+'<br>Period: '+str(p)+'; Scenario: '+str(sc)+'; LoadLevel: '+n, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top'}, font=dict(size=14), hovermode='closest', geo=dict(projection_type='azimuthal equal area', showland=True,), mapbox=dict(style='dark', accesstoken=token, bearing=0, center=dict(lat=(loc_df['Lat'].max()+loc_df['Lat'].min())*0.5, lon=(loc_df['Lon'].max()+loc_df['Lon'].min())*0.5), pitch=0, zoom=5), showlegend=False,)
-
-    # Saving the figure
-    fig.write_html(_path+'/oT_Plot_MapNetwork_'+CaseName+'.html')
+    # flows by corridor, NTC and number of circuits, and width of the lines by voltage
+    sLoadLevels = MapLoadLevels(mTEPES)
+    Flow   = pd.Series(data=SolutionValues(mTEPES, 'vFlow', [(p,sc,n)+la for n in sLoadLevels for la in mTEPES.la])*1e3, index=pd.MultiIndex.from_tuples([(n,)+la for n in sLoadLevels for la in mTEPES.la])).groupby(level=[0,1,2]).sum().unstack([1,2])
+    Lines  = pd.DataFrame(data={'NTCFrw': [mTEPES.pLineNTCFrw[la] * 1e3 + pEpsilon for la in mTEPES.la], 'NTCBck': [mTEPES.pLineNTCBck[la] * 1e3 + pEpsilon for la in mTEPES.la], 'Circuits': 1, 'Voltage': [mTEPES.pLineVoltage[la] for la in mTEPES.la]}, index=pd.MultiIndex.from_tuples(list(mTEPES.la)))
+    Lines  = Lines.groupby(level=[0,1]).agg({'NTCFrw': 'sum', 'NTCBck': 'sum', 'Circuits': 'sum', 'Voltage': 'last'})
+    Lines['Width'] = pd.cut(Lines['Voltage'], bins=[-math.inf, 50, 200, 290, 350, 500, 700, 900, math.inf], labels=False).map(dict(enumerate([0.5, 1, 1.5, 2, 2.5, 3, 4, 0.5])))
+    Demand = pd.DataFrame(data=[[mTEPES.pDemand[p,sc,n,nd]*1e3 for nd in mTEPES.nd] for n in sLoadLevels], index=sLoadLevels, columns=list(mTEPES.nd))
+    NetworkMapPlot(mTEPES, _path+'/oT_Plot_MapNetwork_'+CaseName+'.html', 'Power Network: '+CaseName, p, sc, Flow, Lines, Demand, 'MW', 'rgb(0,0,0)')
 
     PlottingNetMapsTime = time.time() - StartTime
     print('Plotting  electric network maps        ... ', round(PlottingNetMapsTime), 's')
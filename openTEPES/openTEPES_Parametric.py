@@ -0,0 +1,106 @@
+"""
+Open Generation, Storage, and Transmission Operation and Expansion Planning Model with RES and ESS (openTEPES) - January 18, 2024
+"""
+
+import os
+import pandas        as pd
+import pyomo.environ as pyo
+from   pyomo.common.collections import ComponentSet
+from   pyomo.environ import Param
+
+from .openTEPES_InputData import DiscountedWeights
+
+# parameters of the parametric re-solve, with the name of the column in oT_Data_Parameter, and parameters of the model derived from them used by the output results
+ParametricParameters = ['ENSCost', 'CO2Cost', 'AnnualDiscountRate', 'DemandScale']
+ParametricParams     = ['pENSCost', 'pCO2Cost', 'pAnnualDiscRate', 'pEmissionVarCost', 'pDiscountedWeight', 'pDemand', 'pDemandAbs', 'pPeakDemand']
+
+# mutable parameters of the objective function set to 1 at the end of every run, restored before solving the built model again
+ParametricWeights    = ['pPeriodWeight', 'pScenProb', 'pPeriodProb']
+
+
+def ParametricBase(DirName, CaseName, mTEPES):
+    # values of the parameters of the case, kept to change the parameters of the built model for every point
+    _path    = os.path.join(DirName, CaseName)
+    dfPeriod = pd.read_csv(_path+'/oT_Data_Period_'+CaseName+'.csv', index_col=[0])
+    mTEPES.pParametricBase = {'ENSCost'           : pyo.value(mTEPES.pENSCost) * 1e3,
+                              'CO2Cost'           : pyo.value(mTEPES.pCO2Cost),
+                              'AnnualDiscountRate': pyo.value(mTEPES.pAnnualDiscRate),
+                              'DemandScale'       : 1.0,
+                              'PeriodWeight'      : dfPeriod['Weight'].astype('int').to_dict(),
+                              'Params'            : {Name: dict(getattr(mTEPES, Name).extract_values()) for Name in ParametricParams}}
+
+
+def ParametricFixedVariables(mTEPES):
+    # variables fixed by the input data and weights of the periods and scenarios of the case, restored before solving the built model again
+    mTEPES.pParametricFixed   = ComponentSet(var for var in mTEPES.component_data_objects(pyo.Var) if var.fixed)
+    mTEPES.pParametricWeights = {Name: {idx: pyo.value(Weight) for idx,Weight in getattr(mTEPES, Name).items()} for Name in ParametricWeights}
+
+
+def ParamReplace(mTEPES, Name, Values):
+    # immutable parameter declared again with new values, the constraints are changed by the mutable scales
+    OldParam = mTEPES.component(Name)
+    mTEPES.del_component(OldParam)
+    if OldParam.is_indexed():
+        mTEPES.add_component(Name, Param(OldParam.index_set(), initialize=Values,       within=OldParam.domain, doc=OldParam.doc))
+    else:
+        mTEPES.add_component(Name, Param(                      initialize=Values[None], within=OldParam.domain, doc=OldParam.doc))
+
+
+def ParametricUpdate(mTEPES, Point):
+    # parameters of a point of the parametric re-solve (ENSCost [EUR/MWh], CO2Cost [EUR/tCO2], AnnualDiscountRate [p.u.], DemandScale [p.u.]), the others keep the value of the case
+    # the constraints are built with the parameters of the case multiplied by the mutable scales, so only the scales are changed before solving
+    # the emission cost of all the units is changed in proportion to the CO2 cost, as in the maximum emission constraints
+    Base = mTEPES.pParametricBase
+    for Parameter in Point:
+        if Parameter not in ParametricParameters:
+            raise ValueError('Unknown parametric parameter '+str(Parameter)+', it must be one of '+', '.join(ParametricParameters))
+    Value = {Parameter: float(Point.get(Parameter, Base[Parameter])) for Parameter in ParametricParameters}
+
+    # the costs are changed by scales of the costs of the case, which can not be changed if they are 0
+    for Parameter in ['ENSCost', 'CO2Cost']:
+        if Base[Parameter] == 0.0 and Value[Parameter] != 0.0:
+            raise ValueError('The '+Parameter+' of the case is 0, it can not be changed by the parametric re-solve')
+
+    # discount factors of the periods with the annual discount rate of the point
+    pDiscountedWeight = DiscountedWeights(mTEPES.p, Base['PeriodWeight'], Value['AnnualDiscountRate'], mTEPES.pEconomicBaseYear()).to_dict()
+
+    # scales of the parameters in the constraints
+    mTEPES.pENSCostScale.set_value(Value['ENSCost'] / Base['ENSCost'] if Base['ENSCost'] else 1.0)
+    mTEPES.pCO2CostScale.set_value(Value['CO2Cost'] / Base['CO2Cost'] if Base['CO2Cost'] else 1.0)
+    mTEPES.pDemandScale.set_value (Value['DemandScale'])
+    for p in mTEPES.p:
+        mTEPES.pDiscountScale[p] = pDiscountedWeight[p] / Base['Params']['pDiscountedWeight'][p]
+
+    # energy not served bounded by the demand of the point
+    if hasattr(mTEPES, 'vENS'):
+        [mTEPES.vENS[p,sc,n,nd].setub(Base['Params']['pDemandAbs'][p,sc,n,nd] * Value['DemandScale']) for p,sc,n,nd in mTEPES.psnnd]
+
+    mTEPES.pParametricPoint = (Value, pDiscountedWeight)
+    print('Parametric point                       ... ', Value)
+
+
+def ParametricParamsUpdate(mTEPES):
+    # parameters read by the output results declared with the values of the point, once the constraints are built
+    Base = mTEPES.pParametricBase
+    Value, pDiscountedWeight = mTEPES.pParametricPoint
+    pAnnualDiscRate          = Value['AnnualDiscountRate']
+    ParamReplace(mTEPES, 'pENSCost',          {None: Value['ENSCost'] * 1e-3})
+    ParamReplace(mTEPES, 'pCO2Cost',          {None: Value['CO2Cost']})
+    ParamReplace(mTEPES, 'pAnnualDiscRate',   {None: pAnnualDiscRate})
+    ParamReplace(mTEPES, 'pEmissionVarCost',  {idx: Cost   * pyo.value(mTEPES.pCO2CostScale) for idx,Cost   in Base['Params']['pEmissionVarCost'].items()})
+    ParamReplace(mTEPES, 'pDiscountedWeight', pDiscountedWeight)
+    ParamReplace(mTEPES, 'pDemand',           {idx: Demand * Value['DemandScale']            for idx,Demand in Base['Params']['pDemand'         ].items()})
+    ParamReplace(mTEPES, 'pDemandAbs',        {idx: Demand * Value['DemandScale']            for idx,Demand in Base['Params']['pDemandAbs'      ].items()})
+    ParamReplace(mTEPES, 'pPeakDemand',       {idx: Demand * Value['DemandScale']            for idx,Demand in Base['Params']['pPeakDemand'     ].items()})
+
+
+def ParametricRelease(mTEPES):
+    # variables fixed after solving the previous point released, keeping their values as warm start, and weights of the periods and scenarios of the case
+    for Name,Values in mTEPES.pParametricWeights.items():
+        getattr(mTEPES, Name).store_values(Values)
+    nReleased = 0
+    for var in mTEPES.component_data_objects(pyo.Var):
+        if var.fixed and var not in mTEPES.pParametricFixed:
+            var.unfix()
+            nReleased += 1
+    return nReleased
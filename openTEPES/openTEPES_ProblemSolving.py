@@ -12,27 +12,92 @@ from   pyomo.opt             import SolverFactory, SolverStatus, TerminationCond
 from   pyomo.util.infeasible import log_infeasible_constraints
 from   pyomo.environ         import Suffix
 
+# solver options of the predefined profiles: LP with barrier without crossover, unit commitment MIP, and expansion planning MIP
+SolverProfiles = {
+    'LP-barrier'   : {'gurobi'     : {'Method': 2, 'Crossover': -1                                           , 'TimeLimit': 36000, 'IterationLimit': 36000000},
+                      'cplex'      : {'lpmethod': 4, 'solutiontype': 2                                       , 'timelimit': 36000                            },
+                      'appsi_highs': {'solver': 'ipm', 'run_crossover': 'off'                                , 'time_limit': 36000                           },
+                      'cbc'        : {                                                                         'sec': 36000                                  },
+                      'glpk'       : {                                                                         'tmlim': 36000                                }},
+    'UC-MIP'       : {'gurobi'     : {'Method': 2, 'Crossover': -1, 'MIPGap': 0.01                           , 'TimeLimit': 36000, 'IterationLimit': 36000000},
+                      'cplex'      : {'lpmethod': 4, 'mip_tolerances_mipgap': 0.01, 'mip_strategy_rinsheur': 100, 'timelimit': 36000                      },
+                      'appsi_highs': {'mip_rel_gap': 0.01                                                    , 'time_limit': 36000                           },
+                      'cbc'        : {'ratioGap': 0.01                                                       , 'sec': 36000                                  },
+                      'glpk'       : {'mipgap': 0.01                                                         , 'tmlim': 36000                                }},
+    'expansion-MIP': {'gurobi'     : {'Method': 2, 'Crossover': -1, 'MIPGap': 0.01                           , 'TimeLimit': 36000, 'IterationLimit': 36000000},
+                      'cplex'      : {'lpmethod': 4, 'mip_tolerances_mipgap': 0.01, 'mip_strategy_rinsheur': 100, 'timelimit': 36000                      },
+                      'appsi_highs': {'mip_rel_gap': 0.01                                                    , 'time_limit': 36000                           },
+                      'cbc'        : {'ratioGap': 0.01                                                       , 'sec': 36000                                  },
+                      'glpk'       : {'mipgap': 0.01                                                         , 'tmlim': 36000                                }},
+}
+
+# name of the threads option of each solver
+SolverThreads = {'gurobi': 'Threads', 'cplex': 'threads', 'appsi_highs': 'threads', 'cbc': 'threads'}
+
+
+def SolverOptionValue(Value):
+    # value of an option read as text, converted to an integer, a real or kept as text as the typed options of the solvers require
+    for Type in [int, float]:
+        try:
+            return Type(Value)
+        except ValueError:
+            pass
+    return Value
+
+
+def SolverProfileOptions(DirName, CaseName, SolverName, Profile):
+    _path = os.path.join(DirName, CaseName)
+
+    # predefined options of the profile
+    SolverOptions = dict(SolverProfiles[Profile].get(SolverName, {}))
+    if SolverName in SolverThreads:
+        SolverOptions[SolverThreads[SolverName]] = int((psutil.cpu_count(logical=True) + psutil.cpu_count(logical=False))/2)
+
+    # options of the profile defined in the case (columns Profile, Solver, Option, Value)
+    try:
+        dfSolverOption = pd.read_csv(_path+'/oT_Data_SolverOption_'+CaseName+'.csv', index_col=[0,1,2], dtype={'Value': str})
+        for (profile,solver,option),value in dfSolverOption['Value'].items():
+            if profile == Profile and solver == SolverName:
+                SolverOptions[option] = SolverOptionValue(value)
+    except FileNotFoundError:
+        pass
+
+    return SolverOptions
+
+
 def ProblemSolving(DirName, CaseName, SolverName, OptModel, mTEPES, pIndLogConsole, p, sc):
     print('Problem solving                        ****')
     _path = os.path.join(DirName, CaseName)
     StartTime = time.time()
 
+    idx = 0
+    for var in OptModel.component_data_objects(pyo.Var, active=True, descend_into=True):
+        if not var.is_continuous():
+            idx += 1
+    if idx == 0:
+        OptModel.dual = Suffix(direction=Suffix.IMPORT_EXPORT)
+        OptModel.rc   = Suffix(direction=Suffix.IMPORT_EXPORT)
+
+    # solver profile depending on the existence of binary investment or operation decisions
+    nInvest = sum(1 for vInvest in [OptModel.vGenerationInvest, OptModel.vGenerationRetire, OptModel.vNetworkInvest] for var in vInvest.values() if not var.is_continuous() and not var.fixed)
+    if   idx     == 0:
+        Profile = 'LP-barrier'
+    elif nInvest >  0:
+        Profile = 'expansion-MIP'
+    else:
+        Profile = 'UC-MIP'
+
     #%% solving the problem
     Solver = SolverFactory(SolverName)                                                       # select solver
+    if getattr(mTEPES, 'pSolverOptions', None) is not None:
+        # options given explicitly, e.g., by the solver tuning
+        Profile = 'given'
+        Solver.options.update(mTEPES.pSolverOptions)
+    else:
+        Solver.options.update(SolverProfileOptions(DirName, CaseName, SolverName, Profile))
     if SolverName == 'gurobi':
         Solver.options['LogFile'       ] = _path+'/openTEPES_gurobi_'+CaseName+'.log'
         # Solver.options['IISFile'     ] = _path+'/openTEPES_gurobi_'+CaseName+'.ilp'        # should be uncommented to show results of IIS
-        Solver.options['Method'        ] = 2                                                 # barrier method
-        # Solver.options['MIPFocus'      ] = 3
-        # Solver.options['Presolve'      ] = 2
-        # Solver.options['RINS'          ] = 100
-        Solver.options['Crossover'     ] = -1
-        # Solver.options['BarConvTol'    ] = 1e-9
-        # Solver.options['BarQCPConvTol' ] = 0.025
-        Solver.options['MIPGap'        ] = 0.01
-        Solver.options['Threads'       ] = int((psutil.cpu_count(logical=True) + psutil.cpu_count(logical=False))/2)
-        Solver.options['TimeLimit'     ] =    36000
-        Solver.options['IterationLimit'] = 36000000
     if SolverName == 'gams':
         solver_options = {
             'file COPT / cplex.opt / ; put COPT putclose "LPMethod 4" / "RINSHeur 100" / ; GAMS_MODEL.OptFile = 1 ;'
@@ -41,19 +106,18 @@ def ProblemSolving(DirName, CaseName, SolverName, OptModel, mTEPES, pIndLogConso
             'option ResLim  = 36000 ; option IterLim = 36000000 ;',
             'option Threads = '+str(int((psutil.cpu_count(logical=True) + psutil.cpu_count(logical=False))/2))+' ;'
         }
+    print('Solver profile                         ... ', Profile)
 
-    idx = 0
-    for var in OptModel.component_data_objects(pyo.Var, active=True, descend_into=True):
-        if not var.is_continuous():
-            idx += 1
-    if idx == 0:
-        OptModel.dual = Suffix(direction=Suffix.IMPORT_EXPORT)
-        OptModel.rc   = Suffix(direction=Suffix.IMPORT_EXPORT)
+    # the current values of the variables are passed as MIP start if the solver accepts it
+    # also the solution of the previous point of a parametric re-solve
+    pWarmStart = idx > 0 and (mTEPES.pIndWarmStart() > 0 or getattr(mTEPES, 'pParametricWarmStart', False)) and SolverName in ['gurobi', 'cplex', 'cbc']
 
     if   SolverName == 'gurobi':
-        SolverResults = Solver.solve(OptModel, tee=True, report_timing=True)
+        SolverResults = Solver.solve(OptModel, tee=True, report_timing=True, warmstart=pWarmStart)
     elif SolverName == 'gams'  :
         SolverResults = Solver.solve(OptModel, tee=True, report_timing=True, symbolic_solver_labels=False, add_options=solver_options)
+    elif pWarmStart:
+        SolverResults = Solver.solve(OptModel, tee=True, report_timing=True, warmstart=pWarmStart)
     else:
         SolverResults = Solver.solve(OptModel, tee=True, report_timing=True)
 
@@ -65,6 +129,14 @@ def ProblemSolving(DirName, CaseName, SolverName, OptModel, mTEPES, pIndLogConso
     assert (SolverResults.solver.termination_condition == TerminationCondition.optimal or SolverResults.solver.termination_condition == TerminationCondition.maxTimeLimit or SolverResults.solver.termination_condition == TerminationCondition.infeasible.maxIterations), 'Problem infeasible'
     SolverResults.write()                                                              # summary of the solver results
 
+    # solver statistics used by the solver tuning
+    try:
+        pGap = abs(SolverResults.problem.upper_bound - SolverResults.problem.lower_bound) / max(abs(SolverResults.problem.upper_bound), 1e-10)
+    except:
+        pGap = float('nan')
+    if hasattr(mTEPES, 'pSolverStats'):
+        mTEPES.pSolverStats.append({'Period': p, 'Scenario': sc, 'Profile': Profile, 'Termination': str(SolverResults.solver.termination_condition), 'Time [s]': time.time() - StartTime, 'Gap': pGap})
+
     #%% fix values of some variables to get duals and solve it again
     # binary/continuous investment decisions are fixed to their optimal values
     # binary            operation  decisions are fixed to their optimal values
@@ -79,23 +151,31 @@ def ProblemSolving(DirName, CaseName, SolverName, OptModel, mTEPES, pIndLogConso
         SolverResults = Solver.solve(OptModel, tee=True, report_timing=True)
 
     # saving the dual variables for writing in output results
-    pDuals = {}
+    # the duals are stored by constraint family and stage, indexed by (period, scenario, stage) and the constraint index
+    # the families without constraints in the stage are stored empty, to tell the constraints skipped from the stages without duals
+    # the stage is parsed once from the suffix _<period>_<scenario>_<stage> of the name of the constraint family
+    sStage = {(str(pp),str(scc),str(stt)): (pp,scc,stt) for pp,scc,stt in mTEPES.ps*mTEPES.stt}
     for c in OptModel.component_objects(pyo.Constraint, active=True):
         if c.is_indexed():
-            for index in c:
-                pDuals[str(c.name)+str(index)] = OptModel.dual[c[index]]
+            Name   = str(c.name).rsplit('_', 3)
+            Stage  = sStage.get(tuple(Name[1:]), ())
+            Family = Name[0] if Stage else str(c.name)
+            Keys   = list(c.keys())
+            Values = list(map(OptModel.dual.get, c.values()))
+            sIndex = pd.MultiIndex.from_tuples(Keys) if len(Keys) and isinstance(Keys[0], tuple) else pd.MultiIndex.from_arrays([Keys])
+            if Stage:
+                sIndex = pd.MultiIndex.from_arrays([[Level]*len(Keys) for Level in Stage] + [sIndex.get_level_values(Level) for Level in range(sIndex.nlevels)])
+            mTEPES.pDuals.setdefault(Family, {})[Stage or None] = pd.Series(data=Values, index=sIndex if len(Keys) else None, dtype='float64')
 
     # delete dual and rc suffixes if they exist
     if idx > 0:
         OptModel.del_component(OptModel.dual)
         OptModel.del_component(OptModel.rc  )
 
-    mTEPES.pDuals.update(pDuals)
-
     SolvingTime = time.time() - StartTime
 
     print('***** Period: '+str(p)+', Scenario: '+str(sc)+' ******')
-    print    ('  Problem size                         ... ', OptModel.model().nconstraints(), 'constraints, ', OptModel.model().nvariables()-mTEPES.nFixedVariables+1, 'variables')
+    print    ('  Problem size                         ... ', OptModel.model().nconstraints(), 'constraints, ', OptModel.model().nvariables()-mTEPES.nFixedVariables()+1, 'variables')
     print    ('  Solution time                        ... ', round(SolvingTime), 's')
     print    ('  Total system                 cost [MEUR] ', OptModel.vTotalSCost())
     print    ('  Total generation  investment cost [MEUR] ', sum(mTEPES.pDiscountedWeight[p] * mTEPES.pGenInvestCost [gc      ]   * OptModel.vGenerationInvest[p,gc      ]() for gc       in mTEPES.gc))
@@ -113,3 +193,153 @@ def ProblemSolving(DirName, CaseName, SolverName, OptModel, mTEPES, pIndLogConso
     print    ('  Total consumption operation  cost [MEUR] ', sum(mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb      [p,sc    ]() * OptModel.vTotalCCost      [p,sc,n    ]() for n        in mTEPES.n ))
     print    ('  Total emission               cost [MEUR] ', sum(mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb      [p,sc    ]() * OptModel.vTotalECost      [p,sc,n    ]() for n        in mTEPES.n ))
     print    ('  Total reliability            cost [MEUR] ', sum(mTEPES.pDiscountedWeight[p] * mTEPES.pScenProb      [p,sc    ]() * OptModel.vTotalRCost      [p,sc,n    ]() for n        in mTEPES.n ))
+
+
+def LPRelaxationPrePass(DirName, CaseName, SolverName, OptModel, mTEPES, pIndLogConsole):
+    print('LP relaxation pre-pass                 ****')
+    _path = os.path.join(DirName, CaseName)
+    StartTime = time.time()
+
+    # tolerance to consider an investment decision 0 or 1
+    pEpsilon = 1e-6
+
+    # investment and retirement decisions to be rounded
+    vInvestment = [OptModel.vGenerationInvest, OptModel.vGenerationRetire, OptModel.vNetworkInvest]
+    if mTEPES.pIndHydroTopology == 1:
+        vInvestment.append(OptModel.vReservoirInvest)
+    if mTEPES.pIndHydrogen      == 1:
+        vInvestment.append(OptModel.vPipelineInvest )
+
+    #%% relax all the non-continuous variables and solve the LP relaxation
+    pDomain = {}
+    for var in OptModel.component_data_objects(pyo.Var, active=True, descend_into=True):
+        if not var.is_continuous() and not var.fixed:
+            pDomain[var] = var.domain
+            var.domain   = pyo.UnitInterval if var.is_binary() else pyo.NonNegativeReals
+    Solver = SolverFactory(SolverName)
+    Solver.options.update(SolverProfileOptions(DirName, CaseName, SolverName, 'LP-barrier'))
+    SolverResults = Solver.solve(OptModel, tee=True, report_timing=True)
+    print('Termination condition: ', SolverResults.solver.termination_condition)
+
+    # restore the domain of the relaxed variables
+    for var,domain in pDomain.items():
+        var.domain = domain
+    RelaxationTime = time.time() - StartTime
+    StartTime      = time.time()
+
+    #%% fix the binary investment decisions that are already integer in the LP relaxation
+    nFixedToZero = nFixedToOne = nRemaining = 0
+    if SolverResults.solver.termination_condition == TerminationCondition.optimal:
+        for vInvest in vInvestment:
+            for idx in vInvest:
+                if vInvest[idx] in pDomain and vInvest[idx].is_binary():
+                    if   vInvest[idx]() is not None and vInvest[idx]() <=     pEpsilon:
+                        vInvest[idx].fix(0)
+                        nFixedToZero += 1
+                    elif vInvest[idx]() is not None and vInvest[idx]() >= 1 - pEpsilon:
+                        vInvest[idx].fix(1)
+                        nFixedToOne  += 1
+                    else:
+                        nRemaining   += 1
+        mTEPES.nFixedVariables.set_value(mTEPES.nFixedVariables() + nFixedToZero + nFixedToOne)
+    else:
+        print('LP relaxation not solved to optimality, no investment decision fixed')
+
+    RoundingTime = time.time() - StartTime
+    print('  Relaxed non-continuous variables     ... ', len(pDomain))
+    print('  Investment decisions fixed to 0      ... ', nFixedToZero)
+    print('  Investment decisions fixed to 1      ... ', nFixedToOne )
+    print('  Investment decisions still binary    ... ', nRemaining  )
+    print('  LP relaxation time                   ... ', round(RelaxationTime), 's')
+    print('  Rounding time                        ... ', round(RoundingTime  ), 's')
+
+
+def WarmStartFrames(DirName, CaseName, mTEPES):
+    # power of the units, demand, upward operating reserve and results of a previous run as frames by period, scenario and load level
+    # built once per run and sliced by every stage, and built again in the next run as the parametric points change the demand
+    if getattr(mTEPES, 'pWarmStartFrames', None) is None:
+        _path  = os.path.join(DirName, CaseName)
+        Frames = {Name: pd.Series(getattr(mTEPES, Name).extract_values()).unstack() for Name in ['pMaxPower', 'pMinPower', 'pMaxPower2ndBlock']}
+        Frames['pDemand' ] = pd.Series(mTEPES.pDemand.extract_values(),        dtype='float64').groupby(level=[0,1,2]).sum()
+        Frames['pReserve'] = pd.Series(mTEPES.pOperReserveUp.extract_values(), dtype='float64').groupby(level=[0,1,2]).sum()
+        if mTEPES.pIndWarmStart() == 2:
+            # commitment and output of the units from the results of a previous run
+            try:
+                pCommit = pd.read_csv(_path+'/oT_Result_GenerationCommitment_'+CaseName+'.csv', index_col=[0,1,2])
+                pOutput = pd.read_csv(_path+'/oT_Result_Generation_'          +CaseName+'.csv', index_col=[0,1,2]) * 1e-3
+                # results of clustered units are aggregated again
+                for cl,g in mTEPES.c2g:
+                    if cl != g:
+                        pCommit[cl] += pCommit.pop(g)
+                        pOutput[cl] += pOutput.pop(g)
+                Frames['pCommit'], Frames['pOutput'] = pCommit, pOutput
+            except (FileNotFoundError, KeyError):
+                pass
+        mTEPES.pWarmStartFrames = Frames
+    return mTEPES.pWarmStartFrames
+
+
+def WarmStart(DirName, CaseName, OptModel, mTEPES, pIndLogConsole, p, sc, st):
+    print('MIP start                              ****')
+    StartTime = time.time()
+
+    # load levels of the stage
+    sN  = [n  for n  in mTEPES.nn if n in mTEPES.pDuration and (st,n) in mTEPES.s2n]
+    # units dispatched by the heuristic, excluding ESS and hydro units whose output depends on their inventory
+    sGO = [go for go in mTEPES.go if go not in mTEPES.eh]
+    sNR = [nr for nr in sGO       if nr in     mTEPES.nr]
+    if len(sN) == 0 or len(sNR) == 0:
+        return
+
+    # maximum and minimum power of the units in the load levels of the stage, a column per unit
+    Frames    = WarmStartFrames(DirName, CaseName, mTEPES)
+    sPSN      = pd.MultiIndex.from_tuples([(p,sc,n) for n in sN])
+    pMaxPower = Frames['pMaxPower'        ].reindex(index=sPSN, columns=sGO).set_axis(sN)
+    pMinPower = Frames['pMinPower'        ].reindex(index=sPSN, columns=sGO).set_axis(sN)
+    pMax2nd   = Frames['pMaxPower2ndBlock'].reindex(index=sPSN, columns=sNR).set_axis(sN)
+
+    pCommit = pOutput = None
+    if mTEPES.pIndWarmStart() == 2:
+        try:
+            pCommit = Frames['pCommit'].loc[(p,sc)].reindex(index=sN, columns=sGO).fillna(0.0)
+            pOutput = Frames['pOutput'].loc[(p,sc)].reindex(index=sN, columns=sGO).fillna(0.0)
+        except KeyError:
+            pCommit = pOutput = None
+            print('No previous results found, MIP start from the merit order')
+
+    if pCommit is None:
+        # priority list dispatch: units are committed by increasing variable cost until covering the demand and the upward operating reserve
+        pDemand   = Frames['pDemand' ].reindex(sPSN, fill_value=0.0).set_axis(sN)
+        pReserve  = Frames['pReserve'].reindex(sPSN, fill_value=0.0).set_axis(sN)
+        pPrevious = pMaxPower.cumsum(axis=1) - pMaxPower
+        pCommit   = pPrevious.lt(pDemand + pReserve, axis=0) & (pMaxPower > 0.0)
+        pOutput   = (-pPrevious).add(pDemand, axis=0).clip(lower=0.0).clip(upper=pMaxPower)
+        pOutput   = pOutput.where(~pCommit | (pOutput > pMinPower), pMinPower).where(pCommit, 0.0)
+        pCommit   = pCommit.astype('float') * pd.Series([mTEPES.pUnitMultiplicity[go] for go in sGO], index=sGO)
+
+    # startups and shutdowns from the change of commitment between consecutive load levels
+    pInitial  = pd.Series([mTEPES.pInitialUC[p,sc,sN[0],nr]() for nr in sNR], index=sNR)
+    pChange   = pCommit[sNR] - pCommit[sNR].shift(1).fillna(pInitial)
+    pStartUp  = ( pChange).clip(lower=0.0)
+    pShutDown = (-pChange).clip(lower=0.0)
+
+    def StartValues(Var, Frame):
+        # values of a frame of the stage assigned at once to the variables not fixed, returning their number and the frame with the values of the fixed ones
+        Values = Frame.stack()
+        Fixed  = pd.Series({Index: Var[(p,sc)+Index].value for Index in Values.index if Var[(p,sc)+Index].fixed}, dtype='float64')
+        Var.set_values({(p,sc)+Index: Value for Index,Value in Values.drop(Fixed.index).items()})
+        Values.update(Fixed)
+        return len(Values) - len(Fixed), Values.unstack()
+
+    nOutput,   _           = StartValues(OptModel.vTotalOutput, pOutput.clip(upper=pMaxPower))
+    nCommit,   pCommitment = StartValues(OptModel.vCommitment,  pCommit[sNR].round())
+    nStartUp,  _           = StartValues(OptModel.vStartUp,     pStartUp.round())
+    nShutDown, _           = StartValues(OptModel.vShutDown,    pShutDown.round())
+    pMultiple = pd.Series([mTEPES.pUnitMultiplicity[nr] for nr in sNR], index=sNR)
+    n2ndBlock, _           = StartValues(OptModel.vOutput2ndBlock, (pOutput[sNR] - pMinPower[sNR] * pCommitment.reindex(index=sN, columns=sNR) / pMultiple).clip(lower=0.0).clip(upper=pMax2nd))
+    nValues = nOutput + nCommit + nStartUp + nShutDown + n2ndBlock
+
+    WarmStartTime = time.time() - StartTime
+    if pIndLogConsole == 1:
+        print('MIP start values                       ... ', nValues)
+    print('MIP start                              ... ', round(WarmStartTime), 's')
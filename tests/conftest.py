@@ -0,0 +1,56 @@
+"""Synthetic cases, models and solver shared by the tests of the model."""
+import os
+
+import pytest
+
+# free solvers tried in order, the tests solving a model are skipped if none is available
+SOLVERS = ['appsi_highs', 'cbc', 'glpk']
+
+
+@pytest.fixture
+def solver_name():
+    """First free solver available in the machine."""
+    pytest.importorskip('pyomo')
+    from pyomo.opt import SolverFactory
+    for name in SOLVERS:
+        if SolverFactory(name).available(exception_flag=False):
+            return name
+    pytest.skip('none of the solvers '+', '.join(SOLVERS)+' is available')
+
+
+@pytest.fixture
+def small_case(tmp_path):
+    """Synthetic case of a day with two nodes and four thermal units, returned as (DirName, CaseName)."""
+    pytest.importorskip('pyomo')
+    pytest.importorskip('pandas')
+    from openTEPES.openTEPES_CaseGenerator import CaseGenerator
+    CaseGenerator(str(tmp_path), 'Small', Nodes=2, ThermalUnits=4, SolarUnits=1, WindUnits=1, ESSUnits=0, LoadLevels=24)
+    return str(tmp_path), 'Small'
+
+
+@pytest.fixture
+def built_model():
+    """Factory of the model of a case with its input data read and its variables declared."""
+    pytest.importorskip('pyomo')
+    from pyomo.environ import ConcreteModel
+    from openTEPES.openTEPES_InputData import InputData, SettingUpVariables
+
+    def build(DirName, CaseName):
+        mTEPES = ConcreteModel()
+        InputData(DirName, CaseName, mTEPES, 0)
+        SettingUpVariables(mTEPES, mTEPES)
+        return mTEPES
+    return build
+
+
+@pytest.fixture
+def set_option():
+    """Function changing an option of a case in its oT_Data_Option file."""
+    pd = pytest.importorskip('pandas')
+
+    def set(DirName, CaseName, Option, Value):
+        _path    = os.path.join(DirName, CaseName)
+        dfOption = pd.read_csv(_path+'/oT_Data_Option_'+CaseName+'.csv', index_col=[0])
+        dfOption[Option] = Value
+        dfOption.to_csv(_path+'/oT_Data_Option_'+CaseName+'.csv')
+    return set
@@ -0,0 +1,72 @@
+"""Checkpoint of the solution of a stage saved and loaded again."""
+import os
+import pickle
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from pyomo.environ import Var
+
+from openTEPES.openTEPES_Checkpoint import CheckpointFingerprint, CheckpointFileName, CheckpointSave, CheckpointLoad
+
+
+@pytest.fixture
+def checkpoint_model(built_model):
+    """Factory of the built model with the attributes saved in a checkpoint."""
+    def build(DirName, CaseName):
+        mTEPES = built_model(DirName, CaseName)
+        mTEPES.pCheckpointFingerprint = CheckpointFingerprint(DirName, CaseName)
+        mTEPES.pDuals       = {'eBalance': {('p', 'sc', 'st'): 1.0}}
+        mTEPES.pSolverStats = []
+        mTEPES.pPhaseStats  = []
+        return mTEPES
+    return build
+
+
+def free_variables(mTEPES):
+    return [var for var in mTEPES.component_data_objects(Var) if not var.fixed]
+
+
+def test_checkpoint_round_trip(small_case, checkpoint_model):
+    """Values and fixed state of the variables are restored, also unfixing the variables free when saved."""
+    DirName, CaseName = small_case
+    mTEPES = checkpoint_model(DirName, CaseName)
+    p,sc   = next(iter(mTEPES.ps))
+    st     = next(iter(mTEPES.stt))
+    Free   = free_variables(mTEPES)
+    for idx,var in enumerate(Free):
+        var.set_value(float(idx % 7), skip_validation=True)
+    Free[0].fix()
+    CheckpointSave(DirName, CaseName, mTEPES, p, sc, st, AllStages=True)
+
+    Loaded = checkpoint_model(DirName, CaseName)
+    Fixed  = free_variables(Loaded)
+    Fixed[1].fix(3.0)
+    assert CheckpointLoad(DirName, CaseName, Loaded, p, sc, st, AllStages=True)
+    assert [var.value for var in free_variables(Loaded)+[Fixed[0]]] == pytest.approx([float(idx % 7) for idx in range(1, len(Free))]+[0.0])
+    assert Fixed[0].fixed and not Fixed[1].fixed
+    assert Loaded.pDuals == mTEPES.pDuals
+
+
+def test_checkpoint_variables_changed(small_case, checkpoint_model):
+    """A checkpoint whose variables differ from those of the model is not loaded."""
+    DirName, CaseName = small_case
+    mTEPES = checkpoint_model(DirName, CaseName)
+    p,sc   = next(iter(mTEPES.ps))
+    st     = next(iter(mTEPES.stt))
+    CheckpointSave(DirName, CaseName, mTEPES, p, sc, st, AllStages=True)
+
+    FileName = CheckpointFileName(DirName, CaseName, p, sc, st)
+    with open(FileName, 'rb') as File:
+        Checkpoint = pickle.load(File)
+    Values, Fixed = Checkpoint['Variables']['vTotalOutput']
+    Checkpoint['Variables']['vTotalOutput'] = (Values[:-1], Fixed[:-1])
+    with open(FileName, 'wb') as File:
+        pickle.dump(Checkpoint, File)
+
+    Loaded = checkpoint_model(DirName, CaseName)
+    assert not CheckpointLoad(DirName, CaseName, Loaded, p, sc, st, AllStages=True)
+    assert Loaded.pDuals == {'eBalance': {('p', 'sc', 'st'): 1.0}} and Loaded.pSolverStats == []
+    assert os.path.exists(FileName)
@@ -0,0 +1,72 @@
+"""Clustering of identical thermal units and disaggregation of the commitment of the clusters."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from pyomo.environ import NonNegativeReals
+
+import openTEPES.openTEPES as oT
+from openTEPES.openTEPES_OutputResults import ClusterDisaggregation
+
+
+def identical_units(DirName, CaseName):
+    """Thermal0004 (CCGT as Thermal0001) moved to the node of Thermal0001."""
+    _path        = os.path.join(DirName, CaseName)
+    dfGeneration = pd.read_csv(_path+'/oT_Data_Generation_'+CaseName+'.csv', index_col=[0])
+    dfGeneration.loc['Thermal0004', 'Node'] = dfGeneration.loc['Thermal0001', 'Node']
+    dfGeneration.to_csv(_path+'/oT_Data_Generation_'+CaseName+'.csv')
+
+
+def test_cluster_identical_units(small_case, built_model, set_option):
+    """Two identical units at one node are a cluster of multiplicity 2 with twice the power, whose commitment is split back into its units."""
+    DirName, CaseName = small_case
+    identical_units(DirName, CaseName)
+    Units   = built_model(DirName, CaseName)
+    set_option(DirName, CaseName, 'IndClusterUnits', 1)
+    Cluster = built_model(DirName, CaseName)
+
+    assert Cluster.pUnitMultiplicity['Thermal0001'] == 2
+    assert 'Thermal0004' not in Cluster.g
+    assert Cluster.pRatedMaxPower['Thermal0001'] == pytest.approx(2*Units.pRatedMaxPower['Thermal0001'])
+    assert Cluster.pRatedMinPower['Thermal0001'] == pytest.approx(2*Units.pRatedMinPower['Thermal0001'])
+
+    # commitment, startup and shutdown of the cluster are continuous (relaxed commitment) up to the number of units
+    sPSN = [(p,sc,n) for p,sc,n in Cluster.psn][:3]
+    for p,sc,n in sPSN:
+        for v in [Cluster.vCommitment, Cluster.vStartUp, Cluster.vShutDown]:
+            assert v[p,sc,n,'Thermal0001'].ub     == 2
+            assert v[p,sc,n,'Thermal0001'].domain == NonNegativeReals
+
+    # the committed units of the cluster add up to the commitment of the cluster
+    Upper   = pd.Series(data=[0.0, 1.0, 2.0], index=pd.MultiIndex.from_tuples([(p,sc,n,'Thermal0001') for p,sc,n in sPSN]))
+    PerUnit = ClusterDisaggregation(Cluster, Upper, Upper*0.0)
+    assert set(PerUnit.index.get_level_values(3)) == {'Thermal0001', 'Thermal0004'}
+    assert PerUnit.groupby(level=[0,1,2]).sum().values == pytest.approx(Upper.values)
+    assert PerUnit.between(0.0, 1.0).all()
+
+
+def test_unclustered_startup_shutdown(small_case, solver_name):
+    """Without clusters the startup and shutdown results are the values of the startup and shutdown variables."""
+    DirName, CaseName = small_case
+    mTEPES = oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No').model
+    _path  = os.path.join(DirName, CaseName)
+    for Variable,File in [(mTEPES.vStartUp, 'GenerationStartUp'), (mTEPES.vShutDown, 'GenerationShutDown')]:
+        Results = pd.read_csv(_path+'/oT_Result_'+File+'_'+CaseName+'.csv', index_col=[0,1,2])
+        for p,sc,n,nr in mTEPES.psnnr:
+            assert Results.loc[(p,sc,n), nr] == pytest.approx(Variable[p,sc,n,nr].value, abs=1e-6)
+
+
+def test_cluster_surplus_disaggregated(small_case, solver_name, set_option):
+    """The surplus of a cluster is split evenly among its units."""
+    DirName, CaseName = small_case
+    identical_units(DirName, CaseName)
+    set_option(DirName, CaseName, 'IndClusterUnits', 1)
+    oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No')
+    _path   = os.path.join(DirName, CaseName)
+    Results = pd.read_csv(_path+'/oT_Result_GenerationSurplus_'+CaseName+'.csv', index_col=[0,1,2])
+    if 'Thermal0001' not in Results.columns:
+        pytest.skip('the cluster is dispatched at its maximum output')
+    assert Results['Thermal0004'].fillna(0.0).values == pytest.approx(Results['Thermal0001'].fillna(0.0).values)
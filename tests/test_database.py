@@ -0,0 +1,31 @@
+"""Results written to a SQLite or DuckDB database and read back with DatabaseResults."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+import openTEPES.openTEPES as oT
+from openTEPES.openTEPES_OutputResults import DatabaseResults
+
+
+def stacked(Results):
+    """Values of a result keyed by the text of its period, scenario, load level and element."""
+    return {tuple(str(Key) for Key in Index): Value for Index,Value in Results.items()}
+
+
+@pytest.mark.parametrize('Database,Extension', [(1, '.db'), (2, '.duckdb')])
+def test_database_round_trip(small_case, solver_name, set_option, Database, Extension):
+    """The tables of the database are read back with the elements in columns and the values of the CSV files."""
+    if Database == 2:
+        pytest.importorskip('duckdb')
+    DirName, CaseName = small_case
+    set_option(DirName, CaseName, 'IndResultDatabase', Database)
+    oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No')
+    _path = os.path.join(DirName, CaseName)
+    assert os.path.exists(_path+'/oT_Result_'+CaseName+Extension)
+
+    assert 'Generation' in DatabaseResults(DirName, CaseName)
+    CSV = pd.read_csv(_path+'/oT_Result_Generation_'+CaseName+'.csv', index_col=[0,1,2])
+    assert stacked(DatabaseResults(DirName, CaseName, 'Generation').stack()) == pytest.approx(stacked(CSV.stack()))
@@ -0,0 +1,41 @@
+"""Duals of the constraint families read by the output results."""
+from types import SimpleNamespace
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from openTEPES.openTEPES_OutputResults import DualsConcatenation, DualValues
+
+
+def solved_model():
+    # eBalance solved in two stages, eReserve without constraints in the second one
+    Stage1, Stage2 = ('p', 'sc', 'st1'), ('p', 'sc', 'st2')
+    return SimpleNamespace(pDuals={'eBalance': {Stage1: pd.Series([1.0, 2.0], index=pd.MultiIndex.from_tuples([Stage1+('n1',), Stage1+('n2',)])),
+                                                Stage2: pd.Series([3.0],      index=pd.MultiIndex.from_tuples([Stage2+('n1',)]))},
+                                   'eReserve': {Stage1: pd.Series([4.0],      index=pd.MultiIndex.from_tuples([Stage1+('n1',)])),
+                                                Stage2: pd.Series(dtype='float64')}})
+
+
+def test_dual_values():
+    mTEPES = solved_model()
+    DualsConcatenation(mTEPES)
+    Duals  = {Family: {Stage: Values.copy() for Stage,Values in Stages.items()} for Family,Stages in mTEPES.pDuals.items()}
+
+    # the constraints skipped in a stage solved are 0
+    assert list(DualValues(mTEPES, 'eBalance', [('p', 'sc', 'st1', 'n2'), ('p', 'sc', 'st2', 'n1'), ('p', 'sc', 'st2', 'n2')])) == [2.0, 3.0, 0.0]
+    assert list(DualValues(mTEPES, 'eReserve', [('p', 'sc', 'st1', 'n1'), ('p', 'sc', 'st2', 'n1')])) == [4.0, 0.0]
+
+    # the duals of the stages are not changed by the readers
+    assert all(mTEPES.pDuals[Family][Stage].equals(Values) for Family,Stages in Duals.items() for Stage,Values in Stages.items())
+
+
+def test_dual_values_missing_stage():
+    mTEPES = solved_model()
+    DualsConcatenation(mTEPES)
+    with pytest.raises(ValueError, match='st3'):
+        DualValues(mTEPES, 'eBalance', [('p', 'sc', 'st3', 'n1')])
+    # only the stages without duals are reported, not the constraints skipped in a stage solved
+    with pytest.raises(ValueError, match=r"The duals of eBalance are not available for the stages \('p', 'sc', 'st3'\), \('p', 'sc', 'st4'\)$"):
+        DualValues(mTEPES, 'eBalance', [('p', 'sc', 'st1', 'n1'), ('p', 'sc', 'st2', 'n2'), ('p', 'sc', 'st4', 'n1'), ('p', 'sc', 'st3', 'n2')])
@@ -0,0 +1,26 @@
+"""Import time of the package measured in a new interpreter with -X importtime."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+# budget of the cumulative import time of the package in seconds
+IMPORT_TIME_BUDGET = float(os.environ.get('OPENTEPES_IMPORT_TIME_BUDGET', '3.0'))
+
+
+def import_time(module):
+    """Cumulative import time of the module in seconds and modules loaded after importing it."""
+    code   = f'import sys, {module}; print(" ".join(sorted(sys.modules)))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, check=True)
+    cumulative = [int(line.split('|')[1]) for line in result.stderr.splitlines() if line.startswith('import time:') and line.split('|')[-1].strip() == module]
+    return max(cumulative)*1e-6, set(result.stdout.split())
+
+
+def test_import_time():
+    """The package is imported within the budget and without the plotting libraries."""
+    pytest.importorskip('pyomo')
+    pytest.importorskip('pandas')
+    seconds, modules = import_time('openTEPES')
+    assert not {'altair', 'plotly', 'colour'} & modules
+    assert seconds < IMPORT_TIME_BUDGET
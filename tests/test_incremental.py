@@ -0,0 +1,53 @@
+"""Dependency tracker of the input tables and incremental update of a built model."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+import openTEPES.openTEPES as oT
+from openTEPES.openTEPES_InputData        import SettingUpVariables
+from openTEPES.openTEPES_ModelFormulation import GenerationOperationModelFormulationObjFunct, NetworkOperationModelFormulation
+from openTEPES.openTEPES_Incremental      import InputDependencies, ModelReferences
+
+
+def test_input_dependencies():
+    """Parameters and sets derived from the input tables, found by the static scan of InputData."""
+    Dependencies = InputDependencies()
+    assert {'pLinearVarCost', 'pConstantVarCost'} <= Dependencies['Data_VariableFuelCost']
+    assert not {'g', 'nd', 'lc'}                  &  Dependencies['Data_VariableFuelCost']
+    assert {'lc', 'pNetFixedCost'}                <= Dependencies['Data_Network']
+    assert 'nd'                                   in Dependencies['Dict_Node']
+
+
+def test_model_references():
+    """Attributes of the model read by the formulation functions."""
+    assert {'pLinearVarCost', 'pConstantVarCost', 'vTotalGCost'} <= ModelReferences(GenerationOperationModelFormulationObjFunct)
+    assert 'pLinearVarCost' not in ModelReferences(NetworkOperationModelFormulation)
+    assert 'pLinearVarCost' not in ModelReferences(SettingUpVariables)
+
+
+def test_incremental_update(small_case, solver_name, set_option):
+    """A change of the fuel cost rebuilds the objective function only, and gives the same solution as the case built again."""
+    DirName, CaseName = small_case
+    _path = os.path.join(DirName, CaseName)
+    set_option(DirName, CaseName, 'IndStreamResults', 2)
+
+    Results = oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No', WriteResults=False, Incremental=True)
+    Cost    = oT.CaseKPIs(Results)['Total System Cost [MEUR]']
+    assert os.path.exists(_path+'/oT_Result_Dependency_'+CaseName+'.csv')
+
+    # fuel cost of the thermal units tripled
+    dfFuelCost = pd.read_csv(_path+'/oT_Data_VariableFuelCost_'+CaseName+'.csv', index_col=[0,1,2])
+    dfFuelCost[[Unit for Unit in dfFuelCost.columns if Unit.startswith('Thermal')]] = 3.0
+    dfFuelCost.to_csv(_path+'/oT_Data_VariableFuelCost_'+CaseName+'.csv')
+
+    Results  = oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No', WriteResults=False, Incremental=True, Model=Results.model)
+    dfReport = pd.read_csv(_path+'/oT_Result_Rebuild_'+CaseName+'.csv')
+    assert set(dfReport.loc[dfReport['Status'] == 'Rebuilt', 'Formulation']) >= {'GenerationOperationModelFormulationObjFunct'}
+    assert 'NetworkOperationModelFormulation' in set(dfReport.loc[dfReport['Status'] == 'Reused', 'Formulation'])
+    assert oT.CaseKPIs(Results)['Total System Cost [MEUR]'] > Cost
+
+    Rebuilt = oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No', WriteResults=False)
+    assert oT.CaseKPIs(Results)['Total System Cost [MEUR]'] == pytest.approx(Rebuilt.vTotalSCost(), rel=1e-4)
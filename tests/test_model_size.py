@@ -0,0 +1,38 @@
+"""Model size estimated before building the model compared with the built one."""
+import os
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+# relative difference allowed between the estimated and the built number of variables and constraints
+TOLERANCE = 0.02
+
+
+def test_model_size_9n(built_model):
+    from pyomo.environ import Set
+    import openTEPES
+    from openTEPES.openTEPES_Instrumentation import ModelSizeEstimate
+    from openTEPES.openTEPES_ModelFormulation import TotalObjectiveFunction, InvestmentModelFormulation, GenerationOperationModelFormulationObjFunct, GenerationOperationModelFormulationInvestment, GenerationOperationModelFormulationDemand, GenerationOperationModelFormulationStorage, GenerationOperationModelFormulationCommitment, GenerationOperationModelFormulationRampMinTime, NetworkSwitchingModelFormulation, NetworkOperationModelFormulation
+
+    mTEPES = built_model(os.path.dirname(openTEPES.__file__), '9n')
+    dfModelSize = ModelSizeEstimate(mTEPES)
+
+    # model formulated as in openTEPES_run, with the load levels of every stage
+    TotalObjectiveFunction    (mTEPES, mTEPES, 0)
+    InvestmentModelFormulation(mTEPES, mTEPES, 0)
+    for p,sc,st in mTEPES.ps*mTEPES.stt:
+        mTEPES.del_component(mTEPES.st)
+        mTEPES.del_component(mTEPES.n )
+        mTEPES.del_component(mTEPES.n2)
+        mTEPES.st = Set(initialize=mTEPES.stt, ordered=True, doc='stages',      filter=lambda mTEPES,stt: stt in st == stt and mTEPES.pStageWeight and sum(1 for (st,nn) in mTEPES.s2n))
+        mTEPES.n  = Set(initialize=mTEPES.nn,  ordered=True, doc='load levels', filter=lambda mTEPES,nn:  nn  in               mTEPES.pDuration    and           (st,nn) in mTEPES.s2n)
+        mTEPES.n2 = Set(initialize=mTEPES.nn,  ordered=True, doc='load levels', filter=lambda mTEPES,nn:  nn  in               mTEPES.pDuration    and           (st,nn) in mTEPES.s2n)
+        for Formulation in [GenerationOperationModelFormulationObjFunct, GenerationOperationModelFormulationInvestment, GenerationOperationModelFormulationDemand, GenerationOperationModelFormulationStorage,
+                            GenerationOperationModelFormulationCommitment, GenerationOperationModelFormulationRampMinTime, NetworkSwitchingModelFormulation, NetworkOperationModelFormulation]:
+            Formulation(mTEPES, mTEPES, 0, p, sc, st)
+
+    Rows = dfModelSize.groupby('Kind')['Rows'].sum()
+    assert Rows['Variable']   == pytest.approx(mTEPES.nvariables(),   rel=TOLERANCE)
+    assert Rows['Constraint'] == pytest.approx(mTEPES.nconstraints(), rel=TOLERANCE)
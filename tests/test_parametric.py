@@ -0,0 +1,47 @@
+"""Parametric re-solve of a built model compared with the case built again with the parameters of each point."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+import openTEPES.openTEPES as oT
+
+
+def test_parametric_points(small_case, solver_name, set_option):
+    """Points of the parametric re-solve, with the results streamed by stage, match the case built with their CO2 cost and demand."""
+    DirName, CaseName = small_case
+    _path = os.path.join(DirName, CaseName)
+    set_option(DirName, CaseName, 'IndStreamResults', 2)
+
+    Points  = {'base': {'CO2Cost': 50.0, 'DemandScale': 1.0}, 'high': {'CO2Cost': 200.0, 'DemandScale': 1.1}}
+    Results = oT.openTEPES_parametric(DirName, CaseName, solver_name, Points)
+    assert os.path.exists(_path+'/oT_Result_Parametric_'+CaseName+'.csv')
+    assert Results.loc['high', 'Total System Cost [MEUR]'] > Results.loc['base', 'Total System Cost [MEUR]']
+    assert Results.loc['high', 'Emission Cost [MEUR]']     != pytest.approx(Results.loc['base', 'Emission Cost [MEUR]'])
+
+    # the same case built again with the CO2 cost and the demand of the second point
+    dfParameter = pd.read_csv(_path+'/oT_Data_Parameter_'+CaseName+'.csv', index_col=[0])
+    dfParameter['CO2Cost'] = 200.0
+    dfParameter.to_csv(_path+'/oT_Data_Parameter_'+CaseName+'.csv')
+    dfDemand = pd.read_csv(_path+'/oT_Data_Demand_'+CaseName+'.csv', index_col=[0,1,2])
+    (dfDemand*1.1).to_csv(_path+'/oT_Data_Demand_'+CaseName+'.csv')
+    mTEPES = oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No', WriteResults=False)
+    assert Results.loc['high', 'Total System Cost [MEUR]'] == pytest.approx(mTEPES.vTotalSCost(), rel=1e-4)
+    assert Results.loc['high', 'ENS [GWh]']                == pytest.approx(oT.CaseKPIs(mTEPES)['ENS [GWh]'], rel=1e-4, abs=1e-6)
+
+
+def test_parametric_zero_cost(small_case, solver_name):
+    """A case without CO2 cost can change the demand, but not its CO2 cost."""
+    DirName, CaseName = small_case
+    _path = os.path.join(DirName, CaseName)
+    dfParameter = pd.read_csv(_path+'/oT_Data_Parameter_'+CaseName+'.csv', index_col=[0])
+    dfParameter['CO2Cost'] = 0.0
+    dfParameter.to_csv(_path+'/oT_Data_Parameter_'+CaseName+'.csv')
+
+    Results = oT.openTEPES_parametric(DirName, CaseName, solver_name, {'base': {'DemandScale': 1.0}, 'high': {'DemandScale': 1.1}})
+    assert Results.loc['high', 'Total System Cost [MEUR]'] > Results.loc['base', 'Total System Cost [MEUR]']
+
+    with pytest.raises(ValueError, match='CO2Cost'):
+        oT.openTEPES_parametric(DirName, CaseName, solver_name, {'high': {'CO2Cost': 50.0}})
@@ -0,0 +1,32 @@
+"""Variables and constraint families counted by the phase statistics."""
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('psutil')
+pyo = pytest.importorskip('pyomo.environ')
+
+from openTEPES.openTEPES_Instrumentation import PhaseStats
+
+
+def test_phase_stats_components_added():
+    mTEPES = pyo.ConcreteModel()
+    mTEPES.n = pyo.Set(initialize=['n1', 'n2', 'n3'])
+    mTEPES.vOld = pyo.Var(mTEPES.n)
+    mTEPES.eOld_p_sc_st1 = pyo.Constraint(mTEPES.n, rule=lambda mTEPES,n: mTEPES.vOld[n] >= 0.0)
+
+    with PhaseStats(mTEPES, 'GenerationOperationModelFormulationDemand', 'p', 'sc', 'st2'):
+        # the constraints of the previous stage deleted in the phase are not counted
+        mTEPES.del_component(mTEPES.eOld_p_sc_st1)
+        mTEPES.vNew = pyo.Var(mTEPES.n)
+        mTEPES.eNew_p_sc_st2 = pyo.Constraint(mTEPES.n, rule=lambda mTEPES,n: mTEPES.vNew[n] >= mTEPES.vOld[n])
+        mTEPES.eOne_p_sc_st2 = pyo.Constraint(expr=mTEPES.vNew['n1'] <= 1.0)
+
+    assert [(Stats['Family'], Stats['Constraints']) for Stats in mTEPES.pFamilyStats] == [('eNew', 3), ('eOne', 1)]
+    assert mTEPES.pPhaseStats[-1]['Variables']   == 3
+    assert mTEPES.pPhaseStats[-1]['Constraints'] == 4
+
+    # a phase without new components
+    with PhaseStats(mTEPES, 'ProblemSolving', 'p', 'sc', 'st2'):
+        pass
+    assert mTEPES.pPhaseStats[-1]['Variables'] == mTEPES.pPhaseStats[-1]['Constraints'] == 0
+    assert len(mTEPES.pFamilyStats) == 2
@@ -0,0 +1,48 @@
+"""Downsampling of the data of the area and line plots to a maximum number of points."""
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from openTEPES.openTEPES_OutputResults import PlotDownsampling
+
+
+def plot_data(LoadLevels, Categories):
+    """Values of the categories by load level, as passed to the plots."""
+    sX  = ['01-01 '+str(n).zfill(5) for n in range(LoadLevels)]
+    Rng = np.random.default_rng(0)
+    return pd.DataFrame({'LoadLevel': np.tile(sX, Categories), 'Technology': np.repeat(['Tech'+str(i) for i in range(Categories)], LoadLevels), 'GWh': Rng.random(LoadLevels*Categories)})
+
+
+@pytest.mark.parametrize('LoadLevels,Categories,MaxPoints', [(8736, 5, 4000), (8736, 1, 1000), (1000, 7, 300)])
+def test_area_downsampling(LoadLevels, Categories, MaxPoints):
+    """The stacked areas keep one point per bucket and category, with the average of the bucket, within the budget."""
+    Results = plot_data(LoadLevels, Categories)
+    Sampled = PlotDownsampling(Results, 'Technology', 'LoadLevel', 'GWh', 'sum', MaxPoints)
+    assert len(Sampled) <= MaxPoints + Categories
+    assert list(Sampled.columns) == list(Results.columns)
+    # every category has the same load levels, so the areas stack
+    assert Sampled.groupby('Technology')['LoadLevel'].apply(tuple).nunique() == 1
+    assert Sampled['GWh'].between(Results['GWh'].min(), Results['GWh'].max()).all()
+    assert Sampled['GWh'].mean() == pytest.approx(Results['GWh'].mean(), rel=0.05)
+
+
+@pytest.mark.parametrize('LoadLevels,Categories,MaxPoints', [(8736, 5, 4000), (8736, 1, 1000), (1000, 7, 300)])
+def test_line_downsampling(LoadLevels, Categories, MaxPoints):
+    """The lines keep the minimum and maximum of each bucket, so their extremes are not lost, within the budget."""
+    Results = plot_data(LoadLevels, Categories)
+    Sampled = PlotDownsampling(Results, 'Technology', 'LoadLevel', 'GWh', 'mean', MaxPoints)
+    assert len(Sampled) <= MaxPoints + 2*Categories
+    # the points kept are points of the data, in their order
+    assert Sampled.index.is_monotonic_increasing
+    assert Sampled.equals(Results.loc[Sampled.index])
+    assert Sampled.groupby('Technology')['GWh'].max().equals(Results.groupby('Technology')['GWh'].max())
+    assert Sampled.groupby('Technology')['GWh'].min().equals(Results.groupby('Technology')['GWh'].min())
+
+
+def test_small_plot_unchanged():
+    """The data within the budget are plotted as they are."""
+    Results = plot_data(24, 3)
+    assert PlotDownsampling(Results, 'Technology', 'LoadLevel', 'GWh', 'sum',  4000) is Results
+    assert PlotDownsampling(Results, 'Technology', 'LoadLevel', 'GWh', 'mean', 4000) is Results
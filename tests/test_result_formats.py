@@ -0,0 +1,30 @@
+"""Results by load level written in long format to Parquet and Feather files."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+pytest.importorskip('pyarrow')
+
+import openTEPES.openTEPES as oT
+
+
+def stacked(Results):
+    """Values of a result keyed by the text of its period, scenario, load level and element."""
+    return {tuple(str(Key) for Key in Index): Value for Index,Value in Results.items()}
+
+
+def test_parquet_feather_round_trip(small_case, solver_name, set_option):
+    """The long Parquet and Feather results hold the same values as the CSV file, with the keys as categories."""
+    DirName, CaseName = small_case
+    set_option(DirName, CaseName, 'IndResultFormat', 3)
+    oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No')
+    _path = os.path.join(DirName, CaseName)
+
+    CSV = stacked(pd.read_csv(_path+'/oT_Result_Generation_'+CaseName+'.csv', index_col=[0,1,2]).stack())
+    for Results in [pd.read_parquet(_path+'/oT_Result_Generation_'+CaseName+'.parquet'),
+                    pd.read_feather(_path+'/oT_Result_Generation_'+CaseName+'.feather')]:
+        assert list(Results.columns) == ['Period', 'Scenario', 'LoadLevel', 'Element', 'MW']
+        assert all(isinstance(Results[Level].dtype, pd.CategoricalDtype) for Level in ['Period', 'Scenario', 'LoadLevel', 'Element'])
+        assert stacked(Results.set_index(['Period', 'Scenario', 'LoadLevel', 'Element'])['MW']) == pytest.approx(CSV)
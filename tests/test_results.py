@@ -0,0 +1,40 @@
+"""Results returned by openTEPES_run, computed only when they are accessed."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+import openTEPES.openTEPES as oT
+from openTEPES.openTEPES_OutputResults import Results
+
+
+def test_lazy_results(small_case, solver_name):
+    """Without writing the results, each of them is computed at its first access and kept, and the model attributes are still reachable."""
+    DirName, CaseName = small_case
+    Solution = oT.openTEPES_run(DirName, CaseName, solver_name, 'No', 'No', WriteResults=False)
+    _path    = os.path.join(DirName, CaseName)
+    assert isinstance(Solution, Results)
+    assert not os.path.exists(_path+'/oT_Result_Generation_'+CaseName+'.csv')
+
+    # attributes of the model, as the model returned by previous versions
+    mTEPES = Solution.model
+    assert Solution.psng is mTEPES.psng
+
+    assert 'generation' not in vars(Solution)
+    Generation = Solution.generation
+    assert 'generation' in vars(Solution)
+    assert Solution.generation is Generation
+    assert Generation.index.names == ['Period', 'Scenario', 'LoadLevel', 'Unit']
+    assert Generation.values == pytest.approx([mTEPES.vTotalOutput[p,sc,n,g].value*1e3 for p,sc,n,g in mTEPES.psng])
+
+    assert 'costs' not in vars(Solution)
+    assert Solution.costs.index.names == ['Period', 'Cost']
+    assert Solution.costs.notna().all()
+    assert 'costs' in vars(Solution)
+
+    Solution.export('generation', format='csv')
+    assert len(pd.read_csv(_path+'/oT_Result_Generation_'+CaseName+'.csv')) == len(mTEPES.psng)
+    with pytest.raises(ValueError, match='Unknown result format'):
+        Solution.export('generation', format='xlsx')
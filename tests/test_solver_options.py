@@ -0,0 +1,20 @@
+"""Options of the solver profiles modified in the case."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from openTEPES.openTEPES_ProblemSolving import SolverProfileOptions
+
+
+def test_solver_option_types(tmp_path):
+    """The values of the options keep the type the solvers expect, integers, reals or text."""
+    os.makedirs(os.path.join(str(tmp_path), 'Case'))
+    pd.DataFrame({'Value': [2, 0.005, 'ipm']}, index=pd.MultiIndex.from_tuples([('LP-barrier', 'appsi_highs', 'threads'), ('LP-barrier', 'appsi_highs', 'mip_rel_gap'), ('LP-barrier', 'appsi_highs', 'solver')])).to_csv(os.path.join(str(tmp_path), 'Case', 'oT_Data_SolverOption_Case.csv'))
+
+    Options = SolverProfileOptions(str(tmp_path), 'Case', 'appsi_highs', 'LP-barrier')
+    assert Options['threads'] == 2 and isinstance(Options['threads'], int)
+    assert Options['mip_rel_gap'] == 0.005 and isinstance(Options['mip_rel_gap'], float)
+    assert Options['solver'] == 'ipm'
@@ -0,0 +1,63 @@
+"""Sweep of variants of a case solved in worker processes."""
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+import openTEPES.openTEPES as oT
+
+
+def sweep_file(DirName, Rows):
+    """Sweep file with the overrides (Variant, Table, Column, Operation, Value) of the variants."""
+    FileName = os.path.join(DirName, 'sweep.csv')
+    pd.DataFrame(Rows, columns=['Variant', 'Table', 'Column', 'Operation', 'Value']).to_csv(FileName, index=False)
+    return FileName
+
+
+def case_bytes(DirName, CaseName):
+    _path = os.path.join(DirName, CaseName)
+    Bytes = {}
+    for FileName in os.listdir(_path):
+        if FileName.startswith(('oT_Data_', 'oT_Dict_')):
+            with open(os.path.join(_path, FileName), 'rb') as File:
+                Bytes[FileName] = File.read()
+    return Bytes
+
+
+def test_sweep_base_case_unchanged(small_case):
+    """A variant written again with an override in the same folder does not write through the links to the base case."""
+    DirName, CaseName = small_case
+    Base     = case_bytes(DirName, CaseName)
+    SweepDir = os.path.join(DirName, CaseName, 'sweep')
+
+    for Rows in [[('v1', None, None, None, None)], [('v1', 'Demand', None, 'scale', 1.1)]]:
+        dfSweep    = oT.SweepSpec(sweep_file(DirName, Rows))
+        BaseTables = {Table: oT.SweepTable(DirName, CaseName, Table) for Table in dfSweep['Table'].dropna().unique()}
+        oT.SweepCase(DirName, CaseName, SweepDir, 'v1', dfSweep, BaseTables, 'appsi_highs', 1)
+
+    assert case_bytes(DirName, CaseName) == Base
+    VariantPath = os.path.join(SweepDir, 'v1', CaseName)
+    dfBase      = pd.read_csv(os.path.join(DirName,     CaseName, 'oT_Data_Demand_'+CaseName+'.csv'), index_col=[0,1,2])
+    dfVariant   = pd.read_csv(os.path.join(VariantPath,           'oT_Data_Demand_'+CaseName+'.csv'), index_col=[0,1,2])
+    assert dfVariant.values == pytest.approx(dfBase.values*1.1)
+
+    # the solver threads of the variant are written as integers
+    dfSolverOption = pd.read_csv(os.path.join(VariantPath, 'oT_Data_SolverOption_'+CaseName+'.csv'), index_col=[0,1,2], dtype={'Value': str})
+    assert set(dfSolverOption['Value']) == {'1'}
+
+
+def test_sweep(small_case, solver_name):
+    """Variants of the sweep are solved and their key performance indicators follow their overrides, the base case is not changed."""
+    DirName, CaseName = small_case
+    Base = case_bytes(DirName, CaseName)
+
+    for Scale in [1.05, 1.1]:
+        Results = oT.openTEPES_sweep(DirName, CaseName, solver_name, sweep_file(DirName, [('base', None, None, None, None), ('high', 'Demand', None, 'scale', Scale)]), Workers=2, SolverThreads=1)
+        assert list(Results.index) == ['base', 'high']
+        assert (Results['Status'] == 'optimal').all()
+        assert Results.loc['high', 'Total System Cost [MEUR]'] > Results.loc['base', 'Total System Cost [MEUR]']
+
+    assert os.path.exists(os.path.join(DirName, CaseName, 'oT_Result_Sweep_'+CaseName+'.csv'))
+    assert case_bytes(DirName, CaseName) == Base